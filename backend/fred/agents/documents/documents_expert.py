@@ -98,9 +98,8 @@ class DocumentsExpert(AgentFlow):
             "1. Always use tools to fetch data before providing answers. Avoid generating generic guidance or assumptions.\n"
             "2. Aggregate and analyze the data to directly answer the user's query.\n"
             "3. Present the results clearly, with summaries, breakdowns, and trends where applicable.\n\n"
-            f"The current date is {self.current_date}.\n\n"
-            f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.\n" if self.cluster_fullname else ""
-
+            + (f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.\n" if self.cluster_fullname else "")
+            + f"The current date is {self.current_date}.\n"
         )
     
     async def reasoner(self, state: MessagesState):
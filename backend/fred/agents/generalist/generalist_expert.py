@@ -15,7 +15,6 @@
 from datetime import datetime
 import logging
 from typing import Optional
-from langchain_core.messages import SystemMessage
 from langgraph.graph import END, START, MessagesState, StateGraph
 from fred.common.structure import AgentSettings, Configuration
 from fred.flow import AgentFlow
@@ -70,17 +69,17 @@ class GeneralistExpert(AgentFlow):
         )
 
     def _generate_prompt(self) -> str:
+        # Static instructions first, so that the providers can cache them across clusters.
         lines = [
             "You are a friendly generalist expert, skilled at providing guidance on a wide range of topics without deep specialization.",
+            "Your role is to respond with clarity, providing accurate and reliable information.",
+            "When appropriate, highlight elements that could be particularly relevant.",
+            "In case of graphical representation, render mermaid diagrams code.",
         ]
         if self.cluster_fullname:
             lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
-    
         lines += [
-            "Your role is to respond with clarity, providing accurate and reliable information.",
-            "When appropriate, highlight elements that could be particularly relevant.",
             f"The current date is {datetime.now().strftime('%Y-%m-%d')}.",
-            "In case of graphical representation, render mermaid diagrams code.",
             "",
         ]
         return "\n".join(lines)
@@ -96,8 +95,7 @@ class GeneralistExpert(AgentFlow):
             dict: The updated state with the expert's response.
         """
         model = get_model_for_agent(self.name)
-        prompt = SystemMessage(content=self.base_prompt)
-        response = await model.ainvoke([prompt] + state["messages"])
+        response = await model.ainvoke(self.build_prompt().messages() + state["messages"])
         return {"messages": [response]}
 
     def set_cluster_name(self, cluster_name: str):
@@ -65,9 +65,8 @@ class KedaExpert(AgentFlow):
                 "The expert interprets facts about the application to make assumptions and propose a KEDA configuration."
             ),
             icon=self.icon,
+            # Static instructions first, so that the providers can cache them across clusters.
             base_prompt=(
-                f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.\n" if self.cluster_fullname else ""
-                f"The current date is {current_date}.\n"
                 "You are an assistant that processes functional descriptions to generate "
                 "KEDA cron configurations or KEDA Prometheus-based scaling configurations. "
                 "Each type of KEDA configuration has its specific tool for generation. "
@@ -97,6 +96,8 @@ class KedaExpert(AgentFlow):
                 "    * Ask for missing details **only** if you cannot make assumptions from the Kube configuration or best practices, "
                 "and only when essential parameters like namespace, time specifications, metrics, etc., are completely missing.\n"
                 "    * Reject out-of-scope requests (e.g., unrelated tasks or services) and politely explain the app's limitations.\n\n"
+                + (f"Your current context involves a Kubernetes cluster named {cluster_fullname}.\n" if cluster_fullname else "")
+                + f"The current date is {current_date}.\n"
             ),
             categories=categories,
             tag=self.tag,
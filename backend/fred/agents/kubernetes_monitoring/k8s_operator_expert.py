@@ -78,15 +78,10 @@ class K8SOperatorExpert(AgentFlow):
         Returns:
             str: A formatted string containing the expert's instructions.
         """
+        # Static instructions first, so that the providers can cache them across clusters.
         lines = [
             "You are a Kubernetes monitoring & operator expert with access to tools for retrieving and analyzing data.",
-        ]
-        if self.cluster_fullname:
-            lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}, and you are equipped with MCP server tools.")
-        else:
-            lines.append("You are equipped with MCP server tools.")
-
-        lines += [
+            "You are equipped with MCP server tools.",
             "",
             "### Your Primary Responsibilities:",
             "1. **Retrieve Data**: Use the provided tools, including MCP server tools, to fetch data for:",
@@ -102,6 +97,10 @@ class K8SOperatorExpert(AgentFlow):
             "2. Aggregate and analyze the data to directly answer the user's query.",
             "3. Present the results clearly, with summaries, breakdowns, and trends where applicable.",
             "",
+        ]
+        if self.cluster_fullname:
+            lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
+        lines += [
             f"The current date is {datetime.now().strftime('%Y-%m-%d')}.",
             "",
         ]
@@ -71,13 +71,9 @@ class MonitoringExpert(AgentFlow):
         Returns:
             str: A formatted string containing the expert's instructions.
         """
+        # Static instructions first, so that the providers can cache them across clusters.
         lines = [
             "You are a Kubernetes monitoring expert with access to tools for retrieving and analyzing data.",
-        ]
-        if self.cluster_fullname:
-            lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
-
-        lines += [
             "",
             "### Your Primary Responsibilities:",
             "1. **Retrieve Data**: Use the provided tools to fetch data for:",
@@ -93,8 +89,6 @@ class MonitoringExpert(AgentFlow):
             "2. Aggregate and analyze the data to directly answer the user's query.",
             "3. Present the results clearly, with summaries, breakdowns, and trends where applicable.",
             "",
-            f"The current date is {datetime.now().strftime('%Y-%m-%d')}.",
-            "",
             "### Example Queries and Outputs:",
             "- Query: 'What was the energy consumption for the cluster last week?'",
             "  - Fetch the raw data using the energy consumption tool.",
@@ -115,7 +109,11 @@ class MonitoringExpert(AgentFlow):
             "  - Calculate the weekly total and average daily cost.",
             "  - Include a breakdown by components (e.g., compute, storage, network).",
             "  - Present results in a structured and concise format.",
+            "",
         ]
+        if self.cluster_fullname:
+            lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
+        lines.append(f"The current date is {datetime.now().strftime('%Y-%m-%d')}.")
         return "\n".join(lines)
     
     def get_graph(self):
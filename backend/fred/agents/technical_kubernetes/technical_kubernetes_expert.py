@@ -14,7 +14,6 @@
 
 from datetime import datetime
 from typing import Optional
-from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.graph import END, START, MessagesState, StateGraph
 from fred.flow import AgentFlow
@@ -77,18 +76,18 @@ class TechnicalKubernetesExpert(AgentFlow):
         Returns:
             str: A formatted string containing the expert's instructions.
         """
+        # Static instructions first, so that the providers can cache them across clusters.
         lines = [
             "You are a friendly technical Kubernetes expert.",
+            "Your role is to provide clear and precise technical guidance about this cluster.",
+            "You have access to a set of tools to retrieve specific information about the cluster.",
+            "When needed, highlight your technical and operational knowledge in your response.",
+            "If a graphical representation is required, use Mermaid diagrams.",
         ]
         if self.cluster_fullname:
             lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
-
         lines += [
-            "Your role is to provide clear and precise technical guidance about this cluster.",
-            "You have access to a set of tools to retrieve specific information about the cluster.",
-            "When needed, highlight your technical and operational knowledge in your response.",
             f"The current date is {datetime.now().strftime('%Y-%m-%d')}.",
-            "If a graphical representation is required, use Mermaid diagrams.",
             "",
         ]
         return "\n".join(lines)
@@ -107,8 +106,7 @@ class TechnicalKubernetesExpert(AgentFlow):
         model = get_model_for_agent(self.name)
         model_with_tools = model.bind_tools(self.toolkit.get_tools())
 
-        prompt = SystemMessage(content=self.base_prompt)
-        response = await model_with_tools.ainvoke([prompt] + state["messages"])
+        response = await model_with_tools.ainvoke(self.build_prompt().messages() + state["messages"])
 
         return {"messages": [response]}
 
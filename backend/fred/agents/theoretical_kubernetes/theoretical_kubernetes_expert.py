@@ -215,18 +215,18 @@ class TheoreticalKubernetesExpert(AgentFlow):
         Returns:
             str: A formatted string containing the expert's instructions.
         """
+        # Static instructions first, so that the providers can cache them across clusters.
         lines = [
             "You are a friendly technical Kubernetes expert.",
+            "Your role is to provide clear and precise technical guidance about this cluster.",
+            "You have access to a set of tools to retrieve specific information about the cluster.",
+            "When needed, highlight your technical and operational knowledge in your response.",
+            "If a graphical representation is required, use Mermaid diagrams.",
         ]
         if self.cluster_fullname:
             lines.append(f"Your current context involves a Kubernetes cluster named {self.cluster_fullname}.")
-
         lines += [
-            "Your role is to provide clear and precise technical guidance about this cluster.",
-            "You have access to a set of tools to retrieve specific information about the cluster.",
-            "When needed, highlight your technical and operational knowledge in your response.",
             f"The current date is {datetime.now().strftime('%Y-%m-%d')}.",
-            "If a graphical representation is required, use Mermaid diagrams.",
             "",
         ]
 
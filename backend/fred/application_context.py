@@ -28,7 +28,7 @@ Includes:
 import importlib
 import os
 from threading import Lock
-from typing import Dict, List, Type, Any
+from typing import Dict, List, Optional, Type, Any
 from pydantic import BaseModel
 from fred.config.context_store_local_settings import ContextStoreLocalSettings
 from fred.config.context_store_minio_settings import ContextStoreMinioSettings
@@ -40,9 +40,17 @@ from fred.feedback.store.local_feedback_store import LocalFeedbackStore
 from fred.feedback.store.opensearch_feedback_store import OpenSearchFeedbackStore
 from fred.context.store.local_context_store import LocalContextStore
 from fred.context.store.minio_context_store import MinIOContextStore
+from fred.batch_generation import current_batch_session
 from fred.model_factory import get_structured_chain
-from fred.common.structure import AgentSettings, Configuration, MetricsStorageConfig, ServicesSettings
-from fred.model_factory import get_model
+from fred.common.structure import AgentSettings, Configuration, MetricsStorageConfig, ModelConfiguration, ServicesSettings
+from fred.model_factory import get_embeddings, get_model
+from fred.response_cache.response_cache import ResponseCache
+from fred.response_cache.store.sqlite_response_store import SQLiteResponseStore
+from fred.llm_scheduler import get_llm_scheduler
+from fred.checkpoint.sqlite_checkpoint_saver import SQLiteCheckpointSaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models.base import BaseLanguageModel
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from fred.flow import AgentFlow, Flow  # Base class for all agent flows
@@ -58,22 +66,30 @@ SUPPORTED_TRANSPORTS = ["sse", "stdio", "streamable_http", "websocket"]
 # Public access helper functions
 # -------------------------------
 
-def get_structured_chain_for_service(service_name: str, schema: Type[BaseModel]):
+def get_structured_chain_for_service(service_name: str, schema: Type[BaseModel], artifact: Optional[str] = None):
     """
     Returns a structured output chain for a given service and schema.
     This method provides fallback for unsupported providers. Only OpenAI and Azure 
     support the function_calling features. If not, like Ollama, it will use a default 
     prompt as a fallback.
 
+    The model is the one configured for the schema in the `artifact_models` of the service,
+    else the one configured for the artifact, else the model of the service.
+
     Args:
         service_name (str): The name of the AI service as configured.
         schema (Type[BaseModel]): The Pydantic schema expected from the LLM.
+        artifact (Optional[str]): The artifact the schema is part of, e.g. 'WorkloadScores'
+            for a 'CpuScore'.
 
     Returns:
         A Langchain chain capable of returning a structured schema instance.
     """
     app_context = get_app_context()
-    model_config = app_context.get_service_settings(service_name).model
+    model_config = app_context.get_model_configuration_for_service(service_name, schema.__name__, artifact)
+    batch_session = current_batch_session.get()
+    if batch_session is not None:
+        return batch_session.structured_chain(schema, model_config)
     return get_structured_chain(schema, model_config)
 
 def get_configuration() -> Configuration:
@@ -119,7 +135,12 @@ def get_model_for_agent(agent_name: str) -> BaseLanguageModel:
     Returns:
         BaseLanguageModel: The AI model configured for the agent.
     """
-    return MonitoredLanguageModel(target=get_app_context().get_model_for_agent(agent_name),name=agent_name)
+    app_context = get_app_context()
+    return MonitoredLanguageModel(
+        target=app_context.get_model_for_agent(agent_name),
+        name=agent_name,
+        response_cache=app_context.get_response_cache_for_agent(agent_name),
+    )
 
 
 def get_default_model() -> BaseLanguageModel:
@@ -145,6 +166,16 @@ def get_model_for_leader() -> BaseLanguageModel:
     return get_app_context().get_model_for_leader()
 
 
+def get_checkpointer() -> BaseCheckpointSaver:
+    """
+    Retrieves the checkpointer holding the conversation states of all the agents.
+
+    Returns:
+        BaseCheckpointSaver: The checkpointer configured in ai.checkpoints.
+    """
+    return get_app_context().get_checkpointer()
+
+
 def get_agent_settings(agent_name: str) -> AgentSettings:
     """
     Retrieves the configuration settings for a given agent.
@@ -158,17 +189,23 @@ def get_agent_settings(agent_name: str) -> AgentSettings:
     return get_app_context().get_agent_settings(agent_name)
 
 
-def get_model_for_service(service_name: str) -> BaseLanguageModel:
+def get_model_for_service(service_name: str, artifact: Optional[str] = None) -> BaseLanguageModel:
     """
     Retrieves the AI model instance for a given service.
 
     Args:
         service_name (str): The name of the service.
+        artifact (Optional[str]): The generated artifact, e.g. 'WorkloadSummary', to use the
+            model configured for it in the `artifact_models` of the service.
 
     Returns:
         BaseLanguageModel: The AI model configured for the service.
     """
-    return get_app_context().get_model_for_service(service_name)
+    batch_session = current_batch_session.get()
+    if batch_session is not None:
+        model_config = get_app_context().get_model_configuration_for_service(service_name, artifact)
+        return batch_session.chat_model(model_config)
+    return get_app_context().get_model_for_service(service_name, artifact)
 
 def get_agent_class(agent_name: str) -> Type[AgentFlow]:
     """
@@ -301,6 +338,9 @@ class ApplicationContext:
 
     _instance = None
     _lock = Lock()
+    _response_store: Optional[SQLiteResponseStore] = None
+    _checkpointer: Optional[BaseCheckpointSaver] = None
+    _cache_embeddings: Optional[Embeddings] = None
     context_service = _create_context_service()
     feedback_service = _create_feedback_service()
 
@@ -316,6 +356,7 @@ class ApplicationContext:
                 cls._instance.status = RuntimeStatus()
                 cls._instance._service_instances = {}  # Cache for service instances
                 cls._instance.apply_default_models()
+                get_llm_scheduler().configure(configuration.ai.rate_limits)
                 cls._instance.context_service = _create_context_service()
                 cls._instance.feedback_service = _create_feedback_service()
                 cls._instance._build_indexes()
@@ -388,6 +429,14 @@ class ApplicationContext:
         for service in self.configuration.ai.services:
             if service.enabled:
                 service.model = merge(service.model)
+                # Artifact models only override what they set, e.g. the model name.
+                service.artifact_models = {
+                    artifact: ModelConfiguration(**{
+                        **service.model.model_dump(exclude_unset=True),
+                        **model.model_dump(exclude_unset=True),
+                    })
+                    for artifact, model in service.artifact_models.items()
+                }
 
         # Apply to agents
         for agent in self.configuration.ai.agents:
@@ -412,9 +461,19 @@ class ApplicationContext:
             raise ValueError(f"AI service '{service_name}' is not configured or enabled.")
         return service_settings
 
-    def get_model_for_service(self, service_name: str) -> BaseLanguageModel:
+    def get_model_configuration_for_service(self, service_name: str, *artifacts: Optional[str]) -> ModelConfiguration:
+        """
+        Resolve the model configuration of a service for the first of the given artifacts
+        having a model in the `artifact_models` of the service, else the service model.
+        """
         service_settings = self.get_service_settings(service_name)
-        return get_model(service_settings.model)
+        for artifact in artifacts:
+            if artifact in service_settings.artifact_models:
+                return service_settings.artifact_models[artifact]
+        return service_settings.model
+
+    def get_model_for_service(self, service_name: str, artifact: Optional[str] = None) -> BaseLanguageModel:
+        return get_model(self.get_model_configuration_for_service(service_name, artifact))
 
     def get_default_model(self) -> BaseLanguageModel:
         """
@@ -430,6 +489,43 @@ class ApplicationContext:
         agent_settings = self.get_agent_settings(agent_name)
         return get_model(agent_settings.model)
 
+    def get_response_cache_for_agent(self, agent_name: str) -> Optional[ResponseCache]:
+        """
+        Return the response cache of an agent, or None if the agent does not cache its responses.
+        """
+        settings = self.get_agent_settings(agent_name).response_cache
+        if not settings.enabled:
+            return None
+        cache_settings = self.configuration.ai.response_cache
+        with self._lock:
+            if self._response_store is None:
+                self._response_store = SQLiteResponseStore(cache_settings.path)
+            if settings.semantic and self._cache_embeddings is None:
+                if cache_settings.embedding_model is None:
+                    logger.warning(f"No ai.response_cache.embedding_model, semantic cache of '{agent_name}' disabled")
+                else:
+                    self._cache_embeddings = get_embeddings(cache_settings.embedding_model)
+        return ResponseCache(self._response_store, agent_name, settings, self._cache_embeddings)
+
+    def get_checkpointer(self) -> BaseCheckpointSaver:
+        """
+        Return the checkpointer shared by the agents, the threads of the conversations being
+        keyed by session and agent.
+        """
+        settings = self.configuration.ai.checkpoints
+        with self._lock:
+            if self._checkpointer is None:
+                if settings.type == "sqlite":
+                    self._checkpointer = SQLiteCheckpointSaver(
+                        settings.path,
+                        ttl_seconds=settings.ttl_seconds,
+                        max_checkpoints_per_thread=settings.max_checkpoints_per_thread,
+                        cache_size=settings.cache_size,
+                    )
+                else:
+                    self._checkpointer = MemorySaver()
+        return self._checkpointer
+
     def get_mcp_client_for_agent(self, agent_name) -> None:
         import asyncio
         import nest_asyncio
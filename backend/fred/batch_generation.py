@@ -0,0 +1,203 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generation of the structures through the batch API of the model providers.
+
+A `BatchSession` runs the structure generators twice, without changing them:
+
+1. While recording, the chains returned by `get_structured_chain_for_service` and
+   `get_model_for_service` record the requests of the generators and return placeholders.
+2. The recorded requests are submitted as one batch per model, and the session waits for
+   the results.
+3. While replaying, the same generators are run again, and their chains return the results
+   of the batch, in the order of the recorded requests.
+
+The requests are identified by the key of the generation (e.g. the artifact key) and the
+rank of the call within the generation, so the generators must issue the same calls when
+replayed, which holds as long as they only depend on their inputs and on the LLM answers.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from langchain_core.messages import AIMessage, convert_to_messages, convert_to_openai_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
+
+from fred.common.structure import ModelConfiguration
+from fred.model_factory import BATCH_PROVIDERS, get_batch_client
+
+logger = logging.getLogger(__name__)
+
+# Batch session of the current generation, set while recording or replaying.
+current_batch_session: ContextVar[Optional["BatchSession"]] = ContextVar("current_batch_session", default=None)
+
+
+class BatchRequestError(Exception):
+    """
+    Raised when a request cannot be sent through the batch API, or has no result.
+    The generation must then be run with synchronous calls.
+    """
+
+
+class BatchSession:
+    """
+    Records the requests of structure generators, submits them to the batch API of their
+    models and replays the generators with the results.
+    """
+
+    def __init__(self, poll_interval: float = 30.0, timeout: Optional[float] = None,
+                 completion_window: str = "24h"):
+        """
+        Args:
+            poll_interval (float): The delay between two polls of a batch, in seconds.
+            timeout (Optional[float]): The maximum waiting time of a batch, in seconds.
+            completion_window (str): The time frame within which the batches are processed.
+        """
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.completion_window = completion_window
+        self.recording = False
+        self._key: Optional[str] = None
+        self._rank = 0
+        self._requests: Dict[str, Tuple[ModelConfiguration, Dict[str, Any]]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def _generation(self, key: str, recording: bool) -> Iterator["BatchSession"]:
+        self.recording = recording
+        self._key = key
+        self._rank = 0
+        token = current_batch_session.set(self)
+        try:
+            yield self
+        except BaseException:
+            if recording:
+                # A generation is batched entirely or not at all.
+                for custom_id in [c for c in self._requests if c.startswith(f"{key}#")]:
+                    del self._requests[custom_id]
+            raise
+        finally:
+            current_batch_session.reset(token)
+            self._key = None
+
+    def record(self, key: str) -> Any:
+        """
+        Context manager recording the requests of a generation identified by `key`.
+        The chains return placeholders, so the generated structure must be discarded.
+        """
+        return self._generation(key, recording=True)
+
+    def replay(self, key: str) -> Any:
+        """
+        Context manager replaying a recorded generation with the results of the batch.
+        """
+        return self._generation(key, recording=False)
+
+    @property
+    def request_count(self) -> int:
+        return len(self._requests)
+
+    def structured_chain(self, schema: Type[BaseModel], model_config: ModelConfiguration) -> RunnableLambda:
+        """
+        Return the batch counterpart of `get_structured_chain`.
+        """
+        return RunnableLambda(lambda prompt: self._call(model_config, prompt, schema))
+
+    def chat_model(self, model_config: ModelConfiguration) -> RunnableLambda:
+        """
+        Return the batch counterpart of `get_model`.
+        """
+        return RunnableLambda(lambda messages: self._call(model_config, messages, None))
+
+    def _call(self, model_config: ModelConfiguration, prompt: Any, schema: Optional[Type[BaseModel]]) -> Any:
+        custom_id = f"{self._key}#{self._rank}"
+        self._rank += 1
+
+        if self.recording:
+            if model_config.provider not in BATCH_PROVIDERS:
+                raise BatchRequestError(f"The batch API is not supported by model provider {model_config.provider}")
+            self._requests[custom_id] = (model_config, self._build_body(model_config, prompt, schema))
+            return self._placeholder(schema) if schema is not None else AIMessage(content="")
+
+        body = self._results.pop(custom_id, None)
+        if body is None:
+            raise BatchRequestError(f"No batch result for request {custom_id}")
+        message = body["choices"][0]["message"]
+        if schema is not None:
+            return schema.model_validate_json(message["tool_calls"][0]["function"]["arguments"])
+        return AIMessage(content=message.get("content") or "")
+
+    @staticmethod
+    def _placeholder(schema: Type[BaseModel]) -> BaseModel:
+        """
+        Build an unvalidated instance of the schema, the required fields being None.
+        """
+        values = {name: None for name, field in schema.model_fields.items() if field.is_required()}
+        return schema.model_construct(**values)
+
+    @staticmethod
+    def _build_body(model_config: ModelConfiguration, prompt: Any,
+                    schema: Optional[Type[BaseModel]]) -> Dict[str, Any]:
+        messages = prompt.to_messages() if isinstance(prompt, PromptValue) else convert_to_messages(prompt)
+        body = {
+            "messages": convert_to_openai_messages(messages),
+            "temperature": model_config.temperature or 0,
+        }
+        if schema is not None:
+            # Same forced function call as `with_structured_output(method="function_calling")`.
+            tool = convert_to_openai_tool(schema)
+            body["tools"] = [tool]
+            body["tool_choice"] = {"type": "function", "function": {"name": tool["function"]["name"]}}
+            body["parallel_tool_calls"] = False
+        return body
+
+    def execute(self, checkpoint: Optional[Callable[[], None]] = None) -> int:
+        """
+        Submit the recorded requests, one batch per model, and wait for their results.
+
+        Args:
+            checkpoint (Optional[Callable[[], None]]): Called at every poll. If it raises,
+                the pending batches are cancelled.
+
+        Returns:
+            int: The number of successful requests.
+        """
+        groups: Dict[str, Tuple[ModelConfiguration, Dict[str, Dict[str, Any]]]] = {}
+        for custom_id, (model_config, body) in self._requests.items():
+            group_key = model_config.model_dump_json()
+            groups.setdefault(group_key, (model_config, {}))[1][custom_id] = body
+
+        batches: List[Tuple[Any, str]] = []
+        for model_config, requests in groups.values():
+            client = get_batch_client(model_config, self.completion_window)
+            batches.append((client, client.submit(requests)))
+
+        for index, (client, batch_id) in enumerate(batches):
+            try:
+                batch = client.wait(batch_id, self.poll_interval, self.timeout, checkpoint)
+            except BaseException:
+                for other_client, other_batch_id in batches[index + 1:]:
+                    other_client.client.batches.cancel(other_batch_id)
+                raise
+            self._results.update(client.results(batch))
+
+        self._requests.clear()
+        logger.info(f"{len(self._results)} batch results received from {len(batches)} batch(es)")
+        return len(self._results)
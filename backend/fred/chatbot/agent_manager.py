@@ -12,38 +12,60 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import logging
 import json
-from typing import cast
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Tuple, cast
 from fred.application_context import get_agent_class, get_enabled_agent_names, get_context_service
 from fred.chatbot.structures.agentic_flow import AgenticFlow
+from fred.flow import AgentFlow
 from fred.leader.leader import Leader
 
 logger = logging.getLogger(__name__)
 
 class AgentManager:
     """
-    Manages the creation and optional caching of agent instances by name.
-    This class is responsible for instantiating agents based on their names and
-    managing their lifecycle. It can cache agents to improve performance, especially
-    in scenarios where the same agent is requested multiple times.
+    Manages the creation and caching of agent instances by name.
+
+    Agents hold no conversation state: it lives in the checkpointer, keyed by the thread of
+    each session. An agent is thus built once per name, argument (e.g. the cluster) and
+    contexts, and its compiled graph is shared by all the sessions using it. A session keeps
+    the agent it started with, even if the contexts of the agent change meanwhile.
+
+    The experts write the current date in their base prompt when they are built, so the date
+    is part of the variant: the pooled agents are built again the first time they are used
+    on a new day.
     """
 
-    def __init__(self):
+    def __init__(self, max_pooled_agents: int = 64):
         """
-        Initializes the AgentManager with an empty cache.
+        Initializes the AgentManager with an empty cache and pool.
+
+        Args:
+            max_pooled_agents (int): Number of (name, argument) pairs kept in the pool, the
+                least recently used ones being dropped first. The argument comes from the
+                client, so the pool must not grow with it.
         """
-        self.agent_cache = {}
+        # Agent of each session, by "session_id:name".
+        self.agent_cache: Dict[str, AgentFlow] = {}
+        # Latest variant of each agent, by (name, argument), least recently used first: the
+        # fingerprint of its contexts and date (and of its experts for the leader), and the
+        # shared instance.
+        self.agent_pool: OrderedDict[Tuple[str, str], Tuple[str, AgentFlow]] = OrderedDict()
+        self.max_pooled_agents = max_pooled_agents
 
     def get_create_agent_instance(self, name: str, 
                                   session_id: str,
                                   argument: str):
         """
-        Retrieve an agent instance by name, optionally cached per session.
+        Retrieve the agent instance of a session, taken from the pool of shared agents.
 
         Args:
             name (str): The agent name.
-            session_id (str): Optional session ID for per-session caching.
+            session_id (str): The session ID.
+            argument (str): The argument of the agent, e.g. the cluster name.
 
         Returns:
             An instantiated agent.
@@ -54,27 +76,64 @@ class AgentManager:
             logger.debug(f"Reusing cached agent for key: {cache_key}")
             return self.agent_cache[cache_key]
 
+        _, agent_instance = self._get_pooled_agent(name, argument)
+        self.agent_cache[cache_key] = agent_instance
+        logger.debug(f"Cached agent with key: {cache_key}")
+        return agent_instance
+
+    def _get_pooled_agent(self, name: str, argument: str) -> Tuple[str, AgentFlow]:
+        """
+        Retrieve the shared agent of a name and argument, built again if its contexts changed.
+
+        Returns:
+            The fingerprint of the agent variant, and the agent.
+        """
         agent_class = get_agent_class(name)
         if not agent_class:
             raise ValueError(f"Agent '{name}' not found in configuration")
 
+        if name == "Fred":
+            experts = {
+                expert_name: self._get_pooled_agent(expert_name, argument)
+                for expert_name in get_enabled_agent_names()
+                if expert_name != "Fred"  # Don't add Fred as his own expert
+            }
+            variant = self._fingerprint({expert_name: expert_variant for expert_name, (expert_variant, _) in experts.items()})
+        else:
+            contexts = self._get_contexts(name)
+            variant = self._fingerprint({"contexts": contexts, "date": date.today().isoformat()})
+
+        pooled = self.agent_pool.get((name, argument))
+        if pooled and pooled[0] == variant:
+            logger.debug(f"Reusing pooled agent '{name}' for argument '{argument}'")
+            self.agent_pool.move_to_end((name, argument))
+            return pooled
+
         if name == "Fred":
             agent_instance = agent_class()
             agent_instance = cast(Leader, agent_instance)
             logger.info("Initializing Fred with all enabled experts")
-            for expert_name in get_enabled_agent_names():
-                if expert_name == "Fred":
-                    continue  # Don't add Fred as his own expert
-
-                expert_instance = self.get_create_agent_instance(expert_name, session_id, argument)
+            for expert_name, (_, expert_instance) in experts.items():
                 compiled_graph = expert_instance.graph.compile()
                 agent_instance.add_expert(expert_name, expert_instance, compiled_graph)
-            self.agent_cache[cache_key] = agent_instance
-            return agent_instance
-
-        agent_instance = agent_class(cluster_fullname=argument)
-
-
+        else:
+            agent_instance = agent_class(cluster_fullname=argument)
+            self._include_contexts(agent_instance, contexts)
+
+        self.agent_pool[(name, argument)] = (variant, agent_instance)
+        self.agent_pool.move_to_end((name, argument))
+        while len(self.agent_pool) > self.max_pooled_agents:
+            (evicted_name, evicted_argument), _ = self.agent_pool.popitem(last=False)
+            logger.info(f"Dropped pooled agent '{evicted_name}' for argument '{evicted_argument}'")
+        logger.info(f"Created new agent instance for '{name}' and argument '{argument}'")
+        return variant, agent_instance
+
+    @staticmethod
+    def _fingerprint(value) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _get_contexts(name: str) -> dict:
         context_service = get_context_service()
         contexts = context_service.get_context(name)
 
@@ -84,9 +143,12 @@ class AgentManager:
             except Exception as e:
                 logger.error(f"[agent_manager] Failed to parse contexts JSON for agent '{name}': {e}")
                 contexts = {}
+        return contexts or {}
 
+    @staticmethod
+    def _include_contexts(agent_instance: AgentFlow, contexts: dict):
         if contexts:
-            logger.info(f"Including {len(contexts)} context entries in agent '{name}' base prompt")
+            logger.info(f"Including {len(contexts)} context entries in agent '{agent_instance.name}' base prompt")
 
             context_text = "\n\n### CRITICAL AGENT KNOWLEDGE BASE AND INSTRUCTIONS ###\n\n"
             for ctx_id, ctx in contexts.items():
@@ -106,15 +168,9 @@ class AgentManager:
             # Injection en tête du prompt
             agent_instance.base_prompt = context_text + agent_instance.base_prompt
 
-            logger.info(f"Modified agent '{name}' base_prompt to include context")
+            logger.info(f"Modified agent '{agent_instance.name}' base_prompt to include context")
             logger.info(f"New prompt size: {len(agent_instance.base_prompt)} chars")
 
-
-        self.agent_cache[cache_key] = agent_instance
-        logger.debug(f"Cached agent with key: {cache_key}")
-        logger.info(f"Created new agent instance for '{name}'")
-        return agent_instance
-
     def clear_cache_for_session(self, session_id: str):
         """
         Remove all cached agents for a given session.
@@ -14,13 +14,15 @@
 
 import json
 import logging
-from typing import List
+from typing import List, Optional
 from uuid import uuid4
 
 from fred.chatbot.agent_manager import AgentManager
 from fred.services.chatbot_session.in_memory_session_backend import InMemorySessionStorage
+from fred.services.chatbot_session.sqlite_session_backend import SQLiteSessionStorage
+from fred.services.chatbot_session.session_lifecycle import SessionLifecycleStats
 from fred.services.chatbot_session.session_manager import SessionManager
-from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, ErrorEvent, FinalEvent, SessionSchema, SessionWithFiles, StreamEvent
+from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, ErrorEvent, FinalEvent, SessionEvent, SessionSchema, SessionWithFiles, StreamEvent
 from fred.chatbot.structures.chatbot_error import ChatBotError
 from fastapi import (
     APIRouter,
@@ -28,6 +30,7 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Query,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
@@ -50,6 +53,7 @@ from fred.services.cluster_consumption.cluster_consumption_service import (
     ClusterConsumptionService,
 )
 from fred.services.chatbot_session.session_manager import CallbackType
+from fred.services.chatbot_session.event_bridge import EmitType, stream_events
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +67,13 @@ class ChatbotController:
         self.ai_service = ai_service
         self.cluster_consumption_service = ClusterConsumptionService()
         self.agent_manager = AgentManager()
-        self.session_manager = SessionManager(InMemorySessionStorage(), self.agent_manager)
+        sessions = get_configuration().ai.sessions
+        match sessions.type:
+            case "sqlite":
+                session_storage = SQLiteSessionStorage(sessions.path)
+            case "memory":
+                session_storage = InMemorySessionStorage()
+        self.session_manager = SessionManager(session_storage, self.agent_manager)
 
         # For import-export operations
         match get_configuration().dao.type:
@@ -99,7 +109,8 @@ class ChatbotController:
                 streamed_messages = []
 
                 async def capture_callback(msg: dict):
-                    streamed_messages.append(ChatMessagePayload(**msg))
+                    if msg.get("subtype") != "delta":
+                        streamed_messages.append(ChatMessagePayload(**msg))
 
                 session, messages = await self.session_manager.chat_ask_websocket(
                     callback=capture_callback,
@@ -131,37 +142,41 @@ class ChatbotController:
             user: KeycloakUser = Depends(get_current_user)
         ):
             
-            async def event_stream():
-                try:
-                    streamed_messages: List[ChatMessagePayload] = []
+            async def produce(emit: EmitType):
+                streamed = set()
+
+                async def callback(msg: dict):
+                    if msg.get("subtype") != "delta":
+                        streamed.add((msg["exchange_id"], msg["rank"]))
+                    await emit(json.dumps(StreamEvent(type="stream", message=ChatMessagePayload(**msg)).model_dump()) + "\n")
 
-                    async def callback(msg: dict):
-                        payload = ChatMessagePayload(**msg)
-                        streamed_messages.append(payload)
-                        yield json.dumps(StreamEvent(type="stream", message=payload).model_dump()) + "\n"
-                    
+                async def session_callback(session: dict):
+                    await emit(SessionEvent(type="session", session=SessionSchema(**session)).model_dump_json() + "\n")
+
+                try:
                     session, final_messages = await self.session_manager.chat_ask_websocket(
                         callback=callback,
                         user_id=user.email,
                         session_id=event.session_id,
                         message=event.message,
                         agent_name=event.agent_name,
-                        chat_profile_id=event.chat_profile_id
+                        argument=event.argument or "",
+                        chat_profile_id=event.chat_profile_id,
+                        session_callback=session_callback
                     )
-
-                    yield json.dumps(
-                        FinalEvent(type="final", messages=final_messages, session=session).model_dump()
-                    ) + "\n"
+                    await emit(FinalEvent.after_stream(session, final_messages, streamed).model_dump_json() + "\n")
 
                 except Exception as e:
+                    summary = log_exception(e, "Error processing chatbot streamed query")
                     error = ErrorEvent(
                         type="error",
-                        content=str(e),
+                        content=summary,
                         session_id=event.session_id or "unknown-session"
                     )
-                    yield json.dumps(error.model_dump()) + "\n"
+                    await emit(json.dumps(error.model_dump()) + "\n")
 
-            return StreamingResponse(event_stream(), media_type="application/json")
+            # One NDJSON line per event, written as soon as the agent produces it.
+            return StreamingResponse(stream_events(produce), media_type="application/x-ndjson")
 
         @app.websocket("/chatbot/query/ws")
         async def websocket_chatbot_question(websocket: WebSocket):
@@ -176,13 +191,20 @@ class ChatbotController:
                         # Receive the prompt from the client
                         client_request = await websocket.receive_json()
                         client_event = ChatAskInput(**client_request)
+                        streamed = set()
                         async def websocket_callback(msg: dict):
+                            if msg.get("subtype") != "delta":
+                                streamed.add((msg["exchange_id"], msg["rank"]))
                             await websocket.send_json(
                                 StreamEvent(
                                     type="stream",
                                     message=ChatMessagePayload(**msg)
                              ).model_dump()
                             )
+                        async def websocket_session_callback(session: dict):
+                            await websocket.send_text(
+                                SessionEvent(type="session", session=SessionSchema(**session)).model_dump_json()
+                            )
                         if not client_event.argument:
                             client_event.argument = ""  # Default cluster name
 
@@ -193,15 +215,11 @@ class ChatbotController:
                             message=client_event.message,
                             agent_name=client_event.agent_name,
                             argument=client_event.argument,
-                            chat_profile_id=client_event.chat_profile_id
-                        )
-                        await websocket.send_text(
-                            FinalEvent(
-                                type="final",
-                                messages=messages,
-                                session=session
-                            ).model_dump_json()
+                            chat_profile_id=client_event.chat_profile_id,
+                            session_callback=websocket_session_callback
                         )
+                        # The streamed messages are only referenced, the client already has them.
+                        await websocket.send_text(FinalEvent.after_stream(session, messages, streamed).model_dump_json())
                     except WebSocketDisconnect:
                         logger.debug("Client disconnected from chatbot WebSocket")
                         break
@@ -235,16 +253,32 @@ class ChatbotController:
         )
         def get_sessions(user: KeycloakUser = Depends(get_current_user)) -> list[SessionWithFiles]:
             return self.session_manager.get_sessions(user.email)
+
+        @app.get(
+            "/chatbot/sessions/stats",
+            description="Get the number and estimated size of the chatbot sessions resident in memory, and their evictions.",
+            summary="Get the gauges of the resident chatbot sessions.",
+            tags=fastapi_tags,
+            response_model=SessionLifecycleStats
+        )
+        def get_session_stats(user: KeycloakUser = Depends(get_current_user)) -> SessionLifecycleStats:
+            return self.session_manager.get_session_lifecycle_stats()
         
         @app.get(
             "/chatbot/session/{session_id}/history",
-            description="Get the history of a chatbot session.",
+            description="Get the history of a chatbot session, or a page of it ordered by rank.",
             summary="Get the history of a chatbot session.",
             tags=fastapi_tags,
             response_model=List[ChatMessagePayload]
         )
-        def get_session_history(session_id: str, user: KeycloakUser = Depends(get_current_user)) -> list[ChatMessagePayload]:
-            return self.session_manager.get_session_history(session_id)
+        def get_session_history(
+            session_id: str,
+            limit: Optional[int] = Query(None, ge=1, description="Maximum number of messages: the latest ones, or the first ones after since_rank. The messages sharing the rank cut by the limit are all returned"),
+            before_rank: Optional[int] = Query(None, description="Only return the messages of a lower rank, to page back through the history"),
+            since_rank: Optional[int] = Query(None, description="Only return the messages of a higher rank, to catch up from the last known one"),
+            user: KeycloakUser = Depends(get_current_user)
+        ) -> list[ChatMessagePayload]:
+            return self.session_manager.get_session_history(session_id, limit=limit, before_rank=before_rank, since_rank=since_rank)
 
         @app.delete(
             "/chatbot/session/{session_id}",
@@ -417,6 +417,36 @@ class FileDAO:
         self.cache_date.pop(file_path, None)  # Remove cache entry if exists
         logger.info(f"Deleted file and cache entry for '{file_path}'.")
 
+    def delete_all[T](
+            self,
+            model_class: Type[T],
+            cluster: str | None = None,
+            namespace: str | None = None,
+    ) -> int:
+        """
+        Deletes every file of a model class below a cluster or a namespace, whatever its kind
+        and workload, e.g. the services lists of all the workloads of a namespace.
+
+        :param model_class: (Type[T]): The Pydantic model class of the files.
+        :param cluster: (str) Cluster name.
+        :param namespace: (str) Namespace.
+
+        :return: The number of deleted files.
+        """
+        filename = f"{model_class.__name__}.json"
+        root = os.path.dirname(self._get_file_path(model_class.__name__, cluster, namespace))
+        deleted = 0
+        for directory, _, names in os.walk(root):
+            if filename in names:
+                file_path = os.path.join(directory, filename)
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    continue
+                self.cache_date.pop(file_path, None)
+                deleted += 1
+        return deleted
+
     def exists[T](
             self,
             model_class: Type[T],
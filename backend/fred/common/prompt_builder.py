@@ -0,0 +1,170 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prompt assembly friendly to the prompt caching of the providers.
+
+OpenAI and Azure OpenAI reuse the computation of the longest prompt prefix already seen
+(from 1024 tokens), billing and processing the cached tokens at a fraction of their cost.
+A prompt only benefits from it if its beginning is byte-identical across calls, so a
+`PromptBuilder` keeps the static instructions of a prompt in a first system message, and
+puts every variable part (cluster name, workload definitions, dates, enrichments) in a
+following message:
+
+    prompt = (
+        PromptBuilder("CpuScore")
+        .instructions("You are an expert in Kubernetes and cloud-native applications.")
+        .instructions("Please provide the CPU optimization score of the workload defined below. ...")
+        .context("Workload definitions:\\n\\n{workload_context}")
+    )
+    chain = prompt.template() | structured_model
+    chain.invoke({"workload_context": ...}, config=prompt.config(langfuse_handler))
+
+The instructions are never formatted, so they may contain braces. The calls made with
+`config()` are recorded in the metric store under the name of the prompt, with their
+cached tokens (see `/metrics/prompt_cache`).
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.outputs import LLMResult
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+
+from fred.monitoring.hybrid_metric_store import get_metric_store
+from fred.monitoring.logging_context import get_logging_context
+from fred.monitoring.metric_util import translate_response_metadata_to_metric
+
+logger = logging.getLogger(__name__)
+
+SECTION_SEPARATOR = "\n\n"
+
+
+class PromptBuilder:
+    """
+    Named prompt made of static instructions followed by variable context sections.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Name of the prompt, used in the metrics.
+        """
+        self.name = name
+        self._instructions: List[str] = []
+        self._context: List[str] = []
+
+    def instructions(self, text: str) -> "PromptBuilder":
+        """
+        Append a static section, identical for every call of the prompt.
+        """
+        self._instructions.append(text)
+        return self
+
+    def context(self, text: Optional[str]) -> "PromptBuilder":
+        """
+        Append a variable section, a template for `template()`. Empty sections are skipped.
+        """
+        if text:
+            self._context.append(text)
+        return self
+
+    @property
+    def static_prefix(self) -> str:
+        return SECTION_SEPARATOR.join(self._instructions)
+
+    def template(self) -> ChatPromptTemplate:
+        """
+        Return the prompt as a template: the instructions as a system message, and the
+        context sections, formatted with the input variables, as a human message.
+        """
+        messages: List[Any] = [SystemMessage(content=self.static_prefix)]
+        if self._context:
+            messages.append(("human", SECTION_SEPARATOR.join(self._context)))
+        return ChatPromptTemplate.from_messages(messages)
+
+    def messages(self) -> List[BaseMessage]:
+        """
+        Return the prompt as system messages to put before a conversation: the instructions,
+        then the context sections, used as they are.
+        """
+        messages: List[BaseMessage] = [SystemMessage(content=self.static_prefix)]
+        if self._context:
+            messages.append(SystemMessage(content=SECTION_SEPARATOR.join(self._context)))
+        return messages
+
+    def config(self, *callbacks: Any) -> RunnableConfig:
+        """
+        Return the configuration of an invocation of the prompt, recording its metrics.
+
+        Args:
+            callbacks: Additional callback handlers, e.g. the LangFuse handler. None values
+                are ignored.
+        """
+        return {
+            "run_name": self.name,
+            "metadata": {"prompt_name": self.name},
+            "callbacks": [PromptMetricsHandler(self.name), *(c for c in callbacks if c is not None)],
+        }
+
+
+class PromptMetricsHandler(BaseCallbackHandler):
+    """
+    Callback handler recording the model calls of a prompt in the metric store.
+
+    Used for the models that are not wrapped in a `MonitoredLanguageModel`, e.g. the
+    structured output models of the AI services.
+    """
+
+    def __init__(self, prompt_name: str):
+        self.prompt_name = prompt_name
+        self._starts: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *,
+                            run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts.pop(run_id, None)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        start = self._starts.pop(run_id, None)
+        latency = time.perf_counter() - start if start is not None else 0.0
+        try:
+            metric_store = get_metric_store()
+        except RuntimeError:
+            return
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                raw = dict(getattr(message, "response_metadata", None) or {})
+                if "token_usage" not in raw and response.llm_output:
+                    raw.update(response.llm_output)
+                metric = translate_response_metadata_to_metric(
+                    raw=raw,
+                    ctx=get_logging_context(),
+                    latency=round(latency, 4),
+                    model_type=self.prompt_name,
+                    prompt_name=self.prompt_name,
+                )
+                if metric:
+                    metric_store.add_metric(metric)
@@ -33,7 +33,7 @@ Pydantic structure definitions to use in the carbon microservice
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, model_validator, Field, field_validator
 
@@ -119,6 +119,12 @@ class ModelConfiguration(BaseModel):
     temperature: Optional[float] = Field(0.0, description="Temperature setting for the model.")
     provider_settings: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional provider-specific settings, e.g., Azure deployment name.")
 
+    @field_validator("provider")
+    @classmethod
+    def normalize_provider(cls, provider: Optional[str]) -> Optional[str]:
+        # Providers are matched case-insensitively, e.g. 'OpenAI' is 'openai'.
+        return provider.strip().lower() if provider else provider
+
 class MCPServerConfiguration(BaseModel):
     name: str = Field(None, description="Name of the MCP server")
     transport: Optional[str] = Field("sse", description="MCP server transport. Can be sse, stdio, websocket or streamable_http")
@@ -181,7 +187,23 @@ class ServicesSettings(BaseModel):
     enabled: bool = Field(default=True, description="Whether the service is enabled.")
     settings: Dict[str, Any] = Field(default_factory=dict, description="Service-specific settings.")
     model: ModelConfiguration = Field(default_factory=ModelConfiguration, description="AI model configuration for this service.")
+    artifact_models: Dict[str, ModelConfiguration] = Field(default_factory=dict, description="AI model configuration per generated artifact, e.g. {'WorkloadId': {...}}, merged over the service model.")
+
 
+class AgentResponseCacheSettings(BaseModel):
+    enabled: bool = Field(default=False, description="Whether the responses of the agent model are cached.")
+    ttl_seconds: float = Field(default=86400.0, description="Time to live of the cached responses.")
+    semantic: bool = Field(default=False, description="Whether a similar question asked after the same messages reuses the cached answer. Requires ai.response_cache.embedding_model.")
+    similarity_threshold: float = Field(default=0.95, ge=0, le=1, description="Minimum cosine similarity of two questions for a semantic cache hit.")
+
+class HistoryCompactionSettings(BaseModel):
+    enabled: bool = Field(default=False, description="Whether the older turns of a conversation are folded into a summary when it exceeds max_tokens.")
+    max_tokens: int = Field(default=8000, description="Token budget of the conversation given to the agent.")
+    keep_turns: int = Field(default=4, ge=1, description="Number of last turns (a question and its answers) kept verbatim.")
+    tool_digest_tokens: int = Field(default=200, description="Tokens kept from the tool results of the turns before the last one.")
+    summary_max_tokens: int = Field(default=500, description="Length asked for the summary of the older turns.")
+    tokenizer_model: str = Field(default="gpt-4o", description="Model whose tokenizer is used to measure the conversation.")
+    model: Optional[ModelConfiguration] = Field(default=None, description="Model writing the summaries, the default model if not set.")
 
 class AgentSettings(BaseModel):
     name: str = Field(..., description="Agent identifier name.")
@@ -193,7 +215,84 @@ class AgentSettings(BaseModel):
     tag: Optional[str] = Field(None, description="Tag of the agent")
     mcp_servers: List[MCPServerConfiguration] = Field(default_factory=list, description="List of MCP servers associated to an agent.")
     max_steps: int = Field(None,description="Max step")
-
+    response_cache: AgentResponseCacheSettings = Field(default_factory=AgentResponseCacheSettings, description="Response cache of the agent model.")
+    history_compaction: HistoryCompactionSettings = Field(default_factory=HistoryCompactionSettings, description="Compaction of the conversations of the agent.")
+
+
+class WorkloadContextSettings(BaseModel):
+    max_tokens: int = Field(default=8000, description="Default token budget of the workload context given to the structure generators.")
+    generator_max_tokens: Dict[str, int] = Field(default_factory=dict, description="Token budget per generator, e.g. {'WorkloadId': 2000}. Overrides max_tokens.")
+    max_configmap_value_tokens: int = Field(default=400, description="Maximum number of tokens kept for each configmap value.")
+    tokenizer_model: str = Field(default="gpt-4o", description="Model whose tokenizer is used to measure the context.")
+
+class ClusterSummarySettings(BaseModel):
+    fan_in: int = Field(default=8, ge=2, description="Maximum number of summaries merged by a single reduce step.")
+    max_concurrency: int = Field(default=4, ge=1, description="Maximum number of namespace summaries or reduce steps generated in parallel.")
+
+class TopologySettings(BaseModel):
+    watch: bool = Field(default=False, description="Whether the namespaces, resource quotas, limit ranges, workloads, services and ingresses are watched to invalidate the memoized topologies. Requires access to the clusters.")
+    max_age_seconds: int = Field(default=60, description="Duration after which a memoized topology is rebuilt when the clusters are not watched.")
+    watch_timeout_seconds: int = Field(default=300, description="Duration of a watch request before it is renewed.")
+
+class BatchGenerationSettings(BaseModel):
+    enabled: bool = Field(default=True, description="Whether the Workload Ids and Essentials of small workloads are generated in batches during bulk generations.")
+    max_tokens: int = Field(default=6000, description="Token budget of the workloads packed in a single call.")
+    small_workload_max_tokens: int = Field(default=1000, description="Workloads larger than this number of tokens are always generated by single calls.")
+    max_workloads: int = Field(default=10, description="Maximum number of workloads packed in a single call.")
+
+class ProviderBatchSettings(BaseModel):
+    enabled: bool = Field(default=False, description="Whether the generation of all the resources of a cluster goes through the batch API of the model providers (OpenAI and Azure only).")
+    poll_interval_seconds: float = Field(default=30.0, description="Delay between two polls of a batch.")
+    timeout_seconds: Optional[float] = Field(default=86400.0, description="Maximum waiting time of a batch. The batch is cancelled and the generation fails when exceeded.")
+    completion_window: str = Field(default="24h", description="Time frame within which the provider processes a batch.")
+
+class ScoreHeuristicsSettings(BaseModel):
+    enabled: bool = Field(default=True, description="Whether the Workload Scores that follow from the workload spec are computed by rules instead of the LLM.")
+
+class RateLimit(BaseModel):
+    requests_per_minute: Optional[int] = Field(default=None, description="Requests per minute of the budget (unlimited if not set).")
+    tokens_per_minute: Optional[int] = Field(default=None, description="Prompt and completion tokens per minute of the budget (unlimited if not set).")
+    max_concurrency: Optional[int] = Field(default=None, description="Maximum number of requests in flight (unlimited if not set).")
+
+class RateLimitSettings(BaseModel):
+    enabled: bool = Field(default=False, description="Whether the calls to the OpenAI and Azure models are scheduled within the budgets.")
+    completion_tokens_estimate: int = Field(default=500, description="Completion tokens reserved for a request that sets no completion limit, corrected with its actual usage.")
+    limits: Dict[str, RateLimit] = Field(default_factory=dict, description="Budgets keyed by 'provider/deployment' (Azure deployment or OpenAI model name) or by 'provider' for a budget shared by all its deployments.")
+
+class ResponseCacheSettings(BaseModel):
+    path: str = Field(default="~/.fred/response-cache", description="The directory of the SQLite response cache database.")
+    embedding_model: Optional[ModelConfiguration] = Field(default=None, description="Embedding model of the semantic tier of the response cache, e.g. provider 'openai' and name 'text-embedding-3-small'.")
+
+class SpeechSettings(BaseModel):
+    tts_model: str = Field(default="tts-1", description="OpenAI model of the speech synthesis.")
+    voice: str = Field(default="alloy", description="Voice of the speech synthesis.")
+    response_format: str = Field(default="mp3", description="Audio format of the synthesized speech.")
+    stt_model: str = Field(default="whisper-1", description="OpenAI model of the transcriptions.")
+    language: str = Field(default="en", description="Language of the transcribed audio.")
+    chunk_size: int = Field(default=4096, description="Size in bytes of the audio chunks streamed to the client.")
+    cache_path: str = Field(default="~/.fred/audio-cache", description="The directory of the synthesized speech cache.")
+    cache_max_size_mb: int = Field(default=512, description="Size of the speech cache above which the least recently played audio files are removed.")
+
+class SessionStorageSettings(BaseModel):
+    type: Literal["sqlite", "memory"] = Field(default="sqlite", description="Storage of the chat sessions and their messages: a local SQLite database, or the process memory.")
+    path: str = Field(default="~/.fred/sessions", description="The directory of the SQLite session database.")
+
+class SessionLifecycleSettings(BaseModel):
+    idle_ttl_seconds: float = Field(default=3600.0, description="Idle time after which the agents, caches and temporary files of a session are released from memory.")
+    max_resident_bytes: int = Field(default=256 * 1024 * 1024, description="Estimated size of the conversations held in memory above which the least recently used sessions are released.")
+    sweep_interval_seconds: float = Field(default=60.0, description="Minimum time between two sweeps of the idle sessions.")
+
+class SessionTitleSettings(BaseModel):
+    model: Optional[ModelConfiguration] = Field(default=None, description="Model generating the titles of the new chat sessions, the default model if not set. A small, fast model is enough.")
+    max_length: int = Field(default=60, description="Maximum length of a session title.")
+    timeout_seconds: float = Field(default=1.0, description="Time the title still has once the agent has answered to be sent before the answer. A slower title is only saved.")
+
+class CheckpointSettings(BaseModel):
+    type: Literal["sqlite", "memory"] = Field(default="sqlite", description="Storage of the agent conversation states: a local SQLite database, or the process memory.")
+    path: str = Field(default="~/.fred/checkpoints", description="The directory of the SQLite checkpoint database.")
+    ttl_seconds: float = Field(default=604800.0, description="Time after its last message when the state of a conversation is deleted.")
+    max_checkpoints_per_thread: int = Field(default=10, ge=2, description="Number of checkpoints kept per conversation, the oldest ones are deleted.")
+    cache_size: int = Field(default=256, ge=0, description="Number of recently used conversation states kept in memory.")
 
 class AIConfig(BaseModel):
     timeout: TimeoutSettings = Field(None, description="Timeout settings for the AI client.")
@@ -202,6 +301,19 @@ class AIConfig(BaseModel):
     services: List[ServicesSettings] = Field(default_factory=list, description="List of AI services.")
     agents: List[AgentSettings] = Field(default_factory=list, description="List of AI agents.")
     recursion: RecursionConfig = Field(default_factory=int, description="Number of max recursion while using the model")
+    workload_context: WorkloadContextSettings = Field(default_factory=WorkloadContextSettings, description="Pruning and token budget of the workload contexts.")
+    cluster_summary: ClusterSummarySettings = Field(default_factory=ClusterSummarySettings, description="Hierarchical summarization of the clusters.")
+    topology: TopologySettings = Field(default_factory=TopologySettings, description="Memoization of the cluster, namespace and workload topologies.")
+    batch_generation: BatchGenerationSettings = Field(default_factory=BatchGenerationSettings, description="Batched generation of the artifacts of small workloads.")
+    provider_batch: ProviderBatchSettings = Field(default_factory=ProviderBatchSettings, description="Generation of all the resources of a cluster through the batch API of the model providers.")
+    score_heuristics: ScoreHeuristicsSettings = Field(default_factory=ScoreHeuristicsSettings, description="Rule-based pre-scoring of the workloads.")
+    rate_limits: RateLimitSettings = Field(default_factory=RateLimitSettings, description="Request and token budgets of the model providers and deployments.")
+    response_cache: ResponseCacheSettings = Field(default_factory=ResponseCacheSettings, description="Storage and embedding model of the agent response caches.")
+    speech: SpeechSettings = Field(default_factory=SpeechSettings, description="Speech synthesis and transcription models, and cache of the synthesized speech.")
+    checkpoints: CheckpointSettings = Field(default_factory=CheckpointSettings, description="Storage of the agent conversation states.")
+    sessions: SessionStorageSettings = Field(default_factory=SessionStorageSettings, description="Storage of the chat sessions.")
+    session_lifecycle: SessionLifecycleSettings = Field(default_factory=SessionLifecycleSettings, description="Eviction of the idle chat sessions from memory.")
+    session_title: SessionTitleSettings = Field(default_factory=SessionTitleSettings, description="Generation of the titles of the chat sessions.")
 
 
     @model_validator(mode='after')
@@ -277,6 +389,10 @@ class MetricsStorageConfig(BaseModel):
     type: str = Field(..., description="The metrics store to use (e.g., 'local')")
     settings: MetricsStorageSettings
 
+class JobsConfiguration(BaseModel):
+    path: str = Field(default="~/.fred/jobs-store", description="The directory of the SQLite job database")
+    max_workers: int = Field(default=4, description="Number of worker threads running background jobs")
+
 class Configuration(BaseModel):
     frontend_settings: FrontendSettings
     database: DatabaseConfiguration
@@ -287,6 +403,7 @@ class Configuration(BaseModel):
     context_storage: ContextStorageConfig = Field(..., description="Content Storage configuration")
     feedback_storage: FeedbackStorageConfig = Field(..., description="Feedback Storage configuration")
     metrics_storage:  MetricsStorageConfig = Field(..., description="Feedback Storage configuration")
+    jobs: JobsConfiguration = Field(default_factory=JobsConfiguration, description="Background jobs configuration")
 
 class OfflineStatus(BaseModel):
     is_offline: bool
@@ -0,0 +1,93 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Token counting helpers used to keep prompts within a budget.
+
+Tokens are measured with tiktoken. When the encoding cannot be loaded (unknown model,
+or an offline deployment where tiktoken cannot download its BPE files), an approximation
+of 4 characters per token is used instead.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKENIZER_MODEL = "gpt-4o"
+APPROXIMATE_CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n... [truncated {} tokens]"
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning(f"Falling back to approximate token counts: {e}")
+            return None
+    except Exception as e:  # pylint: disable=W0718
+        logger.warning(f"Falling back to approximate token counts for model '{model}': {e}")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text (str): The text to measure.
+        model (Optional[str]): The model whose tokenizer is used. Defaults to gpt-4o.
+
+    Returns:
+        int: The number of tokens.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model or DEFAULT_TOKENIZER_MODEL)
+    if encoding is None:
+        return -(-len(text) // APPROXIMATE_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    Truncate a text to at most `max_tokens` tokens, appending a marker telling how many
+    tokens were removed.
+
+    Args:
+        text (str): The text to truncate.
+        max_tokens (int): The maximum number of tokens to keep.
+        model (Optional[str]): The model whose tokenizer is used. Defaults to gpt-4o.
+
+    Returns:
+        str: The text, unchanged if it already fits.
+    """
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text
+    max_tokens = max(max_tokens, 0)
+
+    encoding = _get_encoding(model or DEFAULT_TOKENIZER_MODEL)
+    if encoding is None:
+        kept = text[:max_tokens * APPROXIMATE_CHARS_PER_TOKEN]
+    else:
+        kept = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    return kept + TRUNCATION_MARKER.format(total - max_tokens)
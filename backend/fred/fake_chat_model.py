@@ -0,0 +1,123 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local chat model simulating the latency profile of a provider, for testing the routing
+and the hedging of the requests without a live LLM.
+
+Configured with provider 'fake', e.g.:
+
+    provider: "fake"
+    name: "slow-tail"
+    provider_settings:
+      response: "Hello"
+      latency: 0.2            # seconds, usual latency
+      tail_latency: 3.0       # seconds, latency of the slow requests
+      tail_probability: 0.05  # share of the slow requests
+      error_probability: 0.0  # share of the failed requests
+      seed: 42
+"""
+
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field, PrivateAttr
+
+
+class FakeProviderError(Exception):
+    """
+    Simulated failure of the fake provider.
+    """
+
+
+class FakeLatencyChatModel(BaseChatModel):
+    """
+    Chat model answering a fixed response after a simulated latency.
+    """
+
+    model_name: str = Field(default="fake", description="Name reported in the response metadata")
+    response: str = Field(default="OK", description="Content of every answer")
+    latency: float = Field(default=0.1, description="Usual latency, in seconds")
+    tail_latency: float = Field(default=1.0, description="Latency of the slow requests, in seconds")
+    tail_probability: float = Field(default=0.0, description="Share of the slow requests")
+    error_probability: float = Field(default=0.0, description="Share of the failed requests")
+    seed: Optional[int] = Field(default=None, description="Seed of the simulated latencies")
+    _random: random.Random = PrivateAttr()
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "response": self.response}
+
+    def _draw(self) -> tuple:
+        """
+        Draw the latency and the failure of the next request.
+        """
+        with self._lock:
+            slow = self._random.random() < self.tail_probability
+            failed = self._random.random() < self.error_probability
+        return (self.tail_latency if slow else self.latency), failed
+
+    def _result(self, messages: List[BaseMessage], failed: bool) -> ChatResult:
+        if failed:
+            raise FakeProviderError(f"Simulated failure of fake model '{self.model_name}'")
+        prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+        completion_tokens = len(self.response) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        message = AIMessage(
+            content=self.response,
+            response_metadata={"model_name": self.model_name, "finish_reason": "stop", "token_usage": usage},
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        latency, failed = self._draw()
+        time.sleep(latency)
+        return self._result(messages, failed)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        latency, failed = self._draw()
+        await asyncio.sleep(latency)
+        return self._result(messages, failed)
+
+    def bind_tools(self, tools: list, *, tool_choice: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Tools are accepted but never called.
+        """
+        return self.bind(**kwargs)
@@ -17,9 +17,10 @@ from IPython.display import Image
 import logging
 from langgraph.graph import MessagesState
 from langgraph.graph.state import CompiledStateGraph, StateGraph
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.tools import BaseToolkit
-from langchain_core.messages import SystemMessage
+
+from fred.common.prompt_builder import PromptBuilder
 
 
 logger = logging.getLogger(__name__)
@@ -36,16 +37,21 @@ class Flow:
         self.description: str = description
         # The graph of the agentic flow.
         self.graph: StateGraph | None = graph
-        self.streaming_memory: MemorySaver = MemorySaver()
+        # Import here to avoid circular import
+        from fred.application_context import get_checkpointer
+        self.streaming_memory: BaseCheckpointSaver = get_checkpointer()
         self.compiled_graph: CompiledStateGraph | None = None
 
     def get_compiled_graph(self) -> CompiledStateGraph:
         """
-        Compile and return the graph for execution.
+        Compile and return the graph for execution. The compiled graph is shared by all the
+        conversations, their state lives in the checkpointer.
         """
         if not self.graph:
             raise ValueError("Graph is not defined.")
-        return self.graph.compile(checkpointer=self.streaming_memory)
+        if self.compiled_graph is None:
+            self.compiled_graph = self.graph.compile(checkpointer=self.streaming_memory)
+        return self.compiled_graph
     
     def save_graph_image(self, path: str):
         """
@@ -134,13 +140,13 @@ class AgentFlow:
         self.base_prompt = base_prompt
         self.categories = categories or []
         self.tag = tag
-        self.streaming_memory = MemorySaver()
         self.compiled_graph = None
         self._context_enrichment = None
         self.toolkit = toolkit
         self.cluster_name = cluster_name
         # Import here to avoid circular import
-        from fred.application_context import get_model_for_agent
+        from fred.application_context import get_checkpointer, get_model_for_agent
+        self.streaming_memory = get_checkpointer()
         self.model = get_model_for_agent(self.name)
         if self.toolkit:
             self.model = self.model.bind_tools(self.toolkit.get_tools())
@@ -172,19 +178,26 @@ class AgentFlow:
         """
         
         # Build prompt including context enrichment if available
-        prompt_content = self.base_prompt
         if self._context_enrichment:
-            prompt_content = f"{self.base_prompt}\n\n{self._context_enrichment}"
             logger.info(f"Agent '{self.name}' using enriched prompt with context")
-            # Log a short preview of the prompt (first 100 chars)
-            preview = prompt_content[:100].replace('\n', ' ') + "..."
-            logger.debug(f"Prompt preview: {preview}")
+            # Log a short preview of the context (first 100 chars)
+            preview = self._context_enrichment[:100].replace('\n', ' ') + "..."
+            logger.debug(f"Context preview: {preview}")
         else:
             logger.info(f"Agent '{self.name}' using standard prompt without context")
-            
-        prompt = SystemMessage(content=prompt_content)
-        response = await self.model.ainvoke([prompt] + state["messages"])
+
+        response = await self.model.ainvoke(self.build_prompt().messages() + state["messages"])
         return {"messages": [response]}
+
+    def build_prompt(self) -> PromptBuilder:
+        """
+        Build the system prompt of the agent: the base prompt first, identical for every
+        call so that the providers can cache it, then the context enrichment if any.
+
+        Returns:
+            PromptBuilder: The prompt of the agent.
+        """
+        return PromptBuilder(self.name).instructions(self.base_prompt).context(self._context_enrichment)
     
     def set_context_enrichment(self, context_text: str):
         """
@@ -223,15 +236,12 @@ class AgentFlow:
         return f"{self.name} ({self.nickname}): {self.description}"
     
     async def reasoner(self, state: MessagesState):
-        prompt_content = self.base_prompt
         if self._context_enrichment:
-            prompt_content += f"\n\n{self._context_enrichment}"
             logger.info(f"[{self.name}] Using enriched prompt with context.")
         else:
             logger.info(f"[{self.name}] Using standard prompt.")
 
-        prompt = SystemMessage(content=prompt_content)
-        response = await self.model.ainvoke([prompt] + state["messages"])
+        response = await self.model.ainvoke(self.build_prompt().messages() + state["messages"])
         return {"messages": [response]}
 
 
@@ -0,0 +1,60 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+FastAPI routes to poll and cancel background jobs.
+
+* **GET /jobs** – List the most recent jobs, optionally filtered by status.
+* **GET /jobs/{job_id}** – Return the status and progress of a job.
+* **DELETE /jobs/{job_id}** – Cancel a pending or running job.
+"""
+
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from fred.jobs.job_service import JobService, get_job_service
+from fred.jobs.structure import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobController:
+    def __init__(self, router: APIRouter):
+        self.service: JobService = get_job_service()
+
+        @router.get("/jobs", tags=["Jobs"], response_model=List[Job],
+                    summary="List background jobs")
+        def list_jobs(
+            status: Optional[JobStatus] = Query(None, description="Only return jobs with this status"),
+            limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs to return"),
+        ) -> List[Job]:
+            return self.service.list_jobs(status, limit)
+
+        @router.get("/jobs/{job_id}", tags=["Jobs"], response_model=Job,
+                    summary="Get the status and progress of a background job")
+        def get_job(job_id: str) -> Job:
+            job = self.service.get_job(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+            return job
+
+        @router.delete("/jobs/{job_id}", tags=["Jobs"], response_model=Job,
+                       summary="Cancel a background job")
+        def cancel_job(job_id: str) -> Job:
+            job = self.service.cancel(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+            return job
@@ -0,0 +1,249 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process background job service.
+
+Long-running operations (typically LLM generations) are submitted as jobs and executed
+by a pool of worker threads. Jobs are persisted in a `BaseJobStore` so that their
+status and progress can be polled by HTTP clients.
+
+Jobs are deduplicated by artifact key (single-flight): submitting a job whose key is
+already pending or running returns the existing job instead of starting a new one.
+"""
+
+import logging
+from contextvars import ContextVar
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from fred.jobs.store.base_job_store import BaseJobStore
+from fred.jobs.structure import Job, JobCancelledError, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Id of the job running in the current context. Propagate it with contextvars.copy_context()
+# to threads spawned by a job so that their nested jobs are run inline as well.
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)
+
+
+class JobContext:
+    """
+    Handle given to a running job to report its progress and honor cancellation requests.
+    """
+
+    def __init__(self, service: "JobService", job_id: str):
+        self._service = service
+        self.job_id = job_id
+
+    def report_progress(self, progress: float, message: Optional[str] = None) -> None:
+        """
+        Record the completion ratio (between 0 and 1) and an optional message.
+        """
+        self._service._update(self.job_id, progress=max(0.0, min(progress, 1.0)), message=message)
+
+    def is_cancelled(self) -> bool:
+        return self._service._is_cancel_requested(self.job_id)
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise `JobCancelledError` if a cancellation was requested. Jobs should call this
+        between units of work.
+        """
+        if self.is_cancelled():
+            raise JobCancelledError(f"Job {self.job_id} has been cancelled")
+
+
+JobFunction = Callable[[JobContext], Any]
+
+
+class JobService:
+    """
+    Runs jobs on a bounded worker pool, persists their state and deduplicates them by key.
+    """
+
+    def __init__(self, store: BaseJobStore, max_workers: int = 4):
+        """
+        Args:
+            store: The job store used to persist job states.
+            max_workers: The number of worker threads.
+        """
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fred-job")
+        self._lock = Lock()
+        self._active_keys: Dict[str, str] = {}
+        self._futures: Dict[str, Future] = {}
+        self._cancel_requested: Set[str] = set()
+
+        interrupted = self.store.fail_active_jobs("Interrupted by a restart of the server")
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted job(s) as failed")
+        logger.info(f"Job service initialized with {max_workers} worker(s)")
+
+    def submit(self, key: str, name: str, func: JobFunction) -> Job:
+        """
+        Submit a job, or return the active job already registered for the same key.
+
+        Args:
+            key: The artifact key, e.g. 'WorkloadSummary:cluster/namespace/name/Deployment'.
+            name: The name of the operation, for display purposes.
+            func: The function to run. It receives a `JobContext`.
+
+        Returns:
+            Job: The submitted (or already active) job.
+        """
+        job, _ = self._submit(key, name, func)
+        return job
+
+    def run(self, key: str, name: str, func: JobFunction, timeout: Optional[float] = None) -> Any:
+        """
+        Submit a job (or join the active one for the same key) and wait for its completion.
+
+        Returns:
+            The value returned by the job function.
+
+        Raises:
+            JobCancelledError: If the job was cancelled.
+            Exception: The exception raised by the job function, if any.
+        """
+        inline = current_job_id.get() is not None
+        job, future = self._submit(key, name, func, inline)
+        try:
+            return future.result(timeout=timeout)
+        except CancelledError as e:
+            raise JobCancelledError(f"Job {job.id} has been cancelled") from e
+
+    def _submit(self, key: str, name: str, func: JobFunction, inline: bool = False) -> Tuple[Job, Future]:
+        with self._lock:
+            active_id = self._active_keys.get(key)
+            if active_id is not None:
+                logger.info(f"Joining active job {active_id} for key '{key}'")
+                return self.store.get_job(active_id), self._futures[active_id]
+
+            job = Job(id=str(uuid4()), key=key, name=name)
+            self.store.save_job(job)
+            self._active_keys[key] = job.id
+            if inline:
+                future = Future()
+                future.set_running_or_notify_cancel()
+            else:
+                future = self._executor.submit(self._execute, job.id, func)
+            self._futures[job.id] = future
+            logger.info(f"Submitted job {job.id} '{name}' for key '{key}'")
+
+        if inline:
+            # Nested job started from a worker: run it on the current thread so that
+            # jobs waiting for sub-jobs never starve the pool.
+            try:
+                future.set_result(self._execute(job.id, func))
+            except Exception as e:  # pylint: disable=W0718
+                future.set_exception(e)
+        return job, future
+
+    def _execute(self, job_id: str, func: JobFunction) -> Any:
+        context = JobContext(self, job_id)
+        token = current_job_id.set(job_id)
+        try:
+            context.raise_if_cancelled()
+            self._update(job_id, status=JobStatus.RUNNING)
+            result = func(context)
+        except JobCancelledError:
+            self._update(job_id, status=JobStatus.CANCELLED)
+            logger.info(f"Job {job_id} cancelled")
+            raise
+        except Exception as e:
+            self._update(job_id, status=JobStatus.FAILED, error=str(e))
+            logger.error(f"Job {job_id} failed: {e}")
+            raise
+        else:
+            self._update(job_id, status=JobStatus.SUCCEEDED, progress=1.0)
+            return result
+        finally:
+            current_job_id.reset(token)
+            self._release(job_id)
+
+    def _release(self, job_id: str) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+            for key, active_id in list(self._active_keys.items()):
+                if active_id == job_id:
+                    del self._active_keys[key]
+
+    def _update(self, job_id: str, **changes: Any) -> Optional[Job]:
+        with self._lock:
+            job = self.store.get_job(job_id)
+            if job is None:
+                return None
+            job = job.model_copy(update={**changes, "updated_at": datetime.now()})
+            self.store.save_job(job)
+            return job
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_requested
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self.store.get_job(job_id)
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        return self.store.list_jobs(status, limit)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job. A pending job is cancelled immediately; a running job is flagged and
+        stops at its next cancellation checkpoint.
+
+        Returns:
+            Job | None: The updated job, or None if it does not exist.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+            cancelled_before_start = future is not None and future.cancel()
+            if future is not None and not cancelled_before_start:
+                self._cancel_requested.add(job_id)
+
+        if cancelled_before_start:
+            self._release(job_id)
+            logger.info(f"Job {job_id} cancelled before it started")
+            return self._update(job_id, status=JobStatus.CANCELLED)
+        if future is not None:
+            logger.info(f"Cancellation requested for running job {job_id}")
+            return self._update(job_id, cancel_requested=True)
+        return self.store.get_job(job_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_instance: Optional[JobService] = None
+_instance_lock = Lock()
+
+
+def get_job_service() -> JobService:
+    """
+    Returns the JobService singleton, creating it from the application configuration on first use.
+    """
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            from fred.application_context import get_configuration
+            from fred.jobs.store.sqlite_job_store import SQLiteJobStore
+
+            jobs_config = get_configuration().jobs
+            _instance = JobService(SQLiteJobStore(jobs_config.path), jobs_config.max_workers)
+        return _instance
@@ -0,0 +1,50 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from fred.jobs.structure import Job, JobStatus
+
+
+class BaseJobStore(ABC):
+
+    @abstractmethod
+    def save_job(self, job: Job) -> None:
+        """
+        Insert or update a job.
+        """
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Retrieve a job by its ID, or None if unknown.
+        """
+        pass
+
+    @abstractmethod
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        """
+        List the most recent jobs, optionally filtered by status.
+        """
+        pass
+
+    @abstractmethod
+    def fail_active_jobs(self, reason: str) -> int:
+        """
+        Mark every pending or running job as failed. Used at startup, since in-process
+        workers do not survive a restart. Returns the number of jobs updated.
+        """
+        pass
@@ -0,0 +1,121 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+from fred.jobs.store.base_job_store import BaseJobStore
+from fred.jobs.structure import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, key, name, status, progress, message, error, cancel_requested, created_at, updated_at"
+
+
+class SQLiteJobStore(BaseJobStore):
+    """
+    Job store backed by a local SQLite database file named jobs.db
+    inside the configured directory.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = Path(root_path).expanduser()
+        self.root_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root_path / "jobs.db"
+        self._lock = Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, key TEXT NOT NULL, name TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress REAL NOT NULL, message TEXT, error TEXT, cancel_requested INTEGER NOT NULL, "
+            "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)")
+        self._connection.commit()
+        logger.info(f"SQLite job store initialized at '{self.db_path}'")
+
+    @staticmethod
+    def _to_job(row) -> Job:
+        return Job(
+            id=row[0],
+            key=row[1],
+            name=row[2],
+            status=JobStatus(row[3]),
+            progress=row[4],
+            message=row[5],
+            error=row[6],
+            cancel_requested=bool(row[7]),
+            created_at=datetime.fromisoformat(row[8]),
+            updated_at=datetime.fromisoformat(row[9]),
+        )
+
+    def save_job(self, job: Job) -> None:
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.key,
+                    job.name,
+                    job.status.value,
+                    job.progress,
+                    job.message,
+                    job.error,
+                    int(job.cancel_requested),
+                    job.created_at.isoformat(),
+                    job.updated_at.isoformat(),
+                ),
+            )
+            self._connection.commit()
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        with self._lock:
+            if status is None:
+                rows = self._connection.execute(
+                    f"SELECT {_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self._connection.execute(
+                    f"SELECT {_COLUMNS} FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status.value, limit),
+                ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def fail_active_jobs(self, reason: str) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+                (
+                    JobStatus.FAILED.value,
+                    reason,
+                    datetime.now().isoformat(),
+                    JobStatus.PENDING.value,
+                    JobStatus.RUNNING.value,
+                ),
+            )
+            self._connection.commit()
+            return cursor.rowcount
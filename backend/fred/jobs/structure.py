@@ -0,0 +1,67 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pydantic structures describing background jobs.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_active(self) -> bool:
+        return self in (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+class Job(BaseModel):
+    """
+    A unit of background work, typically the generation of one or several AI artifacts.
+
+    Attributes:
+        id: Unique identifier of the job, returned to the HTTP client.
+        key: Artifact key used for single-flight deduplication. Two active jobs never share a key.
+        name: Human readable name of the operation (e.g. 'post_workload_summary').
+        status: Current status of the job.
+        progress: Completion ratio between 0 and 1.
+        message: Last progress message reported by the job.
+        error: Error message if the job failed.
+        cancel_requested: Whether a cancellation has been requested for a running job.
+    """
+    id: str = Field(..., description="Unique identifier of the job")
+    key: str = Field(..., description="Artifact key used to deduplicate identical jobs")
+    name: str = Field(..., description="Name of the operation performed by the job")
+    status: JobStatus = Field(default=JobStatus.PENDING, description="Current status of the job")
+    progress: float = Field(default=0.0, description="Completion ratio between 0 and 1")
+    message: Optional[str] = Field(default=None, description="Last progress message")
+    error: Optional[str] = Field(default=None, description="Error message if the job failed")
+    cancel_requested: bool = Field(default=False, description="Whether a cancellation has been requested")
+    created_at: datetime = Field(default_factory=datetime.now, description="Creation date of the job")
+    updated_at: datetime = Field(default_factory=datetime.now, description="Last update date of the job")
+
+
+class JobCancelledError(Exception):
+    """
+    Raised inside a job when its cancellation has been requested, or to callers waiting on a cancelled job.
+    """
@@ -0,0 +1,523 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Provider-aware scheduling of the LLM calls.
+
+Every call to an OpenAI or Azure model goes through the shared HTTP clients of the model
+registry, which ask the `LLMScheduler` for a slot before sending the request. The scheduler
+holds one `RateLimiter` per provider or deployment with a configured budget:
+
+- requests and tokens per minute, refilled continuously (token buckets). The tokens of a
+  request are estimated from its body and its completion limit, then corrected with the
+  usage of the response;
+- a maximum number of concurrent requests;
+- a pause of the whole budget when the provider answers 429, for its Retry-After delay.
+
+Waiting requests are served by priority, then in arrival order. Chat agents are interactive,
+while the calls made by background jobs (generations) wait until no interactive call is
+pending, so that a cluster generation does not eat the quota of the users.
+
+The time spent waiting is exposed in the scheduler statistics and, for the monitored
+models, in the `queue_wait` field of their metrics.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from fred.common.structure import RateLimit, RateLimitSettings
+from fred.jobs.job_service import current_job_id
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """
+    Priority of an LLM call, the lowest value being served first.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Priority forced for the LLM calls of the current context. By default, the calls made by a
+# job are background calls and the other ones are interactive.
+current_priority: ContextVar[Optional[Priority]] = ContextVar("current_priority", default=None)
+
+# Queue waits of the LLM calls of the current context, see `queue_wait_recorder`.
+_queue_waits: ContextVar[Optional[List[float]]] = ContextVar("queue_waits", default=None)
+
+
+def get_priority() -> Priority:
+    """
+    Return the priority of the LLM calls of the current context.
+    """
+    priority = current_priority.get()
+    if priority is not None:
+        return priority
+    return Priority.BACKGROUND if current_job_id.get() is not None else Priority.INTERACTIVE
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """
+    Context manager forcing the priority of the LLM calls made within it.
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+@contextmanager
+def queue_wait_recorder() -> Iterator[List[float]]:
+    """
+    Context manager collecting the queue waits, in seconds, of the LLM calls made within it.
+
+    The list is shared rather than the context variable set, so that the waits of calls made
+    in copied contexts (e.g. tasks spawned by LangChain) are collected as well.
+    """
+    waits: List[float] = []
+    token = _queue_waits.set(waits)
+    try:
+        yield waits
+    finally:
+        _queue_waits.reset(token)
+
+
+class RateLimiterStats(BaseModel):
+    """
+    Represents the state and the queue waits of a rate limiter.
+    """
+
+    key: str = Field(description="The provider or provider/deployment of the budget")
+    queued: int = Field(description="The number of requests waiting for a slot")
+    running: int = Field(description="The number of requests in flight")
+    granted: int = Field(description="The number of requests granted since the start")
+    rate_limited: int = Field(description="The number of 429 answers of the provider")
+    average_wait: float = Field(description="The average queue wait of the recent requests, in seconds")
+    p95_wait: float = Field(description="The 95th percentile of the queue wait of the recent requests, in seconds")
+    max_wait: float = Field(description="The longest queue wait since the start, in seconds")
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "enqueued", "wake")
+
+    def __init__(self, priority: Priority, seq: int, tokens: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.wake = wake
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimiter:
+    """
+    Request, token and concurrency budget of a provider or deployment, shared by threads
+    and event loops.
+    """
+
+    # Longest sleep of a waiter between two checks of the budget, in case a wake-up is missed.
+    MAX_SLEEP = 1.0
+    # Number of recent waits kept for the statistics.
+    RECENT_WAITS = 1000
+
+    def __init__(self, key: str, limit: RateLimit):
+        self.key = key
+        self.requests_per_minute = limit.requests_per_minute
+        self.tokens_per_minute = limit.tokens_per_minute
+        self.max_concurrency = limit.max_concurrency
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._requests = float(self.requests_per_minute or 0)
+        self._tokens = float(self.tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._running = 0
+        self._granted = 0
+        self._rate_limited = 0
+        self._max_wait = 0.0
+        self._waits: deque = deque(maxlen=self.RECENT_WAITS)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _try_acquire(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """
+        Grant a slot to the waiter if it is the first in line and the budget allows it.
+
+        Returns:
+            Optional[float]: None if the slot is granted, else the delay before a new attempt.
+        """
+        self._refill(now)
+        if self._queue[0] is not waiter:
+            return self.MAX_SLEEP
+
+        delay = self._paused_until - now
+        if self.max_concurrency and self._running >= self.max_concurrency:
+            delay = max(delay, self.MAX_SLEEP)
+        if self.requests_per_minute and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / self.requests_per_minute)
+        # A request larger than the whole budget waits for a full bucket only.
+        tokens = min(waiter.tokens, self.tokens_per_minute or 0)
+        if self.tokens_per_minute and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        if delay > 0:
+            return delay
+
+        heapq.heappop(self._queue)
+        self._running += 1
+        self._requests -= 1
+        self._tokens -= tokens
+        wait = now - waiter.enqueued
+        self._granted += 1
+        self._waits.append(wait)
+        self._max_wait = max(self._max_wait, wait)
+        self._wake_next()
+        return None
+
+    def _wake_next(self) -> None:
+        if self._queue:
+            self._queue[0].wake()
+
+    def _enqueue(self, tokens: int, priority: Priority, wake: Callable[[], None]) -> _Waiter:
+        with self._lock:
+            waiter = _Waiter(priority, next(self._seq), tokens, wake)
+            heapq.heappush(self._queue, waiter)
+            return waiter
+
+    def _check(self, waiter: _Waiter) -> Optional[float]:
+        with self._lock:
+            return self._try_acquire(waiter, time.monotonic())
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self._wake_next()
+
+    def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> float:
+        """
+        Block until a request of `tokens` tokens may be sent.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        event = threading.Event()
+        waiter = self._enqueue(tokens, priority, event.set)
+        try:
+            while True:
+                event.clear()
+                delay = self._check(waiter)
+                if delay is None:
+                    return time.monotonic() - waiter.enqueued
+                event.wait(min(delay, self.MAX_SLEEP))
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def aacquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> float:
+        """
+        Wait, without blocking the event loop, until a request of `tokens` tokens may be sent.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(tokens, priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                event.clear()
+                delay = self._check(waiter)
+                if delay is None:
+                    return time.monotonic() - waiter.enqueued
+                try:
+                    await asyncio.wait_for(event.wait(), min(delay, self.MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def release(self, unused_tokens: float = 0) -> None:
+        """
+        Release the slot of a finished request.
+
+        Args:
+            unused_tokens (float): The estimated tokens of the request minus its actual usage,
+                given back to the budget (negative when the estimate was too low).
+        """
+        with self._lock:
+            self._running -= 1
+            if self.tokens_per_minute:
+                self._tokens = min(self.tokens_per_minute, self._tokens + unused_tokens)
+            self._wake_next()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every request for `seconds`, after a 429 answer of the provider.
+        """
+        with self._lock:
+            self._rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limited by '{self.key}', requests paused for {seconds:.1f}s")
+
+    def stats(self) -> RateLimiterStats:
+        with self._lock:
+            waits = sorted(self._waits)
+            return RateLimiterStats(
+                key=self.key,
+                queued=len(self._queue),
+                running=self._running,
+                granted=self._granted,
+                rate_limited=self._rate_limited,
+                average_wait=sum(waits) / len(waits) if waits else 0.0,
+                p95_wait=waits[math.ceil(0.95 * len(waits)) - 1] if waits else 0.0,
+                max_wait=self._max_wait,
+            )
+
+
+class LLMScheduler:
+    """
+    Registry of the rate limiters of the configured providers and deployments.
+    """
+
+    def __init__(self, settings: Optional[RateLimitSettings] = None):
+        self._lock = threading.Lock()
+        self.configure(settings or RateLimitSettings())
+
+    def configure(self, settings: RateLimitSettings) -> None:
+        """
+        Apply new budgets. The limiters of the previous budgets are dropped.
+        """
+        with self._lock:
+            self.settings = settings
+            self._limiters: Dict[str, RateLimiter] = {}
+
+    def limiter(self, provider: str, deployment: Optional[str]) -> Optional[RateLimiter]:
+        """
+        Return the limiter of a deployment: the budget of 'provider/deployment' if configured,
+        else the budget of the provider, shared by all its deployments.
+
+        Returns:
+            Optional[RateLimiter]: The limiter, or None if the calls are not limited.
+        """
+        if not self.settings.enabled:
+            return None
+        for key in (f"{provider}/{deployment}", provider):
+            limit = self.settings.limits.get(key)
+            if limit is not None:
+                with self._lock:
+                    if key not in self._limiters:
+                        self._limiters[key] = RateLimiter(key, limit)
+                    return self._limiters[key]
+        return None
+
+    def stats(self) -> List[RateLimiterStats]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.stats() for limiter in limiters]
+
+
+_scheduler = LLMScheduler()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """
+    Return the scheduler shared by the HTTP clients of the models.
+    """
+    return _scheduler
+
+
+def _estimate_tokens(request: httpx.Request, completion_tokens: int) -> int:
+    """
+    Estimate the tokens of a chat completion request: about 4 bytes per prompt token, plus
+    the completion limit of the request or the default completion estimate.
+    """
+    try:
+        content = request.content
+    except httpx.RequestNotRead:
+        return completion_tokens
+    try:
+        body = json.loads(content) if content else {}
+    except ValueError:
+        body = {}
+    limit = body.get("max_completion_tokens") or body.get("max_tokens") if isinstance(body, dict) else None
+    return len(content) // 4 + (limit or completion_tokens)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """
+    Return the delay requested by a 429 answer, in seconds.
+    """
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = response.headers.get(header)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                pass
+    return 1.0
+
+
+def _used_tokens(response: httpx.Response) -> Optional[int]:
+    try:
+        return response.json()["usage"]["total_tokens"]
+    except (ValueError, KeyError, TypeError, httpx.ResponseNotRead):
+        return None
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """
+    Response stream releasing the slot of its request when closed.
+    """
+
+    def __init__(self, stream: Any, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """
+    Asynchronous response stream releasing the slot of its request when closed.
+    """
+
+    def __init__(self, stream: Any, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _ScheduledRequest:
+    """
+    Slot of one request, from the budget check to the release of its response.
+    """
+
+    def __init__(self, provider: str, deployment: Optional[str], request: httpx.Request):
+        scheduler = get_llm_scheduler()
+        self.limiter = scheduler.limiter(provider, deployment)
+        self.tokens = _estimate_tokens(request, scheduler.settings.completion_tokens_estimate) \
+            if self.limiter is not None else 0
+        self.priority = get_priority()
+        self._released = False
+
+    @staticmethod
+    def record(wait: float) -> None:
+        waits = _queue_waits.get()
+        if waits is not None:
+            waits.append(wait)
+
+    def release(self, used_tokens: Optional[int] = None) -> None:
+        if not self._released:
+            self._released = True
+            self.limiter.release(self.tokens - used_tokens if used_tokens is not None else 0)
+
+    def handle(self, response: httpx.Response, stream: bool, wrap: Callable[[Any], Any]) -> httpx.Response:
+        if response.status_code == 429:
+            self.limiter.pause(_retry_after(response))
+        if stream and not response.is_closed:
+            response.stream = wrap(response.stream)
+        else:
+            self.release(_used_tokens(response) if response.status_code == 200 else None)
+        return response
+
+
+class ScheduledHttpClient(httpx.Client):
+    """
+    HTTP client of a model, sending its requests within the budget of its deployment.
+    """
+
+    def __init__(self, provider: str, deployment: Optional[str], **kwargs: Any):
+        super().__init__(**kwargs)
+        self._provider = provider
+        self._deployment = deployment
+
+    def send(self, request: httpx.Request, *, stream: bool = False, **kwargs: Any) -> httpx.Response:
+        slot = _ScheduledRequest(self._provider, self._deployment, request)
+        if slot.limiter is None:
+            return super().send(request, stream=stream, **kwargs)
+        slot.record(slot.limiter.acquire(slot.tokens, slot.priority))
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+        except BaseException:
+            slot.release()
+            raise
+        return slot.handle(response, stream, lambda s: _ReleasingStream(s, slot.release))
+
+
+class AsyncScheduledHttpClient(httpx.AsyncClient):
+    """
+    Asynchronous HTTP client of a model, sending its requests within the budget of its deployment.
+    """
+
+    def __init__(self, provider: str, deployment: Optional[str], **kwargs: Any):
+        super().__init__(**kwargs)
+        self._provider = provider
+        self._deployment = deployment
+
+    async def send(self, request: httpx.Request, *, stream: bool = False, **kwargs: Any) -> httpx.Response:
+        slot = _ScheduledRequest(self._provider, self._deployment, request)
+        if slot.limiter is None:
+            return await super().send(request, stream=stream, **kwargs)
+        slot.record(await slot.limiter.aacquire(slot.tokens, slot.priority))
+        try:
+            response = await super().send(request, stream=stream, **kwargs)
+        except BaseException:
+            slot.release()
+            raise
+        return slot.handle(response, stream, lambda s: _AsyncReleasingStream(s, slot.release))
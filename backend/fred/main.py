@@ -41,6 +41,7 @@ from fred.main_utils import configure_logging
 from fred.chatbot.chatbot_controller import ChatbotController
 from fred.context.context_controller import ContextController
 from fred.feedback.feedback_controller import FeedbackController
+from fred.jobs.job_controller import JobController
 from fred.services.frontend.frontend_controller import UiController
 from fred.services.kube.kube_controller import KubeController
 from fred.services.ai.ai_controller import AIController
@@ -110,6 +111,7 @@ def build_app(configuration: Configuration, base_url: str) -> FastAPI:
     ContextController(router)
     FeedbackController(router)
     MetricStoreController(router)
+    JobController(router)
 
     app.include_router(router)
     return app
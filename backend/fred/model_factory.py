@@ -13,19 +13,98 @@
 # limitations under the License.
 
 
+import json
 import logging
-from langchain_openai import AzureChatOpenAI, ChatOpenAI
-from langchain_ollama import ChatOllama
+import time
+from threading import RLock
+
+import httpx
+import openai
+from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings, ChatOpenAI, OpenAIEmbeddings
+from langchain_ollama import ChatOllama, OllamaEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableLambda
 from pydantic import BaseModel
-from typing import Type, Any
+from typing import Any, Callable, Dict, List, Optional, Type
 
 from fred.common.structure import ModelConfiguration
+from fred.fake_chat_model import FakeLatencyChatModel
+from fred.llm_scheduler import AsyncScheduledHttpClient, ScheduledHttpClient
+from fred.model_router import RoutedChatModel
+from fred.replay_chat_model import AUTO, RECORD, ReplayChatModel, get_cassette
 
 logger = logging.getLogger(__name__)
 
+# Connection pool of the HTTP clients of the models, overridable in the provider settings.
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 120.0
+# First Azure OpenAI API version serving the /batches endpoint.
+DEFAULT_AZURE_BATCH_API_VERSION = "2024-07-01-preview"
+
+_models: Dict[str, Any] = {}
+# Reentrant, since a router creates its backends through the registry.
+_models_lock = RLock()
+
+
+def _registry_key(model_config: ModelConfiguration) -> str:
+    """
+    Normalize a model configuration, so that equivalent configurations share a model.
+    """
+    values = model_config.model_dump(mode="json")
+    values["temperature"] = values["temperature"] or 0
+    values["provider_settings"] = values["provider_settings"] or {}
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+def _http_limits(provider_settings: Dict[str, Any]) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=provider_settings.get("max_connections", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=provider_settings.get(
+            "max_keepalive_connections", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        keepalive_expiry=provider_settings.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY),
+    )
+
+
 def get_model(model_config: ModelConfiguration):
+    """
+    Return the shared model instance of a configuration, creating it on first use.
+
+    Models are stateless and thread-safe, so a single instance (and HTTP connection pool)
+    per normalized configuration is shared by every agent, service and session. This keeps
+    client construction and TLS handshakes out of the request path.
+
+    Args:
+        model_config (ModelConfiguration): The model configuration.
+
+    Returns:
+        An instance of a Chat model.
+    """
+    key = _registry_key(model_config)
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = _create_model(model_config)
+            _models[key] = model
+        return model
+
+
+def clear_model_registry() -> None:
+    """
+    Forget the shared models, e.g. after a change of the credentials in the environment.
+    """
+    with _models_lock:
+        _models.clear()
+
+
+def _backend_name(model_config: ModelConfiguration) -> str:
+    provider_settings = model_config.provider_settings or {}
+    return f"{model_config.provider}/{provider_settings.get('azure_deployment', model_config.name)}"
+
+
+def _create_model(model_config: ModelConfiguration):
     """
     Factory function to create a model instance based on configuration.
     
@@ -62,16 +141,25 @@ def get_model(model_config: ModelConfiguration):
 
     if provider == "azure":
         logger.info("Creating Azure Chat model instance with config %s", model_config)
+        limits = _http_limits(provider_settings)
+        deployment = provider_settings.get("azure_deployment", "fred-gpt-4o")
         return AzureChatOpenAI(
-            azure_deployment=provider_settings.get("azure_deployment", "fred-gpt-4o"),
+            azure_deployment=deployment,
             api_version=provider_settings.get("api_version", "2024-05-01-preview"),
+            http_client=ScheduledHttpClient("azure", deployment, limits=limits),
+            http_async_client=AsyncScheduledHttpClient("azure", deployment, limits=limits),
             **common_params
         )
     elif provider == "openai":
         logger.info("Creating OpenAI Chat model instance with config %s", model_config)
+        limits = _http_limits(provider_settings)
         return ChatOpenAI(
             model=model_config.name,
             max_retries=provider_settings.get("max_retries", 2),
+            http_client=ScheduledHttpClient("openai", model_config.name, limits=limits),
+            http_async_client=AsyncScheduledHttpClient("openai", model_config.name, limits=limits),
+            # Enabled by default with the default HTTP clients only.
+            stream_usage=True,
             **common_params
         )
     elif provider == "ollama":
@@ -79,13 +167,67 @@ def get_model(model_config: ModelConfiguration):
         return ChatOllama(
             model=model_config.name,
             base_url=provider_settings.get("base_url", None),
+            client_kwargs={"limits": _http_limits(provider_settings)},
             **common_params
         )
+    elif provider == "router":
+        logger.info("Creating routed Chat model instance with config %s", model_config)
+        backends = [ModelConfiguration.model_validate(backend) for backend in provider_settings.get("backends", [])]
+        if not backends:
+            raise ValueError("A router model requires at least one backend in its provider settings.")
+        return RoutedChatModel(
+            backends=[get_model(backend) for backend in backends],
+            backend_names=[_backend_name(backend) for backend in backends],
+            **{key: value for key, value in provider_settings.items() if key != "backends"},
+        )
+    elif provider == "fake":
+        logger.info("Creating fake Chat model instance with config %s", model_config)
+        return FakeLatencyChatModel(model_name=model_config.name or "fake", **provider_settings)
+    elif provider == "replay":
+        logger.info("Creating replay Chat model instance with config %s", model_config)
+        settings = dict(provider_settings)
+        if "cassette" not in settings:
+            raise ValueError("A replay model requires a cassette in its provider settings.")
+        cassette = get_cassette(settings.pop("cassette"))
+        backend = settings.pop("backend", None)
+        if settings.get("mode") in {RECORD, AUTO}:
+            if backend is None:
+                raise ValueError("A replay model recording answers requires a backend in its provider settings.")
+            settings["backend"] = get_model(ModelConfiguration.model_validate(backend))
+        return ReplayChatModel(model_name=model_config.name or "replay", cassette=cassette, **settings)
     else:
         logger.error("Unsupported model provider %s", provider)
         raise ValueError(f"Unknown model provider {provider}")
 
 
+def get_embeddings(model_config: ModelConfiguration) -> Embeddings:
+    """
+    Create an embedding model based on configuration.
+
+    Args:
+        model_config (ModelConfiguration): The model configuration. On Azure, the deployment
+            is set with the 'azure_deployment' provider setting.
+
+    Returns:
+        Embeddings: An instance of an embedding model.
+    """
+    provider = model_config.provider
+    provider_settings = model_config.provider_settings or {}
+
+    if provider == "azure":
+        return AzureOpenAIEmbeddings(
+            azure_deployment=provider_settings.get("azure_deployment", model_config.name),
+            api_version=provider_settings.get("api_version", "2024-05-01-preview"),
+        )
+    if provider == "openai":
+        return OpenAIEmbeddings(model=model_config.name)
+    if provider == "ollama":
+        return OllamaEmbeddings(model=model_config.name, base_url=provider_settings.get("base_url", None))
+
+    logger.error("Unsupported embedding model provider %s", provider)
+    raise ValueError(f"Unknown embedding model provider {provider}")
+
+
 
 def get_structured_chain(
     schema: Type[BaseModel],
@@ -108,6 +250,9 @@ def get_structured_chain(
     if provider in {"openai", "azure"}:
         logger.debug(f"Using function_calling for schema {schema_name} with provider '{provider}'")
         return model.with_structured_output(schema, method="function_calling")
+    if provider in {"router", "replay"}:
+        # Tool calling, with the tools bound to the backends.
+        return model.with_structured_output(schema)
 
     logger.debug(f"Falling back to prompt-based structured output for schema {schema_name} with provider '{provider}'")
 
@@ -139,3 +284,170 @@ def get_structured_chain(
             raise RuntimeError(f"Structured output parsing failed for schema: {schema_name}")
 
     return prompt | RunnableLambda(parse_fallback)
+
+
+BATCH_PROVIDERS = {"openai", "azure"}
+
+
+class BatchClient:
+    """
+    Client of the batch API of OpenAI and Azure OpenAI.
+
+    Requests are uploaded as a JSONL file and processed asynchronously by the provider,
+    within the completion window, at a lower cost and with a separate quota from the
+    synchronous calls.
+    """
+
+    TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+    def __init__(self, client: openai.OpenAI, model: str, url: str, completion_window: str = "24h"):
+        """
+        Args:
+            client (openai.OpenAI): The OpenAI or AzureOpenAI client.
+            model (str): The model (OpenAI) or the global batch deployment (Azure) of the requests.
+            url (str): The endpoint of the requests, relative to the API root.
+            completion_window (str): The time frame within which the batch is processed.
+        """
+        self.client = client
+        self.model = model
+        self.url = url
+        self.completion_window = completion_window
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Upload the requests and create a batch.
+
+        Args:
+            requests (Dict[str, Dict[str, Any]]): The bodies of the requests, without model,
+                keyed by custom id.
+
+        Returns:
+            str: The batch id.
+        """
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": self.url,
+                "body": {**body, "model": self.model},
+            })
+            for custom_id, body in requests.items()
+        ]
+        input_file = self.client.files.create(
+            file=("requests.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.url,
+            completion_window=self.completion_window,
+        )
+        logger.info(f"Submitted batch {batch.id} of {len(lines)} requests to model '{self.model}'")
+        return batch.id
+
+    def wait(
+        self,
+        batch_id: str,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        checkpoint: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Poll a batch until it reaches a terminal status.
+
+        Args:
+            batch_id (str): The batch id.
+            poll_interval (float): The delay between two polls, in seconds.
+            timeout (Optional[float]): The maximum waiting time, in seconds.
+            checkpoint (Optional[Callable[[], None]]): Called before every poll. If it raises,
+                e.g. because the job waiting for the batch is cancelled, the batch is cancelled.
+
+        Returns:
+            Batch: The batch in its terminal status.
+
+        Raises:
+            TimeoutError: If the batch is not over within the timeout. The batch is cancelled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if checkpoint is not None:
+                    checkpoint()
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch_id} is not over after {timeout} seconds")
+            except BaseException:
+                self.client.batches.cancel(batch_id)
+                raise
+
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in self.TERMINAL_STATUSES:
+                logger.info(f"Batch {batch_id} is {batch.status}: {batch.request_counts}")
+                return batch
+            time.sleep(poll_interval)
+
+    def results(self, batch: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Download the results of a batch.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The bodies of the successful responses, keyed by custom id.
+                The failed requests are logged and omitted.
+        """
+        results = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[result["custom_id"]] = response["body"]
+                else:
+                    logger.warning(f"Batch request {result['custom_id']} failed: {result.get('error') or response}")
+        if batch.error_file_id:
+            for line in self.client.files.content(batch.error_file_id).text.splitlines():
+                if line.strip():
+                    result = json.loads(line)
+                    logger.warning(f"Batch request {result['custom_id']} failed: {result.get('error')}")
+        return results
+
+
+def get_batch_client(model_config: ModelConfiguration, completion_window: str = "24h") -> BatchClient:
+    """
+    Create a batch client for the provider of a model configuration.
+
+    The OpenAI client reads its credentials from the environment (OPENAI_API_KEY, or
+    AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT). The 'base_url' provider setting
+    redirects the OpenAI client, e.g. to a local server. On Azure, the batch API requires
+    a global batch deployment, set with the 'batch_deployment' provider setting, and an API
+    version serving it, set with the 'batch_api_version' provider setting: the chat
+    'api_version' is not used, as it may predate the batch API.
+
+    Args:
+        model_config (ModelConfiguration): The model configuration.
+        completion_window (str): The time frame within which the batches are processed.
+
+    Returns:
+        BatchClient: The batch client.
+    """
+    provider = model_config.provider
+    provider_settings = model_config.provider_settings or {}
+
+    if provider == "azure":
+        client = openai.AzureOpenAI(
+            api_version=provider_settings.get("batch_api_version", DEFAULT_AZURE_BATCH_API_VERSION),
+            max_retries=provider_settings.get("max_retries", 2),
+        )
+        deployment = provider_settings.get(
+            "batch_deployment", provider_settings.get("azure_deployment", "fred-gpt-4o")
+        )
+        return BatchClient(client, deployment, "/chat/completions", completion_window)
+    if provider == "openai":
+        client = openai.OpenAI(
+            base_url=provider_settings.get("base_url", None),
+            max_retries=provider_settings.get("max_retries", 2),
+        )
+        return BatchClient(client, model_config.name, "/v1/chat/completions", completion_window)
+
+    logger.error("Unsupported batch model provider %s", provider)
+    raise ValueError(f"The batch API is not supported by model provider {provider}")
@@ -0,0 +1,357 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency-aware routing of a logical model over several provider backends.
+
+A `RoutedChatModel` is configured with provider 'router' and a list of backends, each one
+a regular model configuration:
+
+    provider: "router"
+    name: "gpt-4o"
+    provider_settings:
+      backends:
+        - {provider: "azure", name: "gpt-4o", provider_settings: {azure_deployment: "fred-gpt-4o"}}
+        - {provider: "openai", name: "gpt-4o"}
+      hedge: true             # send a second request when the first one is slow
+      hedge_quantile: 0.95    # latency quantile of the backend after which it is hedged
+      min_hedge_delay: 0.5    # seconds
+      initial_hedge_delay: 5  # seconds, before the latency of the backend is known
+
+Every call goes to the backend with the best observed latency, penalized by its error rate;
+backends never observed are tried first. A failed call fails over to the next backend.
+On the asynchronous path, a call still running after the hedge delay of its backend is
+hedged on the next backend: the first answer wins and the other request is cancelled.
+Streamed calls are hedged and failed over the same way until their first chunk: from then
+on, the backend that sent it streams the whole answer.
+
+The backends are called without the callbacks of the caller, which observe the router call
+itself: the tokens of a streamed answer are reported once, by the router.
+
+Each backend call is recorded in the metric store (model_type 'router', model_name the
+backend, finish_reason 'error' on failure), and the latency statistics of the backends are
+rebuilt from these metrics on startup.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import BaseModel, Field
+
+from fred.monitoring.hybrid_metric_store import get_metric_store
+from fred.monitoring.logging_context import get_logging_context
+from fred.monitoring.metric_store import Metric
+
+logger = logging.getLogger(__name__)
+
+ROUTER_MODEL_TYPE = "router"
+ERROR_FINISH_REASON = "error"
+# Configuration of the backend calls, detached from the callbacks of the router call.
+BACKEND_CONFIG = {"callbacks": []}
+
+
+class BackendStatsSnapshot(BaseModel):
+    """
+    Represents the observed latency and error rate of a routing backend.
+    """
+
+    backend: str = Field(description="The backend, as provider/model")
+    calls: int = Field(description="The number of recent calls observed")
+    error_rate: float = Field(description="The share of failed calls among the recent calls")
+    p50_latency: Optional[float] = Field(None, description="The median latency of the recent successful calls, in seconds")
+    p95_latency: Optional[float] = Field(None, description="The 95th percentile latency of the recent successful calls, in seconds")
+
+
+class BackendStats:
+    """
+    Sliding window of the latencies and failures of a backend.
+    """
+
+    WINDOW = 200
+    # Factor applied to the error rate in the score of a backend.
+    ERROR_PENALTY = 10.0
+    # Age of the metrics read from the metric store on startup.
+    HISTORY = timedelta(hours=1)
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self._lock = Lock()
+        self._latencies: deque = deque(maxlen=self.WINDOW)
+        self._errors: deque = deque(maxlen=self.WINDOW)
+        self._load_history()
+
+    def _load_history(self) -> None:
+        try:
+            metric_store = get_metric_store()
+        except RuntimeError:
+            return
+        end = datetime.now()
+        for metric in metric_store.get_by_date_range(end - self.HISTORY, end):
+            if metric.model_type == ROUTER_MODEL_TYPE and metric.model_name == self.backend:
+                self._observe(metric.latency, metric.finish_reason == ERROR_FINISH_REASON)
+
+    def _observe(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self._errors.append(error)
+            if not error:
+                self._latencies.append(latency)
+
+    def observe(self, latency: float, error: bool, finish_reason: Optional[str] = None) -> None:
+        """
+        Record a call of the backend, in the window and in the metric store.
+        """
+        self._observe(latency, error)
+        try:
+            metric_store = get_metric_store()
+        except RuntimeError:
+            return
+        ctx = get_logging_context()
+        metric_store.add_metric(Metric(
+            timestamp=time.time(),
+            latency=round(latency, 4),
+            user_id=ctx.get("user_id", "unknown"),
+            session_id=ctx.get("session_id", "unknown"),
+            model_type=ROUTER_MODEL_TYPE,
+            model_name=self.backend,
+            finish_reason=ERROR_FINISH_REASON if error else finish_reason,
+        ))
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[max(0, math.ceil(q * len(latencies)) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(self._errors) / len(self._errors) if self._errors else 0.0
+
+    @property
+    def calls(self) -> int:
+        with self._lock:
+            return len(self._errors)
+
+    def score(self) -> float:
+        """
+        Expected cost of a call, the lowest being the best. Unknown backends score 0.
+        """
+        median = self.quantile(0.5)
+        if median is None:
+            return 0.0 if self.calls == 0 else math.inf
+        return median * (1 + self.ERROR_PENALTY * self.error_rate)
+
+    def snapshot(self) -> BackendStatsSnapshot:
+        return BackendStatsSnapshot(
+            backend=self.backend,
+            calls=self.calls,
+            error_rate=self.error_rate,
+            p50_latency=self.quantile(0.5),
+            p95_latency=self.quantile(0.95),
+        )
+
+
+_backend_stats: Dict[str, BackendStats] = {}
+_backend_stats_lock = Lock()
+
+
+def get_backend_stats(backend: str) -> BackendStats:
+    """
+    Return the statistics of a backend, shared by every router using it.
+    """
+    with _backend_stats_lock:
+        if backend not in _backend_stats:
+            _backend_stats[backend] = BackendStats(backend)
+        return _backend_stats[backend]
+
+
+def get_routing_stats() -> List[BackendStatsSnapshot]:
+    with _backend_stats_lock:
+        stats = list(_backend_stats.values())
+    return [backend_stats.snapshot() for backend_stats in stats]
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    Chat model routing each call to one of several backends.
+    """
+
+    backends: List[Any] = Field(description="The backend models (chat models or bound runnables)")
+    backend_names: List[str] = Field(description="The names of the backends, as provider/model")
+    hedge: bool = Field(default=True, description="Whether slow asynchronous calls are hedged")
+    hedge_quantile: float = Field(default=0.95, description="Latency quantile after which a call is hedged")
+    min_hedge_delay: float = Field(default=0.5, description="Minimum delay before hedging a call, in seconds")
+    initial_hedge_delay: float = Field(default=5.0, description="Hedge delay of a backend without observed latency")
+
+    @property
+    def _llm_type(self) -> str:
+        return "router"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"backends": self.backend_names}
+
+    def _ranked(self) -> List[int]:
+        """
+        Return the indexes of the backends, best first.
+        """
+        return sorted(range(len(self.backends)), key=lambda i: get_backend_stats(self.backend_names[i]).score())
+
+    def _hedge_delay(self, index: int) -> float:
+        latency = get_backend_stats(self.backend_names[index]).quantile(self.hedge_quantile)
+        return max(self.min_hedge_delay, latency if latency is not None else self.initial_hedge_delay)
+
+    def _result(self, index: int, message: BaseMessage, latency: float) -> ChatResult:
+        get_backend_stats(self.backend_names[index]).observe(
+            latency, False, message.response_metadata.get("finish_reason")
+        )
+        message.response_metadata["routed_backend"] = self.backend_names[index]
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        last_error: Optional[Exception] = None
+        for index in self._ranked():
+            start = time.perf_counter()
+            try:
+                message = self.backends[index].invoke(messages, config=BACKEND_CONFIG, stop=stop, **kwargs)
+            except Exception as e:
+                get_backend_stats(self.backend_names[index]).observe(time.perf_counter() - start, True)
+                logger.warning(f"Backend '{self.backend_names[index]}' failed, failing over: {e}")
+                last_error = e
+                continue
+            return self._result(index, message, time.perf_counter() - start)
+        raise last_error
+
+    async def _acall(self, index: int, messages: List[BaseMessage], stop: Optional[List[str]],
+                     kwargs: Dict[str, Any]) -> ChatResult:
+        start = time.perf_counter()
+        try:
+            message = await self.backends[index].ainvoke(messages, config=BACKEND_CONFIG, stop=stop, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            get_backend_stats(self.backend_names[index]).observe(time.perf_counter() - start, True)
+            raise
+        return self._result(index, message, time.perf_counter() - start)
+
+    async def _arace(self, call: Callable[[int], Awaitable[Any]],
+                     discard: Optional[Callable[[Any], Awaitable[None]]] = None) -> Tuple[int, Any]:
+        """
+        Run `call` on the best backend, hedging it when slow and failing it over on error.
+
+        Returns:
+            Tuple[int, Any]: The index of the backend that answered first, and its answer.
+                The other answers completed at the same time are given to `discard`.
+        """
+        candidates = self._ranked()
+        pending: Dict[asyncio.Task, int] = {}
+        last_error: Optional[BaseException] = None
+        winner: Optional[Tuple[int, Any]] = None
+
+        def start_next() -> None:
+            index = candidates.pop(0)
+            pending[asyncio.ensure_future(call(index))] = index
+
+        start_next()
+        try:
+            while pending and winner is None:
+                timeout = None
+                if self.hedge and candidates and len(pending) == 1:
+                    timeout = self._hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"Hedging slow call of '{self.backend_names[next(iter(pending.values()))]}'")
+                    start_next()
+                    continue
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        logger.warning(f"Backend '{self.backend_names[index]}' failed, failing over: {last_error}")
+                    elif winner is None:
+                        winner = index, task.result()
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is None and not pending and candidates:
+                    start_next()
+        finally:
+            # The losing requests are cancelled, which closes their connections.
+            for task in pending:
+                task.cancel()
+        if winner is None:
+            raise last_error
+        return winner
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        _, result = await self._arace(lambda index: self._acall(index, messages, stop, kwargs))
+        return result
+
+    async def _afirst_chunk(self, index: int, messages: List[BaseMessage], stop: Optional[List[str]],
+                            kwargs: Dict[str, Any]) -> Tuple[AsyncIterator, Optional[BaseMessage], float]:
+        """
+        Start streaming the answer of a backend, up to its first chunk.
+        """
+        start = time.perf_counter()
+        stream = self.backends[index].astream(messages, config=BACKEND_CONFIG, stop=stop, **kwargs)
+        try:
+            first = await anext(stream, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            get_backend_stats(self.backend_names[index]).observe(time.perf_counter() - start, True)
+            raise
+        return stream, first, start
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        index, (stream, chunk, start) = await self._arace(
+            lambda index: self._afirst_chunk(index, messages, stop, kwargs),
+            discard=lambda started: started[0].aclose(),
+        )
+        stats = get_backend_stats(self.backend_names[index])
+        finish_reason = None
+        if chunk is not None:
+            chunk.response_metadata["routed_backend"] = self.backend_names[index]
+        try:
+            while chunk is not None:
+                finish_reason = chunk.response_metadata.get("finish_reason", finish_reason)
+                yield ChatGenerationChunk(message=chunk)
+                # The answer has started: it is not hedged, nor failed over, anymore.
+                chunk = await anext(stream, None)
+        except Exception:
+            stats.observe(time.perf_counter() - start, True)
+            raise
+        finally:
+            await stream.aclose()
+        stats.observe(time.perf_counter() - start, False, finish_reason)
+
+    def bind_tools(self, tools: list, *, tool_choice: Optional[Any] = None, **kwargs: Any) -> "RoutedChatModel":
+        """
+        Bind the tools to every backend, each one formatting them for its provider.
+        """
+        return self.model_copy(update={
+            "backends": [backend.bind_tools(tools, tool_choice=tool_choice, **kwargs) for backend in self.backends],
+        })
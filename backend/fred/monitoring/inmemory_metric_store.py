@@ -207,7 +207,9 @@ class InMemoryMetricStore(MetricStore):
                 finish_reason=m.finish_reason,
                 id=getattr(m, "id", None),
                 system_fingerprint=m.system_fingerprint,
-                service_tier=m.service_tier
+                service_tier=m.service_tier,
+                cache_tier=m.cache_tier,
+                prompt_name=m.prompt_name
             ))
         return result
 
@@ -22,11 +22,12 @@ Defines:
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from collections import defaultdict
 from typing import List, Optional
 from pydantic import BaseModel
 from enum import Enum
 
-from fred.monitoring.metric_types import CategoricalMetric, NumericalMetric
+from fred.monitoring.metric_types import CategoricalMetric, NumericalMetric, PromptCacheMetric
 
 
 class TokenDetails(BaseModel):
@@ -79,6 +80,11 @@ class Metric(BaseModel):
         system_fingerprint: Version or hash of the deployed model.
         service_tier: SLA or environment type (e.g., premium, free).
         token_usage: Token usage information associated with the inference.
+        queue_wait: Duration in seconds spent waiting for the rate limits of the provider.
+        cache_hit: 1 if the response came from the response cache, 0 if not, None if the
+            model has no response cache. Its average is the hit rate.
+        cache_tier: Tier of the response cache hit ('exact' or 'semantic').
+        prompt_name: Name of the prompt of the inference (see `fred.common.prompt_builder`).
     """
     timestamp: float
     latency: float
@@ -92,6 +98,10 @@ class Metric(BaseModel):
     system_fingerprint: Optional[str] = None
     service_tier: Optional[str] = None
     token_usage: Optional[TokenUsage] = None
+    queue_wait: Optional[float] = None
+    cache_hit: Optional[float] = None
+    cache_tier: Optional[str] = None
+    prompt_name: Optional[str] = None
 
 class Precision(str, Enum):
     sec = "sec"
@@ -158,3 +168,33 @@ class MetricStore(ABC):
         """
         pass
 
+    def get_prompt_cache_by_date_range(self, start: datetime, end: datetime) -> List[PromptCacheMetric]:
+        """
+        Sum the prompt tokens and the cached prompt tokens of each prompt in a date range.
+
+        The calls without a prompt name are grouped by model type, e.g. the agent name.
+
+        Args:
+            start: Start datetime.
+            end: End datetime.
+        """
+        totals = defaultdict(lambda: [0, 0, 0])
+        for metric in self.get_by_date_range(start, end):
+            usage = metric.token_usage
+            if usage is None or not usage.prompt_tokens:
+                continue
+            total = totals[metric.prompt_name or metric.model_type]
+            total[0] += 1
+            total[1] += usage.prompt_tokens
+            if usage.prompt_tokens_details is not None:
+                total[2] += usage.prompt_tokens_details.cached_tokens or 0
+        return [
+            PromptCacheMetric(
+                prompt_name=name,
+                calls=calls,
+                prompt_tokens=prompt_tokens,
+                cached_tokens=cached_tokens,
+                cached_ratio=round(cached_tokens / prompt_tokens, 4),
+            )
+            for name, (calls, prompt_tokens, cached_tokens) in sorted(totals.items())
+        ]
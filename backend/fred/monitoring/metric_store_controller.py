@@ -17,13 +17,19 @@
 FastAPI routes and controller for accessing metrics stored in an in-memory
 MetricStore.
 
-The module exposes three endpoints:
+The module exposes six endpoints:
 
 * **/metrics/all** – Returns raw MetaData objects in a date range.
 * **/metrics/numerical** – Returns aggregated numerical metrics with configurable
   time precision and aggregation function.
 * **/metrics/categorical** – Returns categorical-only metrics rows (id, model,
   finish_reason, …) for the given date range.
+* **/metrics/scheduler** – Returns the queues and queue waits of the rate limits of the
+  model providers.
+* **/metrics/routing** – Returns the observed latency and error rate of the backends of the
+  routed models.
+* **/metrics/prompt_cache** – Returns the share of the prompt tokens of each prompt served
+  from the prompt cache of the provider, for the given date range.
 
 All query parameters use ISO 8601 date-time strings (e.g. ``2025-06-12T09:15:00``).
 """
@@ -33,9 +39,11 @@ from datetime import datetime
 from typing import Annotated, List, Tuple
 import logging
 
+from fred.llm_scheduler import RateLimiterStats, get_llm_scheduler
+from fred.model_router import BackendStatsSnapshot, get_routing_stats
 from fred.monitoring.hybrid_metric_store import HybridMetricStore, get_metric_store
 from fred.monitoring.metric_store import Aggregation, Precision
-from fred.monitoring.metric_types import CategoricalMetric, MetaData, NumericalMetric
+from fred.monitoring.metric_types import CategoricalMetric, MetaData, NumericalMetric, PromptCacheMetric
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +72,7 @@ class MetricStoreController:
     """
     Wires the FastAPI router to the singleton :class:`~fred.monitoring.inmemory_metric_store.InMemoryMetricStore`.
 
-    Instantiating this class adds three **GET** endpoints to the supplied router.
+    Instantiating this class adds six **GET** endpoints to the supplied router.
 
     Example
     -------
@@ -144,3 +152,43 @@ class MetricStoreController:
             return self.metric_store.get_categorical_rows_by_date_range(
                 start=start_dt, end=end_dt
             )
+
+        @router.get(
+            "/metrics/scheduler",
+            response_model=List[RateLimiterStats],
+            tags=["Metrics"],
+            summary="List the rate limiters of the model providers",
+            description="Return the queued and running requests and the queue waits of every "
+                        "provider or deployment budget in use.",
+        )
+        def get_scheduler_metrics() -> List[RateLimiterStats]:
+            """Retrieve the current state of the LLM rate limiters."""
+            return get_llm_scheduler().stats()
+
+        @router.get(
+            "/metrics/routing",
+            response_model=List[BackendStatsSnapshot],
+            tags=["Metrics"],
+            summary="List the backends of the routed models",
+            description="Return the recent latency quantiles and error rate of every backend "
+                        "used by a routed model.",
+        )
+        def get_routing_metrics() -> List[BackendStatsSnapshot]:
+            """Retrieve the statistics used to route the calls of the routed models."""
+            return get_routing_stats()
+
+        @router.get(
+            "/metrics/prompt_cache",
+            response_model=List[PromptCacheMetric],
+            tags=["Metrics"],
+            summary="List the provider prompt cache usage of each prompt",
+            description="Return the prompt tokens, the cached prompt tokens and their ratio for "
+                        "every prompt called inside the date range.",
+        )
+        def get_prompt_cache_metrics(
+            start: Annotated[str, Query()],
+            end: Annotated[str, Query()]
+        ) -> List[PromptCacheMetric]:
+            """Retrieve the cached-token ratio of each prompt between the given dates."""
+            start_dt, end_dt = parse_dates(start, end)
+            return self.metric_store.get_prompt_cache_by_date_range(start_dt, end_dt)
@@ -146,6 +146,8 @@ class CategoricalMetric(BaseModel):
         id: Unique identifier of the inference.
         system_fingerprint: Deployment hash or version.
         service_tier: Tier or SLA level of the request.
+        cache_tier: Tier of the response cache hit, if any.
+        prompt_name: Name of the prompt of the inference, if any.
     """
     timestamp: float
     user_id: Optional[str]
@@ -155,4 +157,24 @@ class CategoricalMetric(BaseModel):
     finish_reason: Optional[str]
     id: Optional[str]
     system_fingerprint: Optional[str]
-    service_tier: Optional[str]
\ No newline at end of file
+    service_tier: Optional[str]
+    cache_tier: Optional[str] = None
+    prompt_name: Optional[str] = None
+
+
+class PromptCacheMetric(BaseModel):
+    """
+    Provider prompt caching of a prompt over a date range.
+
+    Attributes:
+        prompt_name: Name of the prompt, or the model type of the unnamed calls.
+        calls: Number of calls reporting their token usage.
+        prompt_tokens: Total number of prompt tokens.
+        cached_tokens: Total number of prompt tokens served from the provider cache.
+        cached_ratio: Share of the prompt tokens served from the provider cache.
+    """
+    prompt_name: str
+    calls: int
+    prompt_tokens: int
+    cached_tokens: int
+    cached_ratio: float
@@ -70,7 +70,9 @@ def translate_response_metadata_to_metric(
     raw: Dict[str, Any],
     ctx: Dict[str, str],
     latency: float,
-    model_type: str
+    model_type: str,
+    queue_wait: Optional[float] = None,
+    prompt_name: Optional[str] = None,
 ) -> Optional[Metric]:
     try:
         logger.info(f"Raw metadata: {json.dumps(raw, indent=2, default=str)}")
@@ -91,6 +93,8 @@ def translate_response_metadata_to_metric(
             system_fingerprint=raw.get("system_fingerprint"),
             service_tier=raw.get("service_tier"),
             token_usage=token_usage.model_dump() if token_usage else None,  # ✅ KEY FIX
+            queue_wait=queue_wait,
+            prompt_name=prompt_name,
         )
 
         return metric
@@ -20,7 +20,11 @@ This module defines `MonitoredLanguageModel`, a drop-in replacement that wraps
 any LangChain-compatible LLM and logs structured monitoring data (latency,
 token usage, metadata, etc.) to a `MetricStore` backend.
 
-Metrics are automatically captured and translated from response metadata.
+Metrics are automatically captured and translated from response metadata, along with
+the time spent waiting for the rate limits of the provider (see `fred.llm_scheduler`).
+
+An optional `ResponseCache` answers repeated calls (`invoke` and `ainvoke`) without
+reaching the provider; hits and misses are recorded in the metrics.
 """
 
 
@@ -34,10 +38,12 @@ from langchain_core.language_models import BaseLanguageModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import LLMResult
 
+from fred.llm_scheduler import queue_wait_recorder
 from fred.monitoring.hybrid_metric_store import HybridMetricStore, get_metric_store
 from fred.monitoring.logging_context import get_logging_context
 from fred.monitoring.metric_store import Metric
 from fred.monitoring.metric_util import translate_response_metadata_to_metric
+from fred.response_cache.response_cache import CacheTier, ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +56,8 @@ class MonitoredLanguageModel(BaseLanguageModel):
     - Model name/type
     - User/session context (from `get_logging_context`)
     - Token usage (via `response_metadata`)
+    - Queue wait before the requests are sent (via `queue_wait_recorder`)
+    - Response cache hits and misses, if a cache is set
 
     Metrics are translated using `translate_response_metadata_to_metric`
     and stored in the configured `MetricStore` backend.
@@ -57,20 +65,24 @@ class MonitoredLanguageModel(BaseLanguageModel):
     Attributes:
         target: The underlying LLM to wrap.
         name: Logical name for the wrapped model (used in metrics).
+        response_cache: Optional response cache of the wrapped model. Not named `cache`,
+            which is the LangChain cache of `BaseLanguageModel`.
     """
     target: Any = Field(...)
     name: str = Field(default="unnamed")
+    response_cache: Optional[ResponseCache] = Field(default=None)
     _metric_store: HybridMetricStore = PrivateAttr()
 
-    def __init__(self, target: Any, name: str = "unnamed"):
+    def __init__(self, target: Any, name: str = "unnamed", response_cache: Optional[ResponseCache] = None):
         """
         Initialize the monitored LLM wrapper.
 
         Args:
             target: A LangChain-compatible language model instance.
             name: Optional label used to identify the model in logs and metrics.
+            response_cache: Optional response cache, e.g. from the agent settings.
         """
-        super().__init__(target=target, name=name)
+        super().__init__(target=target, name=name, response_cache=response_cache)
         self._metric_store = get_metric_store()
 
     def _llm_type(self) -> str:
@@ -82,27 +94,39 @@ class MonitoredLanguageModel(BaseLanguageModel):
         """
         return "monitoring_wrapper"
 
-    def _log_and_store(self, result: Any, latency: float) -> Optional[Metric]:
+    def _log_and_store(
+        self, result: Any, latency: float, queue_waits: List[float], cache_tier: Optional[CacheTier] = None
+    ) -> Optional[Metric]:
         """
         Extract metadata from the result and log it as a `Metric`.
 
         Args:
             result: The output of the LLM call, expected to have `response_metadata`.
             latency: Duration of the call in seconds.
+            queue_waits: Queue waits of the requests of the call, in seconds.
+            cache_tier: Tier of the response cache hit, None if the provider was called.
 
         Returns:
             Metric | None: The created metric, or None if translation failed.
         """
         ctx = get_logging_context()
         raw_metadata = getattr(result, "response_metadata", {}) or {}
+        if cache_tier is not None:
+            # A cache hit consumes no tokens.
+            raw_metadata = {key: value for key, value in raw_metadata.items() if key != "token_usage"}
 
         metric = translate_response_metadata_to_metric(
             raw=raw_metadata,
             ctx=ctx,
             latency=round(latency, 4),
             model_type=self.name,
+            queue_wait=round(sum(queue_waits), 4),
         )
 
+        if metric and self.response_cache is not None:
+            metric.cache_hit = 0.0 if cache_tier is None else 1.0
+            metric.cache_tier = cache_tier.value if cache_tier is not None else None
+
         if metric:
             logger.info(f"Captured metric: {metric}")
             self._metric_store.add_metric(metric)
@@ -112,52 +136,76 @@ class MonitoredLanguageModel(BaseLanguageModel):
 
     def invoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
         start = time.perf_counter()
-        result = self.target.invoke(input, **kwargs)
-        self._log_and_store(result, time.perf_counter() - start)
+        request = self.response_cache.request(self.target, input, kwargs) if self.response_cache is not None else None
+        if request is not None:
+            cached, tier = self.response_cache.lookup(request)
+            if cached is not None:
+                self._log_and_store(cached, time.perf_counter() - start, [], tier)
+                return cached
+        with queue_wait_recorder() as queue_waits:
+            result = self.target.invoke(input, **kwargs)
+        if request is not None:
+            self.response_cache.update(request, result)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     async def ainvoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
         start = time.perf_counter()
-        result = await self.target.ainvoke(input, **kwargs)
-        self._log_and_store(result, time.perf_counter() - start)
+        request = self.response_cache.request(self.target, input, kwargs) if self.response_cache is not None else None
+        if request is not None:
+            cached, tier = await self.response_cache.alookup(request)
+            if cached is not None:
+                self._log_and_store(cached, time.perf_counter() - start, [], tier)
+                return cached
+        with queue_wait_recorder() as queue_waits:
+            result = await self.target.ainvoke(input, **kwargs)
+        if request is not None:
+            await self.response_cache.aupdate(request, result)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     def predict(self, text: str, stop: Optional[List[str]] = None) -> str:
         start = time.perf_counter()
-        result = self.target.predict(text, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = self.target.predict(text, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     async def apredict(self, text: str, stop: Optional[List[str]] = None) -> str:
         start = time.perf_counter()
-        result = await self.target.apredict(text, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = await self.target.apredict(text, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     def predict_messages(self, messages: List[BaseMessage], stop: Optional[List[str]] = None) -> BaseMessage:
         start = time.perf_counter()
-        result = self.target.predict_messages(messages, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = self.target.predict_messages(messages, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     async def apredict_messages(self, messages: List[BaseMessage], stop: Optional[List[str]] = None) -> BaseMessage:
         start = time.perf_counter()
-        result = await self.target.apredict_messages(messages, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = await self.target.apredict_messages(messages, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     def generate_prompt(self, prompts: List[Any], stop: Optional[List[str]] = None) -> LLMResult:
         start = time.perf_counter()
-        result = self.target.generate_prompt(prompts, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = self.target.generate_prompt(prompts, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     async def agenerate_prompt(self, prompts: List[Any], stop: Optional[List[str]] = None) -> LLMResult:
         start = time.perf_counter()
-        result = await self.target.agenerate_prompt(prompts, stop=stop)
-        self._log_and_store(result, time.perf_counter() - start)
+        with queue_wait_recorder() as queue_waits:
+            result = await self.target.agenerate_prompt(prompts, stop=stop)
+        self._log_and_store(result, time.perf_counter() - start, queue_waits)
         return result
 
     def bind_tools(self, tools: list, *, tool_choice: Optional[str] = None, **kwargs) -> "MonitoredLanguageModel":
         bound = self.target.bind_tools(tools, tool_choice=tool_choice, **kwargs)
-        return MonitoredLanguageModel(target=bound, name=self.name)
+        return MonitoredLanguageModel(target=bound, name=self.name, response_cache=self.response_cache)
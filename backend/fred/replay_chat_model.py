@@ -0,0 +1,324 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Record and replay of the answers of a chat model, for benchmarking Fred without a live LLM.
+
+Configured with provider 'replay', e.g.:
+
+    provider: "replay"
+    name: "gpt-4o"
+    provider_settings:
+      cassette: "~/.fred/cassettes/gpt-4o.jsonl"
+      mode: "replay"            # 'record', 'replay', or 'auto' (replay, record the misses)
+      match: "request"          # 'request' (same messages, tools and parameters) or 'sequence'
+      backend:                  # the model called when recording
+        {provider: "azure", name: "gpt-4o", provider_settings: {azure_deployment: "fred-gpt-4o"}}
+      latency: null             # seconds before the first token, null for the recorded latency
+      latency_scale: 1.0        # factor applied to the recorded latency
+      tokens_per_second: null   # output rate after the first token, null for instantaneous
+
+A cassette is a JSON Lines file with one recorded answer per line: the key of the request,
+the observed latency and the answer message, with its tool calls and usage metadata, so
+that the metrics of the monitored models stay meaningful when replaying.
+
+With 'request' matching, identical requests replay their recorded answers in turn. With
+'sequence' matching, the n-th call replays the n-th recorded answer whatever the request,
+which suits prompts embedding the current date or random identifiers.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+
+MATCH_REQUEST = "request"
+MATCH_SEQUENCE = "sequence"
+
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised when a request has no recorded answer in the cassette.
+    """
+
+
+class Cassette:
+    """
+    Recorded answers of a model, kept in memory and appended to a JSON Lines file.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._next_by_key: Dict[str, int] = {}
+        self._next = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+            logger.info(f"Loaded {len(self._entries)} recorded answers from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        self._entries.append(entry)
+        self._by_key.setdefault(entry["key"], []).append(entry)
+
+    def record(self, key: str, message: AIMessage, latency: float) -> None:
+        entry = {"key": key, "latency": round(latency, 4), "message": message_to_dict(message)}
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+            self._add(entry)
+
+    def play(self, key: str, match: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the next recorded answer of a request, None if there is none.
+        """
+        with self._lock:
+            if match == MATCH_SEQUENCE:
+                if not self._entries:
+                    return None
+                entry = self._entries[self._next % len(self._entries)]
+                self._next += 1
+                return entry
+            entries = self._by_key.get(key)
+            if not entries:
+                return None
+            index = self._next_by_key.get(key, 0)
+            self._next_by_key[key] = index + 1
+            return entries[index % len(entries)]
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = Lock()
+
+
+def get_cassette(path: str) -> Cassette:
+    """
+    Return the cassette of a file, shared by every model recording into it.
+    """
+    path = os.path.expanduser(path)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def _message_key(message: BaseMessage) -> Dict[str, Any]:
+    # Message and tool call ids change between runs.
+    return {
+        "type": message.type,
+        "content": message.content,
+        "tool_calls": [{"name": call["name"], "args": call["args"]} for call in getattr(message, "tool_calls", [])],
+    }
+
+
+def request_key(messages: List[BaseMessage], tools: List[Dict[str, Any]], parameters: Dict[str, Any]) -> str:
+    """
+    Hash the messages, the tools and the call parameters of a request.
+    """
+    request = {
+        "messages": [_message_key(message) for message in messages],
+        "tools": tools,
+        "parameters": parameters,
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Chat model answering from a cassette, recording the answers of a backend model.
+    """
+
+    model_name: str = Field(default="replay", description="Name of the replayed model")
+    cassette: Cassette = Field(description="The recorded answers")
+    mode: str = Field(default=REPLAY, description="'record', 'replay' or 'auto'")
+    match: str = Field(default=MATCH_REQUEST, description="'request' or 'sequence'")
+    backend: Optional[Any] = Field(default=None, description="The model called when recording")
+    latency: Optional[float] = Field(default=None, description="Seconds before the first token, None for the recorded latency")
+    latency_scale: float = Field(default=1.0, description="Factor applied to the recorded latency")
+    tokens_per_second: Optional[float] = Field(default=None, description="Output rate after the first token")
+    tools: List[Dict[str, Any]] = Field(default_factory=list, description="The bound tools, part of the request key")
+    tool_choice: Optional[Any] = Field(default=None, description="The bound tool choice, part of the request key")
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "cassette": self.cassette.path, "mode": self.mode}
+
+    def _key(self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+        return request_key(messages, self.tools, {"tool_choice": self.tool_choice, "stop": stop, **kwargs})
+
+    def _replayed(self, key: str) -> Optional[Tuple[AIMessage, float, float]]:
+        """
+        Return the next recorded answer of a request, with the simulated delay before its
+        first token and between its tokens, None if the request is to be recorded.
+        """
+        if self.mode == RECORD:
+            return None
+        entry = self.cassette.play(key, self.match)
+        if entry is None:
+            if self.mode == REPLAY:
+                raise CassetteMissError(f"No recorded answer in {self.cassette.path} for request {key[:12]}")
+            return None
+        message = messages_from_dict([entry["message"]])[0]
+        per_token = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        generation = self._output_tokens(message) * per_token
+        if self.latency is not None:
+            return message, self.latency, per_token
+        # The recorded latency includes the generation of the answer.
+        return message, max(0.0, entry["latency"] * self.latency_scale - generation), per_token
+
+    @staticmethod
+    def _output_tokens(message: AIMessage) -> int:
+        usage = message.usage_metadata or {}
+        return usage.get("output_tokens") or len(str(message.content)) // 4
+
+    def _check_backend(self) -> Any:
+        if self.backend is None:
+            raise CassetteMissError(f"Replay model '{self.model_name}' has no backend to record from")
+        return self.backend
+
+    def _recorded(self, key: str, message: AIMessage, latency: float) -> ChatResult:
+        self.cassette.record(key, message, latency)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages, stop, kwargs)
+        replayed = self._replayed(key)
+        if replayed is not None:
+            message, first_token, per_token = replayed
+            time.sleep(first_token + self._output_tokens(message) * per_token)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        start = time.perf_counter()
+        message = self._check_backend().invoke(messages, stop=stop, **kwargs)
+        return self._recorded(key, message, time.perf_counter() - start)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages, stop, kwargs)
+        replayed = self._replayed(key)
+        if replayed is not None:
+            message, first_token, per_token = replayed
+            await asyncio.sleep(first_token + self._output_tokens(message) * per_token)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        start = time.perf_counter()
+        message = await self._check_backend().ainvoke(messages, stop=stop, **kwargs)
+        return self._recorded(key, message, time.perf_counter() - start)
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> List[ChatGenerationChunk]:
+        """
+        Split an answer into one chunk per token, the last one carrying the tool calls and
+        the metadata of the answer.
+        """
+        content = message.content if isinstance(message.content, str) else message.text()
+        tokens = _TOKEN_PATTERN.findall(content) or [""]
+        chunks = [ChatGenerationChunk(message=AIMessageChunk(content=token)) for token in tokens[:-1]]
+        chunks.append(ChatGenerationChunk(message=AIMessageChunk(
+            content=tokens[-1],
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+            response_metadata=message.response_metadata,
+        )))
+        return chunks
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        key = self._key(messages, stop, kwargs)
+        replayed = self._replayed(key)
+        if replayed is None:
+            # Recorded without streaming, then emitted at once.
+            start = time.perf_counter()
+            message = self._check_backend().invoke(messages, stop=stop, **kwargs)
+            self.cassette.record(key, message, time.perf_counter() - start)
+            replayed = message, 0.0, 0.0
+        message, first_token, per_token = replayed
+        time.sleep(first_token)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index:
+                time.sleep(per_token)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._key(messages, stop, kwargs)
+        replayed = self._replayed(key)
+        if replayed is None:
+            # Recorded without streaming, then emitted at once.
+            start = time.perf_counter()
+            message = await self._check_backend().ainvoke(messages, stop=stop, **kwargs)
+            self.cassette.record(key, message, time.perf_counter() - start)
+            replayed = message, 0.0, 0.0
+        message, first_token, per_token = replayed
+        await asyncio.sleep(first_token)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index:
+                await asyncio.sleep(per_token)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def bind_tools(self, tools: list, *, tool_choice: Optional[Any] = None, **kwargs: Any) -> "ReplayChatModel":
+        """
+        Bind the tools to the backend, which formats them for its provider, and keep their
+        definitions as part of the request key.
+        """
+        update: Dict[str, Any] = {
+            "tools": [convert_to_openai_tool(tool) for tool in tools],
+            "tool_choice": tool_choice,
+        }
+        if self.backend is not None:
+            update["backend"] = self.backend.bind_tools(tools, tool_choice=tool_choice, **kwargs)
+        return self.model_copy(update=update)
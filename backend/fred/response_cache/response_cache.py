@@ -0,0 +1,220 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Response cache of the LLM calls of an agent, used by `MonitoredLanguageModel`.
+
+The responses are scoped by agent and by user (from the logging context), so that a user
+is never answered with the response to another user. Two tiers are looked up in order:
+
+1. Exact: the hash of the model parameters (model, temperature, bound tools...) and of
+   the messages. Message ids and response metadata are ignored, so the same conversation
+   replayed in another session hits the cache.
+2. Semantic (optional): the embedding of the last user message is compared with the
+   questions asked after the same previous messages, with the same model parameters.
+   Only final answers are reused this way, never tool calls, whose arguments depend on
+   the exact wording of the question. Models bound to tools skip this tier: their answers
+   rely on live data fetched by the tools, which a similar question must fetch again.
+
+The store is a local database: the asynchronous lookups and updates run in a thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, convert_to_messages, messages_from_dict, messages_to_dict
+from langchain_core.prompt_values import PromptValue
+
+from fred.common.structure import AgentResponseCacheSettings
+from fred.monitoring.logging_context import get_logging_context
+from fred.response_cache.store.base_response_store import BaseResponseStore
+
+logger = logging.getLogger(__name__)
+
+
+class CacheTier(str, Enum):
+    EXACT = "exact"
+    SEMANTIC = "semantic"
+
+
+class CacheRequest:
+    """
+    Keys of one LLM call, and the embedding of its question once computed.
+    """
+
+    def __init__(self, key: str, namespace: str, context: str, question: Optional[str]):
+        self.key = key
+        self.namespace = namespace
+        self.context = context
+        self.question = question
+        self.embedding: Optional[List[float]] = None
+
+
+def _to_messages(input: Any) -> List[BaseMessage]:
+    if isinstance(input, PromptValue):
+        return input.to_messages()
+    if isinstance(input, str):
+        return [HumanMessage(content=input)]
+    return convert_to_messages(input)
+
+
+def _message_content(message: BaseMessage) -> Dict[str, Any]:
+    return {
+        "type": message.type,
+        "content": message.content,
+        "name": message.name,
+        "tool_calls": getattr(message, "tool_calls", None),
+        "tool_call_id": getattr(message, "tool_call_id", None),
+    }
+
+
+def _hash(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _call_params(target: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return {**getattr(target, "kwargs", {}), **kwargs}
+
+
+def _llm_string(target: Any, kwargs: Dict[str, Any]) -> str:
+    """
+    Identify the model parameters of a call, including the tools bound to the model.
+    """
+    model = getattr(target, "bound", target)
+    params = _call_params(target, kwargs)
+    if hasattr(model, "_get_llm_string"):
+        return model._get_llm_string(**params)
+    return f"{type(model).__name__}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+class ResponseCache:
+    """
+    Response cache of one agent (namespace), on top of a shared response store. The
+    responses of each user are kept apart within the namespace.
+    """
+
+    def __init__(
+        self,
+        store: BaseResponseStore,
+        namespace: str,
+        settings: AgentResponseCacheSettings,
+        embeddings: Optional[Embeddings] = None,
+    ):
+        """
+        Args:
+            store (BaseResponseStore): The store of the responses.
+            namespace (str): The namespace of the responses, e.g. the agent name.
+            settings (AgentResponseCacheSettings): The TTL and semantic tier settings.
+            embeddings (Optional[Embeddings]): The embedding model of the semantic tier,
+                which is disabled without it.
+        """
+        self.store = store
+        self.namespace = namespace
+        self.settings = settings
+        self.embeddings = embeddings if settings.semantic else None
+
+    def request(self, target: Any, input: Any, kwargs: Dict[str, Any]) -> CacheRequest:
+        """
+        Compute the keys of a call of `target` with `input` and `kwargs`, by the current user.
+        """
+        namespace = f"{self.namespace}/{get_logging_context()['user_id']}"
+        messages = [_message_content(message) for message in _to_messages(input)]
+        context = _hash(namespace, _llm_string(target, kwargs), messages[:-1])
+        question = None
+        if self.embeddings is not None and not _call_params(target, kwargs).get("tools") and messages \
+                and messages[-1]["type"] == "human" and isinstance(messages[-1]["content"], str):
+            question = messages[-1]["content"]
+        return CacheRequest(_hash(context, messages[-1:]), namespace, context, question)
+
+    def _exact(self, request: CacheRequest) -> Optional[BaseMessage]:
+        response = self.store.get(request.key)
+        return messages_from_dict(json.loads(response))[0] if response else None
+
+    def _similar(self, request: CacheRequest) -> Optional[BaseMessage]:
+        if request.embedding is None:
+            return None
+        response = self.store.search(
+            request.namespace, request.context, request.embedding, self.settings.similarity_threshold
+        )
+        return messages_from_dict(json.loads(response))[0] if response else None
+
+    def lookup(self, request: CacheRequest) -> Tuple[Optional[BaseMessage], Optional[CacheTier]]:
+        """
+        Look the response of a call up, in the exact tier then in the semantic tier.
+
+        Returns:
+            Tuple[Optional[BaseMessage], Optional[CacheTier]]: The cached response and its
+                tier, or (None, None) on a miss.
+        """
+        cached = self._exact(request)
+        if cached is not None:
+            return cached, CacheTier.EXACT
+        if request.question is not None:
+            try:
+                request.embedding = self.embeddings.embed_query(request.question)
+            except Exception as e:
+                logger.warning(f"Semantic cache lookup skipped for '{self.namespace}': {e}")
+            cached = self._similar(request)
+            if cached is not None:
+                return cached, CacheTier.SEMANTIC
+        return None, None
+
+    async def alookup(self, request: CacheRequest) -> Tuple[Optional[BaseMessage], Optional[CacheTier]]:
+        """
+        Asynchronous counterpart of `lookup`, embedding the question and reading the store
+        without blocking.
+        """
+        cached = await asyncio.to_thread(self._exact, request)
+        if cached is not None:
+            return cached, CacheTier.EXACT
+        if request.question is not None:
+            try:
+                request.embedding = await self.embeddings.aembed_query(request.question)
+            except Exception as e:
+                logger.warning(f"Semantic cache lookup skipped for '{self.namespace}': {e}")
+            cached = await asyncio.to_thread(self._similar, request)
+            if cached is not None:
+                return cached, CacheTier.SEMANTIC
+        return None, None
+
+    def update(self, request: CacheRequest, response: Any) -> None:
+        """
+        Store the response of a call. Only model messages are cached.
+        """
+        if not isinstance(response, AIMessage):
+            return
+        embedding = None if response.tool_calls else request.embedding
+        self.store.put(
+            request.key,
+            request.namespace,
+            request.context,
+            json.dumps(messages_to_dict([response])),
+            self.settings.ttl_seconds,
+            embedding,
+        )
+
+    async def aupdate(self, request: CacheRequest, response: Any) -> None:
+        """
+        Asynchronous counterpart of `update`, writing to the store without blocking.
+        """
+        await asyncio.to_thread(self.update, request, response)
@@ -0,0 +1,57 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class BaseResponseStore(ABC):
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retrieve the unexpired response stored under an exact key, or None.
+        """
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        key: str,
+        namespace: str,
+        context: str,
+        response: str,
+        ttl_seconds: float,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """
+        Insert or replace a response. The embedding of the question, if any, makes the
+        response available to `search` within the same namespace and context.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, namespace: str, context: str, embedding: List[float], threshold: float) -> Optional[str]:
+        """
+        Retrieve the unexpired response of the most similar question (cosine similarity at
+        least `threshold`) within a namespace and context, or None.
+        """
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """
+        Delete the expired responses. Returns the number of responses deleted.
+        """
+        pass
@@ -0,0 +1,118 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import math
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+from fred.response_cache.store.base_response_store import BaseResponseStore
+
+logger = logging.getLogger(__name__)
+
+
+def _norm(vector: List[float]) -> float:
+    return math.sqrt(sum(x * x for x in vector))
+
+
+class SQLiteResponseStore(BaseResponseStore):
+    """
+    Response store backed by a local SQLite database file named responses.db
+    inside the configured directory.
+
+    Embeddings are stored as float32 blobs. The similarity search scans the embeddings of
+    a single namespace and context, which keeps it small enough for a linear scan.
+    """
+
+    # Number of insertions between two purges of the expired responses.
+    PURGE_INTERVAL = 100
+
+    def __init__(self, root_path: str):
+        self.root_path = Path(root_path).expanduser()
+        self.root_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root_path / "responses.db"
+        self._lock = Lock()
+        self._puts = 0
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, context TEXT NOT NULL, "
+            "response TEXT NOT NULL, embedding BLOB, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_context ON responses (namespace, context)"
+        )
+        self._connection.commit()
+        self.purge_expired()
+        logger.info(f"SQLite response store initialized at '{self.db_path}'")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self,
+        key: str,
+        namespace: str,
+        context: str,
+        response: str,
+        ttl_seconds: float,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        blob = array("f", embedding).tobytes() if embedding else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, namespace, context, response, embedding, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, context, response, blob, time.time() + ttl_seconds),
+            )
+            self._connection.commit()
+            self._puts += 1
+            purge = self._puts % self.PURGE_INTERVAL == 0
+        if purge:
+            self.purge_expired()
+
+    def search(self, namespace: str, context: str, embedding: List[float], threshold: float) -> Optional[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT response, embedding FROM responses "
+                "WHERE namespace = ? AND context = ? AND embedding IS NOT NULL AND expires_at > ?",
+                (namespace, context, time.time()),
+            ).fetchall()
+
+        norm = _norm(embedding)
+        best, best_similarity = None, threshold
+        for response, blob in rows:
+            candidate = array("f")
+            candidate.frombytes(blob)
+            if len(candidate) != len(embedding) or not norm:
+                continue
+            similarity = sum(a * b for a, b in zip(embedding, candidate)) / (norm * (_norm(candidate) or 1.0))
+            if similarity >= best_similarity:
+                best, best_similarity = response, similarity
+        return best
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._connection.commit()
+        return cursor.rowcount
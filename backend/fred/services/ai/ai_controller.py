@@ -22,13 +22,16 @@ from fastapi import (APIRouter, Body, Depends, FastAPI, File, HTTPException, Que
                      UploadFile)
 
 from fred.common.utils import log_exception
+from fred.jobs.structure import Job
 from fred.security.keycloak import KeycloakUser, get_current_user
 from fred.services.ai.ai_service import AIService
 from fred.services.ai.structure.cluster_summary import ClusterSummary
 from fred.services.ai.structure.cluster_topology import ClusterTopology
+from fred.services.ai.structure.context_report import ContextTokensReport
 from fred.services.ai.structure.facts import Fact, Facts
 from fred.services.ai.structure.namespace_summary import NamespaceSummary
 from fred.services.ai.structure.namespace_topology import NamespaceTopology
+from fred.services.ai.structure.scores_report import ScoresHeuristicsReport
 from fred.services.ai.structure.workload_advanced import WorkloadAdvanced
 from fred.services.ai.structure.workload_essentials import WorkloadEssentials
 from fred.services.ai.structure.workload_id import WorkloadId
@@ -118,15 +121,18 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
             tags=fastapi_tags,
             summary="Generate all the resources for the cluster",
         )
-        async def generate_all_resources(cluster_name: str = Query(..., description="The Cluster name")):
+        async def generate_all_resources(cluster_name: str = Query(..., description="The Cluster name")) -> Job:
             """
             Generate all the resources for the cluster.
 
             Args:
                 cluster_name (str): The Cluster name.
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.generate_all_resources(cluster_name)
+                return ai_service.submit_all_resources(cluster_name)
             except Exception as e:
                 logger.error(
                     (
@@ -148,15 +154,18 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
             tags=fastapi_tags,
             summary="Generate all the missing resources for the cluster",
         )
-        async def generate_missing_resources(cluster_name: str = Query(..., description="The Cluster name")):
+        async def generate_missing_resources(cluster_name: str = Query(..., description="The Cluster name")) -> Job:
             """
             Generate the missing resources for the cluster.
 
             Args:
                 cluster_name (str): The Cluster name.
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.generate_missing_resources(cluster_name)
+                return ai_service.submit_missing_resources(cluster_name)
             except Exception as e:
                 logger.error(
                     (
@@ -315,15 +324,18 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
         )
         async def post_cluster_summary(
                 cluster_name: str = Query(..., description="The Cluster name"),
-        ):
+        ) -> Job:
             """
             Generate the Cluster Summary.
 
             Args:
                 cluster_name (str): The Cluster name.
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_cluster_summary(cluster_name)
+                return ai_service.submit_generation(ai_service.post_cluster_summary, ClusterSummary, cluster_name)
             except Exception as e:
                 log_exception(e,
                         f"An unexpected error occurred while generating the Cluster Summary for "
@@ -374,6 +386,78 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                     ),
                 ) from e
 
+        @app.get(
+            "/ai/cluster/context/tokens",
+            tags=fastapi_tags,
+            summary="Get the tokens saved by the pruning of the workload contexts",
+        )
+        async def get_context_tokens_report(
+                cluster_name: str = Query(..., description="The Cluster name"),
+                user: KeycloakUser = Depends(get_current_user)
+        ) -> ContextTokensReport:
+            """
+            Get the size of every workload context of the Cluster, before and after pruning.
+
+            Args:
+                cluster_name (str): The Cluster name.
+
+            Returns:
+                ContextTokensReport: The tokens report.
+            """
+            try:
+                return ai_service.get_context_tokens_report(cluster_name)
+            except Exception as e:
+                logger.error(
+                    (
+                        f"An unexpected error occurred while measuring the workload contexts of "
+                        f"Cluster {cluster_name}: {e}"
+                    )
+                )
+
+                raise HTTPException(
+                    status_code=500,
+                    detail=(
+                        f"An error occurred while measuring the workload contexts of Cluster "
+                        f"{cluster_name}"
+                    ),
+                ) from e
+
+        @app.get(
+            "/ai/cluster/scores/heuristics",
+            tags=fastapi_tags,
+            summary="Get the score LLM calls avoided by the rule-based pre-scoring of the workloads",
+        )
+        async def get_scores_heuristics_report(
+                cluster_name: str = Query(..., description="The Cluster name"),
+                user: KeycloakUser = Depends(get_current_user)
+        ) -> ScoresHeuristicsReport:
+            """
+            Get the scores of every workload of the Cluster that are computed by the rules instead of the LLM.
+
+            Args:
+                cluster_name (str): The Cluster name.
+
+            Returns:
+                ScoresHeuristicsReport: The pre-scoring report.
+            """
+            try:
+                return ai_service.get_scores_heuristics_report(cluster_name)
+            except Exception as e:
+                logger.error(
+                    (
+                        f"An unexpected error occurred while pre-scoring the workloads of "
+                        f"Cluster {cluster_name}: {e}"
+                    )
+                )
+
+                raise HTTPException(
+                    status_code=500,
+                    detail=(
+                        f"An error occurred while pre-scoring the workloads of Cluster "
+                        f"{cluster_name}"
+                    ),
+                ) from e
+
         @app.put(
             "/ai/namespace/fact",
             tags=fastapi_tags,
@@ -528,16 +612,21 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
         async def post_namespace_summary(
                 cluster_name: str = Query(..., description="The Cluster name"),
                 namespace: str = Query(..., description="The Namespace"),
-        ):
+        ) -> Job:
             """
             Generate the Namespace Summary.
 
             Args:
                 cluster_name (str): The Cluster where the Namespace is running.
                 namespace (str): The Namespace.
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_namespace_summary(cluster_name, namespace)
+                return ai_service.submit_generation(
+                    ai_service.post_namespace_summary, NamespaceSummary, cluster_name, namespace
+                )
             except Exception as e:
                 logger.error(
                     (
@@ -649,7 +738,7 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace: str = Query(..., description="The Namespace"),
                 workload_name: str = Query(..., description="The Workload name"),
                 kind: WorkloadKind = Query(..., description="The Workload kind"),
-        ):
+        ) -> Job:
             """
             Generate Workload ID (Commercial Off-The-Shelf software name).
 
@@ -658,9 +747,14 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace (str): The Namespace where the Workload is running.
                 workload_name (str): The name of the Workload.
                 kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_workload_id(
+                return ai_service.submit_generation(
+                    ai_service.post_workload_id,
+                    WorkloadId,
                     cluster_name,
                     namespace,
                     workload_name,
@@ -739,7 +833,7 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace: str = Query(..., description="The Namespace"),
                 workload_name: str = Query(..., description="The Workload name"),
                 kind: WorkloadKind = Query(..., description="The Workload kind"),
-        ):
+        ) -> Job:
             """
             Generate Workload Essentials.
 
@@ -748,9 +842,14 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace (str): The Namespace where the Workload is running.
                 workload_name (str): The Workload name.
                 kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_workload_essentials(
+                return ai_service.submit_generation(
+                    ai_service.post_workload_essentials,
+                    WorkloadEssentials,
                     cluster_name,
                     namespace,
                     workload_name,
@@ -829,7 +928,7 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace: str = Query(..., description="The Namespace"),
                 workload_name: str = Query(..., description="The Workload name"),
                 kind: WorkloadKind = Query(..., description="The Workload kind"),
-        ):
+        ) -> Job:
             """
             Generate Workload Summary.
 
@@ -838,9 +937,14 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace (str): The Namespace where the Workload is running.
                 workload_name (str): The Workload name.
                 kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_workload_summary(
+                return ai_service.submit_generation(
+                    ai_service.post_workload_summary,
+                    WorkloadSummary,
                     cluster_name,
                     namespace,
                     workload_name,
@@ -919,7 +1023,7 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace: str = Query(..., description="The Namespace"),
                 workload_name: str = Query(..., description="The Workload name"),
                 kind: WorkloadKind = Query(..., description="The Workload kind"),
-        ):
+        ) -> Job:
             """
             Generate Workload Advanced.
 
@@ -928,9 +1032,14 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace (str): The Namespace where the Workload is running.
                 workload_name (str): The Workload name.
                 kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_workload_advanced(
+                return ai_service.submit_generation(
+                    ai_service.post_workload_advanced,
+                    WorkloadAdvanced,
                     cluster_name,
                     namespace,
                     workload_name,
@@ -1009,7 +1118,7 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace: str = Query(..., description="The Namespace"),
                 workload_name: str = Query(..., description="The Workload name"),
                 kind: WorkloadKind = Query(..., description="The Workload kind"),
-        ):
+        ) -> Job:
             """
             Generate Workload Scores.
 
@@ -1018,9 +1127,14 @@ class AIController:  # pylint: disable=R0914, R0915, R0903
                 namespace (str): The Namespace where the Workload is running.
                 workload_name (str): The Workload name.
                 kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+
+            Returns:
+                Job: The background job performing the generation.
             """
             try:
-                ai_service.post_workload_scores(
+                return ai_service.submit_generation(
+                    ai_service.post_workload_scores,
+                    WorkloadScores,
                     cluster_name,
                     namespace,
                     workload_name,
@@ -17,44 +17,60 @@
 Module that handles the GenAI operations.
 """
 
-import io
+import asyncio
+import contextvars
 import logging
 import os
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import openai
 import yaml
 from fastapi import HTTPException, UploadFile, WebSocket
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from kubernetes import config
 from langfuse.callback import CallbackHandler
 
 from fred.application_context import get_app_context, get_configuration
+from fred.services.ai.audio_cache import AudioCache, speech_key
 from fred.services.ai.structure.cluster_context import ClusterContext
 from fred.services.ai.structure.cluster_summary import ClusterSummary
 from fred.services.ai.structure.cluster_topology import ClusterTopology
+from fred.services.ai.structure.context_report import ContextTokensReport, WorkloadContextTokens
 from fred.services.ai.structure.facts import Fact, Facts
 from fred.services.ai.structure.ingress_essentials import IngressesEssentials
 from fred.services.ai.structure.namespace_context import NamespaceContext
 from fred.services.ai.structure.namespace_summary import NamespaceSummary
 from fred.services.ai.structure.namespace_topology import NamespaceTopology
+from fred.services.ai.structure.scores_report import ScoresHeuristicsReport, WorkloadPrescores
 from fred.services.ai.structure.service_essentials import ServicesEssentials
 from fred.services.ai.structure.workload_advanced import WorkloadAdvanced
 from fred.services.ai.structure.workload_context import WorkloadContext
 from fred.services.ai.structure.workload_essentials import WorkloadEssentials
 from fred.services.ai.structure.workload_id import WorkloadId
 from fred.services.ai.structure.workload_scores import WorkloadScores
+from fred.services.ai.structure.workload_scores.heuristics import SCORE_TYPES, prescore_workload
 from fred.services.ai.structure.workload_summary import WorkloadSummary
 from fred.services.ai.structure.workload_topology import WorkloadTopology
+from fred.services.ai.topology_store import TopologyStore, TopologyWatcher
 from fred.services.kube.kube_service import KubeService
 from fred.services.kube.structure import WorkloadKind
 from fred.common.connectors.file_dao import FileDAO
 from fred.common.error import UnavailableError
 from fred.common.structure import Configuration, DAOTypeEnum
+from fred.common.token_utils import count_tokens
+from fred.batch_generation import BatchSession, current_batch_session
+from fred.jobs.job_service import JobContext, get_job_service
+from fred.jobs.structure import Job
 
 # 🔹 Create a module-level logger
 logger = logging.getLogger(__name__)
 
+# Part of the progress of a bulk generation covered by the batched Workload Ids and Essentials,
+# which are 2 of the 5 artifacts generated per workload.
+BATCHED_PROGRESS_SHARE = 0.4
+
 class AIService:  # pylint: disable=R0904
     """
     Service to handle GenAI operations.
@@ -88,70 +104,316 @@ class AIService:  # pylint: disable=R0904
 
         self.kube_service = kube_service
         self.langfuse_handler = langfuse_handler
+        self.job_service = get_job_service()
+        topology = self.configuration.ai.topology
+        self.topology_store = TopologyStore(None if topology.watch else topology.max_age_seconds)
+        self.topology_watcher = TopologyWatcher(
+            self.topology_store,
+            self.kube_service.connected_client.get_watch_list_functions,
+            self.configuration.ai.topology.watch_timeout_seconds,
+            self.kube_service.forget_changed_object,
+        )
+        speech = self.configuration.ai.speech
+        self.audio_cache = AudioCache(
+            speech.cache_path, speech.cache_max_size_mb * 1024 * 1024, speech.response_format
+        )
+        self._openai_client: Optional[openai.AsyncOpenAI] = None
         config.load_kube_config(self.configuration.kubernetes.kube_config)
 
-    def generate_all_resources(self, cluster_name: str):
+    def generate_all_resources(
+        self,
+        cluster_name: str,
+        job_context: Optional[JobContext] = None,
+    ):
         """
         Generate all the GenAI resources for a cluster.
 
         Args:
             cluster_name (str): The name of the cluster.
+            job_context (Optional[JobContext]): When run as a background job, used to
+                report the progress and to stop as soon as a cancellation is requested.
         """
-        namespaces_list = self.kube_service.get_namespaces_list(cluster_name)
+        workloads = self._list_cluster_workloads(cluster_name)
 
-        for namespace in namespaces_list.namespaces:
-            for workload_kind in WorkloadKind:
-                workload_names = self.kube_service.get_workload_names_list(
+        if self.configuration.ai.provider_batch.enabled:
+            self._generate_with_batch_api(cluster_name, workloads, job_context)
+            return
+
+        batched = self.configuration.ai.batch_generation.enabled
+        progress_start = 0.0
+        if batched:
+            progress_start = BATCHED_PROGRESS_SHARE
+            self.post_workloads_batched(
+                cluster_name, workloads, job_context=job_context, progress_range=(0.0, progress_start)
+            )
+
+        for index, (namespace, workload_kind, workload) in enumerate(workloads):
+            if job_context:
+                job_context.raise_if_cancelled()
+
+            if not batched:
+                self.post_workload_id(
                     cluster_name,
                     namespace,
+                    workload,
                     workload_kind,
-                ).workloads
+                )
 
-                for workload in workload_names:
-                    self.post_workload_id(
-                        cluster_name,
-                        namespace,
-                        workload,
-                        workload_kind,
-                    )
+                self.post_workload_essentials(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
 
-                    self.post_workload_essentials(
-                        cluster_name,
-                        namespace,
-                        workload,
-                        workload_kind,
-                    )
+            self.post_workload_summary(
+                cluster_name,
+                namespace,
+                workload,
+                workload_kind,
+            )
 
-                    self.post_workload_summary(
-                        cluster_name,
-                        namespace,
-                        workload,
-                        workload_kind,
-                    )
+            self.post_workload_advanced(
+                cluster_name,
+                namespace,
+                workload,
+                workload_kind,
+            )
 
-                    self.post_workload_advanced(
-                        cluster_name,
-                        namespace,
-                        workload,
-                        workload_kind,
-                    )
+            self.post_workload_scores(
+                cluster_name,
+                namespace,
+                workload,
+                workload_kind,
+            )
 
-                    self.post_workload_scores(
-                        cluster_name,
-                        namespace,
-                        workload,
-                        workload_kind,
-                    )
+            if job_context:
+                job_context.report_progress(
+                    progress_start + (1 - progress_start) * (index + 1) / len(workloads),
+                    f"{workload_kind.value} '{workload}' in namespace '{namespace}' processed",
+                )
+
+    def _generate_with_batch_api(
+        self,
+        cluster_name: str,
+        workloads: List[Tuple[str, WorkloadKind, str]],
+        job_context: Optional[JobContext] = None,
+    ):
+        """
+        Generate the workload resources of a cluster through the batch API of the model providers.
+
+        The generations run in two rounds, since the Workload Advanced depend on the Workload Ids.
+        In each round, the requests of every generation are recorded, submitted as batches, and
+        the generations are replayed with the results, which stores them. The generations whose
+        requests cannot be batched (unsupported provider) or failed are run with synchronous calls.
+
+        Args:
+            cluster_name (str): The name of the cluster.
+            workloads (List[Tuple[str, WorkloadKind, str]]): The (namespace, kind, name) of the workloads.
+            job_context (Optional[JobContext]): When run as a background job, used to
+                report the progress and to stop as soon as a cancellation is requested.
+        """
+        settings = self.configuration.ai.provider_batch
+        rounds = [
+            [
+                (WorkloadId, self.post_workload_id),
+                (WorkloadEssentials, self.post_workload_essentials),
+                (WorkloadSummary, self.post_workload_summary),
+                (WorkloadScores, self.post_workload_scores),
+            ],
+            [(WorkloadAdvanced, self.post_workload_advanced)],
+        ]
+        checkpoint = job_context.raise_if_cancelled if job_context else None
+
+        for round_index, posts in enumerate(rounds):
+            session = BatchSession(settings.poll_interval_seconds, settings.timeout_seconds,
+                                   settings.completion_window)
+            generations = [
+                (self._artifact_key(artifact, cluster_name, namespace, name, kind), post,
+                 (cluster_name, namespace, name, kind))
+                for namespace, kind, name in workloads
+                for artifact, post in posts
+            ]
+            synchronous = []
+            batched = []
+            for key, post, args in generations:
+                try:
+                    with session.record(key):
+                        post(*args)
+                    batched.append((key, post, args))
+                except Exception as e:  # pylint: disable=W0718
+                    logger.info(f"Generation '{key}' cannot be batched, it will be run synchronously: {e}")
+                    synchronous.append((key, post, args))
+
+            if session.request_count:
+                session.execute(checkpoint)
+
+            for key, post, args in batched:
+                try:
+                    with session.replay(key):
+                        post(*args)
+                except Exception as e:  # pylint: disable=W0718
+                    logger.warning(f"Batched generation '{key}' failed, running it synchronously: {e}")
+                    synchronous.append((key, post, args))
+
+            for _, post, args in synchronous:
+                if job_context:
+                    job_context.raise_if_cancelled()
+                post(*args)
+
+            if job_context:
+                job_context.report_progress(
+                    (round_index + 1) / len(rounds),
+                    f"{len(batched)} generations batched, {len(synchronous)} run synchronously",
+                )
 
-    def generate_missing_resources(self, cluster_name: str):
+    def generate_missing_resources(
+        self,
+        cluster_name: str,
+        job_context: Optional[JobContext] = None,
+    ):
         """
         Generate missing GenAI resources for a cluster.
 
         Args:
             cluster_name (str): The name of the cluster.
+            job_context (Optional[JobContext]): When run as a background job, used to
+                report the progress and to stop as soon as a cancellation is requested.
         """
-        namespaces_list = self.kube_service.get_namespaces_list(cluster_name)
+        workloads = self._list_cluster_workloads(cluster_name)
+
+        progress_start = 0.0
+        if self.configuration.ai.batch_generation.enabled:
+            progress_start = BATCHED_PROGRESS_SHARE
+            self.post_workloads_batched(
+                cluster_name,
+                workloads,
+                missing_only=True,
+                job_context=job_context,
+                progress_range=(0.0, progress_start),
+            )
+
+        for index, (namespace, workload_kind, workload) in enumerate(workloads):
+            if job_context:
+                job_context.raise_if_cancelled()
+
+            try:
+                self.get_workload_id(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+                logger.info(
+                    "Workload ID for %s '%s' in namespace '%s' already exists",
+                    workload_kind.value,
+                    workload,
+                    namespace,
+                )
+            except Exception:  # pylint: disable=W0718
+                self.post_workload_id(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+
+            try:
+                self.get_workload_essentials(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+                logger.info(
+                    "Workload Essentials for %s '%s' in namespace '%s' already exists",
+                    workload_kind.value,
+                    workload,
+                    namespace,
+                )
+            except Exception:  # pylint: disable=W0718
+                self.post_workload_essentials(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+
+            try:
+                self.get_workload_summary(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+                logger.info(
+                    "Workload Summary for %s '%s' in namespace '%s' already exists",
+                    workload_kind.value,
+                    workload,
+                    namespace,
+                )
+            except Exception:  # pylint: disable=W0718
+                self.post_workload_summary(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+
+            try:
+                self.get_workload_advanced(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+                logger.info(
+                    "Workload Advanced for %s '%s' in namespace '%s' already exists",
+                    workload_kind.value,
+                    workload,
+                    namespace,
+                )
+            except Exception:  # pylint: disable=W0718
+                self.post_workload_advanced(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+
+            try:
+                self.get_workload_scores(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+                logger.info(
+                    "Workload Scores for %s '%s' in namespace '%s' already exists",
+                    workload_kind.value,
+                    workload,
+                    namespace,
+                )
+            except Exception:  # pylint: disable=W0718
+                self.post_workload_scores(
+                    cluster_name,
+                    namespace,
+                    workload,
+                    workload_kind,
+                )
+
+            if job_context:
+                job_context.report_progress(
+                    progress_start + (1 - progress_start) * (index + 1) / len(workloads),
+                    f"{workload_kind.value} '{workload}' in namespace '{namespace}' processed",
+                )
 
+    def _list_cluster_workloads(self, cluster_name: str) -> List[Tuple[str, WorkloadKind, str]]:
+        """
+        List every (namespace, workload kind, workload name) of a cluster.
+        """
+        workloads = []
+        namespaces_list = self.kube_service.get_namespaces_list(cluster_name)
         for namespace in namespaces_list.namespaces:
             for workload_kind in WorkloadKind:
                 workload_names = self.kube_service.get_workload_names_list(
@@ -159,112 +421,245 @@ class AIService:  # pylint: disable=R0904
                     namespace,
                     workload_kind,
                 ).workloads
+                workloads.extend((namespace, workload_kind, workload) for workload in workload_names)
+        return workloads
+
+    def post_workloads_batched(  # pylint: disable=R0913, R0917
+        self,
+        cluster_name: str,
+        workloads: List[Tuple[str, WorkloadKind, str]],
+        missing_only: bool = False,
+        job_context: Optional[JobContext] = None,
+        progress_range: Tuple[float, float] = (0.0, 1.0),
+    ):
+        """
+        Generate and store the Workload Ids and Essentials of several workloads, packing the
+        small workloads of each Namespace into batched calls to cut the per-call overhead.
+
+        Workloads larger than `small_workload_max_tokens`, and the workloads of a batch whose
+        response cannot be parsed, are generated by single calls.
+
+        Args:
+            cluster_name (str): The Cluster name.
+            workloads (List[Tuple[str, WorkloadKind, str]]): The (namespace, kind, name) of the workloads.
+            missing_only (bool): Whether only the artifacts missing from the storage are generated.
+            job_context (Optional[JobContext]): When run as a background job, used to
+                report the progress and to stop as soon as a cancellation is requested.
+            progress_range (Tuple[float, float]): The part of the job progress covered by
+                these generations.
+        """
+        generations = (
+            (WorkloadId, WorkloadId.from_workload_contexts, self.post_workload_id),
+            (WorkloadEssentials, WorkloadEssentials.from_workload_definitions, self.post_workload_essentials),
+        )
+        start, end = progress_range
+        step = (end - start) / len(generations)
+        for index, (artifact, generate_batch, post) in enumerate(generations):
+            pending = [
+                (namespace, workload_kind, workload_name)
+                for namespace, workload_kind, workload_name in workloads
+                if not missing_only
+                or not self._is_cached(artifact, cluster_name, namespace, workload_kind, workload_name)
+            ]
+            self._post_batched(
+                cluster_name,
+                pending,
+                artifact,
+                generate_batch,
+                post,
+                job_context,
+                (start + index * step, start + (index + 1) * step),
+            )
+
+    def _post_batched(  # pylint: disable=R0913, R0917, R0914
+        self,
+        cluster_name: str,
+        workloads: List[Tuple[str, WorkloadKind, str]],
+        artifact: type,
+        generate_batch: Callable[..., Dict[str, Any]],
+        post: Callable[..., None],
+        job_context: Optional[JobContext] = None,
+        progress_range: Tuple[float, float] = (0.0, 1.0),
+    ):
+        settings = self.configuration.ai.batch_generation
+        singles = []
+        candidates: Dict[str, List[Tuple[WorkloadKind, str, Any, int]]] = {}
+
+        for namespace, workload_kind, workload_name in workloads:
+            if job_context:
+                job_context.raise_if_cancelled()
+
+            # The prompt inputs are the ones of the single calls, so that a workload gets the
+            # same artifact whether it is batched or not.
+            if artifact is WorkloadId:
+                prompt_input = self._get_workload_context(
+                    cluster_name, namespace, workload_name, workload_kind, "WorkloadId"
+                )
+                tokens = prompt_input.tokens
+            else:
+                prompt_input = self._get_workload_definition(
+                    cluster_name, namespace, workload_name, workload_kind
+                )
+                tokens = count_tokens(prompt_input, self.configuration.ai.workload_context.tokenizer_model)
 
-                for workload in workload_names:
-                    try:
-                        self.get_workload_id(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-                        logger.info(
-                            "Workload ID for %s '%s' in namespace '%s' already exists",
-                            workload_kind.value,
-                            workload,
-                            namespace,
-                        )
-                    except Exception:  # pylint: disable=W0718
-                        self.post_workload_id(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-
-                    try:
-                        self.get_workload_essentials(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-                        logger.info(
-                            "Workload Essentials for %s '%s' in namespace '%s' already exists",
-                            workload_kind.value,
-                            workload,
-                            namespace,
-                        )
-                    except Exception:  # pylint: disable=W0718
-                        self.post_workload_essentials(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-
-                    try:
-                        self.get_workload_summary(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-                        logger.info(
-                            "Workload Summary for %s '%s' in namespace '%s' already exists",
-                            workload_kind.value,
-                            workload,
-                            namespace,
-                        )
-                    except Exception:  # pylint: disable=W0718
-                        self.post_workload_summary(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-
-                    try:
-                        self.get_workload_advanced(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-                        logger.info(
-                            "Workload Advanced for %s '%s' in namespace '%s' already exists",
-                            workload_kind.value,
-                            workload,
-                            namespace,
-                        )
-                    except Exception:  # pylint: disable=W0718
-                        self.post_workload_advanced(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-
-                    try:
-                        self.get_workload_scores(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
-                        logger.info(
-                            "Workload Scores for %s '%s' in namespace '%s' already exists",
-                            workload_kind.value,
-                            workload,
-                            namespace,
-                        )
-                    except Exception:  # pylint: disable=W0718
-                        self.post_workload_scores(
-                            cluster_name,
-                            namespace,
-                            workload,
-                            workload_kind,
-                        )
+            if tokens > settings.small_workload_max_tokens:
+                singles.append((namespace, workload_kind, workload_name))
+            else:
+                candidates.setdefault(namespace, []).append((workload_kind, workload_name, prompt_input, tokens))
+
+        batches = []
+        for namespace, items in candidates.items():
+            for batch in self._pack_batches(items, settings.max_tokens, settings.max_workloads):
+                if len(batch) == 1:
+                    singles.append((namespace, batch[0][0], batch[0][1]))
+                else:
+                    batches.append((namespace, batch))
+
+        start, end = progress_range
+        done = 0
+
+        def report_progress(message: str):
+            nonlocal done
+            done += 1
+            if job_context:
+                # The singles grow with the batches falling back to single calls.
+                job_context.report_progress(start + (end - start) * done / (len(batches) + len(singles)), message)
+
+        for namespace, batch in batches:
+            if job_context:
+                job_context.raise_if_cancelled()
+
+            logger.info(
+                "Trying to generate %s for %d workloads of Namespace '%s' in a single call",
+                artifact.__name__,
+                len(batch),
+                namespace,
+            )
+            try:
+                results = generate_batch(
+                    {workload_name: prompt_input for _, workload_name, prompt_input, _ in batch},
+                    self.langfuse_handler,
+                )
+            except Exception as e:  # pylint: disable=W0718
+                logger.warning(
+                    "Batched generation of %s failed for Namespace '%s', falling back to "
+                    "single calls: %s",
+                    artifact.__name__,
+                    namespace,
+                    e,
+                )
+                singles.extend(
+                    (namespace, workload_kind, workload_name)
+                    for workload_kind, workload_name, _, _ in batch
+                )
+                report_progress(f"{artifact.__name__} batch of namespace '{namespace}' deferred to single calls")
+                continue
+
+            for workload_kind, workload_name, _, _ in batch:
+                self.dao.saveCache(
+                    results[workload_name], cluster_name, namespace, workload_kind, workload_name
+                )
+                self.topology_store.invalidate_workload(
+                    cluster_name, namespace, workload_kind, workload_name
+                )
+
+            report_progress(f"{artifact.__name__} of {len(batch)} workloads in namespace '{namespace}' generated")
+
+        for namespace, workload_kind, workload_name in singles:
+            if job_context:
+                job_context.raise_if_cancelled()
+            post(cluster_name, namespace, workload_name, workload_kind)
+            report_progress(f"{artifact.__name__} of {workload_kind.value} '{workload_name}' generated")
+
+    @staticmethod
+    def _pack_batches(items: List[Tuple[WorkloadKind, str, Any, int]], max_tokens: int,
+                      max_items: int) -> List[List[Tuple[WorkloadKind, str, Any, int]]]:
+        """
+        Pack (kind, name, prompt input, tokens) items into batches of at most `max_items` items
+        and `max_tokens` tokens. Batches are keyed by workload name, so two workloads sharing
+        a name never share a batch.
+        """
+        batches, current, current_tokens = [], [], 0
+        for item in items:
+            if current and (
+                current_tokens + item[3] > max_tokens
+                or len(current) >= max_items
+                or any(other[1] == item[1] for other in current)
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += item[3]
+        if current:
+            batches.append(current)
+        return batches
+
+    def _is_cached(self, artifact: type, *keys) -> bool:
+        try:
+            self.dao.loadCacheItem(artifact, *keys)
+            return True
+        except Exception:  # pylint: disable=W0718
+            return False
+
+    @staticmethod
+    def _artifact_key(artifact: type, *args) -> str:
+        """
+        Build the key identifying a generated artifact, e.g.
+        'WorkloadSummary:cluster/namespace/name/Deployment'.
+        """
+        return f"{artifact.__name__}:" + "/".join(str(getattr(arg, "value", arg)) for arg in args)
+
+    def _save_generated(self, obj: Any, *args) -> None:
+        """
+        Store a generated artifact, unless the generation only records its requests for a
+        batch of the model provider, in which case the artifact is a placeholder.
+        """
+        batch_session = current_batch_session.get()
+        if batch_session is not None and batch_session.recording:
+            return
+        self.dao.saveCache(obj, *args)
+
+    def _generate_once(self, post: Callable[..., None], artifact: type, *args) -> None:
+        """
+        Run a generation method and wait for it, joining the generation already in
+        progress for the same artifact if any, so that concurrent cache misses trigger
+        a single LLM call.
+        """
+        self.job_service.run(self._artifact_key(artifact, *args), post.__name__, lambda _: post(*args))
+
+    def submit_generation(self, post: Callable[..., None], artifact: type, *args) -> Job:
+        """
+        Submit a generation method as a background job, deduplicated by artifact.
+
+        Args:
+            post (Callable[..., None]): The generation method, e.g. self.post_workload_summary.
+            artifact (type): The generated structure, e.g. WorkloadSummary.
+            *args: The arguments of the generation method.
+
+        Returns:
+            Job: The submitted (or already active) job.
+        """
+        return self.job_service.submit(self._artifact_key(artifact, *args), post.__name__, lambda _: post(*args))
+
+    def submit_all_resources(self, cluster_name: str) -> Job:
+        """
+        Submit the generation of all the GenAI resources of a cluster as a background job.
+        """
+        return self.job_service.submit(
+            f"AllResources:{cluster_name}",
+            "generate_all_resources",
+            lambda job_context: self.generate_all_resources(cluster_name, job_context),
+        )
+
+    def submit_missing_resources(self, cluster_name: str) -> Job:
+        """
+        Submit the generation of the missing GenAI resources of a cluster as a background job.
+        """
+        return self.job_service.submit(
+            f"MissingResources:{cluster_name}",
+            "generate_missing_resources",
+            lambda job_context: self.generate_missing_resources(cluster_name, job_context),
+        )
 
     def _get_cluster_context(
         self,
@@ -305,6 +700,7 @@ class AIService:  # pylint: disable=R0904
         cluster_facts.facts.append(fact)
 
         self.dao.save(cluster_facts, cluster_name)
+        self.topology_store.invalidate_cluster(cluster_name)
         logger.info(
             "Updated Cluster Facts for Cluster '%s' in storage",
             cluster_name,
@@ -327,6 +723,7 @@ class AIService:  # pylint: disable=R0904
         try:
             cluster_facts.facts.remove(fact)
             self.dao.save(cluster_facts, cluster_name)
+            self.topology_store.invalidate_cluster(cluster_name)
             logger.info(
                 "Removed Fact from Cluster '%s' in storage",
                 cluster_name,
@@ -399,7 +796,7 @@ class AIService:  # pylint: disable=R0904
             )
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
-        self.post_cluster_summary(cluster_name)
+        self._generate_once(self.post_cluster_summary, ClusterSummary, cluster_name)
         return self.dao.loadCacheItem(ClusterSummary, cluster_name)
 
     def post_cluster_summary(
@@ -409,32 +806,112 @@ class AIService:  # pylint: disable=R0904
         """
         Generate and store the Cluster Summary.
 
+        The summary is built hierarchically: the Namespace Summaries are retrieved (or
+        generated) first, then reduced by groups of at most `fan_in` summaries until they
+        can be merged into the Cluster Summary. Existing Namespace Summaries are reused, the
+        Namespaces whose summary fails are left out.
+
         Args:
             cluster_name (str): The Cluster name.
+
+        Raises:
+            ValueError: If no Namespace Summary is available, e.g. the Cluster has no Namespace.
         """
-        cluster_context = self._get_cluster_context(cluster_name)
+        settings = self.configuration.ai.cluster_summary
+        namespaces = self.kube_service.get_namespaces_list(cluster_name).namespaces
 
         logger.info(
-            "Trying to generate Cluster Summary for Cluster '%s'",
+            "Trying to generate Cluster Summary for Cluster '%s' from %d Namespace Summaries",
             cluster_name,
-        )
-        cluster_summary = ClusterSummary.from_cluster_context(
-            cluster_context,
+            len(namespaces),
+        )
+        def namespace_summary(namespace: str) -> Optional[str]:
+            try:
+                return f"namespace: {namespace}\n\n{self.get_namespace_summary(cluster_name, namespace)}"
+            except UnavailableError:
+                raise
+            except Exception as e:  # pylint: disable=W0718
+                logger.warning(
+                    "Leaving Namespace '%s' out of the Cluster Summary of Cluster '%s': %s",
+                    namespace,
+                    cluster_name,
+                    e,
+                )
+                return None
+
+        summaries = [
+            summary
+            for summary in self._map_concurrently(namespace_summary, namespaces, settings.max_concurrency)
+            if summary is not None
+        ]
+        if not summaries:
+            raise ValueError(
+                f"Cannot generate the Cluster Summary of Cluster '{cluster_name}': "
+                f"no Namespace Summary is available out of {len(namespaces)} Namespaces"
+            )
+
+        while len(summaries) > settings.fan_in:
+            groups = [
+                summaries[index:index + settings.fan_in]
+                for index in range(0, len(summaries), settings.fan_in)
+            ]
+            logger.info(
+                "Reducing %d summaries into %d partial summaries for Cluster '%s'",
+                len(summaries),
+                len(groups),
+                cluster_name,
+            )
+            summaries = self._map_concurrently(
+                lambda group: group[0] if len(group) == 1 else str(
+                    ClusterSummary.from_summaries(
+                        cluster_name, group, self.langfuse_handler, partial=True
+                    )
+                ),
+                groups,
+                settings.max_concurrency,
+            )
+
+        cluster_summary = ClusterSummary.from_summaries(
+            cluster_name,
+            summaries,
             self.langfuse_handler,
         )
 
         self.dao.saveCache(cluster_summary, cluster_name)
+        self.topology_store.invalidate_cluster(cluster_name)
         logger.info(
             "Generated and stored new Cluster Summary for Cluster '%s'",
             cluster_name,
         )
 
+    @staticmethod
+    def _map_concurrently(func: Callable[[Any], Any], items: List[Any], max_concurrency: int) -> List[Any]:
+        """
+        Apply a function to every item on at most `max_concurrency` threads, keeping the
+        order of the items. The context is propagated so that generations started from a
+        background job join it instead of waiting for a free worker.
+        """
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+            return [future.result() for future in futures]
+
+    def _watch_topology(self, cluster_name: str):
+        """
+        Watch the changes of a Cluster before serving its topologies, if enabled.
+        """
+        if self.configuration.ai.topology.watch:
+            self.topology_watcher.watch(cluster_name)
+
     def get_cluster_topology(
         self,
         cluster_name: str,
     ) -> ClusterTopology:
         """
-        Retrieve the Cluster Topology.
+        Retrieve the Cluster Topology. It is built once, then served from the topology store
+        until a change in the Cluster invalidates it, or until it expires when the Cluster is
+        not watched.
 
         Args:
             cluster_name (str): The Cluster name.
@@ -442,17 +919,27 @@ class AIService:  # pylint: disable=R0904
         Returns:
             ClusterTopology: The Cluster Topology.
         """
+        self._watch_topology(cluster_name)
+
+        cluster_topology = self.topology_store.get_cluster(cluster_name)
+        if cluster_topology is not None:
+            return cluster_topology
+
+        generation = self.topology_store.generation(cluster_name)
+
         cluster_context = self._get_cluster_context(cluster_name)
 
         cluster_summary = self.get_cluster_summary(cluster_name)
 
         cluster_facts = self.get_cluster_facts(cluster_name)
 
-        return ClusterTopology(
+        cluster_topology = ClusterTopology(
             cluster_context=cluster_context,
             cluster_summary=cluster_summary,
             facts=cluster_facts,
         )
+        self.topology_store.put_cluster(cluster_name, cluster_topology, generation)
+        return cluster_topology
 
     def _get_namespace_context(
         self,
@@ -534,6 +1021,7 @@ class AIService:  # pylint: disable=R0904
         namespace_facts.facts.append(fact)
 
         self.dao.save(namespace_facts, cluster_name, namespace)
+        self.topology_store.invalidate_namespace(cluster_name, namespace)
         logger.info(
             "Updated Namespace Facts for Namespace '%s' in storage",
             namespace,
@@ -558,6 +1046,7 @@ class AIService:  # pylint: disable=R0904
         try:
             namespace_facts.facts.remove(fact)
             self.dao.save(namespace_facts, cluster_name, namespace)
+            self.topology_store.invalidate_namespace(cluster_name, namespace)
             logger.info(
                 "Removed Fact from Namespace '%s' in storage",
                 namespace,
@@ -636,7 +1125,9 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_namespace_summary(
+        self._generate_once(
+            self.post_namespace_summary,
+            NamespaceSummary,
             cluster_name,
             namespace,
         )
@@ -669,6 +1160,7 @@ class AIService:  # pylint: disable=R0904
         )
 
         self.dao.saveCache(namespace_summary, cluster_name, namespace)
+        self.topology_store.invalidate_namespace(cluster_name, namespace)
         logger.info(
             "Generated and stored new Namespace Summary for Namespace '%s'",
             namespace,
@@ -689,6 +1181,14 @@ class AIService:  # pylint: disable=R0904
         Returns:
             NamespaceTopology: The Namespace Topology.
         """
+        self._watch_topology(cluster_name)
+
+        namespace_topology = self.topology_store.get_namespace(cluster_name, namespace)
+        if namespace_topology is not None:
+            return namespace_topology
+
+        generation = self.topology_store.generation(cluster_name)
+
         namespace_context = self._get_namespace_context(
             cluster_name,
             namespace,
@@ -704,11 +1204,42 @@ class AIService:  # pylint: disable=R0904
             namespace,
         )
 
-        return NamespaceTopology(
+        namespace_topology = NamespaceTopology(
             namespace_context=namespace_context,
             namespace_summary=namespace_summary,
             facts=namespace_facts,
         )
+        self.topology_store.put_namespace(cluster_name, namespace, namespace_topology, generation)
+        return namespace_topology
+
+    def _get_workload_definition(
+        self,
+        cluster_name: str,
+        namespace: str,
+        workload_name: str,
+        workload_kind: WorkloadKind,
+    ) -> str:
+        """
+        Get the YAML definition of a Workload, from which its Essentials are generated.
+
+        Args:
+            cluster_name (str): The Cluster name.
+            namespace (str): The Namespace.
+            workload_name (str): The Workload name.
+            workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+        """
+        workload = self.kube_service.get_workload_description(
+            cluster_name,
+            namespace,
+            workload_name,
+            workload_kind,
+        ).object
+
+        return yaml.dump(
+            workload,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
 
     def _get_workload_context(
         self,
@@ -716,14 +1247,18 @@ class AIService:  # pylint: disable=R0904
         namespace: str,
         workload_name: str,
         workload_kind: WorkloadKind,
+        generator: Optional[str] = None,
     ) -> WorkloadContext:
         """
-        Get a Workload Context.
+        Get a Workload Context, pruned to fit in the token budget of the generator.
 
         Args:
             cluster_name (str): The Cluster name.
             namespace (str): The Namespace.
             workload_name (str): The Workload name.
+            workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
+            generator (Optional[str]): The structure generated from the context, e.g. 'WorkloadId',
+                used to select its token budget.
         """
         workload = self.kube_service.get_workload_description(
             cluster_name,
@@ -744,39 +1279,54 @@ class AIService:  # pylint: disable=R0904
             cluster_name, namespace, workload_name, workload_kind
         ).ingresses_list
 
-        workload_yaml = yaml.dump(
+        settings = self.configuration.ai.workload_context
+        workload_context = WorkloadContext.from_resources(
             workload,
-            default_flow_style=False,
-            allow_unicode=True,
-        )
-
-        configmaps_yaml = yaml.dump_all(
             configmaps,
-            default_flow_style=False,
-            allow_unicode=True,
-            explicit_start=True,
-        )
-
-        services_yaml = yaml.dump_all(
             services,
-            default_flow_style=False,
-            allow_unicode=True,
-            explicit_start=True,
-        )
-
-        ingresses_yaml = yaml.dump_all(
             ingresses,
-            default_flow_style=False,
-            allow_unicode=True,
-            explicit_start=True,
+            max_tokens=settings.generator_max_tokens.get(generator, settings.max_tokens),
+            max_configmap_value_tokens=settings.max_configmap_value_tokens,
+            model=settings.tokenizer_model,
         )
+        logger.debug(
+            "Workload Context for %s '%s' pruned from %s to %s tokens",
+            workload_kind.value,
+            workload_name,
+            workload_context.raw_tokens,
+            workload_context.tokens,
+        )
+        return workload_context
+
+    def get_context_tokens_report(self, cluster_name: str) -> ContextTokensReport:
+        """
+        Measure the tokens saved by the pruning of the workload contexts of a cluster.
+
+        Args:
+            cluster_name (str): The Cluster name.
 
-        return WorkloadContext(
-            workload_yaml=workload_yaml,
-            configmaps_yaml=configmaps_yaml,
-            services_yaml=services_yaml,
-            ingresses_yaml=ingresses_yaml,
+        Returns:
+            ContextTokensReport: The size of every workload context, before and after pruning.
+        """
+        report = ContextTokensReport(
+            cluster=cluster_name,
+            max_tokens=self.configuration.ai.workload_context.max_tokens,
         )
+        for namespace, workload_kind, workload_name in self._list_cluster_workloads(cluster_name):
+            workload_context = self._get_workload_context(
+                cluster_name, namespace, workload_name, workload_kind
+            )
+            report.workloads.append(
+                WorkloadContextTokens(
+                    namespace=namespace,
+                    kind=workload_kind,
+                    name=workload_name,
+                    raw_tokens=workload_context.raw_tokens,
+                    tokens=workload_context.tokens,
+                )
+            )
+        logger.info(str(report))
+        return report
 
     def get_workload_id(
         self,
@@ -815,7 +1365,10 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_id(cluster_name, namespace, workload_name, workload_kind)
+        self._generate_once(
+            self.post_workload_id, WorkloadId,
+            cluster_name, namespace, workload_name, workload_kind
+        )
         return self.dao.loadCacheItem(
             WorkloadId, cluster_name, namespace, workload_kind, workload_name
         )
@@ -837,7 +1390,7 @@ class AIService:  # pylint: disable=R0904
             workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
         """
         workload_context = self._get_workload_context(
-            cluster_name, namespace, workload_name, workload_kind
+            cluster_name, namespace, workload_name, workload_kind, "WorkloadId"
         )
 
         logger.info(
@@ -852,9 +1405,12 @@ class AIService:  # pylint: disable=R0904
             self.langfuse_handler,
         )
 
-        self.dao.saveCache(
+        self._save_generated(
             workload_id, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Successfully generated and stored new Workload Id for %s '%s' "
             "from Namespace '%s'",
@@ -907,7 +1463,8 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_essentials(
+        self._generate_once(
+            self.post_workload_essentials, WorkloadEssentials,
             cluster_name, namespace, workload_name, workload_kind
         )
         return self.dao.loadCacheItem(
@@ -930,17 +1487,8 @@ class AIService:  # pylint: disable=R0904
             workload_name (str): The Workload name.
             workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
         """
-        workload = self.kube_service.get_workload_description(
-            cluster_name,
-            namespace,
-            workload_name,
-            workload_kind,
-        ).object
-
-        workload_definition = yaml.dump(
-            workload,
-            default_flow_style=False,
-            allow_unicode=True,
+        workload_definition = self._get_workload_definition(
+            cluster_name, namespace, workload_name, workload_kind
         )
 
         logger.info(
@@ -955,9 +1503,12 @@ class AIService:  # pylint: disable=R0904
             self.langfuse_handler,
         )
 
-        self.dao.saveCache(
+        self._save_generated(
             workload_essentials, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Generated and stored new Workload Essentials for %s '%s' "
             "from Namespace '%s'",
@@ -1005,7 +1556,8 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_summary(
+        self._generate_once(
+            self.post_workload_summary, WorkloadSummary,
             cluster_name, namespace, workload_name, workload_kind
         )
         return self.dao.loadCacheItem(
@@ -1029,7 +1581,7 @@ class AIService:  # pylint: disable=R0904
             workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
         """
         workload_id = self._get_workload_context(
-            cluster_name, namespace, workload_name, workload_kind
+            cluster_name, namespace, workload_name, workload_kind, "WorkloadSummary"
         )
 
         logger.info(
@@ -1044,9 +1596,12 @@ class AIService:  # pylint: disable=R0904
             self.langfuse_handler,
         )
 
-        self.dao.saveCache(
+        self._save_generated(
             workload_summary, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Generated and stored new Workload Summary for %s '%s' "
             "from Namespace '%s'",
@@ -1094,7 +1649,8 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_advanced(
+        self._generate_once(
+            self.post_workload_advanced, WorkloadAdvanced,
             cluster_name, namespace, workload_name, workload_kind
         )
         return self.dao.loadCacheItem(
@@ -1122,7 +1678,7 @@ class AIService:  # pylint: disable=R0904
         )
 
         workload_context = self._get_workload_context(
-            cluster_name, namespace, workload_name, workload_kind
+            cluster_name, namespace, workload_name, workload_kind, "WorkloadAdvanced"
         )
 
         logger.info(
@@ -1138,7 +1694,7 @@ class AIService:  # pylint: disable=R0904
             self.langfuse_handler,
         )
 
-        self.dao.saveCache(
+        self._save_generated(
             workload_advanced, cluster_name, namespace, workload_kind, workload_name
         )
         logger.info(
@@ -1149,6 +1705,60 @@ class AIService:  # pylint: disable=R0904
             namespace,
         )
 
+    def _prescore_workload(
+        self,
+        cluster_name: str,
+        namespace: str,
+        workload_name: str,
+        workload_kind: WorkloadKind,
+    ) -> Dict[str, Any]:
+        """
+        Compute the Workload Scores that follow from the workload spec, without the LLM.
+
+        Returns:
+            Dict[str, Any]: The conclusive scores, keyed by `WorkloadScores` field.
+        """
+        workload = self.kube_service.get_workload_description(
+            cluster_name, namespace, workload_name, workload_kind
+        ).object
+
+        try:
+            autoscaled = bool(self.kube_service.get_workload_horizontal_pod_autoscalers(
+                cluster_name, namespace, workload_name, workload_kind
+            ).horizontal_pod_autoscalers_list)
+        except Exception as e:  # pylint: disable=W0718
+            # Without the autoscalers, the single replica rule is inconclusive.
+            logger.warning(
+                f"Failed to list the HorizontalPodAutoscalers of {workload_kind.value} '{workload_name}': {e}"
+            )
+            autoscaled = None
+
+        return prescore_workload(workload, workload_kind, autoscaled)
+
+    def get_scores_heuristics_report(self, cluster_name: str) -> ScoresHeuristicsReport:
+        """
+        Measure the score LLM calls avoided by the rule-based pre-scoring of the workloads of a cluster.
+
+        Args:
+            cluster_name (str): The Cluster name.
+
+        Returns:
+            ScoresHeuristicsReport: The scores computed by the rules for every workload.
+        """
+        report = ScoresHeuristicsReport(cluster=cluster_name)
+        for namespace, workload_kind, workload_name in self._list_cluster_workloads(cluster_name):
+            prescores = self._prescore_workload(cluster_name, namespace, workload_name, workload_kind)
+            report.workloads.append(
+                WorkloadPrescores(
+                    namespace=namespace,
+                    kind=workload_kind,
+                    name=workload_name,
+                    prescored=list(prescores),
+                )
+            )
+        logger.info(str(report))
+        return report
+
     def get_workload_scores(
         self,
         cluster_name: str,
@@ -1185,7 +1795,10 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_scores(cluster_name, namespace, workload_name, workload_kind)
+        self._generate_once(
+            self.post_workload_scores, WorkloadScores,
+            cluster_name, namespace, workload_name, workload_kind
+        )
         return self.dao.loadCacheItem(
             WorkloadScores, cluster_name, namespace, workload_kind, workload_name
         )
@@ -1207,19 +1820,25 @@ class AIService:  # pylint: disable=R0904
             workload_kind (WorkloadKind): The kind of Workload (Deployment, StatefulSet, etc.).
         """
         workload_context = self._get_workload_context(
-            cluster_name, namespace, workload_name, workload_kind
+            cluster_name, namespace, workload_name, workload_kind, "WorkloadScores"
         )
 
+        prescores = {}
+        if self.configuration.ai.score_heuristics.enabled:
+            prescores = self._prescore_workload(cluster_name, namespace, workload_name, workload_kind)
+
         logger.info(
-            f"Trying to generate Workload Scores for {workload_kind.value} '{workload_name}' from Namespace '{namespace}'"
+            f"Trying to generate Workload Scores for {workload_kind.value} '{workload_name}' from Namespace "
+            f"'{namespace}', {len(prescores)} of {len(SCORE_TYPES)} scores computed by the rules"
         )
 
         workload_scores = WorkloadScores.from_workload_context(
             workload_context,
             self.langfuse_handler,
+            prescores,
         )
 
-        self.dao.saveCache(
+        self._save_generated(
             workload_scores, cluster_name, namespace, workload_kind, workload_name
         )
         logger.info(
@@ -1269,7 +1888,8 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_services_essentials(
+        self._generate_once(
+            self.post_workload_services_essentials, ServicesEssentials,
             cluster_name, namespace, workload_name, workload_kind
         )
         return self.dao.loadCacheItem(
@@ -1319,6 +1939,9 @@ class AIService:  # pylint: disable=R0904
         self.dao.saveCache(
             services_essentials, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Generated and stored new Workload Services Essentials for %s '%s' "
             "from Namespace '%s'",
@@ -1370,7 +1993,8 @@ class AIService:  # pylint: disable=R0904
             if get_app_context().status.offline:
                 raise UnavailableError("AI client") from e
 
-        self.post_workload_ingresses_essentials(
+        self._generate_once(
+            self.post_workload_ingresses_essentials, IngressesEssentials,
             cluster_name, namespace, workload_name, workload_kind
         )
         return self.dao.loadCacheItem(
@@ -1420,6 +2044,9 @@ class AIService:  # pylint: disable=R0904
         self.dao.saveCache(
             ingresses_essentials, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Generated and stored new Workload Ingresses Essentials for %s '%s' "
             "from Namespace '%s'",
@@ -1447,6 +2074,16 @@ class AIService:  # pylint: disable=R0904
         Returns:
             WorkloadTopology: The Workload Topology.
         """
+        self._watch_topology(cluster_name)
+
+        workload_topology = self.topology_store.get_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
+        if workload_topology is not None:
+            return workload_topology
+
+        generation = self.topology_store.generation(cluster_name)
+
         workload_id = self.get_workload_id(
             cluster_name, namespace, workload_name, workload_kind
         )
@@ -1466,7 +2103,7 @@ class AIService:  # pylint: disable=R0904
             cluster_name, namespace, workload_name, workload_kind
         )
 
-        return WorkloadTopology(
+        workload_topology = WorkloadTopology(
             workload_id=workload_id,
             workload_essentials=workload_essential,
             workload_summary=workload_summary,
@@ -1474,6 +2111,10 @@ class AIService:  # pylint: disable=R0904
             ingresses_essentials=ingresses_essentials,
             facts=facts,
         )
+        self.topology_store.put_workload(
+            cluster_name, namespace, workload_kind, workload_name, workload_topology, generation
+        )
+        return workload_topology
 
     def put_workload_fact(  # pylint: disable=R0913, R0917
         self,
@@ -1530,6 +2171,9 @@ class AIService:  # pylint: disable=R0904
         self.dao.saveCache(
             workload_facts, cluster_name, namespace, workload_kind, workload_name
         )
+        self.topology_store.invalidate_workload(
+            cluster_name, namespace, workload_kind, workload_name
+        )
         logger.info(
             "Updated Workload Facts for Namespace '%s' in storage",
             namespace,
@@ -1565,6 +2209,9 @@ class AIService:  # pylint: disable=R0904
             self.dao.saveCache(
                 workload_facts, cluster_name, namespace, workload_kind, workload_name
             )
+            self.topology_store.invalidate_workload(
+                cluster_name, namespace, workload_kind, workload_name
+            )
             logger.info(
                 "Removed Fact from Namespace '%s' in storage",
                 namespace,
@@ -1614,88 +2261,98 @@ class AIService:  # pylint: disable=R0904
             )
             return Facts(facts=[])
 
+    def _get_openai_client(self) -> openai.AsyncOpenAI:
+        """
+        Return the asynchronous OpenAI client of the speech models, created on first use.
+        """
+        if self._openai_client is None:
+            try:
+                self._openai_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            except Exception as e:  # pylint: disable=W0718
+                logger.error("OpenAI API key not found for speech models: %s", e)
+                if get_app_context().status.offline:
+                    raise UnavailableError("AI client") from e
+                raise HTTPException(
+                    status_code=500, detail="Internal server error."
+                ) from e
+        return self._openai_client
+
     async def get_transcribe(self, file: UploadFile) -> Dict[str, str]:
         """
         Get the transcription of an audio file.
 
+        The upload is streamed to the provider from its spooled file, without reading it
+        into memory.
+
         Args:
             file (UploadFile): The audio file to transcribe.
 
         Returns:
             str: The transcription of the audio file.
         """
+        client = self._get_openai_client()
+        speech = self.configuration.ai.speech
         try:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-        except Exception as e:
-            logger.error(
-                "OpenAI API key not found for transcribe generation: %s", e
-            )
-
-            if get_app_context().status.offline:
-                raise UnavailableError("AI client") from e
-            else:
-                raise HTTPException(
-                    status_code=500, detail="Internal server error."
-                ) from e
-
-        try:
-            audio_bytes = await file.read()
-            audio_file = io.BytesIO(audio_bytes)
-            audio_file.name = file.filename
-
-            transcript = openai.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="en",
+            await file.seek(0)
+            transcript = await client.audio.transcriptions.create(
+                model=speech.stt_model,
+                file=(file.filename, file.file),
+                language=speech.language,
             )
 
             return {"text": transcript.text}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e)) from e
 
-    async def get_speech(self, text: str) -> StreamingResponse:
+    async def get_speech(self, text: str) -> Response:
         """
         Get the speech of a text.
 
+        The speech is streamed to the client as it is synthesized, and stored in the audio
+        cache: the speech of a text already synthesized is served from the cache.
+
         Args:
             text (str): The text to convert to speech.
 
         Returns:
-            StreamingResponse: The speech of the text as an audio stream.
+            Response: The speech of the text as an audio stream.
         """
-        try:
-            # Load the OpenAI API key
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-        except Exception as e:  # pylint: disable=W0718
-            logger.error("OpenAI API key not found for speech generation: %s", e)
-            if get_app_context().status.offline:
-                raise UnavailableError("AI client") from e
-            else:
-                raise HTTPException(
-                    status_code=500, detail="Internal server error."
-                ) from e
-        try:
-            response = openai.audio.speech.create(
-                model="tts-1",
-                voice="alloy",
-                input=text,
-            )
-
-            audio_bytes_io = io.BytesIO()
-
-            for chunk in response.iter_bytes():
-                audio_bytes_io.write(chunk)
+        speech = self.configuration.ai.speech
+        media_type = f"audio/{'mpeg' if speech.response_format == 'mp3' else speech.response_format}"
+        headers = {"Content-Disposition": f"attachment; filename=output.{speech.response_format}"}
+        key = speech_key(text, speech.tts_model, speech.voice, speech.response_format)
 
-            audio_bytes_io.seek(0)
+        cached = self.audio_cache.get(key)
+        if cached is not None:
+            logger.info("Speech served from the audio cache: %s", key)
+            return FileResponse(cached, media_type=media_type, headers=headers)
 
-            return StreamingResponse(
-                audio_bytes_io,
-                media_type="audio/mpeg",
-                headers={"Content-Disposition": "attachment; filename=output.mp3"},
+        client = self._get_openai_client()
+        stack = AsyncExitStack()
+        try:
+            # The request is sent before responding, so that its errors are reported.
+            response = await stack.enter_async_context(
+                client.audio.speech.with_streaming_response.create(
+                    model=speech.tts_model,
+                    voice=speech.voice,
+                    input=text,
+                    response_format=speech.response_format,
+                )
             )
-
         except Exception as e:
+            await stack.aclose()
             logger.error(
                 "An unexpected error occurred while generating the speech: %s", e
             )
             raise HTTPException(status_code=500, detail=str(e)) from e
+
+        async def stream_audio():
+            async with stack:
+                with self.audio_cache.writer(key) as cache_file:
+                    async for chunk in response.iter_bytes(speech.chunk_size):
+                        cache_file.write(chunk)
+                        yield chunk
+            if self.audio_cache.over_size:
+                await asyncio.to_thread(self.audio_cache.prune)
+
+        return StreamingResponse(stream_audio(), media_type=media_type, headers=headers)
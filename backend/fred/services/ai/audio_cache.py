@@ -0,0 +1,145 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Disk cache of the synthesized speech, keyed by a hash of the text and the voice settings.
+
+An audio file is written while it is streamed to the client, under a temporary name, and
+only becomes visible in the cache once complete: an interrupted synthesis is never served.
+Replayed files are touched, and the least recently played ones are removed when the cache
+exceeds its size.
+
+The size of the cache is tracked as the files are written, so that writing a file never
+walks the directory. Only `prune`, run in a thread once the cache exceeds its size, does.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def speech_key(text: str, model: str, voice: str, response_format: str) -> str:
+    """
+    Return the content hash of a speech synthesis request.
+    """
+    payload = "\0".join([model, voice, response_format, text])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Directory of audio files named after their content hash.
+    """
+
+    def __init__(self, root_path: str, max_size_bytes: int, extension: str = "mp3"):
+        self.root_path = os.path.expanduser(root_path)
+        self.max_size_bytes = max_size_bytes
+        self.extension = extension
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        os.makedirs(self.root_path, exist_ok=True)
+        self._size_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_path, key[:2], f"{key}.{self.extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the path of a cached audio file, None if it is not cached.
+        """
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        """
+        Open a cache entry for writing. The entry is stored when the block completes, and
+        discarded if it is interrupted.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._size_bytes += size
+
+    @property
+    def over_size(self) -> bool:
+        """
+        Whether the cache exceeds its size, and should be pruned.
+        """
+        with self._lock:
+            return self._size_bytes > self.max_size_bytes
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """
+        List the (modification time, size, path) of the cached files. The files removed
+        meanwhile, e.g. by a concurrent prune, are skipped.
+        """
+        files = []
+        for directory, _, names in os.walk(self.root_path):
+            for name in names:
+                if name.endswith(f".{self.extension}"):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def prune(self) -> None:
+        """
+        Remove the least recently played files until the cache fits in its size. Walks the
+        whole cache: run it in a thread. A prune already running makes it return at once.
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                written_before = self._size_bytes
+            files = self._scan()
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_size_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                else:
+                    logger.info(f"Removed {path} from the speech cache")
+                total -= size
+            with self._lock:
+                # The files written during the prune are counted on top of the scanned ones.
+                self._size_bytes = total + self._size_bytes - written_before
+        finally:
+            self._prune_lock.release()
@@ -16,16 +16,14 @@
 Module for extracting a summary of a cluster based on a condensed representation of its components.
 """
 
-from typing import Optional
+from typing import List, Optional
 
-from langchain_core.prompts import PromptTemplate
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
-from fred.services.ai.structure.cluster_context import ClusterContext
-
 
 class ClusterSummary(BaseModel):
     """
@@ -46,45 +44,64 @@ class ClusterSummary(BaseModel):
         return self.cluster_summary.__str__()
 
     @classmethod
-    def from_cluster_context(
+    def from_summaries(
         cls,
-        cluster_context: ClusterContext,
+        cluster_name: str,
+        summaries: List[str],
         langfuse_handler: Optional[CallbackHandler] = None,
+        partial: bool = False,
     ) -> "ClusterSummary":
         """
-        Extract a summary of the cluster based on its context.
+        Reduce the summaries of a group of namespaces into a single summary.
+
+        Used for the hierarchical summarization of large clusters: the namespace summaries
+        are merged by groups into partial summaries, until they are few enough to be merged
+        into the final article.
 
         Args:
-            cluster_context (ClusterContext): The cluster context.
+            cluster_name (str): The name of the cluster.
+            summaries (List[str]): The namespace summaries, or partial summaries of the cluster.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
+            partial (bool): Whether the result is an intermediate summary covering only a part
+                of the cluster, rather than the final article.
         """
-
-        prompt = PromptTemplate(
-            template=(
-                "{cluster_context}\n\n"
-                "You are an expert in Kubernetes.\n"
-                "Your role is produce a medium like article about a cluster above.\n"
+        if partial:
+            instructions = (
+                "Your role is to merge the summaries given after these instructions, describing a part of the cluster, "
+                "into a single condensed summary.\n"
+                "Keep the name of every namespace, its purpose and the key relationships "
+                "between workloads. Drop the details that are not needed to understand the "
+                "cluster as a whole.\n"
+                "Your summary should be concise and provided in markdown format.\n"
+            )
+        else:
+            instructions = (
+                "Your role is produce a medium like article about the cluster described by the "
+                "summaries given after these instructions.\n"
                 "The audience of this article could be an administrator or a developer who "
                 "wants to understand the key aspects of the cluster.\n"
                 "It should aims to speed up the onboarding process of new team members, "
                 "or to provide a high-level overview of the cluster to stakeholders.\n"
-                "Here is a condensed representation of the cluster you have to write about:\n\n"
                 "Your article should be provided in markdown format.\n"
-                "Provide the article in a structured JSON format with the key: "
+            )
+
+        prompt = (
+            PromptBuilder("PartialClusterSummary" if partial else "ClusterSummary")
+            .instructions(
+                "You are an expert in Kubernetes.\n"
+                f"{instructions}"
+                "Provide the result in a structured JSON format with the key: "
                 "`cluster_summary`."
-            ),
-            input_variables=["cluster_context"],
+            )
+            .context("cluster: {cluster_name}\n\n{summaries}")
         )
 
         structured_model = get_structured_chain_for_service("kubernetes", ClusterSummary)
-        chain = prompt | structured_model
+        chain = prompt.template() | structured_model
 
-        invocation_args = {"cluster_context": cluster_context}
-
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
+        invocation_args = {
+            "cluster_name": cluster_name,
+            "summaries": "\n\n------\n\n".join(summaries),
+        }
 
-        return chain.invoke(invocation_args)
+        return chain.invoke(invocation_args, config=prompt.config(langfuse_handler))
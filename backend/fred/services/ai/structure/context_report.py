@@ -0,0 +1,74 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module to represent the tokens saved by the pruning of the workload contexts.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field, computed_field
+
+from fred.common.structure import WorkloadKind
+
+
+class WorkloadContextTokens(BaseModel):
+    """
+    Represents the size of the context of one workload, before and after pruning.
+    """
+
+    namespace: str = Field(description="The Namespace of the workload")
+    kind: WorkloadKind = Field(description="The kind of the workload")
+    name: str = Field(description="The name of the workload")
+    raw_tokens: int = Field(description="The number of tokens of the raw context")
+    tokens: int = Field(description="The number of tokens of the pruned context")
+
+
+class ContextTokensReport(BaseModel):
+    """
+    Represents the tokens saved by the pruning of the workload contexts of a cluster.
+    """
+
+    cluster: str = Field(description="The name of the cluster")
+    max_tokens: int = Field(description="The token budget applied to every workload context")
+    workloads: List[WorkloadContextTokens] = Field(
+        default_factory=list, description="The size of every workload context"
+    )
+
+    @computed_field
+    @property
+    def raw_tokens(self) -> int:
+        return sum(workload.raw_tokens for workload in self.workloads)
+
+    @computed_field
+    @property
+    def tokens(self) -> int:
+        return sum(workload.tokens for workload in self.workloads)
+
+    @computed_field
+    @property
+    def saved_tokens(self) -> int:
+        return self.raw_tokens - self.tokens
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the report.
+        """
+        saved_ratio = self.saved_tokens / self.raw_tokens if self.raw_tokens else 0.0
+        return (
+            f"Cluster '{self.cluster}': {len(self.workloads)} workload contexts, "
+            f"{self.raw_tokens} raw tokens, {self.tokens} tokens after pruning "
+            f"(budget {self.max_tokens} per context), {self.saved_tokens} tokens saved "
+            f"({saved_ratio:.1%})"
+        )
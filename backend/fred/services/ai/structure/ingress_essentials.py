@@ -18,11 +18,11 @@ Module for extracting essential attributes of an ingress based on its definition
 
 from typing import Optional, List
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 
 class IngressEssentials(BaseModel):
@@ -89,11 +89,10 @@ class IngressEssentials(BaseModel):
         Returns:
             IngressEssentials: An instance containing the essential attributes of the ingress.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("IngressEssentials")
+            .instructions(
                 "You are an expert in Kubernetes.\n"
-                "Based on the following workload YAML definitions:\n\n"
-                "{ingress_definition}\n\n"
                 "Please extract and provide the following essentials of the ingress:\n"
                 "- Name of the ingress\n"
                 "- Namespace of the ingress\n"
@@ -106,22 +105,22 @@ class IngressEssentials(BaseModel):
                 "Provide the information in a structured JSON format with the keys: "
                 "'name', 'namespace', 'hosts', 'tls_enabled', 'paths', "
                 "'service_names', 'annotations', 'labels'"
-            ),
-            input_variables=["ingress_definition"],
+            )
+            .context(
+                "Workload YAML definitions:\n\n"
+                "{ingress_definition}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", IngressEssentials)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", IngressEssentials, "IngressesEssentials")
+        chain = prompt.template() | structured_model
 
         invocation_args = {"ingress_definition": ingress_definition}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
 
 class IngressesEssentials(BaseModel):
     """
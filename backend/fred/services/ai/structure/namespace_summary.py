@@ -18,11 +18,11 @@ Module for extracting a summary of a namespace based on the topology of its work
 
 from typing import Optional
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 from fred.services.ai.structure.namespace_context import NamespaceContext
 
 
@@ -57,13 +57,12 @@ class NamespaceSummary(BaseModel):
             namespace_context (NamespaceContext): The context of the namespace.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("NamespaceSummary")
+            .instructions(
                 "You are an expert in Kubernetes.\n"
-                "Your role is to analyze a namespace based on its context.\n\n"
-                "Here are some information about the attributes of the namespace and the "
-                "workloads it contains:\n\n"
-                "{namespace_context}\n\n"
+                "Your role is to analyze a namespace based on its context, given after these "
+                "instructions.\n\n"
                 "Please provide a summary of the namespace.\n"
                 "You should highlight the key aspects, commenting on potential relationships "
                 "between the workloads, and providing any other relevant information like the "
@@ -74,19 +73,18 @@ class NamespaceSummary(BaseModel):
                 "You MUST NOT provide a list of informations.\n"
                 "Provide the summary in a structured JSON format with the key: "
                 "`namespace_summary`."
-            ),
-            input_variables=["namespace_context"],
+            )
+            .context(
+                "Here are some information about the attributes of the namespace and the "
+                "workloads it contains:\n\n"
+                "{namespace_context}"
+            )
         )
 
         structured_model = get_structured_chain_for_service("kubernetes", NamespaceSummary)
-        chain = prompt | structured_model
-
-        invocation_args = {"namespace_context": namespace_context}
+        chain = prompt.template() | structured_model
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            {"namespace_context": namespace_context},
+            config=prompt.config(langfuse_handler),
+        )
@@ -0,0 +1,73 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module to represent the LLM calls avoided by the rule-based pre-scoring of the workloads.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field, computed_field
+
+from fred.common.structure import WorkloadKind
+from fred.services.ai.structure.workload_scores.heuristics import SCORE_TYPES
+
+
+class WorkloadPrescores(BaseModel):
+    """
+    Represents the scores of one workload computed by the rules.
+    """
+
+    namespace: str = Field(description="The Namespace of the workload")
+    kind: WorkloadKind = Field(description="The kind of the workload")
+    name: str = Field(description="The name of the workload")
+    prescored: List[str] = Field(
+        default_factory=list, description="The scores computed by the rules, e.g. ['cpu', 'scalability']"
+    )
+
+
+class ScoresHeuristicsReport(BaseModel):
+    """
+    Represents the LLM calls avoided by the pre-scoring of the workloads of a cluster.
+    """
+
+    cluster: str = Field(description="The name of the cluster")
+    workloads: List[WorkloadPrescores] = Field(
+        default_factory=list, description="The scores computed by the rules for every workload"
+    )
+
+    @computed_field
+    @property
+    def score_calls(self) -> int:
+        return len(self.workloads) * len(SCORE_TYPES)
+
+    @computed_field
+    @property
+    def avoided_calls(self) -> int:
+        return sum(len(workload.prescored) for workload in self.workloads)
+
+    @computed_field
+    @property
+    def avoided_ratio(self) -> float:
+        return self.avoided_calls / self.score_calls if self.score_calls else 0.0
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the report.
+        """
+        return (
+            f"Cluster '{self.cluster}': {len(self.workloads)} workloads, "
+            f"{self.avoided_calls} of {self.score_calls} score LLM calls avoided by the rules "
+            f"({self.avoided_ratio:.1%})"
+        )
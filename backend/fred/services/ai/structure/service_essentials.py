@@ -18,11 +18,11 @@ Module for extracting essential attributes of a service based on its definition.
 
 from typing import Optional, List
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 
 class ServiceEssentials(BaseModel):
@@ -81,11 +81,10 @@ class ServiceEssentials(BaseModel):
         Returns:
             ServiceEssentials: An instance containing the essential attributes of the service.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("ServiceEssentials")
+            .instructions(
                 "You are an expert in Kubernetes.\n"
-                "Based on the following workload YAML definitions:\n\n"
-                "{service_definition}\n\n"
                 "Please extract and provide the following essentials of the service:\n"
                 "- Name of the service\n"
                 "- Namespace of the service\n"
@@ -94,21 +93,21 @@ class ServiceEssentials(BaseModel):
                 "- Selector of the service\n"
                 "- Annotations of the service\n"
                 "- Labels of the service"
-            ),
-            input_variables=["service_definition"],
+            )
+            .context(
+                "Workload YAML definitions:\n\n"
+                "{service_definition}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", ServiceEssentials)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", ServiceEssentials, "ServicesEssentials")
+        chain = prompt.template() | structured_model
         invocation_args = {"service_definition": service_definition}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
 
 class ServicesEssentials(BaseModel):
     """
@@ -18,11 +18,11 @@ Module to represent advanced information about a Kafka workload.
 
 from typing import Optional, Literal
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import Field, BaseModel
 
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 from fred.services.ai.structure.workload_context import WorkloadContext
 
 
@@ -156,11 +156,10 @@ class KafkaAdvanced(BaseModel):
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("KafkaAdvanced")
+            .instructions(
                 "You are an expert in Kubernetes.\n\n"
-                "Based on the following Kafka definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide advanced information about the following Kafka attributes:\n"
                 "- Broker ID\n"
                 "- Log Retention (ms)\n"
@@ -184,18 +183,18 @@ class KafkaAdvanced(BaseModel):
                 "'replica_fetch_max_bytes', 'broker_heap_size', 'num_network_threads', "
                 "'socket_send_buffer_bytes', 'socket_receive_buffer_bytes', 'log_cleanup_policy', "
                 "'num_partitions', 'topic_replication_factor', 'topic_min_insync_replicas'"
-            ),
-            input_variables=["workload_context"],
+            )
+            .context(
+                "Kafka definitions:\n\n"
+                "{workload_context}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", KafkaAdvanced)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", KafkaAdvanced, "WorkloadAdvanced")
+        chain = prompt.template() | structured_model
         invocation_args = {"workload_context": workload_context}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
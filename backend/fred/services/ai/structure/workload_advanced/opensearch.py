@@ -18,8 +18,8 @@ Module to represent advanced information about OpenSearch workload.
 
 from typing import Optional, Literal
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import Field, BaseModel
 
@@ -68,29 +68,28 @@ class OpenSearchAdvanced(BaseModel):
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("OpenSearchAdvanced")
+            .instructions(
                 "You are an expert in Kubernetes.\n\n"
-                "Based on the following OpenSearch definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide advanced information about the following OpenSearch attributes:\n"
                 "- Shard Size (GB)\n"
                 "- Shard Count\n"
                 "- Shards per Data Node\n"
                 "Provide the information in a structured JSON format with the keys:\n"
                 "'shard_size_gb', 'shard_count', 'shards_per_data_node'"
-            ),
-            input_variables=["workload_context"],
+            )
+            .context(
+                "OpenSearch definitions:\n\n"
+                "{workload_context}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", OpenSearchAdvanced)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", OpenSearchAdvanced, "WorkloadAdvanced")
+        chain = prompt.template() | structured_model
         invocation_args = {"workload_context": workload_context}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
@@ -18,10 +18,10 @@ Module to represent advanced information about OpenSearch Dashboard workload.
 
 from typing import Optional, Literal
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import Field, BaseModel
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from fred.services.ai.structure.workload_context import WorkloadContext
 
@@ -108,11 +108,10 @@ class OpenSearchDashboardAdvanced(BaseModel):
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("OpenSearchDashboardAdvanced")
+            .instructions(
                 "You are an expert in Kubernetes.\n\n"
-                "Based on the following OpenSearch Dashboard definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide advanced information about the following OpenSearch Dashboard "
                 "attributes:\n"
                 "- Opensearch Hosts\n"
@@ -136,18 +135,18 @@ class OpenSearchDashboardAdvanced(BaseModel):
                 "'server_host', 'server_port', 'server_base_path', 'server_rewrite_base_path', "
                 "'server_ssl_enabled', 'server_ssl_certificate', 'server_ssl_key', "
                 "'logging_dest', 'logging_level'"
-            ),
-            input_variables=["workload_context"],
+            )
+            .context(
+                "OpenSearch Dashboard definitions:\n\n"
+                "{workload_context}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", OpenSearchDashboardAdvanced)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", OpenSearchDashboardAdvanced, "WorkloadAdvanced")
+        chain = prompt.template() | structured_model
         invocation_args = {"workload_context": workload_context}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
@@ -18,10 +18,10 @@ Module to represent advanced information about a Punchline workload.
 
 from typing import Optional, Literal
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import Field, BaseModel
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from fred.services.ai.structure.workload_context import WorkloadContext
 
@@ -86,11 +86,10 @@ class PunchlineAdvanced(BaseModel):
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("PunchlineAdvanced")
+            .instructions(
                 "You are an expert in Kubernetes.\n\n"
-                "Based on the following Punchline definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide advanced information about the following Punchline attributes:\n"
                 "- Pipeline Workers\n"
                 "- Pipeline Batch Size\n"
@@ -105,18 +104,18 @@ class PunchlineAdvanced(BaseModel):
                 "'pipeline_workers', 'pipeline_batch_size', 'pipeline_batch_delay', 'heap_size', "
                 "'log_level', 'input_plugin', 'output_plugin', 'input_plugin_port', "
                 "'output_plugin_hosts'"
-            ),
-            input_variables=["workload_context"],
+            )
+            .context(
+                "Punchline definitions:\n\n"
+                "{workload_context}"
+            )
         )
 
-        structured_model = get_structured_chain_for_service("kubernetes", PunchlineAdvanced)
-        chain = prompt | structured_model
+        structured_model = get_structured_chain_for_service("kubernetes", PunchlineAdvanced, "WorkloadAdvanced")
+        chain = prompt.template() | structured_model
         invocation_args = {"workload_context": workload_context}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
-            )
-
-        return chain.invoke(invocation_args)
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
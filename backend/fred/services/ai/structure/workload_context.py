@@ -16,10 +16,131 @@
 Module to represent the context of a workload.
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+import yaml
 from pydantic import BaseModel, Field
 
+from fred.common.token_utils import count_tokens, truncate_to_tokens
+
+# Fields of the object metadata that describe the bookkeeping of a Kubernetes object and
+# bring nothing to the understanding of the workload. Both the snake_case keys of the
+# python client and the camelCase keys of the raw API are listed.
+PRUNED_METADATA_KEYS = {
+    "managed_fields", "managedFields",
+    "uid",
+    "resource_version", "resourceVersion",
+    "generation",
+    "creation_timestamp", "creationTimestamp",
+    "deletion_timestamp", "deletionTimestamp",
+    "deletion_grace_period_seconds", "deletionGracePeriodSeconds",
+    "self_link", "selfLink",
+}
+
+# Fields of the containers of a pod spec holding their defaults.
+PRUNED_CONTAINER_KEYS = {
+    "termination_message_path", "terminationMessagePath",
+    "termination_message_policy", "terminationMessagePolicy",
+}
+
+CONTAINER_LISTS = {
+    "containers", "init_containers", "initContainers", "ephemeral_containers", "ephemeralContainers",
+}
+
+# Maps owned by the users: their keys are data, never pruned.
+OPAQUE_KEYS = {
+    "data", "string_data", "stringData", "binary_data", "binaryData",
+    "labels", "annotations", "match_labels", "matchLabels", "env",
+}
+
+PRUNED_ANNOTATIONS = {
+    "kubectl.kubernetes.io/last-applied-configuration",
+    "deployment.kubernetes.io/revision",
+}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == {} or value == []
+
+
+def _prune(resource: Any) -> Any:
+    if isinstance(resource, dict):
+        pruned = {}
+        for key, value in resource.items():
+            if key in OPAQUE_KEYS:
+                if key == "annotations" and isinstance(value, dict):
+                    value = {k: v for k, v in value.items() if k not in PRUNED_ANNOTATIONS}
+            else:
+                if key == "metadata" and isinstance(value, dict):
+                    value = {k: v for k, v in value.items() if k not in PRUNED_METADATA_KEYS}
+                elif key in CONTAINER_LISTS and isinstance(value, list):
+                    value = [
+                        {k: v for k, v in container.items() if k not in PRUNED_CONTAINER_KEYS}
+                        if isinstance(container, dict) else container
+                        for container in value
+                    ]
+                value = _prune(value)
+            if _is_empty(value):
+                continue
+            pruned[key] = value
+        return pruned
+    if isinstance(resource, list):
+        return [_prune(item) for item in resource]
+    return resource
+
+
+def prune_resource(resource: Any) -> Any:
+    """
+    Remove the runtime state, the bookkeeping fields of the metadata, the container defaults,
+    the noisy annotations and the empty values of a Kubernetes object.
+
+    Fields are only pruned at their known paths: the user-owned maps (data, labels,
+    annotations, environment...) are kept whole, whatever their keys.
+
+    Args:
+        resource (Any): The Kubernetes object, as returned by `to_dict()`.
+
+    Returns:
+        Any: The pruned copy of the object.
+    """
+    if isinstance(resource, dict):
+        resource = {key: value for key, value in resource.items() if key != "status"}
+    return _prune(resource)
+
+
+def _shrink_configmap(configmap: Dict[str, Any], max_value_tokens: Optional[int],
+                      model: Optional[str]) -> Dict[str, Any]:
+    """
+    Truncate every data value of a configmap to `max_value_tokens`, or replace them by a
+    one-line summary when `max_value_tokens` is None. Binary data is always summarized.
+    """
+    configmap = dict(configmap)
+    data = configmap.get("data")
+    if isinstance(data, dict):
+        if max_value_tokens is None:
+            configmap["data"] = {
+                key: f"<omitted, {count_tokens(str(value), model)} tokens>" for key, value in data.items()
+            }
+        else:
+            configmap["data"] = {
+                key: truncate_to_tokens(str(value), max_value_tokens, model) for key, value in data.items()
+            }
+    for binary_key in ("binary_data", "binaryData"):
+        binary_data = configmap.get(binary_key)
+        if isinstance(binary_data, dict):
+            configmap[binary_key] = {
+                key: f"<binary data, {len(value or '')} base64 characters>" for key, value in binary_data.items()
+            }
+    return configmap
+
+
+def _dump(resource: Dict[str, Any]) -> str:
+    return yaml.dump(resource, default_flow_style=False, allow_unicode=True)
+
+
+def _dump_all(resources: List[Dict[str, Any]]) -> str:
+    return yaml.dump_all(resources, default_flow_style=False, allow_unicode=True, explicit_start=True)
+
 
 class WorkloadContext(BaseModel):
     """
@@ -38,6 +159,93 @@ class WorkloadContext(BaseModel):
     ingresses_yaml: Optional[str] = Field(
         default=None, description="The YAML definition of the ingresses"
     )
+    raw_tokens: Optional[int] = Field(
+        default=None, description="The number of tokens of the context before pruning"
+    )
+    tokens: Optional[int] = Field(
+        default=None, description="The number of tokens of the pruned context"
+    )
+
+    @classmethod
+    def from_resources(  # pylint: disable=R0913, R0917
+        cls,
+        workload: Dict[str, Any],
+        configmaps: List[Dict[str, Any]],
+        services: List[Dict[str, Any]],
+        ingresses: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        max_configmap_value_tokens: Optional[int] = 400,
+        model: Optional[str] = None,
+    ) -> "WorkloadContext":
+        """
+        Build a pruned workload context that fits in a token budget.
+
+        The runtime fields of every object are pruned and the configmap values are
+        truncated. If the context still exceeds the budget, the configmap values are
+        replaced by one-line summaries, then the sections are truncated, the least
+        relevant first (configmaps, ingresses, services, and the workload last).
+
+        Args:
+            workload (Dict[str, Any]): The workload object.
+            configmaps (List[Dict[str, Any]]): The configmaps mounted by the workload.
+            services (List[Dict[str, Any]]): The services exposing the workload.
+            ingresses (List[Dict[str, Any]]): The ingresses routing to the services.
+            max_tokens (Optional[int]): The token budget of the context. None for no budget.
+            max_configmap_value_tokens (Optional[int]): The maximum number of tokens of each configmap value.
+            model (Optional[str]): The model whose tokenizer measures the context.
+
+        Returns:
+            WorkloadContext: The pruned workload context.
+        """
+        raw_tokens = count_tokens(str(cls(
+            workload_yaml=_dump(workload),
+            configmaps_yaml=_dump_all(configmaps),
+            services_yaml=_dump_all(services),
+            ingresses_yaml=_dump_all(ingresses),
+        )), model)
+
+        workload = prune_resource(workload)
+        configmaps = [prune_resource(configmap) for configmap in configmaps]
+        services_yaml = _dump_all([prune_resource(service) for service in services])
+        ingresses_yaml = _dump_all([prune_resource(ingress) for ingress in ingresses])
+
+        truncated_configmaps = configmaps
+        if max_configmap_value_tokens is not None:
+            truncated_configmaps = [_shrink_configmap(c, max_configmap_value_tokens, model) for c in configmaps]
+
+        context = cls(
+            workload_yaml=_dump(workload),
+            configmaps_yaml=_dump_all(truncated_configmaps),
+            services_yaml=services_yaml,
+            ingresses_yaml=ingresses_yaml,
+        )
+
+        if max_tokens is not None and count_tokens(str(context), model) > max_tokens:
+            context.configmaps_yaml = _dump_all([_shrink_configmap(c, None, model) for c in configmaps])
+
+        if max_tokens is not None and count_tokens(str(context), model) > max_tokens:
+            context._truncate_sections(max_tokens, model)
+
+        context.raw_tokens = raw_tokens
+        context.tokens = count_tokens(str(context), model)
+        return context
+
+    def _truncate_sections(self, max_tokens: int, model: Optional[str]) -> None:
+        """
+        Share the token budget between the sections, by decreasing relevance.
+        """
+        headers_tokens = count_tokens(str(self.model_copy(update={
+            "workload_yaml": "", "configmaps_yaml": " ", "services_yaml": " ", "ingresses_yaml": " ",
+        })), model)
+        remaining = max(max_tokens - headers_tokens, 0)
+        for field in ("workload_yaml", "services_yaml", "ingresses_yaml", "configmaps_yaml"):
+            value = getattr(self, field)
+            if not value:
+                continue
+            # Keep a few tokens for the truncation marker.
+            truncated = truncate_to_tokens(value, max(remaining - 10, 0), model)
+            setattr(self, field, truncated)
+            remaining = max(remaining - count_tokens(truncated, model), 0)
 
     def __str__(self) -> str:
         """
@@ -16,13 +16,13 @@
 Module for extracting essential attributes of the commercial off-the-shelf software being deployed.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 
 class WorkloadEssentials(BaseModel):
@@ -89,11 +89,10 @@ class WorkloadEssentials(BaseModel):
         Returns:
             WorkloadEssentials: An instance containing the extracted essential attributes.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("WorkloadEssentials")
+            .instructions(
                 "You are an expert in Kubernetes.\n"
-                "Based on the following workload YAML definitions:\n\n"
-                "{workload_definition}\n\n"
                 "Please extract and provide the following essentials of the deployed software:\n"
                 "- Name of the workload\n"
                 "- Namespace\n"
@@ -103,18 +102,90 @@ class WorkloadEssentials(BaseModel):
                 "- Number of replicas\n\n"
                 "Provide the information in a structured JSON format with the keys: "
                 "`name`, `namespace`, `kind`, `container_images`, `version`, `replicas`."
-            ),
-            input_variables=["workload_definition"],
+            )
+            .context(
+                "Workload YAML definitions:\n\n"
+                "{workload_definition}"
+            )
         )
 
         structured_model = get_structured_chain_for_service("kubernetes", WorkloadEssentials)
-        chain = prompt | structured_model
+        chain = prompt.template() | structured_model
         invocation_args = {"workload_definition": workload_definition}
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                invocation_args,
-                config={"callbacks": [langfuse_handler]},
+        return chain.invoke(
+            invocation_args,
+            config=prompt.config(langfuse_handler),
+        )
+
+    @classmethod
+    def from_workload_definitions(
+        cls,
+        workload_definitions: Dict[str, str],
+        langfuse_handler: Optional[CallbackHandler] = None,
+    ) -> Dict[str, "WorkloadEssentials"]:
+        """
+        Extract the essential attributes of several workloads in a single call.
+
+        Args:
+            workload_definitions (Dict[str, str]): The workload definitions, keyed by workload name.
+            langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
+
+        Returns:
+            Dict[str, WorkloadEssentials]: The extracted essentials, keyed by workload name.
+
+        Raises:
+            ValueError: If the response does not provide exactly one entry per workload.
+        """
+        prompt = (
+            PromptBuilder("WorkloadEssentialsBatch")
+            .instructions(
+                "You are an expert in Kubernetes.\n"
+                "For every workload, please extract and provide the following essentials of "
+                "the deployed software:\n"
+                "- Name of the workload\n"
+                "- Namespace\n"
+                "- Kind of workload (e.g., Deployment, StatefulSet)\n"
+                "- Container image\n"
+                "- Version of the application (not Kubernetes or image version)\n"
+                "- Number of replicas\n\n"
+                "Provide the information in a structured JSON format with the key "
+                "`workloads_essentials`: a list with one object per workload, with the keys "
+                "`name`, `namespace`, `kind`, `container_images`, `version`, `replicas`."
+            )
+            .context(
+                "Workload YAML definitions, each introduced by the name "
+                "of its workload:\n\n"
+                "{workload_definitions}"
+            )
+        )
+
+        structured_model = get_structured_chain_for_service("kubernetes", WorkloadEssentialsBatch, "WorkloadEssentials")
+        chain = prompt.template() | structured_model
+
+        invocation_args = {
+            "workload_definitions": "\n\n".join(
+                f"====== Workload: {name} ======\n\n{definition}"
+                for name, definition in workload_definitions.items()
             )
+        }
+
+        batch = chain.invoke(invocation_args, config=prompt.config(langfuse_handler))
+
+        workloads_essentials = {essentials.name: essentials for essentials in batch.workloads_essentials}
+        if workloads_essentials.keys() != workload_definitions.keys():
+            raise ValueError(
+                f"Expected Workload Essentials for {sorted(workload_definitions)}, "
+                f"got {sorted(workloads_essentials)}"
+            )
+        return workloads_essentials
+
 
-        return chain.invoke(invocation_args)
+class WorkloadEssentialsBatch(BaseModel):
+    """
+    Represents the essential attributes of a batch of workloads.
+    """
+
+    workloads_essentials: List[WorkloadEssentials] = Field(
+        description="The essential attributes of every workload"
+    )
@@ -17,12 +17,12 @@ Module for handling commercial off-the-shelf software identification based on wo
 is composed of the YAML definitions of the workload, configmaps, services, and ingresses.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from fred.services.ai.structure.workload_context import WorkloadContext
 
@@ -58,24 +58,99 @@ class WorkloadId(BaseModel):
         Returns:
             workload_id: The extracted commercial off-the-shelf software name.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("WorkloadId")
+            .instructions(
                 "You are an expert in Kubernetes.\n\n"
-                "Based on the following workload definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide the name of the commercial off-the-shelf "
                 "software being deployed.\n"
-            ),
-            input_variables=["workload_definitions"],
+            )
+            .context(
+                "Workload definitions:\n\n"
+                "{workload_context}"
+            )
         )
 
         structured_model = get_structured_chain_for_service("kubernetes", WorkloadId)
-        chain = prompt | structured_model
+        chain = prompt.template() | structured_model
+
+        return chain.invoke(
+            {"workload_context": workload_context},
+            config=prompt.config(langfuse_handler),
+        )
+
+    @classmethod
+    def from_workload_contexts(
+        cls,
+        workload_contexts: Dict[str, WorkloadContext],
+        langfuse_handler: Optional[CallbackHandler] = None,
+    ) -> Dict[str, "WorkloadId"]:
+        """
+        Extract the commercial off-the-shelf software names of several workloads in a single call.
+
+        Args:
+            workload_contexts (Dict[str, WorkloadContext]): The workload contexts, keyed by workload name.
+            langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
+
+        Returns:
+            Dict[str, WorkloadId]: The extracted software names, keyed by workload name.
+
+        Raises:
+            ValueError: If the response does not provide exactly one name per workload.
+        """
+        prompt = (
+            PromptBuilder("WorkloadIdBatch")
+            .instructions(
+                "You are an expert in Kubernetes.\n\n"
+                "For every workload, please provide the name of the commercial off-the-shelf "
+                "software being deployed.\n"
+                "Provide the result in a structured JSON format with the key `workload_ids`: "
+                "a list with one object per workload, with the keys `workload_name` and "
+                "`workload_id`.\n"
+            )
+            .context(
+                "Workload definitions, each introduced by the name "
+                "of its workload:\n\n"
+                "{workload_contexts}"
+            )
+        )
+
+        structured_model = get_structured_chain_for_service("kubernetes", WorkloadIdBatch, "WorkloadId")
+        chain = prompt.template() | structured_model
+
+        invocation_args = {
+            "workload_contexts": "\n\n".join(
+                f"====== Workload: {name} ======\n\n{context}"
+                for name, context in workload_contexts.items()
+            )
+        }
 
-        if langfuse_handler is not None:
-            return chain.invoke(
-                {"workload_context": workload_context},
-                config={"callbacks": [langfuse_handler]},
+        batch = chain.invoke(invocation_args, config=prompt.config(langfuse_handler))
+
+        workload_ids = {item.workload_name: WorkloadId(workload_id=item.workload_id) for item in batch.workload_ids}
+        if workload_ids.keys() != workload_contexts.keys():
+            raise ValueError(
+                f"Expected Workload Ids for {sorted(workload_contexts)}, got {sorted(workload_ids)}"
             )
+        return workload_ids
+
+
+class WorkloadIdItem(BaseModel):
+    """
+    Represents the name of the software deployed by one workload of a batch.
+    """
 
-        return chain.invoke({"workload_context": workload_context})
+    workload_name: str = Field(description="The name of the workload")
+    workload_id: str = Field(
+        description="The name of the commercial off-the-shelf software being deployed"
+    )
+
+
+class WorkloadIdBatch(BaseModel):
+    """
+    Represents the names of the software deployed by a batch of workloads.
+    """
+
+    workload_ids: List[WorkloadIdItem] = Field(
+        description="The name of the software deployed by every workload"
+    )
@@ -16,7 +16,7 @@
 Module for generating workload scores.
 """
 
-from typing import Optional
+from typing import Dict, Optional
 
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
@@ -24,6 +24,7 @@ from pydantic import BaseModel, Field
 from fred.services.ai.structure.workload_context import WorkloadContext
 from fred.services.ai.structure.workload_scores.compression import CompressionScore
 from fred.services.ai.structure.workload_scores.cpu import CpuScore
+from fred.services.ai.structure.workload_scores.heuristics import SCORE_TYPES
 from fred.services.ai.structure.workload_scores.io import IoScore
 from fred.services.ai.structure.workload_scores.ram import RamScore
 from fred.services.ai.structure.workload_scores.scalability import ScalabilityScore
@@ -93,6 +94,7 @@ class WorkloadScores(BaseModel):
         cls,
         workload_context: WorkloadContext,
         langfuse_handler: Optional[CallbackHandler] = None,
+        prescores: Optional[Dict[str, BaseModel]] = None,
     ) -> "WorkloadScores":
         """
         Extract the scores of a workload based on the workload context.
@@ -100,20 +102,16 @@ class WorkloadScores(BaseModel):
         Args:
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
+            prescores (Optional[Dict[str, BaseModel]]): The scores already computed by the
+                rules of `prescore_workload`, keyed by field. They are not asked to the LLM.
 
         Returns:
             WorkloadScores: The extracted scores of the workload.
         """
-        cpu = CpuScore.from_workload_context(workload_context, langfuse_handler)
-        ram = RamScore.from_workload_context(workload_context, langfuse_handler)
-        io = IoScore.from_workload_context(workload_context, langfuse_handler)
-        scalability = ScalabilityScore.from_workload_context(
-            workload_context, langfuse_handler
-        )
-        compression = CompressionScore.from_workload_context(
-            workload_context, langfuse_handler
-        )
-
-        return cls(
-            cpu=cpu, ram=ram, io=io, scalability=scalability, compression=compression
-        )
+        prescores = prescores or {}
+        scores = {
+            field: prescores[field] if field in prescores
+            else score_type.from_workload_context(workload_context, langfuse_handler)
+            for field, score_type in SCORE_TYPES.items()
+        }
+        return cls(**scores)
@@ -0,0 +1,169 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Rule-based pre-scoring of workloads.
+
+Some scores follow mechanically from the workload spec, e.g. a workload without any CPU
+request or limit cannot be well optimized for CPU usage. These scores are computed
+directly from the spec, and the LLM is only asked for the scores whose rules are
+inconclusive.
+
+The workload spec is the dictionary returned by the Kubernetes client (`to_dict()`), whose
+keys are in snake_case. The camelCase keys of raw manifests are accepted as well.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from fred.common.structure import WorkloadKind
+from fred.services.ai.structure.workload_scores.compression import CompressionScore
+from fred.services.ai.structure.workload_scores.cpu import CpuScore
+from fred.services.ai.structure.workload_scores.io import IoScore
+from fred.services.ai.structure.workload_scores.ram import RamScore
+from fred.services.ai.structure.workload_scores.scalability import ScalabilityScore
+
+SCORE_TYPES: Dict[str, type[BaseModel]] = {
+    "cpu": CpuScore,
+    "ram": RamScore,
+    "io": IoScore,
+    "scalability": ScalabilityScore,
+    "compression": CompressionScore,
+}
+
+# Volumes that only hold configuration, and do not take part in the I/O of the workload.
+CONFIGURATION_VOLUMES = ("config_map", "secret", "projected", "downward_api")
+
+REPLICATED_KINDS = (WorkloadKind.DEPLOYMENT, WorkloadKind.STATEFUL_SET)
+
+
+def _get(obj: Optional[Dict[str, Any]], key: str) -> Any:
+    """
+    Get a value by its snake_case key, falling back to the camelCase key.
+    """
+    if not obj:
+        return None
+    value = obj.get(key)
+    if value is None and "_" in key:
+        head, *tail = key.split("_")
+        value = obj.get(head + "".join(part.capitalize() for part in tail))
+    return value
+
+
+def _pod_spec(workload: Dict[str, Any]) -> Dict[str, Any]:
+    spec = _get(workload, "spec") or {}
+    if _get(spec, "job_template") is not None:
+        spec = _get(_get(spec, "job_template"), "spec") or {}
+    return _get(_get(spec, "template"), "spec") or {}
+
+
+def _declares(containers: List[Dict[str, Any]], resource: str) -> bool:
+    for container in containers:
+        resources = _get(container, "resources") or {}
+        if _get(_get(resources, "requests"), resource) or _get(_get(resources, "limits"), resource):
+            return True
+    return False
+
+
+def _volume_type(volume: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the snake_case type of a volume, e.g. 'empty_dir'.
+    """
+    for key, value in volume.items():
+        if key != "name" and value is not None:
+            return re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
+    return None
+
+
+def _score_cpu(containers: List[Dict[str, Any]]) -> Optional[CpuScore]:
+    if containers and not _declares(containers, "cpu"):
+        return CpuScore(
+            score=2,
+            reason="No container declares a CPU request or limit: the scheduler cannot place "
+                   "the workload according to its CPU needs, and it may starve or be starved "
+                   "by its neighbours.",
+        )
+    return None
+
+
+def _score_ram(containers: List[Dict[str, Any]]) -> Optional[RamScore]:
+    if containers and not _declares(containers, "memory"):
+        return RamScore(
+            score=2,
+            reason="No container declares a memory request or limit: the workload can be "
+                   "scheduled on a node without enough memory, and an unbounded memory usage "
+                   "can get it or its neighbours OOM-killed.",
+        )
+    return None
+
+
+def _score_io(volumes: List[Dict[str, Any]]) -> Optional[IoScore]:
+    data_types = [
+        volume_type for volume_type in map(_volume_type, volumes)
+        if volume_type not in CONFIGURATION_VOLUMES
+    ]
+    if data_types and all(volume_type == "empty_dir" for volume_type in data_types):
+        return IoScore(
+            score=7,
+            reason="The workload only writes to emptyDir volumes: its I/O stays on node-local "
+                   "ephemeral storage, without the latency of network-attached volumes, but "
+                   "its data does not survive a rescheduling of the pod.",
+        )
+    return None
+
+
+def _score_scalability(workload: Dict[str, Any], kind: WorkloadKind,
+                       autoscaled: Optional[bool]) -> Optional[ScalabilityScore]:
+    if kind not in REPLICATED_KINDS or autoscaled is not False:
+        return None
+    replicas = _get(_get(workload, "spec"), "replicas")
+    if replicas is None or replicas == 1:
+        return ScalabilityScore(
+            score=1,
+            reason="The workload runs a single replica and is not targeted by any "
+                   "HorizontalPodAutoscaler: it cannot absorb a load increase and is "
+                   "unavailable whenever its pod is restarted.",
+        )
+    return None
+
+
+def prescore_workload(workload: Dict[str, Any], kind: WorkloadKind,
+                      autoscaled: Optional[bool] = None) -> Dict[str, BaseModel]:
+    """
+    Compute the scores that follow from the workload spec.
+
+    Args:
+        workload (Dict[str, Any]): The workload object.
+        kind (WorkloadKind): The kind of the workload.
+        autoscaled (Optional[bool]): Whether a HorizontalPodAutoscaler targets the workload.
+            None if unknown, in which case the scalability rule is inconclusive.
+
+    Returns:
+        Dict[str, BaseModel]: The conclusive scores, keyed by the `WorkloadScores` field
+            ('cpu', 'ram', 'io', 'scalability' or 'compression'). The missing scores must be
+            asked to the LLM.
+    """
+    pod_spec = _pod_spec(workload)
+    containers = _get(pod_spec, "containers") or []
+    volumes = _get(pod_spec, "volumes") or []
+
+    scores = {
+        "cpu": _score_cpu(containers),
+        "ram": _score_ram(containers),
+        "io": _score_io(volumes),
+        "scalability": _score_scalability(workload, kind, autoscaled),
+    }
+    return {field: score for field, score in scores.items() if score is not None}
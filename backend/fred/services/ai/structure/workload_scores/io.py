@@ -18,10 +18,10 @@ Module for generating the I/O optimization score of a workload.
 
 from typing import Optional
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from fred.services.ai.structure.workload_context import WorkloadContext
 
@@ -68,26 +68,25 @@ class IoScore(BaseModel):
         Returns:
             IoScore: The extracted I/O optimization score.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("IoScore")
+            .instructions(
                 "You are an expert in Kubernetes and cloud-native applications.\n\n"
-                "Based on the following workload definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide the I/O optimization score for the workload.\n"
                 "The score should be between 0 and 10 (higher the better).\n"
                 "It should represent how well the application is optimized for I/O operations.\n"
                 "Also, provide a concise explanation of why you provided that score considering "
                 "the software nature, its configuration, and technical context."
-            ),
-            input_variables=["workload_context"],
-        )
-
-        structured_model = get_structured_chain_for_service("kubernetes", IoScore)
-        chain = prompt | structured_model
-        if langfuse_handler is not None:
-            return chain.invoke(
-                {"workload_context": workload_context},
-                config={"callbacks": [langfuse_handler]},
             )
+            .context(
+                "Workload definitions:\n\n"
+                "{workload_context}"
+            )
+        )
 
-        return chain.invoke({"workload_context": workload_context})
+        structured_model = get_structured_chain_for_service("kubernetes", IoScore, "WorkloadScores")
+        chain = prompt.template() | structured_model
+        return chain.invoke(
+            {"workload_context": workload_context},
+            config=prompt.config(langfuse_handler),
+        )
@@ -18,10 +18,10 @@ Module for generating the scalability score of a workload.
 
 from typing import Optional
 
-from langchain_core.prompts import PromptTemplate
 from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 from fred.application_context import get_structured_chain_for_service
+from fred.common.prompt_builder import PromptBuilder
 
 from fred.services.ai.structure.workload_context import WorkloadContext
 
@@ -68,26 +68,25 @@ class ScalabilityScore(BaseModel):
         Returns:
             ScalabilityScore: The extracted scalability score.
         """
-        prompt = PromptTemplate(
-            template=(
+        prompt = (
+            PromptBuilder("ScalabilityScore")
+            .instructions(
                 "You are an expert in Kubernetes and cloud-native applications.\n\n"
-                "Based on the following workload definitions:\n\n"
-                "{workload_context}\n\n"
                 "Please provide the scalability score for the workload.\n"
                 "The score should be between 0 and 10 (higher the better).\n"
                 "It should represent how well the application is optimized for scalability.\n"
                 "Also, provide a concise explanation of why you provided that score considering "
                 "the software architecture, its configuration, and technical context."
-            ),
-            input_variables=["workload_context"],
-        )
-
-        structured_model = get_structured_chain_for_service("kubernetes", ScalabilityScore)
-        chain = prompt | structured_model
-        if langfuse_handler is not None:
-            return chain.invoke(
-                {"workload_context": workload_context},
-                config={"callbacks": [langfuse_handler]},
             )
+            .context(
+                "Workload definitions:\n\n"
+                "{workload_context}"
+            )
+        )
 
-        return chain.invoke({"workload_context": workload_context})
+        structured_model = get_structured_chain_for_service("kubernetes", ScalabilityScore, "WorkloadScores")
+        chain = prompt.template() | structured_model
+        return chain.invoke(
+            {"workload_context": workload_context},
+            config=prompt.config(langfuse_handler),
+        )
@@ -22,6 +22,7 @@ from langfuse.callback import CallbackHandler
 from pydantic import BaseModel, Field
 
 from fred.application_context import get_model_for_service
+from fred.common.prompt_builder import PromptBuilder
 from fred.services.ai.structure.workload_context import WorkloadContext
 
 
@@ -56,30 +57,25 @@ class WorkloadSummary(BaseModel):
             workload_context (WorkloadContext): The workload context.
             langfuse_handler (Optional[CallbackHandler]): The LangFuse callback handler.
         """
-        model = get_model_for_service("kubernetes")
+        model = get_model_for_service("kubernetes", "WorkloadSummary")
 
         prompt = (
-                f"You are an expert in Kubernetes.\n\n"
-                f"Based on the following workload definitions:\n\n"
-                f"{workload_context}\n\n"
-                f"Please provide a summary of the workload.\n"
-                f"You should highlight the key aspects of the workload, comment on "
-                f"the configuration, and provide any other relevant information.\n"
-                f"Your response SHOULD be concise.\n"
-                f"Start by a title representing the name of the software deployed, then followed "
-                f"by structured paragraphs.\n"
-                f"You MUST NOT provide a list of informations.\n"
-                f"The format of the response should be markdown."
-        )
-
-        messages = [{"role": "system", "content": prompt}]
-
-        if langfuse_handler is not None:
-            response = model.invoke(
-                messages,
-                config={"callbacks": [langfuse_handler]},
+            PromptBuilder("WorkloadSummary")
+            .instructions(
+                "You are an expert in Kubernetes.\n\n"
+                "Please provide a summary of the workload defined after these instructions.\n"
+                "You should highlight the key aspects of the workload, comment on "
+                "the configuration, and provide any other relevant information.\n"
+                "Your response SHOULD be concise.\n"
+                "Start by a title representing the name of the software deployed, then followed "
+                "by structured paragraphs.\n"
+                "You MUST NOT provide a list of informations.\n"
+                "The format of the response should be markdown."
             )
+            .context("Workload definitions:\n\n{workload_context}")
+        )
 
-            return cls(workload_summary=response.content)
+        messages = prompt.template().format_messages(workload_context=workload_context)
+        response = model.invoke(messages, config=prompt.config(langfuse_handler))
 
-        return cls(workload_summary=model.invoke(messages).content)
+        return cls(workload_summary=response.content)
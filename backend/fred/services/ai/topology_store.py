@@ -0,0 +1,267 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Materialized cluster, namespace and workload topologies.
+
+Building a topology walks every namespace and workload of a cluster. The `TopologyStore`
+keeps the topologies built so far and serves them until a change invalidates them:
+invalidating a workload drops its topology and the topologies of its namespace and
+cluster, which are rebuilt from the topologies that are still valid.
+
+The `TopologyWatcher` feeds the store with the changes of the namespaces, resource quotas,
+limit ranges, workloads, services and ingresses of the watched clusters, using the
+Kubernetes watch API. When the clusters are not watched, the store is given a maximum age
+that bounds how stale a topology can be.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from kubernetes import watch
+
+from fred.common.structure import WorkloadKind
+from fred.services.ai.structure.cluster_topology import ClusterTopology
+from fred.services.ai.structure.namespace_topology import NamespaceTopology
+from fred.services.ai.structure.workload_topology import WorkloadTopology
+
+logger = logging.getLogger(__name__)
+
+WorkloadKey = Tuple[str, str, WorkloadKind, str]
+
+
+class TopologyStore:
+    """
+    Thread-safe in-memory store of the topologies, with hierarchical invalidation.
+
+    Every invalidation increments the generation of the cluster. A topology built while
+    an invalidation happened is discarded by `put_*`, so that a stale topology is never
+    stored.
+    """
+
+    def __init__(self, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            max_age_seconds (Optional[float]): The duration after which a topology is rebuilt
+                even if nothing invalidated it, or None to serve it until invalidated.
+        """
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        # The topologies are stored with the time they were stored at.
+        self._clusters: Dict[str, Tuple[float, ClusterTopology]] = {}
+        self._namespaces: Dict[Tuple[str, str], Tuple[float, NamespaceTopology]] = {}
+        self._workloads: Dict[WorkloadKey, Tuple[float, WorkloadTopology]] = {}
+
+    def _get(self, topologies: Dict[Any, Tuple[float, Any]], key) -> Optional[Any]:
+        with self._lock:
+            entry = topologies.get(key)
+            if entry is None:
+                return None
+            stored_at, topology = entry
+            if self.max_age_seconds is not None and time.time() - stored_at > self.max_age_seconds:
+                del topologies[key]
+                return None
+            return topology
+
+    def _put(self, topologies: Dict[Any, Tuple[float, Any]], key, cluster: str, topology,
+             generation: int) -> bool:
+        with self._lock:
+            if self._generations.get(cluster, 0) != generation:
+                return False
+            topologies[key] = (time.time(), topology)
+            return True
+
+    def generation(self, cluster: str) -> int:
+        """
+        Return the current generation of a cluster. Capture it before building a topology
+        and give it back to `put_*`.
+        """
+        with self._lock:
+            return self._generations.get(cluster, 0)
+
+    def get_cluster(self, cluster: str) -> Optional[ClusterTopology]:
+        return self._get(self._clusters, cluster)
+
+    def put_cluster(self, cluster: str, topology: ClusterTopology, generation: int) -> bool:
+        return self._put(self._clusters, cluster, cluster, topology, generation)
+
+    def get_namespace(self, cluster: str, namespace: str) -> Optional[NamespaceTopology]:
+        return self._get(self._namespaces, (cluster, namespace))
+
+    def put_namespace(self, cluster: str, namespace: str, topology: NamespaceTopology,
+                      generation: int) -> bool:
+        return self._put(self._namespaces, (cluster, namespace), cluster, topology, generation)
+
+    def get_workload(self, cluster: str, namespace: str, kind: WorkloadKind,
+                     name: str) -> Optional[WorkloadTopology]:
+        return self._get(self._workloads, (cluster, namespace, kind, name))
+
+    def put_workload(self, cluster: str, namespace: str, kind: WorkloadKind, name: str,  # pylint: disable=R0913, R0917
+                     topology: WorkloadTopology, generation: int) -> bool:
+        return self._put(self._workloads, (cluster, namespace, kind, name), cluster, topology, generation)
+
+    def _bump(self, cluster: str) -> None:
+        self._generations[cluster] = self._generations.get(cluster, 0) + 1
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        """
+        Invalidate the cluster topology only, e.g. when the cluster summary or facts change.
+        """
+        with self._lock:
+            self._bump(cluster)
+            self._clusters.pop(cluster, None)
+
+    def invalidate_namespace(self, cluster: str, namespace: str, workloads: bool = False) -> None:
+        """
+        Invalidate a namespace topology and the cluster topology.
+
+        Args:
+            cluster (str): The cluster name.
+            namespace (str): The namespace.
+            workloads (bool): Whether the topologies of the workloads of the namespace are
+                invalidated as well, e.g. when a service or an ingress changes.
+        """
+        with self._lock:
+            self._bump(cluster)
+            self._clusters.pop(cluster, None)
+            self._namespaces.pop((cluster, namespace), None)
+            if workloads:
+                for key in [key for key in self._workloads if key[:2] == (cluster, namespace)]:
+                    del self._workloads[key]
+
+    def invalidate_workload(self, cluster: str, namespace: str, kind: WorkloadKind, name: str) -> None:
+        """
+        Invalidate a workload topology, and the topologies of its namespace and cluster.
+        """
+        with self._lock:
+            self._bump(cluster)
+            self._clusters.pop(cluster, None)
+            self._namespaces.pop((cluster, namespace), None)
+            self._workloads.pop((cluster, namespace, kind, name), None)
+
+    def clear(self, cluster: str) -> None:
+        """
+        Drop every topology of a cluster.
+        """
+        with self._lock:
+            self._bump(cluster)
+            self._clusters.pop(cluster, None)
+            for key in [key for key in self._namespaces if key[0] == cluster]:
+                del self._namespaces[key]
+            for key in [key for key in self._workloads if key[0] == cluster]:
+                del self._workloads[key]
+
+
+class TopologyWatcher:
+    """
+    Watch the namespaces, resource quotas, limit ranges, workloads, services and ingresses
+    of clusters and invalidate the corresponding topologies when they change.
+    """
+
+    def __init__(
+        self,
+        store: TopologyStore,
+        list_functions: Callable[[str], Dict[str, Callable]],
+        timeout_seconds: int = 300,
+        forget_changed_object: Optional[Callable[[str, str, Optional[str], str], None]] = None,
+    ):
+        """
+        Args:
+            store (TopologyStore): The store to invalidate.
+            list_functions (Callable[[str], Dict[str, Callable]]): Returns, for a cluster, the
+                cluster-wide list function of every watched resource, keyed by workload kind,
+                'Namespace', 'ResourceQuota', 'LimitRange', 'Service' or 'Ingress'.
+            timeout_seconds (int): The duration of a watch request before it is renewed.
+            forget_changed_object (Optional[Callable[[str, str, Optional[str], str], None]]):
+                Drops the cached copies of a changed object, given its cluster, resource,
+                namespace and name, so that the topologies are rebuilt from its new state.
+        """
+        self.store = store
+        self.list_functions = list_functions
+        self.timeout_seconds = timeout_seconds
+        self.forget_changed_object = forget_changed_object
+        self._lock = threading.Lock()
+        self._watched: Dict[str, threading.Event] = {}
+
+    def watch(self, cluster: str) -> None:
+        """
+        Start watching a cluster, if not already watched.
+        """
+        with self._lock:
+            if cluster in self._watched:
+                return
+            stop_event = threading.Event()
+            self._watched[cluster] = stop_event
+
+        for resource, list_function in self.list_functions(cluster).items():
+            threading.Thread(
+                target=self._watch_resource,
+                args=(cluster, resource, list_function, stop_event),
+                name=f"topology-watch-{cluster}-{resource}",
+                daemon=True,
+            ).start()
+        logger.info(f"Watching the topology changes of Cluster '{cluster}'")
+
+    def stop(self, cluster: str) -> None:
+        with self._lock:
+            stop_event = self._watched.pop(cluster, None)
+        if stop_event is not None:
+            stop_event.set()
+
+    def _watch_resource(self, cluster: str, resource: str, list_function: Callable,
+                        stop_event: threading.Event) -> None:
+        resource_version = None
+        while not stop_event.is_set():
+            try:
+                if resource_version is None:
+                    # Start from the current state: the existing objects are not changes.
+                    resource_version = list_function(limit=1).metadata.resource_version
+                stream = watch.Watch().stream(
+                    list_function,
+                    resource_version=resource_version,
+                    timeout_seconds=self.timeout_seconds,
+                )
+                for event in stream:
+                    if stop_event.is_set():
+                        return
+                    resource_version = event["object"].metadata.resource_version
+                    self.on_event(cluster, resource, event["object"].metadata)
+            except Exception as e:  # pylint: disable=W0718
+                # The resource version may have expired (410 Gone): restart from the current
+                # state, after invalidating everything since changes may have been missed.
+                logger.warning(f"Restarting the watch of {resource} in Cluster '{cluster}': {e}")
+                resource_version = None
+                self.store.clear(cluster)
+                stop_event.wait(5)
+
+    def on_event(self, cluster: str, resource: str, metadata) -> None:
+        """
+        Invalidate the topologies impacted by the change of an object.
+        """
+        # The cached copies go first: a topology rebuilt after the invalidation reads the
+        # new state of the object.
+        if self.forget_changed_object is not None:
+            self.forget_changed_object(cluster, resource, metadata.namespace, metadata.name)
+        if resource == "Namespace":
+            # The cluster context lists the namespaces.
+            self.store.invalidate_namespace(cluster, metadata.name)
+        elif resource in ("ResourceQuota", "LimitRange"):
+            self.store.invalidate_namespace(cluster, metadata.namespace)
+        elif resource in ("Service", "Ingress"):
+            self.store.invalidate_namespace(cluster, metadata.namespace, workloads=True)
+        else:
+            self.store.invalidate_workload(cluster, metadata.namespace, WorkloadKind(resource), metadata.name)
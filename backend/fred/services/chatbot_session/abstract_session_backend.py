@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import List, Optional
 from abc import ABC, abstractmethod
 
 from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, SessionSchema
@@ -40,6 +40,15 @@ class AbstractSessionStorage(ABC):
         """
         pass
 
+    def evict_session(self, session_id: str) -> bool:
+        """
+        Release the memory held for a cold session. Persistent storages keep the session.
+
+        Returns:
+            Whether the session was dropped from the storage.
+        """
+        return False
+
     @abstractmethod
     def get_sessions_for_user(self, user_id: str) -> List[SessionSchema]:
         """
@@ -53,6 +62,22 @@ class AbstractSessionStorage(ABC):
         pass
 
     @abstractmethod
-    def get_message_history(self, session_id: str) -> List[ChatMessagePayload]:
-        """Retrieve messages for a given session."""
+    def get_message_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        before_rank: Optional[int] = None,
+        since_rank: Optional[int] = None,
+    ) -> List[ChatMessagePayload]:
+        """
+        Retrieve messages for a given session, ordered by rank.
+
+        Args:
+            session_id: The ID of the session.
+            limit: Maximum number of messages. The latest ones are returned, or the first ones
+                after `since_rank` if it is set. Pages hold whole ranks: the messages sharing
+                the rank cut by the limit are all returned, so ranks are safe cursors.
+            before_rank: Only return the messages of a lower rank.
+            since_rank: Only return the messages of a higher rank.
+        """
         pass
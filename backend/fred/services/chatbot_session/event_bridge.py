@@ -0,0 +1,77 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bridge between the agent callbacks and a streamed HTTP response.
+
+The agent run is a producer pushing events into a bounded queue, and the response body is
+the consumer draining it. Each event is handed to the server as soon as it is produced, and
+a slow client makes the producer wait instead of buffering the whole exchange in memory.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Number of events the agent may run ahead of the client.
+MAX_PENDING_EVENTS = 32
+
+EmitType = Callable[[str], Awaitable[None]]
+
+_END = object()
+
+
+async def stream_events(
+    produce: Callable[[EmitType], Awaitable[None]],
+    max_pending: int = MAX_PENDING_EVENTS,
+) -> AsyncIterator[str]:
+    """
+    Run a producer in a background task and yield the events it emits, in order.
+
+    Args:
+        produce: Coroutine function receiving an `emit` coroutine to call for each event.
+        max_pending: Number of events buffered before `emit` waits for the consumer.
+
+    Yields:
+        The emitted events. An exception raised by the producer is re-raised once the events
+        emitted before it have been yielded. If the consumer stops early (the client went
+        away), the producer is cancelled.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def run():
+        try:
+            await produce(queue.put)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(_END)
+            raise
+        await queue.put(_END)
+
+    task = asyncio.create_task(run())
+    try:
+        while (event := await queue.get()) is not _END:
+            yield event
+        await task
+    finally:
+        if not task.done():
+            logger.info("Stream consumer closed, cancelling the agent run")
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
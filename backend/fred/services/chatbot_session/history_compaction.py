@@ -0,0 +1,122 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compaction of the conversation held in the state of an agent.
+
+When the messages of a conversation exceed the token budget of the agent, the last turns
+are kept verbatim and the older ones are folded into a running summary, which takes the
+place of the first folded message. Tool results are replaced by short digests, except in
+the last turn.
+
+The compaction is computed as a state update, from a snapshot of the conversation taken
+after a turn. Messages are only appended to a conversation between two compactions, so the
+update stays valid until it is applied, before the next turn.
+"""
+
+import logging
+from typing import List, Sequence
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+
+from fred.common.prompt_builder import PromptBuilder
+from fred.common.structure import HistoryCompactionSettings
+from fred.common.token_utils import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MARKER = "Summary of the earlier conversation:\n"
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """
+    Split a conversation into turns, each one starting with a question of the user. The
+    messages before the first question (e.g. a previous summary) form a turn of their own.
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def count_message_tokens(messages: Sequence[BaseMessage], model: str) -> int:
+    return sum(count_tokens(message.text(), model) for message in messages)
+
+
+class HistoryCompactor:
+    """
+    Computes the compaction of a conversation with a summarization model.
+    """
+
+    def __init__(self, settings: HistoryCompactionSettings, model: BaseLanguageModel):
+        self.settings = settings
+        self.model = model
+
+    def needs_compaction(self, messages: Sequence[BaseMessage]) -> bool:
+        return count_message_tokens(messages, self.settings.tokenizer_model) > self.settings.max_tokens
+
+    def _digest(self, message: BaseMessage) -> BaseMessage:
+        if not isinstance(message, ToolMessage) or message.response_metadata.get("digest"):
+            return message
+        digest = truncate_to_tokens(message.text(), self.settings.tool_digest_tokens, self.settings.tokenizer_model)
+        if digest == message.content:
+            return message
+        return message.model_copy(update={"content": digest, "response_metadata": {**message.response_metadata, "digest": True}})
+
+    async def compact(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Compute the state update compacting a conversation.
+
+        Args:
+            messages: The messages of the conversation, with their ids.
+
+        Returns:
+            The messages to add to the state: the summary and digests replacing messages
+            of the same id, and removals. Empty if there is nothing to compact.
+        """
+        turns = split_turns(messages)
+        folded = [message for turn in turns[:-self.settings.keep_turns] for message in turn]
+        kept = [message for turn in turns[-self.settings.keep_turns:-1] for message in turn]
+        if len(folded) < 2 and not any(isinstance(message, ToolMessage) for message in kept):
+            return []
+
+        update: List[BaseMessage] = []
+        if len(folded) >= 2:
+            conversation = "\n\n".join(
+                f"{message.type}: {self._digest(message).text()}" for message in folded
+            )
+            prompt = (
+                PromptBuilder("HistorySummary")
+                .instructions(
+                    "You summarize a conversation between a user and an assistant, so that the assistant can "
+                    "continue it without the original messages.\n"
+                    "Keep the facts, figures, names, decisions and open questions. Drop greetings and repetitions.\n"
+                    "If the conversation starts with a previous summary, merge it into the new one.\n"
+                    f"Answer with the summary only, in at most {self.settings.summary_max_tokens} tokens."
+                )
+                .context("{conversation}")
+            )
+            summary = await (prompt.template() | self.model).ainvoke(
+                {"conversation": conversation}, config=prompt.config()
+            )
+            update.append(SystemMessage(content=SUMMARY_MARKER + summary.text(), id=folded[0].id))
+            update.extend(RemoveMessage(id=message.id) for message in folded[1:])
+
+        digests = [digest for message in kept if (digest := self._digest(message)) is not message]
+        update.extend(digests)
+        logger.info(f"Compacting {len(folded)} messages into a summary and {len(digests)} tool results into digests")
+        return update
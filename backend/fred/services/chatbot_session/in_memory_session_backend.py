@@ -13,7 +13,8 @@
 # limitations under the License.
 
 import logging
-from typing import Dict, List
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
 
 from fred.services.chatbot_session.abstract_session_backend import AbstractSessionStorage
 from fred.services.chatbot_session.session_manager import SessionSchema
@@ -23,10 +24,14 @@ logger = logging.getLogger(__name__)
 class InMemorySessionStorage(AbstractSessionStorage):
     def __init__(self):
         self.sessions: Dict[str, SessionSchema] = {}
+        # Session IDs of each user, in creation order.
+        self.user_sessions: Dict[str, Dict[str, None]] = {}
+        # Messages of each session, kept sorted by rank.
         self.history: Dict[str, List[ChatMessagePayload]] = {}
 
     def save_session(self, session: SessionSchema) -> None:
         self.sessions[session.id] = session
+        self.user_sessions.setdefault(session.user_id, {})[session.id] = None
 
     def get_session(self, session_id: str) -> SessionSchema:
         if session_id not in self.sessions:
@@ -35,24 +40,42 @@ class InMemorySessionStorage(AbstractSessionStorage):
 
     def delete_session(self, session_id: str) -> bool:
         if session_id in self.sessions:
-            del self.sessions[session_id]
+            session = self.sessions.pop(session_id)
+            self.user_sessions.get(session.user_id, {}).pop(session_id, None)
             self.history.pop(session_id, None)
             return True
         return False
 
+    def evict_session(self, session_id: str) -> bool:
+        # The memory is the only copy of the session.
+        return self.delete_session(session_id)
+
     def get_sessions_for_user(self, user_id: str) -> List[SessionSchema]:
-        #debug
-        logger.debug(f"Retrieving sessions for user: {user_id}")
-        for session in self.sessions.values():
-            logger.debug(f"Session ID: {session.id}, User ID: {session.user_id}")
-        return [s for s in self.sessions.values() if s.user_id == user_id]
+        return [self.sessions[session_id] for session_id in self.user_sessions.get(user_id, {})]
 
     def save_messages(self, session_id: str, messages: List[ChatMessagePayload]) -> None:
-        if session_id not in self.history:
-            self.history[session_id] = []
-        self.history[session_id].extend(messages)
+        history = self.history.setdefault(session_id, [])
+        in_order = not history or all(m.rank >= history[-1].rank for m in messages)
+        history.extend(messages)
+        if not in_order:
+            history.sort(key=lambda m: m.rank)
         logger.info(f"Saved {len(messages)} messages to session {session_id}")
 
-    def get_message_history(self, session_id: str) -> List[ChatMessagePayload]:
+    def get_message_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        before_rank: Optional[int] = None,
+        since_rank: Optional[int] = None,
+    ) -> List[ChatMessagePayload]:
         history = self.history.get(session_id, [])
-        return sorted(history, key=lambda m: m.rank if m.rank is not None else 0)
+        start = bisect_right(history, since_rank, key=lambda m: m.rank) if since_rank is not None else 0
+        end = bisect_left(history, before_rank, key=lambda m: m.rank) if before_rank is not None else len(history)
+        if limit is not None and end - start > limit:
+            # Pages hold whole ranks, so that a page never splits a question from the context
+            # injected before it: the rank cut by the limit is included entirely.
+            if since_rank is not None:
+                end = bisect_right(history, history[start + limit - 1].rank, key=lambda m: m.rank)
+            else:
+                start = bisect_left(history, history[end - limit].rank, key=lambda m: m.rank)
+        return history[start:max(start, end)]
@@ -0,0 +1,153 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lifecycle of the chat sessions resident in memory.
+
+A session becomes resident when it is used, and stays so while it keeps being used. It is
+cold, and evicted, when it has been idle for the configured time to live, or when the
+resident sessions hold more than the memory cap: the least recently used ones go first.
+A session running a question is never evicted.
+
+The sessions are swept lazily, when a question ends, at most once per sweep interval unless
+the memory cap is exceeded.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Set
+
+from pydantic import BaseModel, Field
+
+from fred.common.structure import SessionLifecycleSettings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLifecycleStats(BaseModel):
+    """
+    Gauges of the sessions resident in memory.
+    """
+
+    resident_sessions: int = Field(description="The number of sessions resident in memory")
+    resident_bytes: int = Field(description="The estimated size of the conversations of the resident sessions, in bytes")
+    max_resident_bytes: int = Field(description="The memory cap of the resident sessions, in bytes")
+    idle_evictions: int = Field(description="The number of sessions evicted after their idle time to live since the start")
+    memory_evictions: int = Field(description="The number of sessions evicted to stay under the memory cap since the start")
+
+
+@dataclass
+class _ResidentSession:
+    last_used: float
+    size_bytes: int = 0
+    running: int = 0
+    agent_names: Set[str] = field(default_factory=set)
+
+
+class SessionLifecycle:
+    """
+    Tracks the resident sessions and tells which ones are cold. Releasing their memory is
+    left to the session manager.
+    """
+
+    def __init__(self, settings: SessionLifecycleSettings):
+        self.settings = settings
+        # Least recently used first.
+        self._sessions: OrderedDict[str, _ResidentSession] = OrderedDict()
+        self._resident_bytes = 0
+        self._last_sweep = time.time()
+        self._idle_evictions = 0
+        self._memory_evictions = 0
+
+    def _touch(self, session_id: str) -> _ResidentSession:
+        resident = self._sessions.get(session_id)
+        if resident is None:
+            resident = self._sessions[session_id] = _ResidentSession(last_used=time.time())
+        self._sessions.move_to_end(session_id)
+        resident.last_used = time.time()
+        return resident
+
+    def begin(self, session_id: str, agent_name: str):
+        """
+        Marks a session as running a question of an agent.
+        """
+        resident = self._touch(session_id)
+        resident.running += 1
+        resident.agent_names.add(agent_name)
+
+    def end(self, session_id: str, added_bytes: int = 0):
+        """
+        Marks the question of a session as done, the conversation having grown by `added_bytes`.
+        """
+        resident = self._touch(session_id)
+        resident.running = max(resident.running - 1, 0)
+        resident.size_bytes += added_bytes
+        self._resident_bytes += added_bytes
+
+    def use(self, session_id: str):
+        """
+        Marks a session as used outside of a question, e.g. by an upload.
+        """
+        self._touch(session_id)
+
+    def forget(self, session_id: str):
+        """
+        Stops tracking a session, e.g. when it is deleted.
+        """
+        if resident := self._sessions.pop(session_id, None):
+            self._resident_bytes -= resident.size_bytes
+
+    def agent_names(self) -> Set[str]:
+        """
+        The agents used by the resident sessions.
+        """
+        return {name for resident in self._sessions.values() for name in resident.agent_names}
+
+    def pop_cold_sessions(self) -> List[str]:
+        """
+        Stops tracking the cold sessions, and returns their IDs to be evicted.
+        """
+        now = time.time()
+        over_cap = self._resident_bytes > self.settings.max_resident_bytes
+        if not over_cap and now - self._last_sweep < self.settings.sweep_interval_seconds:
+            return []
+        self._last_sweep = now
+
+        cold = []
+        for session_id, resident in list(self._sessions.items()):
+            if resident.running:
+                continue
+            if now - resident.last_used > self.settings.idle_ttl_seconds:
+                self._idle_evictions += 1
+            elif self._resident_bytes > self.settings.max_resident_bytes:
+                self._memory_evictions += 1
+            else:
+                # The next sessions were used more recently.
+                break
+            cold.append(session_id)
+            self.forget(session_id)
+        if cold:
+            logger.info(f"Evicting {len(cold)} cold sessions, {len(self._sessions)} sessions and {self._resident_bytes} bytes remain resident")
+        return cold
+
+    def stats(self) -> SessionLifecycleStats:
+        return SessionLifecycleStats(
+            resident_sessions=len(self._sessions),
+            resident_bytes=self._resident_bytes,
+            max_resident_bytes=self.settings.max_resident_bytes,
+            idle_evictions=self._idle_evictions,
+            memory_evictions=self._memory_evictions,
+        )
@@ -16,8 +16,9 @@ from datetime import datetime
 import logging
 from pathlib import Path
 import secrets
+import shutil
 import tempfile
-from typing import List, Tuple, Dict, Any, Optional, Union, Callable, Awaitable
+from typing import List, Set, Tuple, Dict, Any, Optional, Union, Callable, Awaitable
 from uuid import uuid4
 
 from fastapi import UploadFile
@@ -28,9 +29,15 @@ from fred.flow import AgentFlow
 from fred.services.chatbot_session.attachement_processing import AttachementProcessing
 from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, ChatTokenUsage, SessionSchema, SessionWithFiles, clean_agent_metadata
 from fred.services.chatbot_session.abstract_session_backend import AbstractSessionStorage
-from langchain_core.messages import (BaseMessage, HumanMessage, AIMessage)
+from langchain_core.messages import (BaseMessage, HumanMessage, AIMessage, AIMessageChunk)
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.constants import NS_SEP
 from langgraph.graph.state import CompiledStateGraph
-from fred.application_context import get_app_context, get_configuration, get_context_service, get_default_model
+from fred.application_context import get_agent_settings, get_app_context, get_checkpointer, get_configuration, get_context_service, get_default_model, get_enabled_agent_names
+from fred.model_factory import get_model
+from fred.services.chatbot_session.history_compaction import HistoryCompactor
+from fred.services.chatbot_session.session_lifecycle import SessionLifecycle, SessionLifecycleStats
+from fred.leader.leader import Leader
 
 from fred.monitoring.logging_context import set_logging_context
 
@@ -63,8 +70,16 @@ class SessionManager:
         self.temp_files: dict[str, list[str]] = defaultdict(list)
         self.attachement_processing = AttachementProcessing()
 
+        self._compactors: Dict[str, Optional[HistoryCompactor]] = {}
+        self._compactions: Dict[str, asyncio.Task] = {}
+        # Titles still generated after the end of their exchange.
+        self._title_tasks: Set[asyncio.Task] = set()
+
         config = get_configuration()
         self.recursion_limit = config.ai.recursion.recursion_limit
+        self.title_settings = config.ai.session_title
+        self.lifecycle = SessionLifecycle(config.ai.session_lifecycle)
+        self._title_model = None
         
     def _infer_message_subtype(self, metadata: dict, message_type: str | None = None) -> Optional[str]:
         """
@@ -125,10 +140,8 @@ class SessionManager:
                 return session, False
 
         new_session_id = secrets.token_urlsafe(8)
-        title: str = get_default_model().invoke(
-            "Give a short, clear title for this conversation based on the user's question. Just a few keywords. Here's the question: " + query
-        ).content
-
+        # Provisional title, the real one is generated while the agent answers.
+        title = self._provisional_title(query)
 
         session = SessionSchema(
             id=new_session_id,
@@ -140,6 +153,42 @@ class SessionManager:
         logger.warning(f"Created new session {new_session_id} for user {user_id}")
         return session, True
 
+    def _provisional_title(self, query: str) -> str:
+        max_length = self.title_settings.max_length
+        title = " ".join(query.split())
+        if len(title) > max_length:
+            title = title[:max_length].rsplit(" ", 1)[0] + "…"
+        return title or "New conversation"
+
+    def _get_title_model(self):
+        if self._title_model is None:
+            model = self.title_settings.model
+            self._title_model = get_model(model) if model else get_default_model()
+        return self._title_model
+
+    async def _generate_title(self, session: SessionSchema, query: str, session_callback: Optional[CallbackType],
+                              exchange_closed: asyncio.Event):
+        """
+        Replaces the provisional title of a new session by a generated one, and notifies the
+        client with the updated session while its exchange is open. A later title is only
+        saved: the client gets it with the session list.
+        """
+        try:
+            response = await self._get_title_model().ainvoke(
+                "Give a short, clear title for this conversation based on the user's question. "
+                "Just a few keywords. Here's the question: " + query
+            )
+            title = response.content.strip().strip('"')[:self.title_settings.max_length]
+        except Exception as e:
+            logger.warning(f"Failed to generate the title of session {session.id}: {e}")
+            return
+        if not title:
+            return
+        session.title = title
+        self.storage.save_session(session)
+        if session_callback and not exchange_closed.is_set():
+            await self._notify(session_callback, session)
+
     async def chat_ask_websocket(
         self,
         callback: CallbackType,
@@ -148,11 +197,16 @@ class SessionManager:
         message: str,
         agent_name: str,
         argument: str,
-        chat_profile_id: Optional[str] = None
+        chat_profile_id: Optional[str] = None,
+        session_callback: Optional[CallbackType] = None
     ) -> Tuple[SessionSchema, List[ChatMessagePayload]]:
+        """
+        Runs a question through an agent, streaming the messages to `callback` and the updates
+        of the session (e.g. its generated title) to `session_callback`.
+        """
         logger.info(f"chat_ask_websocket called with user_id: {user_id}, session_id: {session_id}, message: {message}, agent_name: {agent_name}, chat_profile_id: {chat_profile_id}")
 
-        session, history, agent, is_new_session = self._prepare_session_and_history(
+        session, history, agent, base_rank, is_new_session, is_new_thread = await self._prepare_session_and_history(
             user_id=user_id,
             session_id=session_id,
             message=message,
@@ -161,98 +215,129 @@ class SessionManager:
         )
         set_logging_context(user_id=user_id, session_id=session.id)
         exchange_id = str(uuid4())
-        base_rank = len(history)
-
-        injected_payload = None
-
-        # 🔁 Inject profile context if provided
-        if chat_profile_id:
-            try:
-                profile_data = self.get_chat_profile_data(chat_profile_id)
-                title = profile_data.get("title", "")
-                description = profile_data.get("description", "")
-                markdown = profile_data.get("markdown", "")
-                full_context = f"## {title}\n\n{description}\n\n{markdown}"
-
-                # Inject AIMessage and keep it for saving
-                profile_message = AIMessage(
-                    content=full_context,
-                    response_metadata={"injected": True, "origin": "chat_profile"}
-                )
-                history.insert(0, profile_message)
-
-                injected_payload = ChatMessagePayload(
-                    exchange_id=str(uuid4()),
-                    type="ai",
-                    sender="assistant",
-                    content=full_context,
-                    timestamp=datetime.now().isoformat(),
-                    session_id=session.id,
-                    rank=base_rank,  # context before user message
-                    metadata={"injected": True, "origin": "chat_profile"},
-                    subtype="injected_context"
-                )
-
-                logger.info(f"[PROFILE CONTEXT INJECTED] Profile {chat_profile_id} injected successfully.")
-
-            except Exception as e:
-                logger.error(f"Failed to inject chat profile context: {e}")
-
-        # 🧠 Run agent
-        all_messages = await self._stream_agent_response(
-            compiled_graph=agent.get_compiled_graph(),
-            input_messages=history,
-            session_id=session.id,
-            callback=callback,
-            exchange_id=exchange_id,
-            base_rank=base_rank,
-        )
-
-        session.updated_at = datetime.now()
-        self.storage.save_session(session)
+        self.lifecycle.begin(session.id, agent_name)
+        all_payloads: List[ChatMessagePayload] = []
+        exchange_closed = asyncio.Event()
+        title_task = asyncio.create_task(
+            self._generate_title(session, message, session_callback, exchange_closed)) if is_new_session else None
+        try:
 
-        # 🙋‍♀️ User message payload
-        timestamp = datetime.now().isoformat()
-        metadata = clean_agent_metadata(getattr(message, "response_metadata", getattr(message, "metadata", {})) or {})
-        subtype = self._infer_message_subtype(metadata, message.type if isinstance(message, BaseMessage) else None)
-
-        user_payload = ChatMessagePayload(
-            exchange_id=exchange_id,
-            type="human",
-            sender="user",
-            content=message,
-            timestamp=timestamp,
-            session_id=session.id,
-            rank=base_rank,
-            subtype=subtype
-        )
+            injected_payload = None
+
+            # 🔁 Inject profile context if provided. The client sends it with every question,
+            # but the profile only opens the agent thread: it is then kept by the checkpointer.
+            if chat_profile_id and is_new_thread and not self._has_chat_profile(history):
+                try:
+                    profile_data = self.get_chat_profile_data(chat_profile_id)
+                    title = profile_data.get("title", "")
+                    description = profile_data.get("description", "")
+                    markdown = profile_data.get("markdown", "")
+                    full_context = f"## {title}\n\n{description}\n\n{markdown}"
+
+                    # Inject AIMessage and keep it for saving
+                    profile_message = AIMessage(
+                        content=full_context,
+                        response_metadata={"injected": True, "origin": "chat_profile"}
+                    )
+                    history.insert(0, profile_message)
 
-        # 🧾 Re-rank assistant messages
-        for i, m in enumerate(all_messages):
-            m.rank = base_rank + 1 + i
+                    injected_payload = ChatMessagePayload(
+                        exchange_id=str(uuid4()),
+                        type="ai",
+                        sender="assistant",
+                        content=full_context,
+                        timestamp=datetime.now().isoformat(),
+                        session_id=session.id,
+                        rank=base_rank,  # context before user message
+                        metadata={"injected": True, "origin": "chat_profile"},
+                        subtype="injected_context"
+                    )
 
-        # 🧠 Save messages: profile (optional) + user + responses
-        all_payloads = []
-        if injected_payload:
-            all_payloads.append(injected_payload)
-        all_payloads.append(user_payload)
-        all_payloads.extend(all_messages)
+                    logger.info(f"[PROFILE CONTEXT INJECTED] Profile {chat_profile_id} injected successfully.")
 
-        self.storage.save_messages(session.id, all_payloads)
-        return session, all_payloads
+                except Exception as e:
+                    logger.error(f"Failed to inject chat profile context: {e}")
 
+            # 🧠 Run agent
+            compiled_graph = agent.get_compiled_graph()
+            config = {
+                "configurable": {"thread_id": self._thread_id(session.id, agent_name)},
+                "recursion_limit": self.recursion_limit
+            }
+            await self._apply_compaction(compiled_graph, config)
+            all_messages = await self._stream_agent_response(
+                compiled_graph=compiled_graph,
+                input_messages=history,
+                session_id=session.id,
+                callback=callback,
+                exchange_id=exchange_id,
+                base_rank=base_rank,
+                config=config,
+            )
+            self._schedule_compaction(compiled_graph, config, agent_name)
+            if title_task:
+                # Started with the agent, the title is usually ready by now. A slower title
+                # does not hold the answer back for long: it ends in the background.
+                await asyncio.wait({title_task}, timeout=self.title_settings.timeout_seconds)
+
+            session.updated_at = datetime.now()
+            self.storage.save_session(session)
+
+            # 🙋‍♀️ User message payload
+            timestamp = datetime.now().isoformat()
+            metadata = clean_agent_metadata(getattr(message, "response_metadata", getattr(message, "metadata", {})) or {})
+            subtype = self._infer_message_subtype(metadata, message.type if isinstance(message, BaseMessage) else None)
+
+            user_payload = ChatMessagePayload(
+                exchange_id=exchange_id,
+                type="human",
+                sender="user",
+                content=message,
+                timestamp=timestamp,
+                session_id=session.id,
+                rank=base_rank,
+                subtype=subtype
+            )
 
-    def _prepare_session_and_history(
+            # 🧾 Re-rank assistant messages
+            for i, m in enumerate(all_messages):
+                m.rank = base_rank + 1 + i
+
+            # 🧠 Save messages: profile (optional) + user + responses
+            all_payloads = []
+            if injected_payload:
+                all_payloads.append(injected_payload)
+            all_payloads.append(user_payload)
+            all_payloads.extend(all_messages)
+
+            self.storage.save_messages(session.id, all_payloads)
+            return session, all_payloads
+        finally:
+            # No session update may follow the end of the exchange, or its failure.
+            exchange_closed.set()
+            if title_task and not title_task.done():
+                self._title_tasks.add(title_task)
+                title_task.add_done_callback(self._title_tasks.discard)
+            self.lifecycle.end(session.id, sum(len(m.model_dump_json()) for m in all_payloads))
+            self._evict_cold_sessions()
+
+
+    async def _prepare_session_and_history(
         self, user_id: str, 
         session_id: str | None, 
         message: str,
         agent_name: str,
         argument: str
-    ) -> Tuple[SessionSchema, List[BaseMessage], AgentFlow, bool]:
+    ) -> Tuple[SessionSchema, List[BaseMessage], AgentFlow, int, bool, bool]:
         """
-        Prepares the session, message history, and agent instance.
+        Prepares the session, the input messages, and agent instance.
         The agent is determined by the agent_name parameter.
         If session_id is None, a new session is created.
+
+        The conversation state lives in the agent checkpointer, keyed by the session ID: when
+        it already holds the session thread, only the new question is sent. The stored history
+        is replayed only to seed a thread the checkpointer does not know (e.g. after a restart).
+
         Args:
             - user_id: the ID of the user
             - session_id: the ID of the session (None if a new session should be created)
@@ -263,16 +348,24 @@ class SessionManager:
             - session: the resolved or created session
             - history: the list of BaseMessage to feed to the agent
             - agent: the LangGraph agent instance
+            - base_rank: the rank of the new question in the session
             - is_new_session: whether this session was newly created
+            - is_new_thread: whether the agent thread is created or seeded by this question
         """
        
         session, is_new_session = self._get_or_create_session(user_id, message, session_id)
+        agent = self.agent_manager.get_create_agent_instance(agent_name, session.id, argument=argument)
+
+        last_messages = [] if is_new_session else self.storage.get_message_history(session.id, limit=1)
+        base_rank = last_messages[-1].rank + 1 if last_messages else 1
+        is_new_thread = is_new_session or not await self._has_checkpoint(
+            agent.get_compiled_graph(), self._thread_id(session.id, agent_name))
 
         # Build up message history
         history: List[BaseMessage] = []
-        if not is_new_session:
+        if last_messages and is_new_thread:
             messages = self.get_session_history(session.id)
-
+            logger.info(f"Seeding the agent thread of session {session.id} with {len(messages)} stored messages")
             for msg in messages:
                 logger.debug(f"[RESTORED] session_id={msg.session_id} exchange_id={msg.exchange_id} rank={msg.rank} | type={msg.type} | subtype={msg.subtype} | fred.task={msg.metadata.get('fred', {}).get('task')}")
                 if msg.type == "human":
@@ -283,17 +376,73 @@ class SessionManager:
                     #history.append(SystemMessage(content=msg.content))
                     pass
 
-
         # Append the new question
         history.append(HumanMessage(message))
 
-        agent = self.agent_manager.get_create_agent_instance(agent_name, session.id, argument=argument)
+        return session, history, agent, base_rank, is_new_session, is_new_thread
 
-        return session, history, agent, is_new_session
+    @staticmethod
+    def _has_chat_profile(history: List[BaseMessage]) -> bool:
+        """
+        Tells whether the stored messages replayed to seed a thread already open with a profile.
+        """
+        return any(m.response_metadata.get("origin") == "chat_profile" for m in history if isinstance(m, AIMessage))
+
+    @staticmethod
+    def _thread_id(session_id: str, agent_name: str) -> str:
+        """
+        The agents share a checkpointer: each one has its own conversation thread in a session.
+        """
+        return f"{session_id}:{agent_name}"
+
+    @staticmethod
+    async def _has_checkpoint(compiled_graph: CompiledStateGraph, thread_id: str) -> bool:
+        """
+        Tells whether the graph checkpointer holds a conversation thread.
+        """
+        if not isinstance(compiled_graph.checkpointer, BaseCheckpointSaver):
+            return False
+        return await compiled_graph.checkpointer.aget_tuple({"configurable": {"thread_id": thread_id}}) is not None
 
     def delete_session(self, session_id: str) -> bool:
+        checkpointer = get_checkpointer()
+        for agent_name in get_enabled_agent_names() + [Leader.name]:
+            thread_id = self._thread_id(session_id, agent_name)
+            checkpointer.delete_thread(thread_id)
+        self._cancel_compactions(session_id)
+        self.agent_manager.clear_cache_for_session(session_id)
+        self.lifecycle.forget(session_id)
         return self.storage.delete_session(session_id)
 
+    def _evict_cold_sessions(self):
+        """
+        Releases the agents, caches and temporary files of the cold sessions. A session held
+        only in memory is dropped, with its agent conversations.
+        """
+        cold_sessions = self.lifecycle.pop_cold_sessions()
+        for session_id in cold_sessions:
+            if self.storage.evict_session(session_id):
+                self.delete_session(session_id)
+            else:
+                self._cancel_compactions(session_id)
+                self.agent_manager.clear_cache_for_session(session_id)
+            shutil.rmtree(self.get_session_temp_folder(session_id), ignore_errors=True)
+            self.temp_files.pop(session_id, None)
+        if cold_sessions:
+            # The contexts of the agents no resident session uses are reloaded when needed.
+            for agent_name in set(self.context_cache) - self.lifecycle.agent_names():
+                del self.context_cache[agent_name]
+
+    def _cancel_compactions(self, session_id: str):
+        """
+        Drops the pending compactions of the agent threads of a session, and their messages.
+        """
+        for thread_id in [k for k in self._compactions if k.startswith(f"{session_id}:")]:
+            self._compactions.pop(thread_id).cancel()
+
+    def get_session_lifecycle_stats(self) -> SessionLifecycleStats:
+        return self.lifecycle.stats()
+
     def get_sessions(self, user_id: str) -> List[SessionWithFiles]:
         """
         Retrieves all sessions for a user and enriches them with file names.
@@ -325,8 +474,25 @@ class SessionManager:
         return enriched_sessions
 
 
-    def get_session_history(self, session_id: str) -> List[ChatMessagePayload]:
-        return self.storage.get_message_history(session_id)
+    def get_session_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        before_rank: Optional[int] = None,
+        since_rank: Optional[int] = None,
+    ) -> List[ChatMessagePayload]:
+        """
+        Retrieves the messages of a session ordered by rank, or a page of them.
+
+        Args:
+            session_id: The ID of the session.
+            limit: Maximum number of messages. The latest ones are returned, or the first ones
+                after `since_rank` if it is set. The messages sharing the rank cut by the limit
+                are all returned.
+            before_rank: Only return the messages of a lower rank, to page back through the history.
+            since_rank: Only return the messages of a higher rank, to catch up from the last known one.
+        """
+        return self.storage.get_message_history(session_id, limit=limit, before_rank=before_rank, since_rank=since_rank)
     
 
     async def _stream_agent_response(
@@ -342,6 +508,9 @@ class SessionManager:
         """
         Executes the agentic flow and streams responses via the given callback.
 
+        The callback receives the token deltas of the messages being generated (subtype
+        `delta`, with the rank of the message they belong to), then each complete message.
+
         Args:
             compiled_graph: A compiled LangGraph graph.
             input_messages: List of Human/AI messages.
@@ -351,7 +520,7 @@ class SessionManager:
             config: Optional LangGraph config dict override.
             
         Returns:
-            The final AIMessage.
+            The complete messages, without the deltas.
         """
 
         config = config or {
@@ -360,15 +529,36 @@ class SessionManager:
         }
         all_payloads: list[ChatMessagePayload] = []
         try:
-            async for event in compiled_graph.astream(
+            async for mode, event in compiled_graph.astream(
                 {"messages": input_messages},
                 config=config,
-                stream_mode="updates"
+                stream_mode=["updates", "messages"]
             ):
+                if mode == "messages":
+                    # Token deltas of the message being generated. They are streamed only, the
+                    # complete message follows in the node update and is the one persisted.
+                    chunk, chunk_metadata = event
+                    if not isinstance(chunk, AIMessageChunk) or not chunk.text():
+                        continue
+                    nested = NS_SEP in chunk_metadata.get("langgraph_checkpoint_ns", "")
+                    delta = ChatMessagePayload(
+                        exchange_id=exchange_id,
+                        type="ai",
+                        sender="assistant",
+                        content=chunk.text(),
+                        timestamp=datetime.now().isoformat(),
+                        rank=base_rank + 1 + len(all_payloads),
+                        session_id=session_id,
+                        metadata={"fred": {"node": chunk_metadata.get("langgraph_node")}, "thought": nested},
+                        subtype="delta"
+                    )
+                    await self._notify(callback, delta)
+                    continue
+
                 # LangGraph returns events like {'end': {'messages': [...]}} or {'next': {...}}
                 key = next(iter(event))
-                message_block = event[key].get("messages", [])
-                for i, message in enumerate(message_block):
+                message_block = (event[key] or {}).get("messages", [])
+                for message in message_block:
                     raw_metadata = getattr(message, "response_metadata", {}) or {}
                     cleaned_metadata = clean_agent_metadata(raw_metadata)
                     # If LangChain returns type='tool', force subtype to 'tool_result'
@@ -380,7 +570,7 @@ class SessionManager:
                         sender="assistant" if isinstance(message, AIMessage) else "system",
                         content=message.content,
                         timestamp=datetime.now().isoformat(),
-                        rank=base_rank + 1 + i, 
+                        rank=base_rank + 1 + len(all_payloads),
                         session_id=session_id,
                         metadata=cleaned_metadata,
                         subtype=subtype
@@ -396,9 +586,7 @@ class SessionManager:
                         enriched.metadata.get("fred", {}).get("task") if isinstance(enriched.metadata.get("fred"), dict) else None
                     )
 
-                    result = callback(enriched.model_dump())
-                    if asyncio.iscoroutine(result):
-                        await result
+                    await self._notify(callback, enriched)
 
         except Exception as e:
             logger.exception(f"Error streaming agent response: {e}")
@@ -406,6 +594,57 @@ class SessionManager:
 
         return all_payloads
 
+    @staticmethod
+    async def _notify(callback: CallbackType, payload: Union[ChatMessagePayload, SessionSchema]):
+        result = callback(payload.model_dump())
+        if asyncio.iscoroutine(result):
+            await result
+
+    def _get_compactor(self, agent_name: str) -> Optional[HistoryCompactor]:
+        """
+        Returns the compactor of the conversations of an agent, None if they are not compacted.
+        """
+        if agent_name not in self._compactors:
+            agent_settings = get_configuration().ai.leader if agent_name == Leader.name else get_agent_settings(agent_name)
+            settings = agent_settings.history_compaction
+            compactor = None
+            if settings.enabled:
+                model = get_model(settings.model) if settings.model else get_default_model()
+                compactor = HistoryCompactor(settings, model)
+            self._compactors[agent_name] = compactor
+        return self._compactors[agent_name]
+
+    def _schedule_compaction(self, compiled_graph: CompiledStateGraph, config: Dict, agent_name: str):
+        """
+        Computes the compaction of a conversation in the background, after a turn. It is
+        applied before the next turn if it is ready by then, else before a later one.
+        """
+        compactor = self._get_compactor(agent_name)
+        thread_id = config["configurable"]["thread_id"]
+        if compactor is None or thread_id in self._compactions:
+            return
+
+        async def compute() -> List[BaseMessage]:
+            state = await compiled_graph.aget_state(config)
+            messages = state.values.get("messages", [])
+            if not compactor.needs_compaction(messages):
+                return []
+            return await compactor.compact(messages)
+
+        self._compactions[thread_id] = asyncio.create_task(compute())
+
+    async def _apply_compaction(self, compiled_graph: CompiledStateGraph, config: Dict):
+        task = self._compactions.get(config["configurable"]["thread_id"])
+        if task is None or not task.done():
+            return
+        del self._compactions[config["configurable"]["thread_id"]]
+        try:
+            update = task.result()
+            if update:
+                await compiled_graph.aupdate_state(config, {"messages": update})
+        except Exception as e:
+            logger.warning(f"Conversation {config['configurable']['thread_id']} not compacted: {e}")
+
     def _get_agent_contexts(self, agent_name: str) -> List[Dict[str, Any]]:
         """
         Gets contexts for an agent using the existing context service.
@@ -471,6 +710,7 @@ class SessionManager:
             dict: Response info with file path.
         """
         try:
+            self.lifecycle.use(session_id)
             # Create session-specific temp directory
             session_folder = self.get_session_temp_folder(session_id)
             file_path = session_folder / file.filename
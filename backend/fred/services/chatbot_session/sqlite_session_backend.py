@@ -0,0 +1,139 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Chat session storage backed by a local SQLite database.
+
+- Sessions are indexed by user, so listing the sessions of a user does not scan the others.
+- Messages are only appended, one row each, and indexed by (session_id, rank): a page of
+  the history is a range scan of the index, whatever the length of the session.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+from fred.services.chatbot_session.abstract_session_backend import AbstractSessionStorage
+from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, SessionSchema
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteSessionStorage(AbstractSessionStorage):
+    """
+    Session storage in a SQLite database file named sessions.db inside the configured directory.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = Path(root_path).expanduser()
+        self.root_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root_path / "sessions.db"
+        self._lock = Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, title TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user_id, updated_at)")
+        # The user question and the context injected before it share a rank: the rowid keeps
+        # the messages of a rank in their insertion order.
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, rank INTEGER NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS messages_session_rank ON messages (session_id, rank, id)")
+        self._connection.commit()
+        logger.info(f"SQLite session storage in {self.db_path}")
+
+    @staticmethod
+    def _to_session(row) -> SessionSchema:
+        return SessionSchema(id=row[0], user_id=row[1], title=row[2], updated_at=datetime.fromisoformat(row[3]))
+
+    def save_session(self, session: SessionSchema) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sessions (id, user_id, title, updated_at) VALUES (?, ?, ?, ?)",
+                (session.id, session.user_id, session.title, session.updated_at.isoformat()),
+            )
+            self._connection.commit()
+
+    def get_session(self, session_id: str) -> Optional[SessionSchema]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, user_id, title, updated_at FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        return self._to_session(row) if row else None
+
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock:
+            deleted = self._connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+            self._connection.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._connection.commit()
+        return deleted > 0
+
+    def get_sessions_for_user(self, user_id: str) -> List[SessionSchema]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, user_id, title, updated_at FROM sessions WHERE user_id = ? ORDER BY updated_at",
+                (user_id,),
+            ).fetchall()
+        return [self._to_session(row) for row in rows]
+
+    def save_messages(self, session_id: str, messages: List[ChatMessagePayload]) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO messages (session_id, rank, payload) VALUES (?, ?, ?)",
+                [(session_id, message.rank, message.model_dump_json()) for message in messages],
+            )
+            self._connection.commit()
+        logger.info(f"Saved {len(messages)} messages to session {session_id}")
+
+    def get_message_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        before_rank: Optional[int] = None,
+        since_rank: Optional[int] = None,
+    ) -> List[ChatMessagePayload]:
+        where = "session_id = ?"
+        params: list = [session_id]
+        if before_rank is not None:
+            where += " AND rank < ?"
+            params.append(before_rank)
+        if since_rank is not None:
+            where += " AND rank > ?"
+            params.append(since_rank)
+        with self._lock:
+            if limit is not None:
+                # Pages hold whole ranks, so that a page never splits a question from the
+                # context injected before it: find the rank cut by the limit, and include it.
+                # Without a lower bound, a limited page holds the latest messages.
+                backwards = since_rank is None
+                cut = self._connection.execute(
+                    f"SELECT rank FROM messages WHERE {where} ORDER BY rank {'DESC' if backwards else 'ASC'} "
+                    "LIMIT 1 OFFSET ?",
+                    [*params, limit - 1],
+                ).fetchone()
+                if cut is not None:
+                    where += " AND rank >= ?" if backwards else " AND rank <= ?"
+                    params.append(cut[0])
+            rows = self._connection.execute(
+                f"SELECT payload FROM messages WHERE {where} ORDER BY rank, id", params
+            ).fetchall()
+        return [ChatMessagePayload.model_validate_json(row[0]) for row in rows]
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Literal, Optional, List, Dict, Union
+from typing import Literal, Optional, List, Dict, Set, Tuple, Union
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -45,8 +45,8 @@ class ChatMessagePayload(BaseModel):
     rank: int = Field(..., description="Monotonically increasing index of the message within the session")
     metadata: Optional[Dict[str, Union[str, int, float, dict, list]]] = Field(default_factory=dict)
     subtype: Optional[Literal[
-        "final", "thought", "tool_result", "plan", "execution", "observation", "error", "injected_context"
-    ]] = None
+        "final", "thought", "tool_result", "plan", "execution", "observation", "error", "injected_context", "delta"
+    ]] = Field(None, description="Semantic role of the message. A `delta` is a streamed piece of the message of the same rank, never persisted")
     def with_metadata(
         self,
         model: Optional[str] = None,
@@ -80,9 +80,31 @@ class StreamEvent(BaseModel):
     type: Literal["stream"]
     message: ChatMessagePayload
 
+class ChatMessageRef(BaseModel):
+    exchange_id: str
+    rank: int
+
 class FinalEvent(BaseModel):
     type: Literal["final"]
-    messages: List[ChatMessagePayload]
+    messages: List[ChatMessagePayload] = Field(default_factory=list, description="Messages of the exchange not already streamed to the client")
+    delivered: List[ChatMessageRef] = Field(default_factory=list, description="References of the messages of the exchange already streamed to the client")
+    session: SessionSchema
+
+    @classmethod
+    def after_stream(cls, session: SessionSchema, messages: List[ChatMessagePayload], streamed: Set[Tuple[str, int]]) -> "FinalEvent":
+        """
+        Final event of a streamed exchange: the streamed messages, given by their (exchange_id, rank),
+        are only referenced.
+        """
+        return cls(
+            type="final",
+            messages=[m for m in messages if (m.exchange_id, m.rank) not in streamed],
+            delivered=[ChatMessageRef(exchange_id=m.exchange_id, rank=m.rank) for m in messages if (m.exchange_id, m.rank) in streamed],
+            session=session,
+        )
+
+class SessionEvent(BaseModel):
+    type: Literal["session"]
     session: SessionSchema
 
 class ErrorEvent(BaseModel):
@@ -90,7 +112,7 @@ class ErrorEvent(BaseModel):
     content: str
 
 # --- Union for WebSocket response ---
-ChatEvent = Union[StreamEvent, FinalEvent, ErrorEvent]
+ChatEvent = Union[StreamEvent, SessionEvent, FinalEvent, ErrorEvent]
 
 def clean_agent_metadata(raw: dict) -> dict:
     """Extract only the relevant and safe metadata fields for ChatMessagePayload."""
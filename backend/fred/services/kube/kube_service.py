@@ -39,7 +39,7 @@ StatefulSets, and ConfigMaps.
 import logging
 import re
 import traceback
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 from os import environ
 
 import urllib3
@@ -48,7 +48,7 @@ from kubernetes.client import ApiException
 
 from fred.application_context import get_app_context, get_configuration
 from fred.services.kube.structure import Cluster, ClusterList, WorkloadKind, WorkloadNameList, Workload, IngressesList, \
-    CustomObject, CustomObjectInfo
+    CustomObject, CustomObjectInfo, HorizontalPodAutoscalersList
 from fred.services.kube.structure import ConfigMapsList, NamespacesList, Namespace, ServicesList
 from fred.common.connectors.file_dao import FileDAO
 from fred.common.error import UnavailableError
@@ -122,6 +122,39 @@ class KubeService:
             custom_object.name
         )
 
+    def _forget(self, model_class: type, *keys) -> None:
+        try:
+            self.dao.delete(model_class, *keys)
+        except FileNotFoundError:
+            pass
+
+    def forget_changed_object(self, cluster: str, resource: str, namespace: Optional[str], name: str):
+        """
+        Drop the cached resources derived from a Kubernetes object that changed, so that they
+        are read again from the cluster.
+
+        Args:
+            cluster (str): The name of the Cluster.
+            resource (str): The kind of the object: a workload kind, 'Namespace', 'ResourceQuota',
+                'LimitRange', 'Service' or 'Ingress'.
+            namespace (Optional[str]): The Namespace of the object, None for a Namespace.
+            name (str): The name of the object.
+        """
+        if resource == "Namespace":
+            self._forget(NamespacesList, cluster)
+            self._forget(Namespace, cluster, name)
+        elif resource in ("ResourceQuota", "LimitRange"):
+            self._forget(Namespace, cluster, namespace)
+        elif resource in ("Service", "Ingress"):
+            # The services and ingresses of a workload are found by its selectors: any
+            # workload of the namespace may be concerned.
+            self.dao.delete_all(ServicesList if resource == "Service" else IngressesList, cluster, namespace)
+        else:
+            kind = WorkloadKind(resource)
+            self._forget(WorkloadNameList, cluster, namespace, kind)
+            for model_class in (Workload, ConfigMapsList, ServicesList, IngressesList):
+                self._forget(model_class, cluster, namespace, kind, name)
+
     def get_clusters_list(self) -> ClusterList:
         """
         Get the list of clusters.
@@ -477,6 +510,53 @@ class KubeService:
 
             return ingresses_list
 
+    def get_workload_horizontal_pod_autoscalers(self, cluster: str, namespace: str, workload_name: str,
+                                                kind: WorkloadKind) -> HorizontalPodAutoscalersList:
+        """
+        Get the list of HorizontalPodAutoscalers targeting a workload.
+        If the list does not exist and simulation mode is disabled, it will create it by accessing the Kubernetes
+        cluster.
+
+        Args:
+            cluster (str): The name of the Cluster.
+            namespace (str): The name of the Namespace.
+            workload_name (str): The name of the workload.
+            kind (WorkloadKind): The kind of the workload.
+
+        Returns:
+            (HorizontalPodAutoscalersList): The list of HorizontalPodAutoscalers.
+        """
+        try:
+            logger.debug(
+                "Reading file for the list of HorizontalPodAutoscalers associated with the workload, "
+                "cluster=%s, namespace=%s, workload_name=%s",
+                cluster,
+                namespace,
+                workload_name,
+            )
+            return self.dao.loadCacheItem(HorizontalPodAutoscalersList, cluster, namespace, kind, workload_name)
+        except FileNotFoundError:
+            autoscalers_list = self.connected_client.get_workload_horizontal_pod_autoscalers(
+                cluster, namespace, workload_name, kind
+            )
+            logger.debug(
+                "Updating file for the list of HorizontalPodAutoscalers associated with the workload, "
+                "cluster=%s, namespace=%s, kind=%s, workload_name=%s",
+                cluster,
+                namespace,
+                kind,
+                workload_name,
+            )
+            self.dao.saveCache(
+                autoscalers_list,
+                cluster,
+                namespace,
+                kind,
+                workload_name,
+            )
+
+            return autoscalers_list
+
     def __update_custom_object_description(self, custom_object: CustomObject):
         """
         Update the file with the description of a custom object.
@@ -824,6 +904,36 @@ class ConnectedKubeService:
             kind=kind
         )
 
+    @requires_online
+    def get_watch_list_functions(self, cluster: str) -> Dict[str, Callable]:
+        """
+        Return the cluster-wide list functions of the namespaces, resource quotas, limit
+        ranges, workloads, services and ingresses, to be used with the Kubernetes watch API.
+
+        Args:
+            cluster (str): The name of the Cluster.
+
+        Returns:
+            Dict[str, Callable]: The list functions keyed by workload kind, 'Namespace',
+                'ResourceQuota', 'LimitRange', 'Service' or 'Ingress'.
+        """
+        apps_v1 = self._get_kube_client(cluster, client.AppsV1Api)
+        batch_v1 = self._get_kube_client(cluster, client.BatchV1Api)
+        core_v1 = self._get_kube_client(cluster, client.CoreV1Api)
+        networking_v1 = self._get_kube_client(cluster, client.NetworkingV1Api)
+        return {
+            WorkloadKind.DEPLOYMENT.value: apps_v1.list_deployment_for_all_namespaces,
+            WorkloadKind.STATEFUL_SET.value: apps_v1.list_stateful_set_for_all_namespaces,
+            WorkloadKind.DAEMON_SET.value: apps_v1.list_daemon_set_for_all_namespaces,
+            WorkloadKind.JOB.value: batch_v1.list_job_for_all_namespaces,
+            WorkloadKind.CRONJOB.value: batch_v1.list_cron_job_for_all_namespaces,
+            "Namespace": core_v1.list_namespace,
+            "ResourceQuota": core_v1.list_resource_quota_for_all_namespaces,
+            "LimitRange": core_v1.list_limit_range_for_all_namespaces,
+            "Service": core_v1.list_service_for_all_namespaces,
+            "Ingress": networking_v1.list_ingress_for_all_namespaces,
+        }
+
     @requires_online
     def _get_workload(self, cluster: str, namespace: str, workload_name: str, kind: WorkloadKind):
         match kind:
@@ -926,6 +1036,19 @@ class ConnectedKubeService:
         return IngressesList(cluster=cluster, namespace=namespace, resource_name=workload_name,
                              ingresses_list=ingresses_list, kind=kind)
 
+    @requires_online
+    def get_workload_horizontal_pod_autoscalers(self, cluster: str, namespace: str, workload_name: str,
+                                                kind: WorkloadKind) -> HorizontalPodAutoscalersList:
+        autoscaling_v2 = self._get_kube_client(cluster, client.AutoscalingV2Api)
+        autoscalers = autoscaling_v2.list_namespaced_horizontal_pod_autoscaler(namespace)
+        autoscalers_list = [
+            autoscaler.to_dict() for autoscaler in autoscalers.items
+            if autoscaler.spec.scale_target_ref.kind == kind.value
+            and autoscaler.spec.scale_target_ref.name == workload_name
+        ]
+        return HorizontalPodAutoscalersList(cluster=cluster, namespace=namespace, resource_name=workload_name,
+                                            horizontal_pod_autoscalers_list=autoscalers_list, kind=kind)
+
     @requires_online
     def create_new_custom_object(self, custom_object: CustomObject) -> CustomObject:
         custom_object_client = self._get_kube_client(custom_object.cluster, client.CustomObjectsApi)
@@ -130,6 +130,16 @@ class IngressesList(BaseModel):
     kind: WorkloadKind = Field(description="The kind of workloads")
 
 
+class HorizontalPodAutoscalersList(BaseModel):
+    cluster: str = Field(default_factory=str, description="The name of the cluster where the resource resides")
+    namespace: str = Field(default_factory=str, description="The namespace where the resource is located")
+    resource_name: str = Field(default_factory=str,
+                               description="The name of the resource associated with this overview")
+    horizontal_pod_autoscalers_list: List[Dict[str, Any]] = Field(
+        default_factory=list, description="The list of HorizontalPodAutoscalers targeting this resource")
+    kind: WorkloadKind = Field(description="The kind of workloads")
+
+
 class RuleType(str, Enum):
     DATE = "date"
     DURATION = "duration"
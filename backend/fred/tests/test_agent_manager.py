@@ -0,0 +1,102 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from fred.chatbot.agent_manager import AgentManager
+
+
+class _Expert:
+    name = "GeneralistExpert"
+    built = 0
+
+    def __init__(self, cluster_fullname=None):
+        _Expert.built += 1
+        self.cluster_fullname = cluster_fullname
+        self.base_prompt = "You are a generalist expert."
+
+        async def answer(state):
+            return {"messages": [AIMessage(content="kafka runs 3 pods")]}
+
+        self.graph = StateGraph(MessagesState)
+        self.graph.add_node("expert", answer)
+        self.graph.add_edge(START, "expert")
+        self.graph.add_edge("expert", END)
+
+
+class _Leader:
+    def __init__(self):
+        self.experts = {}
+
+    def add_expert(self, name, instance, compiled_graph):
+        self.experts[name] = instance
+
+
+def test_agents_are_shared_by_the_sessions_of_a_same_variant():
+    contexts = {"GeneralistExpert": {}}
+    context_service = MagicMock()
+    context_service.get_context.side_effect = lambda name: contexts[name]
+    module = "fred.chatbot.agent_manager"
+    with patch(f"{module}.get_agent_class", side_effect=lambda name: _Leader if name == "Fred" else _Expert), \
+            patch(f"{module}.get_enabled_agent_names", return_value=["GeneralistExpert"]), \
+            patch(f"{module}.get_context_service", return_value=context_service):
+        manager = AgentManager()
+        fred_1 = manager.get_create_agent_instance("Fred", "session-1", "prod")
+        fred_2 = manager.get_create_agent_instance("Fred", "session-2", "prod")
+        expert_1 = manager.get_create_agent_instance("GeneralistExpert", "session-1", "prod")
+        expert_2 = manager.get_create_agent_instance("GeneralistExpert", "session-2", "prod")
+        staging = manager.get_create_agent_instance("GeneralistExpert", "session-3", "staging")
+
+        assert fred_1 is fred_2 and expert_1 is expert_2
+        assert fred_1.experts["GeneralistExpert"] is expert_1
+        assert staging is not expert_1 and staging.cluster_fullname == "staging"
+        assert _Expert.built == 2
+
+        # New contexts make a new variant for the new sessions, the others keep theirs.
+        contexts["GeneralistExpert"] = {"ctx-1": {"content": "The kafka namespace is critical."}}
+        expert_4 = manager.get_create_agent_instance("GeneralistExpert", "session-4", "prod")
+        fred_4 = manager.get_create_agent_instance("Fred", "session-4", "prod")
+        assert expert_4 is not expert_1 and "kafka namespace is critical" in expert_4.base_prompt
+        assert fred_4 is not fred_1 and fred_4.experts["GeneralistExpert"] is expert_4
+        assert manager.get_create_agent_instance("GeneralistExpert", "session-1", "prod") is expert_1
+        assert _Expert.built == 3
+
+        manager.clear_cache_for_session("session-1")
+        assert not any(key.startswith("session-1:") for key in manager.agent_cache)
+        assert len(manager.agent_pool) == 3
+
+
+def test_pooled_agents_are_built_again_on_a_new_day_and_bounded():
+    context_service = MagicMock()
+    context_service.get_context.return_value = {}
+    module = "fred.chatbot.agent_manager"
+    today = MagicMock()
+    today.today.return_value = date(2025, 6, 1)
+    with patch(f"{module}.get_agent_class", return_value=_Expert), \
+            patch(f"{module}.get_context_service", return_value=context_service), \
+            patch(f"{module}.date", today):
+        manager = AgentManager(max_pooled_agents=2)
+        first = manager.get_create_agent_instance("GeneralistExpert", "session-1", "prod")
+        assert manager.get_create_agent_instance("GeneralistExpert", "session-2", "prod") is first
+
+        today.today.return_value = date(2025, 6, 2)
+        assert manager.get_create_agent_instance("GeneralistExpert", "session-3", "prod") is not first
+
+        for cluster in ("staging", "dev", "test"):
+            manager.get_create_agent_instance("GeneralistExpert", f"session-{cluster}", cluster)
+        assert list(manager.agent_pool) == [("GeneralistExpert", "dev"), ("GeneralistExpert", "test")]
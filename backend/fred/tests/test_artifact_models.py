@@ -0,0 +1,71 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock, patch
+
+from fred import application_context
+from fred.application_context import ApplicationContext, get_structured_chain_for_service
+from fred.common.structure import ModelConfiguration, ServicesSettings
+from fred.services.ai.structure.workload_id import WorkloadId
+from fred.services.ai.structure.workload_scores.cpu import CpuScore
+from fred.services.ai.structure.workload_scores.ram import RamScore
+from fred.services.ai.structure.workload_summary import WorkloadSummary
+
+
+def _app_context():
+    service = ServicesSettings(
+        name="kubernetes",
+        model=ModelConfiguration(provider="openai", name="gpt-4o"),
+        artifact_models={
+            "WorkloadId": ModelConfiguration(name="gpt-4o-mini"),
+            "WorkloadScores": ModelConfiguration(name="gpt-4o-mini", temperature=0.2),
+            "CpuScore": ModelConfiguration(provider="ollama", name="qwen2.5"),
+        },
+    )
+    app_context = object.__new__(ApplicationContext)
+    app_context.configuration = MagicMock()
+    app_context.configuration.ai.default_model = ModelConfiguration(provider="azure")
+    app_context.configuration.ai.leader.enabled = False
+    app_context.configuration.ai.services = [service]
+    app_context.configuration.ai.agents = []
+    app_context.apply_default_models()
+    app_context._build_indexes()
+    return app_context
+
+
+def test_artifact_models_are_merged_over_the_service_model():
+    app_context = _app_context()
+
+    workload_id = app_context.get_model_configuration_for_service("kubernetes", "WorkloadId")
+    assert (workload_id.provider, workload_id.name) == ("openai", "gpt-4o-mini")
+    summary = app_context.get_model_configuration_for_service("kubernetes", WorkloadSummary.__name__)
+    assert (summary.provider, summary.name) == ("openai", "gpt-4o")
+
+
+def test_structured_chains_are_routed_by_schema_then_artifact():
+    app_context = _app_context()
+
+    with patch.object(application_context, "get_app_context", return_value=app_context), \
+            patch.object(application_context, "get_structured_chain") as get_structured_chain:
+        get_structured_chain_for_service("kubernetes", CpuScore, "WorkloadScores")
+        get_structured_chain_for_service("kubernetes", RamScore, "WorkloadScores")
+        get_structured_chain_for_service("kubernetes", WorkloadId)
+
+    models = [(call.args[1].provider, call.args[1].name, call.args[1].temperature)
+              for call in get_structured_chain.call_args_list]
+    assert models == [
+        ("ollama", "qwen2.5", 0.0),
+        ("openai", "gpt-4o-mini", 0.2),
+        ("openai", "gpt-4o-mini", 0.0),
+    ]
@@ -0,0 +1,136 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fred.common.structure import BatchGenerationSettings, WorkloadContextSettings, WorkloadKind
+from fred.jobs.structure import JobCancelledError
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.structure.workload_context import WorkloadContext
+from fred.services.ai.structure.workload_essentials import WorkloadEssentials
+from fred.services.ai.structure.workload_id import WorkloadId
+from fred.services.ai.topology_store import TopologyStore
+
+DEPLOYMENT = WorkloadKind.DEPLOYMENT
+SIZES = {"sidecar-a": 100, "sidecar-b": 100, "job-c": 100, "huge": 5000}
+
+
+def _ai_service():
+    service = AIService.__new__(AIService)
+    service.configuration = MagicMock()
+    service.configuration.ai.batch_generation = BatchGenerationSettings(
+        max_tokens=250, small_workload_max_tokens=1000, max_workloads=10
+    )
+    service.configuration.ai.workload_context = WorkloadContextSettings()
+    service.dao = MagicMock()
+    service.topology_store = TopologyStore()
+    service.langfuse_handler = None
+    service._get_workload_context = MagicMock(
+        side_effect=lambda cluster, namespace, name, kind, generator=None: WorkloadContext(
+            workload_yaml=f"name: {name}", tokens=SIZES[name]
+        )
+    )
+    service._get_workload_definition = MagicMock(
+        side_effect=lambda cluster, namespace, name, kind: f"name: {name}\n" + "x " * SIZES[name]
+    )
+    service.post_workload_id = MagicMock()
+    service.post_workload_essentials = MagicMock()
+    return service
+
+
+def _workloads():
+    return [("ns", DEPLOYMENT, name) for name in SIZES]
+
+
+def _fake_ids(contexts, langfuse_handler=None):
+    return {name: WorkloadId(workload_id=f"id-{name}") for name in contexts}
+
+
+def test_small_workloads_are_packed_under_the_token_budget():
+    service = _ai_service()
+
+    with patch.object(WorkloadId, "from_workload_contexts", side_effect=_fake_ids) as batch_ids, \
+            patch.object(WorkloadEssentials, "from_workload_definitions", side_effect=ValueError("bad")):
+        service.post_workloads_batched("c", _workloads())
+
+    # 3 small workloads of 100 tokens under a 250 tokens budget: one batch of 2, one single.
+    batch_ids.assert_called_once()
+    assert list(batch_ids.call_args.args[0]) == ["sidecar-a", "sidecar-b"]
+    single_ids = sorted(call.args[2] for call in service.post_workload_id.call_args_list)
+    assert single_ids == ["huge", "job-c"]
+    saved = [call.args[0] for call in service.dao.saveCache.call_args_list]
+    assert saved == [WorkloadId(workload_id="id-sidecar-a"), WorkloadId(workload_id="id-sidecar-b")]
+
+
+def test_unparsable_batch_falls_back_to_single_calls():
+    service = _ai_service()
+
+    with patch.object(WorkloadId, "from_workload_contexts", side_effect=_fake_ids), \
+            patch.object(WorkloadEssentials, "from_workload_definitions", side_effect=ValueError("bad")):
+        service.post_workloads_batched("c", _workloads())
+
+    single_essentials = sorted(call.args[2] for call in service.post_workload_essentials.call_args_list)
+    assert single_essentials == sorted(SIZES)
+
+
+def test_batched_essentials_use_the_definition_of_the_single_calls():
+    service = _ai_service()
+
+    with patch.object(WorkloadId, "from_workload_contexts", side_effect=ValueError("bad")), \
+            patch.object(WorkloadEssentials, "from_workload_definitions", side_effect=ValueError("bad")) as batch:
+        service.post_workloads_batched("c", _workloads())
+
+    definitions = batch.call_args_list[0].args[0]
+    assert definitions["sidecar-a"] == service._get_workload_definition("c", "ns", "sidecar-a", DEPLOYMENT)
+    assert all(call.args[-1] == "WorkloadId" for call in service._get_workload_context.call_args_list)
+
+
+def test_batched_generation_reports_progress_and_stops_when_cancelled():
+    service = _ai_service()
+    job_context = MagicMock()
+    job_context.raise_if_cancelled.side_effect = [None] * 6 + [JobCancelledError("cancelled")]
+
+    with patch.object(WorkloadId, "from_workload_contexts", side_effect=_fake_ids), \
+            pytest.raises(JobCancelledError):
+        service.post_workloads_batched("c", _workloads(), job_context=job_context, progress_range=(0.0, 0.4))
+
+    # After the 4 contexts, the batch of 2 Ids and the 'huge' single call, out of 3 calls
+    # covering the first half of the range, the cancellation stops before the 'job-c' call.
+    progress = [call.args[0] for call in job_context.report_progress.call_args_list]
+    assert progress == [pytest.approx(0.2 / 3), pytest.approx(0.4 / 3)]
+    assert [call.args[2] for call in service.post_workload_id.call_args_list] == ["huge"]
+
+
+def test_missing_only_skips_cached_artifacts():
+    service = _ai_service()
+
+    def load_cache_item(artifact, cluster, namespace, kind, name):
+        if name == "job-c":
+            raise FileNotFoundError(name)
+        return artifact
+
+    service.dao.loadCacheItem.side_effect = load_cache_item
+
+    service.post_workloads_batched("c", _workloads(), missing_only=True)
+
+    assert [call.args[2] for call in service.post_workload_id.call_args_list] == ["job-c"]
+    assert [call.args[2] for call in service.post_workload_essentials.call_args_list] == ["job-c"]
+
+
+def test_workloads_sharing_a_name_never_share_a_batch():
+    items = [(WorkloadKind.DEPLOYMENT, "app", None, 1), (WorkloadKind.JOB, "app", None, 1)]
+
+    assert len(AIService._pack_batches(items, max_tokens=100, max_items=10)) == 2
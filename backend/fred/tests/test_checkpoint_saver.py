@@ -0,0 +1,102 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from fred.checkpoint.sqlite_checkpoint_saver import SQLiteCheckpointSaver
+
+
+def _graph(saver):
+    async def answer(state):
+        return {"messages": [AIMessage(content=f"Answer to {state['messages'][-1].content}")]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("expert", answer)
+    builder.add_edge(START, "expert")
+    builder.add_edge("expert", END)
+    return builder.compile(checkpointer=saver)
+
+
+def _ask(graph, thread_id, question):
+    config = {"configurable": {"thread_id": thread_id}}
+    return asyncio.run(graph.ainvoke({"messages": [HumanMessage(content=question)]}, config=config))
+
+
+def test_conversations_survive_a_restart_with_a_bounded_number_of_checkpoints(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path), ttl_seconds=3600, max_checkpoints_per_thread=3)
+    graph = _graph(saver)
+    for turn in range(5):
+        _ask(graph, "session-1:GeneralistExpert", f"question {turn}")
+    _ask(graph, "session-2:GeneralistExpert", "other question")
+
+    restarted = _graph(SQLiteCheckpointSaver(str(tmp_path), ttl_seconds=3600, max_checkpoints_per_thread=3))
+    state = _ask(restarted, "session-1:GeneralistExpert", "question 5")
+
+    assert [m.content for m in state["messages"][-4:]] == [
+        "question 4", "Answer to question 4", "question 5", "Answer to question 5",
+    ]
+    assert len(state["messages"]) == 12
+    assert len(list(saver.list({"configurable": {"thread_id": "session-1:GeneralistExpert"}}))) == 3
+    assert len(_ask(restarted, "session-2:GeneralistExpert", "again")["messages"]) == 4
+
+
+def test_idle_threads_expire_and_recent_ones_are_cached(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path), ttl_seconds=3600, cache_size=1)
+    graph = _graph(saver)
+    clock = "fred.checkpoint.sqlite_checkpoint_saver.time.time"
+    with patch(clock, return_value=10**9):
+        _ask(graph, "idle", "question")
+    with patch(clock, return_value=10**9 + 3000):
+        _ask(graph, "active", "question")
+        assert saver.purge_expired() == 0
+    with patch(clock, return_value=10**9 + 4000):
+        assert saver.purge_expired() == 1
+    assert saver.get_tuple({"configurable": {"thread_id": "idle"}}) is None
+
+    active = saver.get_tuple({"configurable": {"thread_id": "active"}})
+    assert saver.get_tuple({"configurable": {"thread_id": "active"}}) is active
+    assert list(saver._cache) == [("active", "")]
+
+    saver.delete_thread("active")
+    assert saver.get_tuple({"configurable": {"thread_id": "active"}}) is None
+
+
+def test_async_calls_and_purges_run_off_the_event_loop(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path), ttl_seconds=3600)
+    saver.PURGE_INTERVAL = 1
+    loop_thread = threading.current_thread()
+    get_threads, purge_threads = [], []
+    get_tuple, purge_expired = saver.get_tuple, saver.purge_expired
+
+    def recording_get_tuple(config):
+        get_threads.append(threading.current_thread())
+        return get_tuple(config)
+
+    def recording_purge_expired():
+        purge_threads.append(threading.current_thread())
+        return purge_expired()
+
+    with patch.object(saver, "get_tuple", side_effect=recording_get_tuple), \
+            patch.object(saver, "purge_expired", side_effect=recording_purge_expired):
+        _ask(_graph(saver), "session-1:GeneralistExpert", "question")
+        saver._purge_thread.join()
+
+    assert get_threads and loop_thread not in get_threads
+    assert purge_threads and loop_thread not in purge_threads
+    assert saver.get_tuple({"configurable": {"thread_id": "session-1:GeneralistExpert"}}) is not None
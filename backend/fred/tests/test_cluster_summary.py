@@ -0,0 +1,95 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from fred.common.structure import ClusterSummarySettings
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.structure.cluster_summary import ClusterSummary
+from fred.services.ai.topology_store import TopologyStore
+
+
+def _ai_service(namespaces, fan_in):
+    service = AIService.__new__(AIService)
+    service.configuration = MagicMock()
+    service.configuration.ai.cluster_summary = ClusterSummarySettings(fan_in=fan_in, max_concurrency=3)
+    service.kube_service = MagicMock()
+    service.kube_service.get_namespaces_list.return_value.namespaces = namespaces
+    service.dao = MagicMock()
+    service.topology_store = TopologyStore()
+    service.langfuse_handler = None
+    service.get_namespace_summary = MagicMock(side_effect=lambda cluster, namespace: f"summary of {namespace}")
+    return service
+
+
+def test_cluster_summary_is_reduced_with_bounded_fan_in():
+    namespaces = [f"ns-{index}" for index in range(20)]
+    service = _ai_service(namespaces, fan_in=4)
+    calls = []
+    lock = threading.Lock()
+
+    def reduce(cluster_name, summaries, langfuse_handler=None, partial=False):
+        with lock:
+            calls.append((len(summaries), partial))
+        return ClusterSummary(cluster_summary=f"merge of {len(summaries)}")
+
+    with patch.object(ClusterSummary, "from_summaries", side_effect=reduce):
+        service.post_cluster_summary("cluster")
+
+    assert service.get_namespace_summary.call_count == 20
+    assert all(size <= 4 for size, _ in calls)
+    # 20 summaries -> 5 partial summaries -> 2 partial summaries (one group of a single
+    # summary needs no call) -> final summary.
+    assert sorted(calls) == sorted([(4, True)] * 6 + [(2, False)])
+    saved = service.dao.saveCache.call_args.args
+    assert saved[0].cluster_summary == "merge of 2"
+    assert saved[1] == "cluster"
+
+
+def test_small_cluster_summary_needs_a_single_reduce():
+    service = _ai_service(["default", "kube-system"], fan_in=8)
+
+    with patch.object(ClusterSummary, "from_summaries",
+                      return_value=ClusterSummary(cluster_summary="article")) as from_summaries:
+        service.post_cluster_summary("cluster")
+
+    from_summaries.assert_called_once()
+    summaries = from_summaries.call_args.args[1]
+    assert summaries == ["namespace: default\n\nsummary of default",
+                         "namespace: kube-system\n\nsummary of kube-system"]
+
+
+def test_cluster_summary_skips_failed_namespaces_and_needs_one_summary():
+    service = _ai_service(["default", "broken"], fan_in=8)
+
+    def get_namespace_summary(cluster, namespace):
+        if namespace == "broken":
+            raise RuntimeError("LLM error")
+        return f"summary of {namespace}"
+
+    service.get_namespace_summary.side_effect = get_namespace_summary
+    with patch.object(ClusterSummary, "from_summaries",
+                      return_value=ClusterSummary(cluster_summary="article")) as from_summaries:
+        service.post_cluster_summary("cluster")
+        assert from_summaries.call_args.args[1] == ["namespace: default\n\nsummary of default"]
+
+        for namespaces in ([], ["broken"]):
+            from_summaries.reset_mock()
+            service.kube_service.get_namespaces_list.return_value.namespaces = namespaces
+            with pytest.raises(ValueError, match="no Namespace Summary"):
+                service.post_cluster_summary("cluster")
+            from_summaries.assert_not_called()
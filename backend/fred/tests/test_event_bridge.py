@@ -0,0 +1,96 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+
+from fred.services.chatbot_session.event_bridge import stream_events
+
+
+def test_events_are_yielded_while_the_agent_runs():
+    async def produce(emit):
+        for i in range(3):
+            await emit(f"step {i}")
+            await asyncio.sleep(0.1)
+        await emit("final")
+
+    async def consume():
+        start, received = time.perf_counter(), []
+        async for event in stream_events(produce):
+            received.append((event, time.perf_counter() - start))
+        return received
+
+    received = asyncio.run(consume())
+
+    assert [event for event, _ in received] == ["step 0", "step 1", "step 2", "final"]
+    assert received[0][1] < 0.05
+    assert received[-1][1] > 0.25
+
+
+def test_a_slow_client_holds_the_agent_back():
+    emitted = []
+
+    async def produce(emit):
+        for i in range(10):
+            await emit(i)
+            emitted.append(i)
+
+    async def consume():
+        stream = stream_events(produce, max_pending=2)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        pending = len(emitted)
+        rest = [event async for event in stream]
+        return first, pending, rest
+
+    first, pending, rest = asyncio.run(consume())
+
+    assert first == 0
+    assert pending <= 3
+    assert rest == list(range(1, 10))
+
+
+def test_agent_errors_follow_the_emitted_events_and_disconnects_cancel_the_agent():
+    async def failing(emit):
+        await emit("step")
+        raise ValueError("model unavailable")
+
+    async def consume_failing():
+        received = []
+        with pytest.raises(ValueError):
+            async for event in stream_events(failing):
+                received.append(event)
+        return received
+
+    assert asyncio.run(consume_failing()) == ["step"]
+
+    cancelled = []
+
+    async def endless(emit):
+        try:
+            while True:
+                await emit("step")
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def disconnect():
+        stream = stream_events(endless)
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(disconnect())
+    assert cancelled == [True]
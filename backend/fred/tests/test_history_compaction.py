@@ -0,0 +1,93 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from fred.common.structure import HistoryCompactionSettings, SessionLifecycleSettings
+from fred.services.chatbot_session.history_compaction import SUMMARY_MARKER, HistoryCompactor
+from fred.services.chatbot_session.in_memory_session_backend import InMemorySessionStorage
+from fred.services.chatbot_session.session_lifecycle import SessionLifecycle
+from fred.services.chatbot_session.session_manager import SessionManager
+from fred.services.chatbot_session.structure.chat_schema import SessionSchema
+
+POD_LIST = "\n".join(f"kafka-{i}   1/1   Running   0   3d" for i in range(60))
+
+
+class _ToolCallingAgent:
+    def __init__(self, prompts):
+        async def answer(state):
+            prompts.append(list(state["messages"]))
+            call_id = f"call-{len(prompts)}"
+            return {"messages": [
+                AIMessage(content="", tool_calls=[{"name": "get_pods", "args": {"namespace": "kafka"}, "id": call_id}]),
+                ToolMessage(content=POD_LIST, tool_call_id=call_id),
+                AIMessage(content=f"Answer {len(prompts)}: 60 kafka pods are running."),
+            ]}
+
+        builder = StateGraph(MessagesState)
+        builder.add_node("expert", answer)
+        builder.add_edge(START, "expert")
+        builder.add_edge("expert", END)
+        self.compiled_graph = builder.compile(checkpointer=MemorySaver())
+
+    def get_compiled_graph(self):
+        return self.compiled_graph
+
+
+def test_older_turns_are_folded_into_a_summary_off_the_critical_path():
+    storage = InMemorySessionStorage()
+    storage.save_session(SessionSchema(id="session-1", user_id="alice", title="Kafka", updated_at=datetime.now()))
+    prompts = []
+    summarizer = FakeListChatModel(responses=["The user asked about the kafka pods, 60 are running."])
+    settings = HistoryCompactionSettings(enabled=True, max_tokens=600, keep_turns=2, tool_digest_tokens=20)
+
+    manager = SessionManager.__new__(SessionManager)
+    manager.storage = storage
+    manager.recursion_limit = 10
+    manager.lifecycle = SessionLifecycle(SessionLifecycleSettings())
+    manager._compactors = {"GeneralistExpert": HistoryCompactor(settings, summarizer)}
+    manager._compactions = {}
+    manager.agent_manager = MagicMock()
+    manager.agent_manager.get_create_agent_instance.return_value = _ToolCallingAgent(prompts)
+
+    async def session():
+        for turn in range(6):
+            await manager.chat_ask_websocket(
+                callback=lambda msg: None, user_id="alice", session_id="session-1",
+                message=f"Question {turn}: how many kafka pods?", agent_name="GeneralistExpert", argument="",
+            )
+            # The compaction runs after the answer, the next question may come later.
+            await asyncio.gather(*manager._compactions.values())
+
+    asyncio.run(session())
+
+    last_prompt = prompts[-1]
+    assert isinstance(last_prompt[0], SystemMessage) and last_prompt[0].content.startswith(SUMMARY_MARKER)
+    assert [m.content for m in last_prompt if isinstance(m, HumanMessage)] == [
+        "Question 3: how many kafka pods?", "Question 4: how many kafka pods?", "Question 5: how many kafka pods?",
+    ]
+    # The tool result of the previous turn is kept whole, older ones are digested.
+    tool_results = [m for m in last_prompt if isinstance(m, ToolMessage)]
+    assert tool_results[-1].content == POD_LIST
+    assert len(tool_results[0].content) < 200 and "truncated" in tool_results[0].content
+    assert tool_results[0].tool_call_id == "call-4"
+    # The stored history is not compacted.
+    assert len(storage.get_message_history("session-1")) == 6 * 4
@@ -0,0 +1,149 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+from fred.jobs.job_service import JobService
+from fred.jobs.store.sqlite_job_store import SQLiteJobStore
+from fred.jobs.structure import Job, JobCancelledError, JobStatus
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteJobStore(str(tmp_path))
+
+
+@pytest.fixture
+def job_service(store):
+    service = JobService(store, max_workers=2)
+    yield service
+    service.shutdown(wait=True)
+
+
+def test_run_returns_result_and_persists_success(job_service):
+    assert job_service.run("a", "compute", lambda _: 42, timeout=5) == 42
+
+    job = job_service.list_jobs()[0]
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.progress == 1.0
+
+
+def _wait_until_done(job_service, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job_service.get_job(job_id).status.is_active:
+        assert time.monotonic() < deadline, "job did not complete in time"
+        time.sleep(0.01)
+    return job_service.get_job(job_id)
+
+
+def test_submissions_with_same_key_share_one_job(job_service):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work(_):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+
+    key = "WorkloadSummary:cluster/namespace/name/Deployment"
+    first = job_service.submit(key, "post_workload_summary", work)
+    started.wait(5)
+    second = job_service.submit(key, "post_workload_summary", work)
+    release.set()
+
+    assert second.id == first.id
+    assert _wait_until_done(job_service, first.id).status == JobStatus.SUCCEEDED
+    assert len(calls) == 1
+
+
+def test_failure_is_recorded_and_raised(job_service):
+    def fail(_):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        job_service.run("b", "fail", fail, timeout=5)
+
+    job = job_service.list_jobs(JobStatus.FAILED)[0]
+    assert job.error == "boom"
+
+
+def test_progress_and_cooperative_cancellation(job_service):
+    started = threading.Event()
+    release = threading.Event()
+
+    def work(context):
+        context.report_progress(0.5, "halfway")
+        started.set()
+        release.wait(5)
+        context.raise_if_cancelled()
+
+    job = job_service.submit("c", "cancellable", work)
+    started.wait(5)
+    running = job_service.get_job(job.id)
+    assert running.status == JobStatus.RUNNING
+    assert running.progress == 0.5
+    assert running.message == "halfway"
+
+    assert job_service.cancel(job.id).cancel_requested
+    release.set()
+    assert _wait_until_done(job_service, job.id).status == JobStatus.CANCELLED
+
+
+def test_pending_job_is_cancelled_before_start(store):
+    service = JobService(store, max_workers=1)
+    release = threading.Event()
+    calls = []
+    try:
+        service.submit("busy", "busy", lambda _: release.wait(5))
+        pending = service.submit("pending", "pending", lambda _: calls.append(1))
+
+        assert service.cancel(pending.id).status == JobStatus.CANCELLED
+    finally:
+        release.set()
+        service.shutdown(wait=True)
+    assert not calls
+
+
+def test_run_raises_when_job_is_cancelled(job_service):
+    def work(context):
+        job_service.cancel(context.job_id)
+        context.raise_if_cancelled()
+
+    with pytest.raises(JobCancelledError):
+        job_service.run("d", "self-cancelling", work, timeout=5)
+
+
+def test_nested_runs_do_not_starve_the_pool(store):
+    service = JobService(store, max_workers=1)
+    try:
+        outer = service.run("outer", "outer", lambda _: service.run("inner", "inner", lambda _: "inner"), timeout=5)
+        assert outer == "inner"
+    finally:
+        service.shutdown(wait=True)
+
+
+def test_restart_marks_interrupted_jobs_as_failed(store):
+    store.save_job(Job(id="stale", key="k", name="interrupted", status=JobStatus.RUNNING))
+
+    service = JobService(store, max_workers=1)
+    try:
+        job = service.get_job("stale")
+        assert job.status == JobStatus.FAILED
+        assert job.error
+    finally:
+        service.shutdown(wait=True)
@@ -0,0 +1,146 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from langchain_openai import ChatOpenAI
+
+from fred.common.structure import RateLimit, RateLimitSettings
+from fred.jobs.job_service import current_job_id
+from fred.llm_scheduler import AsyncScheduledHttpClient, Priority, RateLimiter, ScheduledHttpClient, get_llm_scheduler
+from fred.monitoring.monitored_language_model import MonitoredLanguageModel
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = get_llm_scheduler()
+    yield scheduler
+    scheduler.configure(RateLimitSettings())
+
+
+def _completion(request):
+    return httpx.Response(200, json={
+        "id": "chatcmpl", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+        "usage": {"prompt_tokens": 20, "completion_tokens": 10, "total_tokens": 30},
+    })
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_interactive_requests_are_served_before_background_ones():
+    limiter = RateLimiter("azure/gpt", RateLimit(max_concurrency=1))
+    limiter.acquire(10)
+    served = []
+
+    def request(name, priority):
+        limiter.acquire(10, priority)
+        served.append(name)
+        limiter.release()
+
+    background = threading.Thread(target=request, args=("background", Priority.BACKGROUND))
+    background.start()
+    _wait_until(lambda: limiter.stats().queued == 1)
+    interactive = threading.Thread(target=request, args=("interactive", Priority.INTERACTIVE))
+    interactive.start()
+    _wait_until(lambda: limiter.stats().queued == 2)
+
+    limiter.release()
+    background.join(5)
+    interactive.join(5)
+
+    assert served == ["interactive", "background"]
+    assert limiter.stats().granted == 3
+
+
+def test_token_budget_delays_requests():
+    limiter = RateLimiter("openai", RateLimit(tokens_per_minute=600))
+
+    assert limiter.acquire(600) < 0.1
+    # 10 tokens per second are refilled.
+    assert asyncio.run(limiter.aacquire(3)) >= 0.2
+    limiter.release(-100)
+
+    assert limiter.stats().p95_wait >= 0.2
+
+
+def test_scheduled_clients_follow_the_budget_of_their_deployment(scheduler):
+    scheduler.configure(RateLimitSettings(enabled=True, limits={
+        "openai": RateLimit(requests_per_minute=60),
+        "openai/gpt-4o-mini": RateLimit(tokens_per_minute=60000),
+    }))
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after-ms": "200"}, json={"error": {"message": "slow down"}})
+        return _completion(request)
+
+    model = ChatOpenAI(
+        model="gpt-4o-mini", api_key="fake", max_retries=0,
+        http_client=ScheduledHttpClient("openai", "gpt-4o-mini", transport=httpx.MockTransport(handler)),
+    )
+    metric_store = MagicMock()
+    with patch("fred.monitoring.monitored_language_model.get_metric_store", return_value=metric_store):
+        monitored = MonitoredLanguageModel(target=model, name="test")
+
+    token = current_job_id.set("job")
+    try:
+        with pytest.raises(openai.RateLimitError):
+            monitored.invoke("hello")
+        assert monitored.invoke("hello").content == "ok"
+    finally:
+        current_job_id.reset(token)
+
+    (stats,) = scheduler.stats()
+    assert (stats.key, stats.granted, stats.rate_limited, stats.running) == ("openai/gpt-4o-mini", 2, 1, 0)
+    # The next request waited for the pause requested by the provider.
+    assert metric_store.add_metric.call_args.args[0].queue_wait >= 0.15
+
+
+def test_streamed_responses_hold_their_slot_until_closed(scheduler):
+    scheduler.configure(RateLimitSettings(enabled=True, limits={"azure": RateLimit(max_concurrency=1)}))
+
+    async def chunks():
+        yield b"data: [DONE]"
+
+    def handler(request):
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, content=chunks())
+        return _completion(request)
+
+    async def stream():
+        client = AsyncScheduledHttpClient("azure", "gpt", transport=httpx.MockTransport(handler))
+        async with client.stream("POST", "https://example.com/chat", json={"messages": [], "stream": True}):
+            assert scheduler.stats()[0].running == 1
+        assert scheduler.stats()[0].running == 0
+        response = await client.post("https://example.com/chat", json={"messages": [], "max_tokens": 50})
+        assert response.status_code == 200
+
+    asyncio.run(stream())
+    assert scheduler.stats()[0].granted == 2
+    assert get_llm_scheduler().limiter("ollama", "llama3") is None
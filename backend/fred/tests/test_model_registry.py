@@ -0,0 +1,64 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_openai import ChatOpenAI
+
+from fred.common.structure import ModelConfiguration
+from fred.fake_chat_model import FakeLatencyChatModel
+from fred.model_factory import clear_model_registry, get_model
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    clear_model_registry()
+    yield
+    clear_model_registry()
+
+
+def test_equivalent_configurations_share_a_model():
+    model = get_model(ModelConfiguration(provider="openai", name="gpt-4o", temperature=None))
+
+    assert get_model(ModelConfiguration(provider="OpenAI", name="gpt-4o", temperature=0.0)) is model
+    assert get_model(ModelConfiguration(provider="openai", name="gpt-4o-mini")) is not model
+    assert get_model(ModelConfiguration(provider="openai", name="gpt-4o", temperature=0.5)) is not model
+
+
+def test_provider_case_does_not_depend_on_the_first_use():
+    model = get_model(ModelConfiguration(provider="OpenAI", name="gpt-4o"))
+
+    assert isinstance(model, ChatOpenAI)
+    assert get_model(ModelConfiguration(provider="openai", name="gpt-4o")) is model
+    assert isinstance(get_model(ModelConfiguration(provider=" Fake ", name="fake")), FakeLatencyChatModel)
+
+
+def test_concurrent_first_uses_create_a_single_model():
+    config = ModelConfiguration(provider="openai", name="gpt-4o")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: get_model(config), range(32)))
+
+    assert all(model is models[0] for model in models)
+
+
+def test_connection_pool_is_sized_from_the_provider_settings():
+    model = get_model(ModelConfiguration(
+        provider="openai", name="gpt-4o", provider_settings={"max_connections": 7, "max_keepalive_connections": 3}
+    ))
+
+    pool = model.root_client._client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (7, 3)
+    assert model.stream_usage
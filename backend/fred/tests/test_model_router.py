@@ -0,0 +1,132 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from fred.common.structure import ModelConfiguration
+from fred.fake_chat_model import FakeLatencyChatModel
+from fred.model_factory import get_model
+from fred.model_router import BackendStats, RoutedChatModel, get_backend_stats
+from fred.monitoring.metric_store import Metric
+
+
+def _router(*backends, **settings):
+    return get_model(ModelConfiguration(provider="router", name="logical", provider_settings={
+        "backends": [{"provider": "fake", "name": name, "provider_settings": backend}
+                     for name, backend in backends],
+        **settings,
+    }))
+
+
+def test_calls_go_to_the_fastest_backend():
+    model = _router(("fast-a", {"latency": 0.05, "response": "a"}), ("fast-b", {"latency": 0.01, "response": "b"}))
+
+    # Unknown backends are tried first.
+    answers = [model.invoke("hello").content for _ in range(4)]
+
+    assert answers == ["a", "b", "b", "b"]
+    assert get_backend_stats("fake/fast-b").calls == 3
+
+
+def test_failed_calls_fail_over_to_the_next_backend():
+    model = _router(("broken-a", {"error_probability": 1.0}), ("broken-b", {"latency": 0.01, "response": "b"}))
+
+    assert model.invoke("hello").response_metadata["routed_backend"] == "fake/broken-b"
+    assert get_backend_stats("fake/broken-a").error_rate == 1.0
+    # The failed backend is no longer chosen first.
+    assert model.invoke("hello").content == "b"
+    assert get_backend_stats("fake/broken-a").calls == 1
+
+
+def test_slow_calls_are_hedged_and_the_loser_cancelled():
+    model = _router(
+        ("tail-a", {"latency": 2.0, "response": "a"}), ("tail-b", {"latency": 0.01, "response": "b"}),
+        min_hedge_delay=0.05, initial_hedge_delay=0.05,
+    )
+
+    start = time.perf_counter()
+    message = asyncio.run(model.ainvoke("hello"))
+
+    assert message.content == "b"
+    assert time.perf_counter() - start < 1.0
+    # The cancelled request of the slow backend is not observed.
+    assert get_backend_stats("fake/tail-a").calls == 0
+
+
+def _chunks(model):
+    async def stream():
+        return [chunk async for chunk in model.astream("hello")]
+    return asyncio.run(stream())
+
+
+def test_streamed_calls_hedge_and_fail_over_until_the_first_chunk():
+    model = RoutedChatModel(
+        backends=[
+            FakeLatencyChatModel(model_name="stream-slow", latency=2.0),
+            FakeLatencyChatModel(model_name="stream-broken", error_probability=1.0),
+            GenericFakeChatModel(messages=iter([AIMessage(content="routed token deltas")])),
+        ],
+        backend_names=["fake/stream-slow", "fake/stream-broken", "fake/stream-words"],
+        min_hedge_delay=0.05, initial_hedge_delay=0.05,
+    )
+
+    start = time.perf_counter()
+    chunks = _chunks(model)
+
+    assert [chunk.content for chunk in chunks] == ["routed", " ", "token", " ", "deltas"]
+    assert chunks[0].response_metadata["routed_backend"] == "fake/stream-words"
+    assert time.perf_counter() - start < 1.0
+    assert get_backend_stats("fake/stream-broken").error_rate == 1.0
+    assert get_backend_stats("fake/stream-words").calls == 1
+
+
+def test_started_streams_are_not_hedged():
+    model = RoutedChatModel(
+        backends=[
+            GenericFakeChatModel(messages=iter([AIMessage(content="first answer")])),
+            FakeLatencyChatModel(model_name="stream-spare", latency=0.01),
+        ],
+        backend_names=["fake/stream-first", "fake/stream-spare"],
+        min_hedge_delay=0.01, initial_hedge_delay=0.01,
+    )
+
+    async def slow_stream():
+        chunks = []
+        async for chunk in model.astream("hello"):
+            chunks.append(chunk.content)
+            await asyncio.sleep(0.05)
+        return chunks
+
+    assert asyncio.run(slow_stream()) == ["first", " ", "answer"]
+    assert get_backend_stats("fake/stream-spare").calls == 0
+
+
+def test_statistics_are_rebuilt_from_the_metric_store():
+    metric_store = MagicMock()
+    metric_store.get_by_date_range.return_value = [
+        Metric(timestamp=time.time(), latency=latency, user_id="u", session_id="s",
+               model_type="router", model_name="azure/fred-gpt-4o", finish_reason=finish_reason)
+        for latency, finish_reason in [(1.0, "stop"), (2.0, "stop"), (3.0, "error"), (9.0, "stop")]
+    ] + [Metric(timestamp=time.time(), latency=5.0, user_id="u", session_id="s", model_type="Fred")]
+
+    with patch("fred.model_router.get_metric_store", return_value=metric_store):
+        stats = BackendStats("azure/fred-gpt-4o")
+
+    snapshot = stats.snapshot()
+    assert (snapshot.calls, snapshot.error_rate, snapshot.p50_latency, snapshot.p95_latency) == (4, 0.25, 2.0, 9.0)
@@ -0,0 +1,77 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from fred.common.prompt_builder import PromptBuilder
+from fred.common.structure import MetricsStorageConfig, MetricsStorageSettings
+from fred.monitoring.hybrid_metric_store import HybridMetricStore
+
+
+def _score_prompt() -> PromptBuilder:
+    return (
+        PromptBuilder("CpuScore")
+        .instructions("You are an expert in Kubernetes.")
+        .instructions("Answer in JSON, e.g. {\"score\": 5}.")
+        .context("Workload definitions:\n\n{workload_context}")
+    )
+
+
+def test_instructions_are_a_byte_stable_prefix():
+    template = _score_prompt().template()
+
+    first = template.format_messages(workload_context="kind: Deployment\nname: kafka")
+    second = template.format_messages(workload_context="kind: StatefulSet\nname: redis")
+
+    assert first[0] == second[0]
+    assert first[0].content == "You are an expert in Kubernetes.\n\nAnswer in JSON, e.g. {\"score\": 5}."
+    assert isinstance(first[1], HumanMessage)
+    assert first[1].content.endswith("name: kafka")
+
+
+def test_context_follows_the_instructions_of_an_agent():
+    messages = PromptBuilder("GeneralistExpert").instructions("You are a generalist.").context(None).messages()
+    assert messages == [SystemMessage(content="You are a generalist.")]
+
+    messages = PromptBuilder("GeneralistExpert").instructions("You are a generalist.").context("Use metric units.").messages()
+    assert [m.content for m in messages] == ["You are a generalist.", "Use metric units."]
+
+
+def test_cached_tokens_are_reported_per_prompt(tmp_path):
+    metric_store = HybridMetricStore(MetricsStorageConfig(type="local", settings=MetricsStorageSettings(path=str(tmp_path))))
+    usages = [(2000, 0), (2000, 1536), (2100, 1536)]
+    model = GenericFakeChatModel(messages=iter([
+        AIMessage(content="{}", response_metadata={"model_name": "gpt-4o", "token_usage": {
+            "prompt_tokens": prompt_tokens, "completion_tokens": 10, "total_tokens": prompt_tokens + 10,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }})
+        for prompt_tokens, cached_tokens in usages
+    ]))
+    prompt = _score_prompt()
+    chain = prompt.template() | model
+
+    with patch("fred.common.prompt_builder.get_metric_store", return_value=metric_store):
+        for workload in ["kafka", "redis", "nginx"]:
+            chain.invoke({"workload_context": workload}, config=prompt.config(None))
+
+    now = datetime.now()
+    [cpu_score] = metric_store.get_prompt_cache_by_date_range(now - timedelta(minutes=1), now)
+    assert (cpu_score.prompt_name, cpu_score.calls, cpu_score.prompt_tokens, cpu_score.cached_tokens) == \
+        ("CpuScore", 3, 6100, 3072)
+    assert cpu_score.cached_ratio == round(3072 / 6100, 4)
+    assert metric_store.get_categorical_rows_by_date_range(now - timedelta(minutes=1), now)[0].prompt_name == "CpuScore"
@@ -0,0 +1,237 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fred import application_context
+from fred.batch_generation import BatchSession
+from fred.common.structure import ModelConfiguration, ProviderBatchSettings, WorkloadKind
+from fred.model_factory import get_batch_client
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.structure.workload_context import WorkloadContext
+from fred.services.ai.structure.workload_id import WorkloadId
+from fred.services.ai.structure.workload_scores import WorkloadScores
+from fred.services.ai.structure.workload_summary import WorkloadSummary
+
+
+def _answer(body):
+    """Answer of the fake model to a chat completion request."""
+    if "tools" in body:
+        name = body["tool_choice"]["function"]["name"]
+        arguments = {"workload_id": "kafka"} if name == "WorkloadId" else {"score": 6, "reason": name}
+        message = {"role": "assistant", "content": None, "tool_calls": [{
+            "id": "call", "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }]}
+    else:
+        message = {"role": "assistant", "content": f"summary of {len(body['messages'])} message(s)"}
+    return {"id": "chatcmpl", "object": "chat.completion", "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": message}]}
+
+
+class FakeBatchServer(ThreadingHTTPServer):
+    """
+    Minimal implementation of the files and batches endpoints of the OpenAI API. A batch
+    is in progress at its first poll and completed at the next one.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeBatchHandler)
+        self.files = {}
+        self.batches = {}
+        self.requests = []
+        self.cancelled = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    server: FakeBatchServer
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload, raw=False):
+        data = payload.encode() if raw else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):  # pylint: disable=C0103
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            form = BytesParser(policy=default).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            content = next(part.get_payload(decode=True) for part in form.iter_parts()
+                           if part.get_param("name", header="content-disposition") == "file")
+            file_id = f"file-{len(self.server.files)}"
+            self.server.files[file_id] = content.decode()
+            self._send({"id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+                        "filename": "requests.jsonl", "purpose": "batch", "status": "processed"})
+        elif self.path == "/v1/batches":
+            request = json.loads(body)
+            batch_id = f"batch-{len(self.server.batches)}"
+            self.server.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": request["endpoint"], "created_at": 0,
+                "completion_window": request["completion_window"], "input_file_id": request["input_file_id"],
+                "status": "validating", "output_file_id": None, "error_file_id": None,
+            }
+            self._send(self.server.batches[batch_id])
+        elif self.path.endswith("/cancel"):
+            batch_id = self.path.split("/")[3]
+            self.server.cancelled.append(batch_id)
+            self.server.batches[batch_id]["status"] = "cancelled"
+            self._send(self.server.batches[batch_id])
+
+    def do_GET(self):  # pylint: disable=C0103
+        parts = self.path.split("/")
+        if parts[2] == "files":
+            self._send(self.server.files[parts[3]], raw=True)
+            return
+        batch = self.server.batches[parts[3]]
+        if batch["status"] == "validating":
+            batch["status"] = "in_progress"
+        elif batch["status"] == "in_progress":
+            lines = []
+            for line in self.server.files[batch["input_file_id"]].splitlines():
+                request = json.loads(line)
+                self.server.requests.append(request)
+                lines.append(json.dumps({"custom_id": request["custom_id"], "response": {
+                    "status_code": 200, "body": _answer(request["body"])}}))
+            output_file_id = f"file-{len(self.server.files)}"
+            self.server.files[output_file_id] = "\n".join(lines)
+            batch.update(status="completed", output_file_id=output_file_id)
+        self._send(batch)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    fake_server = FakeBatchServer()
+    thread = threading.Thread(target=fake_server.serve_forever, daemon=True)
+    thread.start()
+    yield fake_server
+    fake_server.shutdown()
+    fake_server.server_close()
+
+
+def _app_context(provider, base_url):
+    app_context = MagicMock()
+    app_context.get_model_configuration_for_service.return_value = ModelConfiguration(
+        provider=provider, name="gpt-4o-mini", provider_settings={"base_url": base_url}
+    )
+    return app_context
+
+
+def test_generators_are_recorded_batched_and_replayed(server):
+    context = WorkloadContext(workload_yaml="kind: Deployment")
+    session = BatchSession(poll_interval=0.01, timeout=10)
+
+    with patch.object(application_context, "get_app_context", return_value=_app_context("openai", server.url)):
+        with session.record("WorkloadId:a"):
+            assert WorkloadId.from_workload_context(context).workload_id is None
+        with session.record("WorkloadScores:a"):
+            WorkloadScores.from_workload_context(context)
+        with session.record("WorkloadSummary:a"):
+            WorkloadSummary.from_workload_context(context)
+
+        assert session.execute() == 7
+
+        with session.replay("WorkloadId:a"):
+            workload_id = WorkloadId.from_workload_context(context)
+        with session.replay("WorkloadScores:a"):
+            scores = WorkloadScores.from_workload_context(context)
+        with session.replay("WorkloadSummary:a"):
+            summary = WorkloadSummary.from_workload_context(context)
+
+    assert workload_id.workload_id == "kafka"
+    assert (scores.cpu.reason, scores.compression.score) == ("CpuScore", 6)
+    # The instructions, then the workload definitions.
+    assert summary.workload_summary == "summary of 2 message(s)"
+    # A single batch, whose requests force the function call of the expected schema.
+    assert len(server.batches) == 1
+    ids = [request["custom_id"] for request in server.requests]
+    assert ids[:3] == ["WorkloadId:a#0", "WorkloadScores:a#0", "WorkloadScores:a#1"]
+    assert server.requests[0]["body"]["model"] == "gpt-4o-mini"
+    assert server.requests[0]["url"] == "/v1/chat/completions"
+
+
+def test_batch_is_cancelled_with_its_job(server):
+    session = BatchSession(poll_interval=0.01, timeout=10)
+    with patch.object(application_context, "get_app_context", return_value=_app_context("openai", server.url)):
+        with session.record("WorkloadId:a"):
+            WorkloadId.from_workload_context(WorkloadContext(workload_yaml=""))
+
+        with pytest.raises(RuntimeError):
+            session.execute(checkpoint=MagicMock(side_effect=RuntimeError("cancelled")))
+
+    assert server.cancelled == ["batch-0"]
+
+
+def test_unsupported_providers_are_generated_synchronously(server):
+    service = AIService.__new__(AIService)
+    service.configuration = MagicMock()
+    service.configuration.ai.provider_batch = ProviderBatchSettings(enabled=True, poll_interval_seconds=0.01)
+    service.dao = MagicMock()
+    context = WorkloadContext(workload_yaml="")
+
+    def post(artifact):
+        def generate(cluster, namespace, name, kind):
+            service._save_generated(artifact.from_workload_context(context), cluster, namespace, kind, name)
+        return MagicMock(side_effect=generate)
+
+    service.post_workload_id = post(WorkloadId)
+    service.post_workload_summary = post(WorkloadSummary)
+    service.post_workload_essentials = MagicMock()
+    service.post_workload_scores = MagicMock()
+    service.post_workload_advanced = MagicMock()
+
+    app_context = _app_context("openai", server.url)
+    ollama = ModelConfiguration(provider="ollama", name="llama3")
+    app_context.get_model_configuration_for_service.side_effect = \
+        lambda service_name, *artifacts: ollama if "WorkloadSummary" in artifacts else \
+        ModelConfiguration(provider="openai", name="gpt-4o-mini", provider_settings={"base_url": server.url})
+
+    app_context.get_model_for_service.return_value.invoke.return_value = MagicMock(content="online")
+    with patch.object(application_context, "get_app_context", return_value=app_context):
+        service._generate_with_batch_api("c", [("ns", WorkloadKind.DEPLOYMENT, "broker")])
+
+    saved = [call.args[0] for call in service.dao.saveCache.call_args_list]
+    assert saved == [WorkloadId(workload_id="kafka"), WorkloadSummary(workload_summary="online")]
+    assert [request["custom_id"] for request in server.requests] == ["WorkloadId:c/ns/broker/Deployment#0"]
+
+
+def test_azure_batches_use_their_own_api_version(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "fake")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://fred.openai.azure.com")
+    chat_settings = {"api_version": "2024-05-01-preview", "azure_deployment": "fred-gpt-4o"}
+
+    client = get_batch_client(ModelConfiguration(provider="azure", name="gpt-4o", provider_settings=chat_settings))
+    assert client.client.default_query["api-version"] == "2024-07-01-preview"
+
+    settings = {**chat_settings, "batch_api_version": "2025-03-01-preview", "batch_deployment": "fred-gpt-4o-batch"}
+    client = get_batch_client(ModelConfiguration(provider="azure", name="gpt-4o", provider_settings=settings))
+    assert client.client.default_query["api-version"] == "2025-03-01-preview"
@@ -0,0 +1,102 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import tool
+from pydantic import BaseModel
+
+from fred.common.structure import ModelConfiguration
+from fred.model_factory import get_structured_chain
+from fred.replay_chat_model import Cassette, CassetteMissError, ReplayChatModel
+
+USAGE = {"input_tokens": 120, "output_tokens": 10, "total_tokens": 130}
+
+
+class ToolCallingFakeChatModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@tool
+def get_pods(namespace: str) -> str:
+    """List the pods of a namespace."""
+    return "kafka-0"
+
+
+class WorkloadId(BaseModel):
+    workload_id: str
+
+
+MESSAGES = [SystemMessage(content="You are a Kubernetes expert."), HumanMessage(content="Which pods run in kafka?")]
+
+
+def test_answers_are_recorded_then_replayed_with_tool_calls(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    answer = AIMessage(content="", tool_calls=[{"name": "get_pods", "args": {"namespace": "kafka"}, "id": "call-1"}],
+                       usage_metadata=USAGE)
+    backend = ToolCallingFakeChatModel(messages=iter([answer]))
+    recorder = ReplayChatModel(cassette=Cassette(path), mode="record", backend=backend)
+
+    recorder.bind_tools([get_pods]).invoke(MESSAGES)
+
+    player = ReplayChatModel(cassette=Cassette(path), latency=0).bind_tools([get_pods])
+    # Message ids are not part of the request.
+    replayed = player.invoke([*MESSAGES[:1], HumanMessage(content="Which pods run in kafka?", id="other")])
+    assert replayed.tool_calls == answer.tool_calls
+    assert replayed.usage_metadata == USAGE
+    with pytest.raises(CassetteMissError):
+        player.invoke([HumanMessage(content="Which pods run in redis?")])
+    with pytest.raises(CassetteMissError):
+        # Without the tools.
+        ReplayChatModel(cassette=Cassette(path), latency=0).invoke(MESSAGES)
+
+
+def test_replay_injects_latency_and_token_rate(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.jsonl"))
+    cassette.record("any", AIMessage(content="one two three four five", usage_metadata=USAGE), latency=2.0)
+
+    start = time.perf_counter()
+    ReplayChatModel(cassette=cassette, match="sequence", latency_scale=0.05).invoke("hello")
+    assert 0.08 < time.perf_counter() - start < 0.5
+
+    model = ReplayChatModel(cassette=cassette, match="sequence", latency=0.0, tokens_per_second=50)
+
+    async def stream():
+        chunks, start = [], time.perf_counter()
+        async for chunk in model.astream("hello"):
+            chunks.append(chunk)
+        return chunks, time.perf_counter() - start
+
+    chunks, elapsed = asyncio.run(stream())
+    assert [chunk.content for chunk in chunks] == ["one ", "two ", "three ", "four ", "five"]
+    assert 0.06 < elapsed < 0.5
+    assert sum(chunks[1:], chunks[0]).usage_metadata == USAGE
+
+
+def test_structured_outputs_are_replayed_from_the_factory(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    Cassette(path).record("recorded-with-another-date", AIMessage(
+        content="", tool_calls=[{"name": "WorkloadId", "args": {"workload_id": "kafka"}, "id": "call-1"}],
+    ), latency=0.0)
+
+    chain = get_structured_chain(WorkloadId, ModelConfiguration(
+        provider="replay", name="gpt-4o", provider_settings={"cassette": path, "match": "sequence"},
+    ))
+
+    assert chain.invoke("Which software is deployed?") == WorkloadId(workload_id="kafka")
@@ -0,0 +1,117 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from fred.common.structure import AgentResponseCacheSettings
+from fred.monitoring.logging_context import set_logging_context
+from fred.monitoring.monitored_language_model import MonitoredLanguageModel
+from fred.response_cache.response_cache import ResponseCache
+from fred.response_cache.store.sqlite_response_store import SQLiteResponseStore
+
+VOCABULARY = ["what", "is", "a", "pod", "service", "kubernetes", "explain"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Bag of words over a small vocabulary."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(word)) for word in VOCABULARY]
+
+
+def _model(tmp_path, responses, **settings):
+    cache = ResponseCache(
+        SQLiteResponseStore(str(tmp_path)), "TheoreticalExpert",
+        AgentResponseCacheSettings(enabled=True, **settings), KeywordEmbeddings(),
+    )
+    metric_store = MagicMock()
+    with patch("fred.monitoring.monitored_language_model.get_metric_store", return_value=metric_store):
+        model = MonitoredLanguageModel(target=FakeListChatModel(responses=responses), name="TheoreticalExpert",
+                                       response_cache=cache)
+    return model, metric_store
+
+
+def _hits(metric_store):
+    return [(m.cache_hit, m.cache_tier) for m in (call.args[0] for call in metric_store.add_metric.call_args_list)]
+
+
+def test_exact_hits_ignore_message_ids(tmp_path):
+    model, metric_store = _model(tmp_path, ["first", "second"])
+    system = SystemMessage(content="You are a Kubernetes expert")
+
+    assert model.invoke([system, HumanMessage(content="What is a pod?", id="1")]).content == "first"
+    assert model.invoke([system, HumanMessage(content="What is a pod?", id="2")]).content == "first"
+    assert model.invoke([HumanMessage(content="What is a pod?")]).content == "second"
+
+    assert _hits(metric_store) == [(0.0, None), (1.0, "exact"), (0.0, None)]
+    assert metric_store.add_metric.call_args_list[1].args[0].token_usage is None
+
+
+def test_expired_responses_are_not_reused(tmp_path):
+    model, metric_store = _model(tmp_path, ["first", "second"], ttl_seconds=0)
+
+    model.invoke("What is a pod?")
+    assert model.invoke("What is a pod?").content == "second"
+
+
+def test_similar_questions_hit_the_semantic_tier(tmp_path):
+    model, metric_store = _model(tmp_path, ["first", "second", "third"], semantic=True, similarity_threshold=0.9)
+    system = SystemMessage(content="You are a Kubernetes expert")
+
+    async def ask(question, prefix=(system,)):
+        return (await model.ainvoke([*prefix, HumanMessage(content=question)])).content
+
+    assert asyncio.run(ask("What is a Kubernetes pod?")) == "first"
+    assert asyncio.run(ask("what is a kubernetes pod")) == "first"
+    assert asyncio.run(ask("Explain a Kubernetes service")) == "second"
+    # Same question after other messages.
+    assert asyncio.run(ask("What is a Kubernetes pod?", prefix=())) == "third"
+
+    assert _hits(metric_store) == [(0.0, None), (1.0, "semantic"), (0.0, None), (0.0, None)]
+
+
+def test_call_parameters_are_part_of_the_key(tmp_path):
+    model, _ = _model(tmp_path, ["first", "second"])
+
+    assert model.invoke("What is a pod?", stop=["\n"]).content == "first"
+    assert model.invoke("What is a pod?").content == "second"
+
+
+def test_users_never_share_responses(tmp_path):
+    model, _ = _model(tmp_path, ["alice's", "bob's"], semantic=True, similarity_threshold=0.9)
+
+    async def ask(user_id, question):
+        set_logging_context(user_id=user_id, session_id="s")
+        return (await model.ainvoke([HumanMessage(content=question)])).content
+
+    assert asyncio.run(ask("alice", "What is a Kubernetes pod?")) == "alice's"
+    assert asyncio.run(ask("bob", "What is a Kubernetes pod?")) == "bob's"
+    assert asyncio.run(ask("alice", "what is a kubernetes pod")) == "alice's"
+
+
+def test_models_bound_to_tools_skip_the_semantic_tier(tmp_path):
+    model, _ = _model(tmp_path, [], semantic=True)
+    tools = [{"type": "function", "function": {"name": "get_pods"}}]
+
+    assert model.response_cache.request(model.target, "What is a pod?", {}).question == "What is a pod?"
+    assert model.response_cache.request(model.target, "What is a pod?", {"tools": tools}).question is None
@@ -0,0 +1,135 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from fred.common.structure import SessionLifecycleSettings
+from fred.services.chatbot_session.in_memory_session_backend import InMemorySessionStorage
+from fred.services.chatbot_session.session_lifecycle import SessionLifecycle
+from fred.services.chatbot_session.session_manager import SessionManager
+from fred.services.chatbot_session.structure.chat_schema import SessionSchema
+
+CLOCK = "fred.services.chatbot_session.session_lifecycle.time.time"
+NOW = time.time()
+
+
+def test_idle_and_least_recently_used_sessions_are_cold():
+    lifecycle = SessionLifecycle(SessionLifecycleSettings(idle_ttl_seconds=600, max_resident_bytes=1000, sweep_interval_seconds=60))
+    with patch(CLOCK, return_value=NOW):
+        for session_id in ["s1", "s2", "s3"]:
+            lifecycle.begin(session_id, "GeneralistExpert")
+            lifecycle.end(session_id, added_bytes=300)
+        lifecycle.begin("s4", "K8SOperatorExpert")
+        assert lifecycle.pop_cold_sessions() == []
+
+    with patch(CLOCK, return_value=NOW + 30):
+        # Over the memory cap, the least recently used session goes without waiting for a sweep.
+        lifecycle.end("s4", added_bytes=300)
+        assert lifecycle.pop_cold_sessions() == ["s1"]
+        assert lifecycle.stats().resident_bytes == 900
+
+    with patch(CLOCK, return_value=NOW + 620):
+        lifecycle.begin("s2", "GeneralistExpert")
+        # s2 is running, s3 is idle, s4 was used recently.
+        assert lifecycle.pop_cold_sessions() == ["s3"]
+        assert lifecycle.agent_names() == {"GeneralistExpert", "K8SOperatorExpert"}
+
+    stats = lifecycle.stats()
+    assert (stats.resident_sessions, stats.resident_bytes, stats.idle_evictions, stats.memory_evictions) == (2, 600, 1, 1)
+
+
+class _Agent:
+    def __init__(self):
+        async def answer(state):
+            return {"messages": [AIMessage(content="kafka runs 3 pods")]}
+
+        builder = StateGraph(MessagesState)
+        builder.add_node("expert", answer)
+        builder.add_edge(START, "expert")
+        builder.add_edge("expert", END)
+        self.compiled_graph = builder.compile(checkpointer=MemorySaver())
+
+    def get_compiled_graph(self):
+        return self.compiled_graph
+
+
+def test_cold_sessions_release_their_agents_caches_and_files():
+    storage = InMemorySessionStorage()
+    for session_id in ["s1", "s2"]:
+        storage.save_session(SessionSchema(id=session_id, user_id="alice", title="Kafka", updated_at=datetime.now()))
+    manager = SessionManager.__new__(SessionManager)
+    manager.storage = storage
+    manager.recursion_limit = 10
+    manager.lifecycle = SessionLifecycle(SessionLifecycleSettings(idle_ttl_seconds=600))
+    manager.context_cache = {"GeneralistExpert": [], "K8SOperatorExpert": []}
+    manager.temp_files = defaultdict(list)
+    manager._compactors = {"GeneralistExpert": None, "K8SOperatorExpert": None}
+    manager._compactions = {}
+    manager.agent_manager = MagicMock()
+    manager.agent_manager.get_create_agent_instance.return_value = _Agent()
+
+    def ask(session_id, agent_name):
+        return asyncio.run(manager.chat_ask_websocket(
+            callback=lambda msg: None, user_id="alice", session_id=session_id,
+            message="How many kafka pods?", agent_name=agent_name, argument="",
+        ))
+
+    with patch(CLOCK, return_value=NOW):
+        ask("s1", "K8SOperatorExpert")
+        upload = manager.get_session_temp_folder("s1") / "pods.yaml"
+        upload.write_text("kind: Pod")
+    assert manager.get_session_lifecycle_stats().resident_bytes > 0
+
+    with patch(CLOCK, return_value=NOW + 700), \
+            patch("fred.services.chatbot_session.session_manager.get_checkpointer", return_value=MemorySaver()), \
+            patch("fred.services.chatbot_session.session_manager.get_enabled_agent_names", return_value=["K8SOperatorExpert"]):
+        ask("s2", "GeneralistExpert")
+
+    # The memory storage holds the only copy of s1: it is dropped.
+    assert storage.get_session("s1") is None and storage.get_message_history("s1") == []
+    assert storage.get_session("s2") is not None
+    manager.agent_manager.clear_cache_for_session.assert_called_with("s1")
+    assert not upload.exists()
+    assert list(manager.context_cache) == ["GeneralistExpert"]
+    assert manager.get_session_lifecycle_stats().resident_sessions == 1
+
+
+def test_evicted_persistent_sessions_drop_their_pending_compactions():
+    manager = SessionManager.__new__(SessionManager)
+    manager.storage = MagicMock()
+    manager.storage.evict_session.return_value = False
+    manager.lifecycle = MagicMock()
+    manager.lifecycle.pop_cold_sessions.return_value = ["s1"]
+    manager.lifecycle.agent_names.return_value = set()
+    manager.context_cache = {}
+    manager.temp_files = defaultdict(list)
+    manager.agent_manager = MagicMock()
+    compactions = {key: MagicMock() for key in ["s1:GeneralistExpert", "s1:Fred", "s2:GeneralistExpert"]}
+    manager._compactions = dict(compactions)
+
+    manager._evict_cold_sessions()
+
+    assert list(manager._compactions) == ["s2:GeneralistExpert"]
+    compactions["s1:GeneralistExpert"].cancel.assert_called_once()
+    compactions["s1:Fred"].cancel.assert_called_once()
+    compactions["s2:GeneralistExpert"].cancel.assert_not_called()
+    manager.agent_manager.clear_cache_for_session.assert_called_once_with("s1")
@@ -0,0 +1,97 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from fred.services.chatbot_session.in_memory_session_backend import InMemorySessionStorage
+from fred.services.chatbot_session.sqlite_session_backend import SQLiteSessionStorage
+from fred.services.chatbot_session.structure.chat_schema import ChatMessagePayload, SessionSchema
+
+
+def _message(session_id, rank, content, type="ai", subtype="final"):
+    return ChatMessagePayload(
+        exchange_id=f"exchange-{rank // 2}", type=type, sender="user" if type == "human" else "assistant",
+        content=content, timestamp="2025-01-01T00:00:00", session_id=session_id, rank=rank, subtype=subtype,
+    )
+
+
+def _exchange(session_id, rank):
+    return [
+        _message(session_id, rank, f"context {rank}", type="system", subtype="injected_context"),
+        _message(session_id, rank, f"question {rank}", type="human"),
+        _message(session_id, rank + 1, f"answer {rank + 1}"),
+    ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    return InMemorySessionStorage() if request.param == "memory" else SQLiteSessionStorage(str(tmp_path))
+
+
+def test_sessions_are_listed_per_user(storage):
+    start = datetime(2025, 1, 1)
+    for i in range(5):
+        storage.save_session(SessionSchema(id=f"s{i}", user_id="alice" if i % 2 else "bob", title=f"t{i}", updated_at=start + timedelta(minutes=i)))
+    storage.save_session(SessionSchema(id="s1", user_id="alice", title="renamed", updated_at=start + timedelta(minutes=1)))
+
+    assert [(s.id, s.title) for s in storage.get_sessions_for_user("alice")] == [("s1", "renamed"), ("s3", "t3")]
+    assert storage.get_session("s4").updated_at == start + timedelta(minutes=4)
+    assert storage.delete_session("s1") and not storage.delete_session("s1")
+    assert [s.id for s in storage.get_sessions_for_user("alice")] == ["s3"]
+    assert storage.get_session("missing") is None
+
+
+def test_history_is_appended_and_read_by_pages(storage):
+    storage.save_session(SessionSchema(id="s1", user_id="alice", title="Kafka", updated_at=datetime.now()))
+    for rank in range(1, 20, 2):
+        storage.save_messages("s1", _exchange("s1", rank))
+    storage.save_messages("s2", _exchange("s2", 1))
+
+    history = storage.get_message_history("s1")
+    assert len(history) == 30
+    assert [m.content for m in history[:3]] == ["context 1", "question 1", "answer 2"]
+    assert [m.rank for m in storage.get_message_history("s1", limit=4)] == [18, 19, 19, 20]
+    assert [m.rank for m in storage.get_message_history("s1", limit=4, before_rank=17)] == [14, 15, 15, 16]
+    assert [m.content for m in storage.get_message_history("s1", since_rank=16)] == [
+        "context 17", "question 17", "answer 18", "context 19", "question 19", "answer 20",
+    ]
+    assert [m.rank for m in storage.get_message_history("s1", limit=2, since_rank=2)] == [3, 3]
+    assert [m.rank for m in storage.get_message_history("s1", before_rank=4, since_rank=1)] == [2, 3, 3]
+    assert storage.get_message_history("s1", since_rank=20) == []
+    # A limit cutting a rank returns the whole rank: the question keeps its context.
+    assert [m.content for m in storage.get_message_history("s1", limit=2)] == ["context 19", "question 19", "answer 20"]
+    assert [m.content for m in storage.get_message_history("s1", limit=1, since_rank=2)] == ["context 3", "question 3"]
+
+    # Paging back by rank cursors reads every message exactly once.
+    pages, before_rank = [], None
+    while page := storage.get_message_history("s1", limit=2, before_rank=before_rank):
+        pages = page + pages
+        before_rank = page[0].rank
+    assert pages == history
+
+    storage.delete_session("s1")
+    assert storage.get_message_history("s1") == []
+    assert len(storage.get_message_history("s2")) == 3
+
+
+def test_sqlite_sessions_survive_a_restart(tmp_path):
+    storage = SQLiteSessionStorage(str(tmp_path))
+    storage.save_session(SessionSchema(id="s1", user_id="alice", title="Kafka", updated_at=datetime(2025, 1, 1)))
+    storage.save_messages("s1", _exchange("s1", 1))
+
+    restarted = SQLiteSessionStorage(str(tmp_path))
+    assert restarted.get_session("s1").title == "Kafka"
+    assert restarted.get_message_history("s1") == storage.get_message_history("s1")
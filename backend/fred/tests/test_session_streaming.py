@@ -0,0 +1,264 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from fred.common.structure import SessionLifecycleSettings, SessionTitleSettings
+from fred.common.token_utils import count_tokens
+from fred.services.chatbot_session.in_memory_session_backend import InMemorySessionStorage
+from fred.services.chatbot_session.session_lifecycle import SessionLifecycle
+from fred.services.chatbot_session.session_manager import SessionManager
+from fred.services.chatbot_session.structure.chat_schema import FinalEvent, SessionSchema
+
+
+def _leader_like_graph():
+    expert_model = GenericFakeChatModel(messages=iter([AIMessage(content="kafka runs 3 pods")]))
+    leader_model = GenericFakeChatModel(messages=iter([AIMessage(content="Kafka is healthy")]))
+
+    async def expert(state):
+        return {"messages": [await expert_model.ainvoke(state["messages"])]}
+
+    expert_builder = StateGraph(MessagesState)
+    expert_builder.add_node("expert", expert)
+    expert_builder.add_edge(START, "expert")
+    expert_builder.add_edge("expert", END)
+    expert_graph = expert_builder.compile()
+
+    async def execute(state):
+        response = await expert_graph.ainvoke({"messages": state["messages"]})
+        return {"messages": response["messages"][-1:]}
+
+    async def respond(state):
+        return {"messages": [await leader_model.ainvoke(state["messages"])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("execute", execute)
+    builder.add_node("respond", respond)
+    builder.add_edge(START, "execute")
+    builder.add_edge("execute", "respond")
+    builder.add_edge("respond", END)
+    return builder.compile(checkpointer=MemorySaver())
+
+
+def test_token_deltas_are_streamed_before_each_complete_message():
+    manager = SessionManager.__new__(SessionManager)
+    manager.recursion_limit = 10
+    streamed = []
+
+    messages = asyncio.run(manager._stream_agent_response(
+        compiled_graph=_leader_like_graph(),
+        input_messages=[HumanMessage(content="How is kafka?")],
+        session_id="session-1",
+        base_rank=4,
+        callback=streamed.append,
+        exchange_id="exchange-1",
+    ))
+
+    assert [(m.rank, m.content) for m in messages] == [(5, "kafka runs 3 pods"), (6, "Kafka is healthy")]
+    assert all(m.subtype != "delta" for m in messages)
+
+    deltas = [m for m in streamed if m["subtype"] == "delta"]
+    assert "".join(m["content"] for m in deltas if m["rank"] == 5) == "kafka runs 3 pods"
+    assert "".join(m["content"] for m in deltas if m["rank"] == 6) == "Kafka is healthy"
+    # The expert answer is an intermediate step of the leader, its own answer is not.
+    assert {m["metadata"]["thought"] for m in deltas if m["rank"] == 5} == {True}
+    assert {(m["metadata"]["thought"], m["metadata"]["fred"]["node"]) for m in deltas if m["rank"] == 6} == {(False, "respond")}
+
+    first_delta = streamed.index(deltas[0])
+    first_message = next(i for i, m in enumerate(streamed) if m["subtype"] != "delta")
+    assert first_delta < first_message
+    assert streamed[-1]["content"] == "Kafka is healthy" and streamed[-1]["subtype"] != "delta"
+
+
+class _RecordingAgent:
+    """Single node agent recording the prompt it is given, with its own checkpointer."""
+
+    def __init__(self, prompts):
+        async def answer(state):
+            prompts.append(list(state["messages"]))
+            return {"messages": [AIMessage(content=f"Answer {len(prompts)}: kafka runs 3 pods in the kafka namespace.")]}
+
+        builder = StateGraph(MessagesState)
+        builder.add_node("expert", answer)
+        builder.add_edge(START, "expert")
+        builder.add_edge("expert", END)
+        self.compiled_graph = builder.compile(checkpointer=MemorySaver())
+
+    def get_compiled_graph(self):
+        return self.compiled_graph
+
+
+def _session_manager(storage, prompts):
+    agent = _RecordingAgent(prompts)
+    manager = SessionManager.__new__(SessionManager)
+    manager.storage = storage
+    manager.recursion_limit = 10
+    manager.title_settings = SessionTitleSettings()
+    manager._title_model = None
+    manager.lifecycle = SessionLifecycle(SessionLifecycleSettings())
+    manager._compactors = {"GeneralistExpert": None}
+    manager._compactions = {}
+    manager._title_tasks = set()
+    manager.agent_manager = MagicMock()
+    manager.agent_manager.get_create_agent_instance.return_value = agent
+    return manager
+
+
+def _ask(manager, question, chat_profile_id=None):
+    return asyncio.run(manager.chat_ask_websocket(
+        callback=lambda msg: None, user_id="alice", session_id="session-1",
+        message=question, agent_name="GeneralistExpert", argument="", chat_profile_id=chat_profile_id,
+    ))
+
+
+def test_prompt_grows_linearly_over_a_50_turn_session():
+    storage = InMemorySessionStorage()
+    storage.save_session(SessionSchema(id="session-1", user_id="alice", title="Kafka", updated_at=datetime.now()))
+    prompts = []
+    profile = {"title": "SRE", "description": "Site reliability", "markdown": "Answer briefly. " * 50}
+    manager = _session_manager(storage, prompts)
+    manager.get_chat_profile_data = MagicMock(return_value=profile)
+
+    for turn in range(50):
+        # The client sends the profile with every question.
+        _, messages = _ask(manager, f"Question {turn}: how many kafka pods are running?", chat_profile_id="sre")
+        assert [m.rank for m in messages if m.subtype != "injected_context"] == [2 * turn + 1, 2 * turn + 2]
+        assert [m.subtype for m in messages].count("injected_context") == (1 if turn == 0 else 0)
+
+    # The checkpointer holds the conversation: turn n sees the profile, the n questions and
+    # n-1 answers once.
+    assert [len(prompt) for prompt in prompts] == [2 * turn + 2 for turn in range(50)]
+    assert all(sum(m.content.startswith("## SRE") for m in prompt) == 1 for prompt in prompts)
+    tokens = [sum(count_tokens(m.content) for m in prompt) for prompt in prompts]
+    growth = {b - a for a, b in zip(tokens, tokens[1:])}
+    assert max(growth) - min(growth) <= 2
+
+    # After a restart the checkpointer is empty, and the stored history, profile included,
+    # seeds it once.
+    prompts.clear()
+    manager = _session_manager(storage, prompts)
+    manager.get_chat_profile_data = MagicMock(return_value=profile)
+    _ask(manager, "Question 50: and in the redis namespace?", chat_profile_id="sre")
+    _ask(manager, "Question 51: and in the default namespace?", chat_profile_id="sre")
+    assert [len(prompt) for prompt in prompts] == [102, 104]
+    assert sum(m.content.startswith("## SRE") for m in prompts[-1]) == 1
+
+
+class _SlowTitleModel:
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.1)
+        return AIMessage(content='"Kafka pods"')
+
+
+def test_new_session_title_is_generated_while_the_agent_answers():
+    storage = InMemorySessionStorage()
+    manager = _session_manager(storage, prompts=[])
+    manager._title_model = _SlowTitleModel()
+    events = []
+
+    async def ask():
+        return await manager.chat_ask_websocket(
+            callback=lambda msg: events.append(("stream", msg)), user_id="alice", session_id=None,
+            message="How many   kafka pods are running in the kafka namespace of the production cluster today?",
+            agent_name="GeneralistExpert", argument="",
+            session_callback=lambda session: events.append(("session", session)),
+        )
+
+    session, _ = asyncio.run(ask())
+
+    # The answer is not held back by the title, which comes afterwards as a session update.
+    assert [kind for kind, _ in events] == ["stream", "session"]
+    assert events[-1][1]["id"] == session.id and events[-1][1]["title"] == "Kafka pods"
+    assert session.title == "Kafka pods"
+    assert storage.get_session(session.id).title == "Kafka pods"
+    assert manager._provisional_title("How many   kafka pods are running in the kafka namespace of the production cluster today?") == \
+        "How many kafka pods are running in the kafka namespace of…"
+
+
+def test_slow_title_is_saved_without_notification_after_the_answer():
+    storage = InMemorySessionStorage()
+    manager = _session_manager(storage, prompts=[])
+    manager.title_settings = SessionTitleSettings(timeout_seconds=0.01)
+    manager._title_model = _SlowTitleModel()
+    events = []
+
+    async def ask():
+        session, _ = await manager.chat_ask_websocket(
+            callback=lambda msg: None, user_id="alice", session_id=None, message="Kafka pods?",
+            agent_name="GeneralistExpert", argument="",
+            session_callback=lambda session: events.append(session),
+        )
+        # The answer came with the provisional title.
+        assert session.title == "Kafka pods?" and manager._title_tasks
+        # Long enough for the title model to have answered.
+        await asyncio.sleep(0.2)
+        return session
+
+    session = asyncio.run(ask())
+
+    assert storage.get_session(session.id).title == "Kafka pods"
+    assert events == [] and not manager._title_tasks
+
+    manager.title_settings = SessionTitleSettings()
+    manager._stream_agent_response = MagicMock(side_effect=RuntimeError("agent failed"))
+
+    async def fail():
+        with pytest.raises(RuntimeError):
+            await manager.chat_ask_websocket(
+                callback=lambda msg: None, user_id="alice", session_id=None, message="Redis pods?",
+                agent_name="GeneralistExpert", argument="",
+                session_callback=lambda session: events.append(session),
+            )
+        await asyncio.sleep(0.2)
+
+    asyncio.run(fail())
+
+    assert events == []
+    assert {session.title for session in storage.get_sessions_for_user("alice")} == {"Kafka pods"}
+
+
+def test_final_event_references_the_streamed_messages_and_history_is_paged():
+    storage = InMemorySessionStorage()
+    storage.save_session(SessionSchema(id="session-1", user_id="alice", title="Kafka", updated_at=datetime.now()))
+    manager = _session_manager(storage, prompts=[])
+    for turn in range(3):
+        _ask(manager, f"Question {turn}")
+
+    streamed = set()
+
+    def callback(msg):
+        if msg["subtype"] != "delta":
+            streamed.add((msg["exchange_id"], msg["rank"]))
+
+    session, messages = asyncio.run(manager.chat_ask_websocket(
+        callback=callback, user_id="alice", session_id="session-1",
+        message="Question 3", agent_name="GeneralistExpert", argument="",
+    ))
+    final = FinalEvent.after_stream(session, messages, streamed)
+
+    # Only the question, which is not streamed, is sent again.
+    assert [(m.type, m.rank) for m in final.messages] == [("human", 7)]
+    assert [ref.rank for ref in final.delivered] == [8]
+
+    assert [m.rank for m in manager.get_session_history("session-1", limit=3)] == [6, 7, 8]
+    assert [m.rank for m in manager.get_session_history("session-1", limit=2, before_rank=6)] == [4, 5]
+    assert [m.content for m in manager.get_session_history("session-1", since_rank=6)] == ["Question 3", messages[-1].content]
@@ -0,0 +1,152 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+
+from fred.common.structure import SpeechSettings
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.audio_cache import AudioCache
+
+AUDIO = bytes(range(256)) * 64
+
+
+def _service(tmp_path, handler, **settings):
+    speech = SpeechSettings(cache_path=str(tmp_path), chunk_size=1024, **settings)
+    service = AIService.__new__(AIService)
+    service.configuration = MagicMock()
+    service.configuration.ai.speech = speech
+    service.audio_cache = AudioCache(speech.cache_path, speech.cache_max_size_mb * 1024 * 1024)
+    service._openai_client = openai.AsyncOpenAI(
+        api_key="test", max_retries=0, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return service
+
+
+async def _body(response):
+    if isinstance(response, FileResponse):
+        with open(response.path, "rb") as f:
+            return [f.read()]
+    return [chunk async for chunk in response.body_iterator]
+
+
+def test_speech_is_streamed_then_replayed_from_the_cache(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=AUDIO, headers={"content-type": "audio/mpeg"})
+
+    service = _service(tmp_path, handler)
+
+    async def speak(text):
+        response = await service.get_speech(text)
+        return response, await _body(response)
+
+    first, chunks = asyncio.run(speak("Hello Fred"))
+    assert isinstance(first, StreamingResponse)
+    assert len(chunks) > 1 and b"".join(chunks) == AUDIO
+
+    replay, chunks = asyncio.run(speak("Hello Fred"))
+    assert isinstance(replay, FileResponse)
+    assert b"".join(chunks) == AUDIO
+    assert len(requests) == 1
+
+    asyncio.run(speak("Hello again"))
+    assert len(requests) == 2
+
+
+def test_interrupted_speech_is_not_cached(tmp_path):
+    service = _service(tmp_path, lambda request: httpx.Response(200, content=AUDIO))
+
+    async def interrupt():
+        response = await service.get_speech("Hello Fred")
+        iterator = response.body_iterator
+        await iterator.__anext__()
+        await iterator.aclose()
+
+    asyncio.run(interrupt())
+
+    assert [files for _, _, files in os.walk(tmp_path) if files] == []
+
+
+def test_least_recently_played_speech_is_evicted(tmp_path):
+    cache = AudioCache(str(tmp_path), max_size_bytes=2 * len(AUDIO))
+    for key in ["aa01", "bb02", "cc03"]:
+        with cache.writer(key) as f:
+            f.write(AUDIO)
+        os.utime(cache.get(key), (0, {"aa01": 1, "bb02": 2, "cc03": 3}[key]))
+    with cache.writer("dd04") as f:
+        f.write(AUDIO)
+    assert cache.over_size
+
+    cache.prune()
+
+    assert [key for key in ["aa01", "bb02", "cc03", "dd04"] if cache.get(key)] == ["cc03", "dd04"]
+    assert not cache.over_size
+
+
+def test_writes_track_the_cache_size_and_prune_tolerates_vanished_files(tmp_path):
+    cache = AudioCache(str(tmp_path), max_size_bytes=len(AUDIO))
+    with patch("fred.services.ai.audio_cache.os.walk", side_effect=AssertionError("walked")):
+        for key in ["aa01", "bb02"]:
+            with cache.writer(key) as f:
+                f.write(AUDIO)
+    assert cache.over_size
+
+    unlink = os.unlink
+
+    def concurrent_unlink(path):
+        # Another prune removed the file first.
+        unlink(path)
+        raise FileNotFoundError(path)
+
+    with patch("fred.services.ai.audio_cache.os.unlink", side_effect=concurrent_unlink):
+        cache.prune()
+
+    assert not cache.over_size
+    assert len([key for key in ["aa01", "bb02"] if cache.get(key)]) == 1
+    # A restarted cache starts from the files on disk.
+    assert not AudioCache(str(tmp_path), max_size_bytes=len(AUDIO)).over_size
+
+
+def test_transcription_is_fed_from_the_upload(tmp_path):
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(200, json={"text": "hello fred"})
+
+    service = _service(tmp_path, handler, language="fr")
+    upload = UploadFile(file=io.BytesIO(AUDIO), filename="question.webm")
+
+    assert asyncio.run(service.get_transcribe(upload)) == {"text": "hello fred"}
+    assert AUDIO in bodies[0] and b'name="language"\r\n\r\nfr' in bodies[0]
+
+
+def test_speech_errors_are_reported_before_streaming(tmp_path):
+    service = _service(tmp_path, lambda request: httpx.Response(400, json={"error": {"message": "too long"}}))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.get_speech("Hello Fred"))
+
+    assert error.value.status_code == 500
@@ -0,0 +1,156 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from fred.common.connectors.file_dao import FileDAO
+from fred.common.structure import DAOConfiguration, DAOTypeEnum, WorkloadKind
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.topology_store import TopologyStore, TopologyWatcher
+from fred.services.kube.kube_service import KubeService
+from fred.services.kube.structure import ServicesList, Workload
+
+DEPLOYMENT = WorkloadKind.DEPLOYMENT
+
+
+def _filled_store():
+    store = TopologyStore()
+    generation = store.generation("c")
+    store.put_workload("c", "ns", DEPLOYMENT, "api", "api-topology", generation)
+    store.put_workload("c", "ns", DEPLOYMENT, "db", "db-topology", generation)
+    store.put_workload("c", "other", DEPLOYMENT, "web", "web-topology", generation)
+    store.put_namespace("c", "ns", "ns-topology", generation)
+    store.put_namespace("c", "other", "other-topology", generation)
+    store.put_cluster("c", "cluster-topology", generation)
+    return store
+
+
+def test_invalidating_a_workload_only_drops_its_ancestors():
+    store = _filled_store()
+
+    store.invalidate_workload("c", "ns", DEPLOYMENT, "api")
+
+    assert store.get_workload("c", "ns", DEPLOYMENT, "api") is None
+    assert store.get_namespace("c", "ns") is None
+    assert store.get_cluster("c") is None
+    assert store.get_workload("c", "ns", DEPLOYMENT, "db") == "db-topology"
+    assert store.get_namespace("c", "other") == "other-topology"
+
+
+def test_topology_built_during_an_invalidation_is_not_stored():
+    store = TopologyStore()
+    generation = store.generation("c")
+
+    store.invalidate_cluster("c")
+
+    assert not store.put_cluster("c", "stale", generation)
+    assert store.get_cluster("c") is None
+
+
+def test_service_change_invalidates_the_workloads_of_its_namespace():
+    store = _filled_store()
+    watcher = TopologyWatcher(store, lambda cluster: {})
+
+    watcher.on_event("c", "Service", SimpleNamespace(namespace="ns", name="api-svc"))
+
+    assert store.get_workload("c", "ns", DEPLOYMENT, "db") is None
+    assert store.get_workload("c", "other", DEPLOYMENT, "web") == "web-topology"
+
+    watcher.on_event("c", "Deployment", SimpleNamespace(namespace="other", name="web"))
+    assert store.get_workload("c", "other", DEPLOYMENT, "web") is None
+
+
+def test_namespace_and_quota_changes_invalidate_the_namespace_and_cluster():
+    store = _filled_store()
+    watcher = TopologyWatcher(store, lambda cluster: {})
+
+    watcher.on_event("c", "ResourceQuota", SimpleNamespace(namespace="ns", name="quota"))
+
+    assert store.get_namespace("c", "ns") is None
+    assert store.get_cluster("c") is None
+    assert store.get_workload("c", "ns", DEPLOYMENT, "api") == "api-topology"
+
+    store.put_cluster("c", "cluster-topology", store.generation("c"))
+    watcher.on_event("c", "Namespace", SimpleNamespace(namespace=None, name="other"))
+
+    assert store.get_cluster("c") is None
+    assert store.get_namespace("c", "other") is None
+
+
+def test_topology_expires_after_the_max_age():
+    store = TopologyStore(max_age_seconds=60)
+    store.put_cluster("c", "cluster-topology", store.generation("c"))
+    assert store.get_cluster("c") == "cluster-topology"
+
+    with patch("fred.services.ai.topology_store.time.time", return_value=time.time() + 61):
+        assert store.get_cluster("c") is None
+
+
+@patch("fred.services.ai.ai_service.WorkloadTopology")
+def test_workload_topology_is_memoized_until_invalidated(_workload_topology):
+    service = AIService.__new__(AIService)
+    service.configuration = SimpleNamespace(ai=SimpleNamespace(topology=SimpleNamespace(watch=False)))
+    service.topology_store = TopologyStore()
+    for getter in ("get_workload_id", "get_workload_essentials", "get_workload_summary",
+                   "get_workload_services_essentials", "get_workload_ingresses_essentials",
+                   "get_workload_facts"):
+        setattr(service, getter, MagicMock(return_value=None))
+
+    first = service.get_workload_topology("c", "ns", "api", DEPLOYMENT)
+    second = service.get_workload_topology("c", "ns", "api", DEPLOYMENT)
+
+    assert second is first
+    assert service.get_workload_id.call_count == 1
+
+    service.topology_store.invalidate_workload("c", "ns", DEPLOYMENT, "api")
+    service.get_workload_topology("c", "ns", "api", DEPLOYMENT)
+    assert service.get_workload_id.call_count == 2
+
+
+def test_watched_change_is_read_again_from_the_cluster(tmp_path):
+    kube_service = KubeService.__new__(KubeService)
+    kube_service.dao = FileDAO(DAOConfiguration(type=DAOTypeEnum.file, base_path=str(tmp_path),
+                                                max_cached_delay_seconds=300), "kube")
+    kube_service.connected_client = MagicMock()
+    service = AIService.__new__(AIService)
+    service.kube_service = kube_service
+    watcher = TopologyWatcher(TopologyStore(), lambda cluster: {},
+                              forget_changed_object=kube_service.forget_changed_object)
+
+    def deployment(image):
+        return Workload(cluster="c", namespace="ns", kind=DEPLOYMENT,
+                        object={"spec": {"template": {"spec": {"containers": [{"image": image}]}}}})
+
+    def services(port):
+        return ServicesList(cluster="c", namespace="ns", resource_name="api", kind=DEPLOYMENT,
+                            services_list=[{"spec": {"ports": [{"port": port}]}}])
+
+    kube_service.connected_client.get_workload_description.return_value = deployment("api:1")
+    kube_service.connected_client.get_workload_services.return_value = services(80)
+    assert "api:1" in service._get_workload_definition("c", "ns", "api", DEPLOYMENT)
+    kube_service.get_workload_services("c", "ns", "api", DEPLOYMENT)
+
+    kube_service.connected_client.get_workload_description.return_value = deployment("api:2")
+    kube_service.connected_client.get_workload_services.return_value = services(8080)
+    # Served from the cache until the change is watched.
+    assert "api:1" in service._get_workload_definition("c", "ns", "api", DEPLOYMENT)
+
+    watcher.on_event("c", "Deployment", SimpleNamespace(namespace="ns", name="api"))
+    watcher.on_event("c", "Service", SimpleNamespace(namespace="ns", name="api-svc"))
+
+    assert "api:2" in service._get_workload_definition("c", "ns", "api", DEPLOYMENT)
+    services_list = kube_service.get_workload_services("c", "ns", "api", DEPLOYMENT).services_list
+    assert services_list[0]["spec"]["ports"][0]["port"] == 8080
@@ -0,0 +1,128 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from fred.common.structure import WorkloadKind
+from fred.common.token_utils import count_tokens
+from fred.services.ai.structure.context_report import ContextTokensReport, WorkloadContextTokens
+from fred.services.ai.structure.workload_context import WorkloadContext, prune_resource
+
+
+def _workload(name: str) -> dict:
+    return {
+        "api_version": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": name,
+            "namespace": "default",
+            "uid": "0f6c1a1e-8f7e-4a3a-9a51-2f0f0b8c5e11",
+            "resource_version": "123456",
+            "creation_timestamp": "2025-01-01T00:00:00Z",
+            "annotations": {
+                "kubectl.kubernetes.io/last-applied-configuration": '{"apiVersion":"apps/v1"}' * 50,
+                "team": "platform",
+            },
+            "managed_fields": [{"manager": "kubectl", "operation": "Update", "fields_v1": {"f:spec": {}}}] * 10,
+            "labels": {"app": name},
+            "finalizers": None,
+        },
+        "spec": {
+            "replicas": 2,
+            "template": {
+                "spec": {
+                    "containers": [{
+                        "name": name,
+                        "image": f"registry.local/{name}:1.0",
+                        "termination_message_path": "/dev/termination-log",
+                        "env": [],
+                    }],
+                },
+            },
+        },
+        "status": {"ready_replicas": 2, "conditions": [{"type": "Available", "status": "True"}] * 5},
+    }
+
+
+def _configmap(name: str, size: int) -> dict:
+    return {
+        "metadata": {"name": f"{name}-config", "uid": "x"},
+        "data": {"application.yaml": "logging:\n  level: INFO\n" * size},
+        "binary_data": {"keystore.jks": "QUJD" * 1000},
+    }
+
+
+def test_prune_resource_removes_runtime_fields_and_empty_values():
+    pruned = prune_resource(_workload("api"))
+
+    assert "status" not in pruned
+    assert "managed_fields" not in pruned["metadata"]
+    assert "uid" not in pruned["metadata"]
+    assert "finalizers" not in pruned["metadata"]
+    assert pruned["metadata"]["annotations"] == {"team": "platform"}
+    container = pruned["spec"]["template"]["spec"]["containers"][0]
+    assert container == {"name": "api", "image": "registry.local/api:1.0"}
+
+
+def test_prune_resource_keeps_user_keys_named_like_runtime_fields():
+    configmap = {
+        "kind": "ConfigMap",
+        "metadata": {"name": "flags", "uid": "x", "generation": 3, "labels": {"generation": "v2", "status": "beta"}},
+        "data": {"status": "enabled", "uid": "1000", "generation": "3", "x": ""},
+    }
+    workload = _workload("api")
+    workload["spec"]["template"]["spec"]["containers"][0]["env"] = [{"name": "status", "value": ""}]
+
+    assert prune_resource(configmap) == {
+        "kind": "ConfigMap",
+        "metadata": {"name": "flags", "labels": {"generation": "v2", "status": "beta"}},
+        "data": {"status": "enabled", "uid": "1000", "generation": "3", "x": ""},
+    }
+    assert prune_resource(workload)["spec"]["template"]["spec"]["containers"][0]["env"] == [{"name": "status", "value": ""}]
+
+
+def test_from_resources_truncates_configmaps_and_enforces_budget():
+    context = WorkloadContext.from_resources(
+        _workload("api"), [_configmap("api", 2000)], [], [],
+        max_tokens=600, max_configmap_value_tokens=100,
+    )
+
+    assert context.tokens <= 600
+    assert context.tokens == count_tokens(str(context))
+    assert context.raw_tokens > context.tokens
+    assert "registry.local/api:1.0" in context.workload_yaml
+    assert "QUJD" not in context.configmaps_yaml
+
+
+def test_from_resources_keeps_small_contexts_intact():
+    context = WorkloadContext.from_resources(_workload("api"), [], [], [], max_tokens=10000)
+
+    assert "truncated" not in str(context)
+    assert "team: platform" in context.workload_yaml
+
+
+def test_tokens_saved_across_a_sample_cluster():
+    report = ContextTokensReport(cluster="sample", max_tokens=2000)
+    for index, size in enumerate([10, 200, 5000]):
+        name = f"app-{index}"
+        context = WorkloadContext.from_resources(
+            _workload(name), [_configmap(name, size)], [], [], max_tokens=2000,
+        )
+        report.workloads.append(WorkloadContextTokens(
+            namespace="default", kind=WorkloadKind.DEPLOYMENT, name=name,
+            raw_tokens=context.raw_tokens, tokens=context.tokens,
+        ))
+
+    assert all(workload.tokens <= 2000 for workload in report.workloads)
+    assert report.saved_tokens > 0
+    assert "tokens saved" in str(report)
+    assert report.model_dump()["saved_tokens"] == report.saved_tokens
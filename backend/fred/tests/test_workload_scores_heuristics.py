@@ -0,0 +1,132 @@
+# Copyright Thales 2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock, patch
+
+from fred.common.structure import ScoreHeuristicsSettings, WorkloadKind
+from fred.services.ai.ai_service import AIService
+from fred.services.ai.structure.workload_context import WorkloadContext
+from fred.services.ai.structure.workload_scores import WorkloadScores
+from fred.services.ai.structure.workload_scores.heuristics import SCORE_TYPES, prescore_workload
+
+
+def _workload(replicas=1, resources=None, volumes=None):
+    return {
+        "spec": {
+            "replicas": replicas,
+            "template": {
+                "spec": {
+                    "containers": [{"name": "app", "resources": resources or {}}],
+                    "volumes": volumes,
+                }
+            },
+        }
+    }
+
+
+BOUNDED = {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"cpu": "1", "memory": "256Mi"}}
+EMPTY_DIR = {"name": "cache", "empty_dir": {}, "persistent_volume_claim": None}
+PVC = {"name": "data", "empty_dir": None, "persistent_volume_claim": {"claim_name": "data"}}
+CONFIG = {"name": "config", "config_map": {"name": "app"}}
+
+# (workload, autoscaled) of a sample cluster
+SAMPLE_CLUSTER = {
+    "frontend": (_workload(replicas=3, resources=BOUNDED), True),
+    "api": (_workload(replicas=1, resources=BOUNDED, volumes=[CONFIG]), False),
+    "worker": (_workload(replicas=2, volumes=[EMPTY_DIR, CONFIG]), False),
+    "database": (_workload(replicas=1, resources=BOUNDED, volumes=[PVC]), False),
+    "cache": (_workload(replicas=1, volumes=[EMPTY_DIR]), False),
+    "legacy": (_workload(replicas=1), None),
+}
+
+
+def test_rules():
+    assert prescore_workload(_workload(resources=BOUNDED), WorkloadKind.DEPLOYMENT, True) == {}
+
+    scores = prescore_workload(_workload(volumes=[EMPTY_DIR, CONFIG]), WorkloadKind.DEPLOYMENT, False)
+    assert set(scores) == {"cpu", "ram", "io", "scalability"}
+    assert scores["cpu"].score == 2 and "CPU request" in scores["cpu"].reason
+
+    # Persistent volumes, DaemonSets and unknown autoscalers are left to the LLM.
+    assert "io" not in prescore_workload(_workload(volumes=[EMPTY_DIR, PVC]), WorkloadKind.DEPLOYMENT)
+    assert "scalability" not in prescore_workload(_workload(), WorkloadKind.DAEMON_SET, False)
+    assert "scalability" not in prescore_workload(_workload(), WorkloadKind.DEPLOYMENT, None)
+
+
+def test_camel_case_manifests():
+    manifest = {
+        "spec": {
+            "jobTemplate": {"spec": {"template": {"spec": {
+                "containers": [{"name": "batch", "resources": {"limits": {"memory": "1Gi"}}}],
+                "volumes": [{"name": "scratch", "emptyDir": {"medium": "Memory"}}],
+            }}}},
+        }
+    }
+
+    assert set(prescore_workload(manifest, WorkloadKind.CRONJOB)) == {"cpu", "io"}
+
+
+def test_only_inconclusive_scores_are_asked_to_the_llm():
+    prescores = prescore_workload(_workload(), WorkloadKind.DEPLOYMENT, False)
+    llm_scores = {}
+    for field, score_type in SCORE_TYPES.items():
+        llm_scores[field] = patch.object(
+            score_type, "from_workload_context", return_value=score_type(score=5, reason="llm")
+        )
+
+    with llm_scores["cpu"] as cpu, llm_scores["ram"] as ram, llm_scores["io"] as io, \
+            llm_scores["scalability"] as scalability, llm_scores["compression"] as compression:
+        scores = WorkloadScores.from_workload_context(WorkloadContext(workload_yaml=""), None, prescores)
+
+    for mock in (cpu, ram, scalability):
+        mock.assert_not_called()
+    io.assert_called_once()
+    compression.assert_called_once()
+    assert scores.scalability.score == 1
+    assert scores.compression.reason == "llm"
+
+
+def test_report_on_sample_cluster():
+    service = AIService.__new__(AIService)
+    service.configuration = MagicMock()
+    service.configuration.ai.score_heuristics = ScoreHeuristicsSettings()
+    service._list_cluster_workloads = MagicMock(
+        return_value=[("default", WorkloadKind.DEPLOYMENT, name) for name in SAMPLE_CLUSTER]
+    )
+    service.kube_service = MagicMock()
+    service.kube_service.get_workload_description.side_effect = \
+        lambda cluster, namespace, name, kind: MagicMock(object=SAMPLE_CLUSTER[name][0])
+
+    def autoscalers(cluster, namespace, name, kind):
+        autoscaled = SAMPLE_CLUSTER[name][1]
+        if autoscaled is None:
+            raise PermissionError("forbidden")
+        return MagicMock(horizontal_pod_autoscalers_list=[{"name": name}] if autoscaled else [])
+
+    service.kube_service.get_workload_horizontal_pod_autoscalers.side_effect = autoscalers
+
+    report = service.get_scores_heuristics_report("sample")
+
+    prescored = {workload.name: set(workload.prescored) for workload in report.workloads}
+    assert prescored == {
+        "frontend": set(),
+        "api": {"scalability"},
+        "worker": {"cpu", "ram", "io"},
+        "database": {"scalability"},
+        "cache": {"cpu", "ram", "io", "scalability"},
+        "legacy": {"cpu", "ram"},
+    }
+    assert report.score_calls == 30
+    assert report.avoided_calls == 11
+    assert round(report.avoided_ratio, 3) == 0.367
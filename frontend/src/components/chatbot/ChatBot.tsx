@@ -25,7 +25,7 @@ import { getAgentBadge } from "../../utils/avatar.tsx";
 import { getConfig } from "../../common/config.tsx";
 import { useGetChatBotMessagesMutation } from "../../slices/chatApi.tsx";
 import { KeyCloakService } from "../../security/KeycloakService.ts";
-import { StreamEvent, ChatMessagePayload, SessionSchema, FinalEvent } from "../../slices/chatApiStructures.ts";
+import { StreamEvent, ChatMessagePayload, SessionSchema, FinalEvent, SessionEvent } from "../../slices/chatApiStructures.ts";
 
 export interface ChatBotError {
   session_id: string | null;
@@ -76,6 +76,21 @@ const ChatBot = ({
     messagesRef.current = [...messagesRef.current, msg];
     setMessages(messagesRef.current);
   };
+  // Token deltas are accumulated in temporary messages, replaced by the complete message of the same rank.
+  const mergeStreamedMessage = (msg: ChatMessagePayload) => {
+    const sameRank = (m: ChatMessagePayload) =>
+      m.subtype === "delta" && m.session_id === msg.session_id && m.exchange_id === msg.exchange_id && m.rank === msg.rank;
+    if (msg.subtype !== "delta") {
+      messagesRef.current = [...messagesRef.current.filter((m) => !sameRank(m)), msg];
+    } else {
+      const index = messagesRef.current.findIndex((m) => sameRank(m) && m.metadata?.fred?.node === msg.metadata?.fred?.node);
+      messagesRef.current =
+        index === -1
+          ? [...messagesRef.current, msg]
+          : messagesRef.current.map((m, i) => (i === index ? { ...msg, content: m.content + msg.content } : m));
+    }
+    setMessages(messagesRef.current);
+  };
   // Update existing messages in the state. This resets the messagesRef to the new state
   const setAllMessages = (msgs: ChatMessagePayload[]) => {
     messagesRef.current = msgs;
@@ -117,7 +132,12 @@ const ChatBot = ({
               console.log(
                 `STREAM ${msg.session_id}-${msg.exchange_id}- ${msg.rank} content: ${msg.content.slice(0, 50)}...`,
               );
-              addMessage(msg);
+              mergeStreamedMessage(msg);
+              break;
+            }
+            case "session": {
+              // A new session starts with a provisional title, its generated title comes later.
+              onUpdateOrAddSession((response as SessionEvent).session);
               break;
             }
             case "final": {
@@ -125,7 +145,9 @@ const ChatBot = ({
               const streamedKeys = new Set(
                 messagesRef.current.map((m) => `${m.session_id}-${m.exchange_id}-${m.rank}`),
               );
-              const finalKeys = new Set(finalEvent.messages.map((m) => `${m.session_id}-${m.exchange_id}-${m.rank}`));
+              const finalKeys = new Set(
+                finalEvent.delivered.map((m) => `${finalEvent.session.id}-${m.exchange_id}-${m.rank}`),
+              );
 
               const missing = [...finalKeys].filter((k) => !streamedKeys.has(k));
               const unexpected = [...streamedKeys].filter((k) => !finalKeys.has(k));
@@ -134,7 +156,7 @@ const ChatBot = ({
               console.log("→ Messages in streamed but missing from final:", unexpected);
               console.log("→ Messages in final but not in streamed:", missing);
 
-              console.log("FinalEvent messages:", finalEvent.messages);
+              console.log("FinalEvent messages not streamed:", finalEvent.messages);
               if (response.session.id !== currentChatBotSession?.id) {
                 onUpdateOrAddSession(response.session);
               }
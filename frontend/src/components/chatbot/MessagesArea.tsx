@@ -102,6 +102,10 @@ function Area({
             console.log("✅ Classified as: FINAL RESPONSE");
           }
         } 
+        else if (msg.subtype === "delta" && msg.metadata?.thought) {
+          console.log("⏭️ Skipping delta of an intermediate step");
+          continue;
+        }
         else if (msg.subtype === "injected_context") {
           console.log("⏭️ Skipping injected context message");
           continue;
@@ -30,10 +30,14 @@ export const { reducer: chatApiReducer, middleware: chatApiMiddleware } = chatAp
 
 const extendedChatApi = chatApiSlice.injectEndpoints({
   endpoints: (builder) => ({
-    getChatBotMessages: builder.mutation<ChatMessagePayload[], { session_id: string }>({
-      query: ({ session_id }) => ({
+    getChatBotMessages: builder.mutation<
+      ChatMessagePayload[],
+      { session_id: string; limit?: number; before_rank?: number; since_rank?: number }
+    >({
+      query: ({ session_id, ...page }) => ({
         url: `/fred/chatbot/session/${session_id}/history`,
         method: "GET",
+        params: page,
       }),
     }),
     getChatBotAgenticFlows: builder.mutation<AgenticFlow[], void>({
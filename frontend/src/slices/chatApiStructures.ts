@@ -29,7 +29,7 @@ export interface ChatTokenUsage {
   total_tokens: number;
 }
 
-export type ChatMessageSubtype = "final" | "thought" | "tool_result" | "plan" | "execution" | "observation" | "error" | "injected_context";
+export type ChatMessageSubtype = "final" | "thought" | "tool_result" | "plan" | "execution" | "observation" | "error" | "injected_context" | "delta";
 
 export interface ChatSource {
   document_uid: string;
@@ -75,9 +75,22 @@ export interface StreamEvent {
   message: ChatMessagePayload;
 }
 
+export interface ChatMessageRef {
+  exchange_id: string;
+  rank: number;
+}
+
 export interface FinalEvent {
   type: "final";
+  // Messages of the exchange that were not streamed, e.g. the stored user question.
   messages: ChatMessagePayload[];
+  // Messages of the exchange already streamed, by reference.
+  delivered: ChatMessageRef[];
+  session: SessionSchema;
+}
+
+export interface SessionEvent {
+  type: "session";
   session: SessionSchema;
 }
 
@@ -87,4 +100,4 @@ export interface ErrorEvent {
   session_id?: string;
 }
 
-export type ChatEvent = StreamEvent | FinalEvent | ErrorEvent;
+export type ChatEvent = StreamEvent | SessionEvent | FinalEvent | ErrorEvent;